@@ -0,0 +1,188 @@
+"""
+Measure what a flooding chat costs the database and the other users, with and without throttling.
+
+`--abusers` chats (or scripts) send the registration dialog over and over,
+`--rounds` times each at `--flood-rate` updates per second, every round
+ending in a client save. Meanwhile `--users` ordinary users go through the dialog once,
+typing a step every `--pace` seconds. Updates are handled in a task each,
+as `start_polling` does; replies go to a local fake Bot API answering
+after `--api-delay` seconds and every SQL statement takes `--db-latency`.
+
+"before" runs with `TELEGRAM_BOT_THROTTLE_RATE = 0`, "after" with the
+configured throttling (`--mode` overrides `TELEGRAM_BOT_THROTTLE_MODE`).
+
+Usage:
+    DATABASE_URL=postgres://... python benchmarks/bench_bot_flood.py --abusers 20 --flood-rate 50 --db-latency 0.02
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Final, List
+
+import django
+
+BASE_DIR: Final[str] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+DB_PATH: Final[str] = os.path.join(BASE_DIR, 'var', 'bench_bot_flood.sqlite3')
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'crm.settings')
+os.environ.setdefault('DATABASE_URL', f"sqlite:///{DB_PATH}")
+os.makedirs(os.path.join(BASE_DIR, 'var'), exist_ok=True)
+if os.path.exists(DB_PATH):
+    os.remove(DB_PATH)
+django.setup()
+
+from aiogram import Bot, Dispatcher
+from aiogram.fsm.storage.memory import MemoryStorage
+from django.conf import settings
+from django.core.management import call_command
+from django.db.backends.signals import connection_created
+
+from bot.dispatcher import create_bot, create_dispatcher
+from bot.scheduler import ScheduledDispatcher
+from clients.models import Client
+from tasks.tests.fake_telegram import FakeTelegramServer
+
+ABUSER_CHATS: Final[int] = 900000
+USER_CHATS: Final[int] = 100000
+
+
+class StatementCounter:
+    """Counts SQL statements and delays each by `latency` seconds."""
+
+    def __init__(self, latency: float) -> None:
+        self.latency: float = latency
+        self.statements: int = 0
+        self._lock: threading.Lock = threading.Lock()
+        connection_created.connect(self._on_connection)
+
+    def _on_connection(self, sender: Any, connection: Any, **kwargs: Any) -> None:
+        if self._execute not in connection.execute_wrappers:
+            connection.execute_wrappers.append(self._execute)
+
+    def _execute(self, execute: Callable, sql: str, params: Any, many: bool, context: Dict[str, Any]) -> Any:
+        with self._lock:
+            self.statements += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return execute(sql, params, many, context)
+
+
+def message(update_id: int, chat_id: int, text: str) -> Dict[str, Any]:
+    """Telegram update with a private text message."""
+    return {
+        'update_id': update_id,
+        'message': {
+            'message_id': update_id,
+            'date': int(time.time()),
+            'chat': {'id': chat_id, 'type': 'private'},
+            'from': {'id': chat_id, 'is_bot': False, 'first_name': f"User {chat_id}"},
+            'text': text,
+        },
+    }
+
+
+def dialog(chat_id: int) -> List[str]:
+    """Texts of one pass through the registration dialog."""
+    return ['/registration', f"ООО Чат {chat_id}", str(7700000000 + chat_id), "пропустить"]
+
+
+async def flood(dispatcher: Dispatcher, bot: Bot, args: argparse.Namespace) -> List[float]:
+    """Run abusers and users together; return the seconds each user update took from sending to handled."""
+    update_ids: List[int] = [0]
+    tasks: List[asyncio.Task] = []
+    latencies: List[float] = []
+
+    def send(chat_id: int, text: str, timed: bool) -> None:
+        update_ids[0] += 1
+        update: Dict[str, Any] = message(update_ids[0], chat_id, text)
+
+        async def handle() -> None:
+            sent: float = time.perf_counter()
+            await dispatcher.feed_raw_update(bot, update)
+            if timed:
+                latencies.append(time.perf_counter() - sent)
+
+        tasks.append(asyncio.create_task(handle()))
+
+    async def abuse(chat_id: int) -> None:
+        for _ in range(args.rounds):
+            for text in dialog(chat_id):
+                send(chat_id, text, timed=False)
+                await asyncio.sleep(1 / args.flood_rate)
+
+    async def register() -> None:
+        for text_index in range(4):
+            for n in range(args.users):
+                send(USER_CHATS + n, dialog(USER_CHATS + n)[text_index], timed=True)
+            await asyncio.sleep(args.pace)
+
+    await asyncio.gather(register(), *(abuse(ABUSER_CHATS + n) for n in range(args.abusers)))
+    await asyncio.gather(*tasks)
+    await bot.session.close()
+    return latencies
+
+
+def run(label: str, throttle_rate: float, args: argparse.Namespace, api: FakeTelegramServer,
+        counter: StatementCounter) -> None:
+    """Let the abusers flood a fresh dispatcher while the users register, and print the costs."""
+    settings.TELEGRAM_BOT_THROTTLE_RATE = throttle_rate
+    Client.objects.all().delete()
+    dispatcher: ScheduledDispatcher = create_dispatcher(MemoryStorage())
+    bot: Bot = create_bot('42:BENCH', api.url)
+    statements_before: int = counter.statements
+
+    started: float = time.perf_counter()
+    latencies: List[float] = asyncio.run(flood(dispatcher, bot, args))
+    elapsed: float = time.perf_counter() - started
+
+    latencies.sort()
+    registered: int = Client.objects.filter(
+        telegram_chat_id__in=[str(USER_CHATS + n) for n in range(args.users)],
+    ).count()
+    line: str = (f"{label:<8} {elapsed:6.2f} s  SQL statements {counter.statements - statements_before:6d}  "
+                 f"user update p50 {statistics.median(latencies) * 1000:6.0f} ms  "
+                 f"p95 {latencies[int(len(latencies) * 0.95)] * 1000:6.0f} ms  "
+                 f"users registered {registered}/{args.users}")
+    if dispatcher.throttling is not None:
+        line += f"\n{'':<8} {dispatcher.throttling.stats}"
+    print(line)
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--abusers', type=int, default=5)
+    parser.add_argument('--rounds', type=int, default=50)
+    parser.add_argument('--flood-rate', type=float, default=20.0, help="updates per second of each abuser")
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--pace', type=float, default=1.0)
+    parser.add_argument('--mode', choices=['delay', 'drop'])
+    parser.add_argument('--api-delay', type=float, default=0.05)
+    parser.add_argument('--db-latency', type=float, default=0.005)
+    args: argparse.Namespace = parser.parse_args()
+
+    call_command('migrate', verbosity=0)
+    counter: StatementCounter = StatementCounter(args.db_latency)
+    api: FakeTelegramServer = FakeTelegramServer().start()
+    api.delay = args.api_delay
+    throttle_rate: float = settings.TELEGRAM_BOT_THROTTLE_RATE or 1.0
+    if args.mode:
+        settings.TELEGRAM_BOT_THROTTLE_MODE = args.mode
+    print(f"{args.abusers} abusers x {args.rounds} dialogs, {args.users} users, "
+          f"throttling {throttle_rate}/s burst {settings.TELEGRAM_BOT_THROTTLE_BURST:g} "
+          f"({settings.TELEGRAM_BOT_THROTTLE_MODE})")
+
+    try:
+        run('before', 0, args, api, counter)
+        run('after', throttle_rate, args, api, counter)
+    finally:
+        api.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""
+Measure concurrent bot registrations: Django's shared thread vs the bot's database threads.
+
+Every chat goes through the registration dialog (/start, /registration,
+organization, INN, "пропустить"); chats run concurrently, each chat's
+updates in order. Updates are fed straight into the dispatcher, replies go
+to a local fake Bot API. `--db-latency` adds a delay to every SQL statement
+to stand in for the network round trip to a database server (the SQLite
+file itself answers in microseconds).
+
+"before" runs with `TELEGRAM_BOT_DB_CONNECTIONS = 0`: every query queues
+for Django's one shared thread, as the `sync_to_async` calls (and the async
+ORM methods) do. "after" uses the pool of `--connections` database threads.
+
+Point `DATABASE_URL` at PostgreSQL for meaningful numbers: SQLite (the
+default, a fresh file) takes one writer at a time whatever the threads.
+
+Usage:
+    DATABASE_URL=postgres://... python benchmarks/bench_bot_registrations.py --chats 200 --db-latency 0.02
+"""
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Final, List
+
+import django
+
+BASE_DIR: Final[str] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+DB_PATH: Final[str] = os.path.join(BASE_DIR, 'var', 'bench_bot_registrations.sqlite3')
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'crm.settings')
+os.environ.setdefault('DATABASE_URL', f"sqlite:///{DB_PATH}")
+os.makedirs(os.path.join(BASE_DIR, 'var'), exist_ok=True)
+if os.path.exists(DB_PATH):
+    os.remove(DB_PATH)
+django.setup()
+
+from aiogram import Bot, Dispatcher
+from aiogram.fsm.storage.memory import MemoryStorage
+from django.conf import settings
+from django.core.management import call_command
+from django.db.backends.signals import connection_created
+
+from bot.dispatcher import create_bot, create_dispatcher
+from clients.models import Client
+from tasks.tests.fake_telegram import FakeTelegramServer
+
+
+class DatabaseProbe:
+    """Counts opened connections and delays every statement by `latency` seconds."""
+
+    def __init__(self, latency: float) -> None:
+        self.latency: float = latency
+        self.connections: int = 0
+        self._lock: threading.Lock = threading.Lock()
+        connection_created.connect(self._on_connection)
+
+    def _on_connection(self, sender: Any, connection: Any, **kwargs: Any) -> None:
+        with self._lock:
+            self.connections += 1
+        # The wrapper object outlives a closed connection and is reused when the thread reconnects
+        if self._execute not in connection.execute_wrappers:
+            connection.execute_wrappers.append(self._execute)
+
+    def _execute(self, execute: Callable, sql: str, params: Any, many: bool, context: Dict[str, Any]) -> Any:
+        if self.latency:
+            time.sleep(self.latency)
+        return execute(sql, params, many, context)
+
+
+def dialog(chat_id: int, first_update_id: int) -> List[Dict[str, Any]]:
+    """Updates of one user going through the registration dialog."""
+    texts: List[str] = ['/start', '/registration', f"ООО Чат {chat_id}", str(7700000000 + chat_id), "пропустить"]
+    return [{
+        'update_id': first_update_id + step,
+        'message': {
+            'message_id': first_update_id + step,
+            'date': int(time.time()),
+            'chat': {'id': chat_id, 'type': 'private'},
+            'from': {'id': chat_id, 'is_bot': False, 'first_name': f"User {chat_id}"},
+            'text': text,
+        },
+    } for step, text in enumerate(texts)]
+
+
+async def register_all(dispatcher: Dispatcher, bot: Bot, chats: int) -> None:
+    async def chat(n: int) -> None:
+        for update in dialog(n + 1, n * 10):
+            await dispatcher.feed_raw_update(bot, update)
+
+    await asyncio.gather(*(chat(n) for n in range(chats)))
+    await bot.session.close()
+
+
+def run(label: str, db_connections: int, chats: int, api: FakeTelegramServer, probe: DatabaseProbe) -> None:
+    """Register `chats` chats concurrently and print registrations/sec."""
+    settings.TELEGRAM_BOT_DB_CONNECTIONS = db_connections
+    Client.objects.all().delete()
+    connections_before: int = probe.connections
+    bot: Bot = create_bot('42:BENCH', api.url)
+
+    started: float = time.perf_counter()
+    asyncio.run(register_all(create_dispatcher(MemoryStorage()), bot, chats))
+    elapsed: float = time.perf_counter() - started
+
+    registered: int = Client.objects.count()
+    print(f"{label:<8} {elapsed:7.2f} s  {registered / elapsed:7.1f} registrations/s  "
+          f"registered {registered}/{chats}  connections opened {probe.connections - connections_before}")
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--chats', type=int, default=200)
+    parser.add_argument('--db-latency', type=float, default=0.005)
+    parser.add_argument('--connections', type=int, default=settings.TELEGRAM_BOT_DB_CONNECTIONS)
+    args: argparse.Namespace = parser.parse_args()
+
+    call_command('migrate', verbosity=0)
+    api: FakeTelegramServer = FakeTelegramServer().start()
+    probe: DatabaseProbe = DatabaseProbe(args.db_latency)
+    print(f"{args.chats} chats, {args.db_latency * 1000:.0f} ms per SQL statement")
+
+    try:
+        run('before', 0, args.chats, api, probe)
+        run('after', args.connections, args.chats, api, probe)
+    finally:
+        api.stop()
+
+
+if __name__ == '__main__':
+    main()
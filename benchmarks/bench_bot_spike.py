@@ -0,0 +1,162 @@
+"""
+Measure how the bot absorbs a spike of updates, e.g. answers to a mass broadcast.
+
+`--chats` users each send the whole registration dialog (/start,
+/registration, organization, INN, "пропустить") at once, so every update
+of the spike is in hand at the same time, like one long-polling batch.
+Each update is handled in its own task, as `start_polling` does. Dialog
+states live in Redis at `REDIS_URL` (or in fakeredis with `--fakeredis`,
+which needs `fakeredis[lua]` for the locks) with its per-chat event
+isolation lock, as in production. Replies go to a local fake Bot API
+answering after `--api-delay` seconds, and `--db-latency` is added to
+every SQL statement.
+
+"before" is a plain aiogram Dispatcher: every task races for the chat's
+Redis lock, which is polled, not first come, first served, so dialog
+steps of one chat may run out of order. "after" is `create_dispatcher()`
+with the update scheduler. A dialog counts as completed when the client
+was saved with its organization name and INN.
+
+Usage:
+    python benchmarks/bench_bot_spike.py --chats 500 --concurrency 50
+    python benchmarks/bench_bot_spike.py --fakeredis
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, Final, List
+
+import django
+
+BASE_DIR: Final[str] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+DB_PATH: Final[str] = os.path.join(BASE_DIR, 'var', 'bench_bot_spike.sqlite3')
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'crm.settings')
+os.environ.setdefault('DATABASE_URL', f"sqlite:///{DB_PATH}")
+os.makedirs(os.path.join(BASE_DIR, 'var'), exist_ok=True)
+if os.path.exists(DB_PATH):
+    os.remove(DB_PATH)
+django.setup()
+
+from aiogram import Bot, Dispatcher
+from aiogram.fsm.storage.base import BaseStorage
+from django.core.management import call_command
+from django.db.backends.signals import connection_created
+
+from bot.dispatcher import create_bot, create_dispatcher
+from bot.handlers import create_router
+from bot.scheduler import ScheduledDispatcher
+from bot.storage import build_event_isolation, build_fsm_storage
+from clients.models import Client
+from tasks.tests.fake_telegram import FakeTelegramServer
+
+
+def spike(chats: int) -> List[Dict[str, Any]]:
+    """Updates of `chats` users going through the registration dialog, each chat's in order, chats interleaved."""
+    steps: List[str] = ['/start', '/registration', "ООО Чат {n}", "{inn}", "пропустить"]
+    updates: List[Dict[str, Any]] = []
+    for step in steps:
+        for n in range(chats):
+            chat_id: int = 100000 + n
+            updates.append({
+                'update_id': len(updates) + 1,
+                'message': {
+                    'message_id': len(updates) + 1,
+                    'date': int(time.time()),
+                    'chat': {'id': chat_id, 'type': 'private'},
+                    'from': {'id': chat_id, 'is_bot': False, 'first_name': f"User {n}"},
+                    'text': step.format(n=n, inn=7700000000 + n),
+                },
+            })
+    return updates
+
+
+def plain_dispatcher(storage: BaseStorage) -> Dispatcher:
+    """The dispatcher without the scheduler."""
+    dispatcher: Dispatcher = Dispatcher(storage=storage, events_isolation=build_event_isolation(storage))
+    dispatcher.include_router(create_router())
+    return dispatcher
+
+
+async def absorb(dispatcher: Dispatcher, bot: Bot, updates: List[Dict[str, Any]]) -> List[float]:
+    """Handle the whole spike, a task per update; return the seconds from arrival to the end of each update."""
+    arrived: float = time.perf_counter()
+    latencies: List[float] = []
+
+    async def handle(update: Dict[str, Any]) -> None:
+        await dispatcher.feed_raw_update(bot, update)
+        latencies.append(time.perf_counter() - arrived)
+
+    await asyncio.gather(*(asyncio.create_task(handle(update)) for update in updates))
+    await bot.session.close()
+    await dispatcher.storage.close()
+    return latencies
+
+
+def run(label: str, make_dispatcher: Callable[[BaseStorage], Dispatcher], chats: int, api: FakeTelegramServer,
+        fake_redis: bool) -> None:
+    """Send the spike through a fresh dispatcher and print how long it took and how many dialogs completed."""
+    Client.objects.all().delete()
+    redis: Any = None
+    if fake_redis:
+        import fakeredis
+        redis = fakeredis.FakeAsyncRedis()
+    storage: BaseStorage = build_fsm_storage('redis', redis=redis)
+    dispatcher: Dispatcher = make_dispatcher(storage)
+    bot: Bot = create_bot('42:BENCH', api.url)
+
+    started: float = time.perf_counter()
+    latencies: List[float] = asyncio.run(absorb(dispatcher, bot, spike(chats)))
+    elapsed: float = time.perf_counter() - started
+
+    latencies.sort()
+    completed: int = sum(
+        client.name == f"ООО Чат {client.inn and int(client.inn) - 7700000000}"
+        for client in Client.objects.all()
+    )
+    line: str = (f"{label:<8} {elapsed:6.2f} s  update p50 {latencies[len(latencies) // 2]:5.2f} s  "
+                 f"p95 {latencies[int(len(latencies) * 0.95)]:5.2f} s  dialogs completed {completed}/{chats}")
+    if isinstance(dispatcher, ScheduledDispatcher):
+        line += f"\n{'':<8} {dispatcher.scheduler.stats}"
+    print(line)
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--chats', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, help="updates handled at once, defaults to TELEGRAM_BOT_CONCURRENCY")
+    parser.add_argument('--api-delay', type=float, default=0.05)
+    parser.add_argument('--db-latency', type=float, default=0.002)
+    parser.add_argument('--fakeredis', action='store_true', help="keep dialog states in fakeredis instead of REDIS_URL")
+    args: argparse.Namespace = parser.parse_args()
+
+    call_command('migrate', verbosity=0)
+
+    def slow_statement(execute: Callable, sql: str, params: Any, many: bool, context: Dict[str, Any]) -> Any:
+        time.sleep(args.db_latency)
+        return execute(sql, params, many, context)
+
+    def on_connection(sender: Any, connection: Any, **kwargs: Any) -> None:
+        if slow_statement not in connection.execute_wrappers:
+            connection.execute_wrappers.append(slow_statement)
+
+    connection_created.connect(on_connection, weak=False)
+    api: FakeTelegramServer = FakeTelegramServer().start()
+    api.delay = args.api_delay
+    print(f"{args.chats} chats x 5 updates, Bot API {args.api_delay * 1000:.0f} ms, "
+          f"{args.db_latency * 1000:.0f} ms per SQL statement")
+
+    try:
+        run('before', plain_dispatcher, args.chats, api, args.fakeredis)
+        run('after', lambda storage: create_dispatcher(storage, concurrency=args.concurrency), args.chats, api,
+            args.fakeredis)
+    finally:
+        api.stop()
+
+
+if __name__ == '__main__':
+    main()
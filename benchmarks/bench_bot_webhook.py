@@ -0,0 +1,213 @@
+"""
+Load test of the bot webhook: replay updates at a high rate against a local endpoint.
+
+The webhook app runs on 127.0.0.1 with the real registration handlers and
+an in-memory FSM storage; replies go to a local fake Bot API that answers
+after `--api-delay` seconds, like the round trip to api.telegram.org.
+Every chat goes through the whole registration dialog (/start,
+/registration, organization, INN, "пропустить"), each chat's updates
+posted in order, the chats in parallel over `--connections` connections
+(Telegram's `max_connections`). `--updates` replays recorded updates from a
+JSON-lines file instead.
+
+The same load runs with one update handled at a time (what a single
+polling loop that awaits every handler amounts to) and with
+`--concurrency` updates at a time.
+
+Usage:
+    python benchmarks/bench_bot_webhook.py --chats 300 --rate 0
+    python benchmarks/bench_bot_webhook.py --updates var/updates.jsonl --rate 200
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, Final, List, Optional
+
+import django
+
+BASE_DIR: Final[str] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+DB_PATH: Final[str] = os.path.join(BASE_DIR, 'var', 'bench_bot_webhook.sqlite3')
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'crm.settings')
+os.environ.setdefault('DATABASE_URL', f"sqlite:///{DB_PATH}")
+os.makedirs(os.path.join(BASE_DIR, 'var'), exist_ok=True)
+if os.path.exists(DB_PATH):
+    os.remove(DB_PATH)
+django.setup()
+
+import aiohttp
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiohttp import web
+from django.core.management import call_command
+
+from bot.dispatcher import create_bot, create_dispatcher
+from bot.webhook import create_webhook_app
+from clients.models import Client
+from tasks.tests.fake_telegram import FakeTelegramServer
+
+SECRET: Final[str] = 'bench-secret'
+PATH: Final[str] = '/telegram/webhook/'
+
+
+def registration_updates(chats: int) -> List[Dict[str, Any]]:
+    """Updates of `chats` users going through the registration dialog, interleaved as they would arrive."""
+    steps: List[str] = ['/start', '/registration', "ООО Чат {n}", "{inn}", "пропустить"]
+    updates: List[Dict[str, Any]] = []
+    for step in steps:
+        for n in range(chats):
+            chat_id: int = 100000 + n
+            updates.append({
+                'update_id': len(updates) + 1,
+                'message': {
+                    'message_id': len(updates) + 1,
+                    'date': int(time.time()),
+                    'chat': {'id': chat_id, 'type': 'private'},
+                    'from': {'id': chat_id, 'is_bot': False, 'first_name': f"User {n}"},
+                    'text': step.format(n=n, inn=7700000000 + n),
+                },
+            })
+    return updates
+
+
+def load_updates(path: str) -> List[Dict[str, Any]]:
+    """Recorded updates, one JSON object per line (e.g. the `result` items of `getUpdates`)."""
+    with open(path, encoding='utf-8') as stream:
+        return [json.loads(line) for line in stream if line.strip()]
+
+
+def chat_of(update: Dict[str, Any]) -> Optional[int]:
+    """Chat an update belongs to, or None for updates without one."""
+    for value in update.values():
+        if isinstance(value, dict):
+            chat: Dict[str, Any] = value.get('chat') or value.get('message', {}).get('chat') or {}
+            if 'id' in chat:
+                return chat['id']
+    return None
+
+
+class WebhookServer:
+    """The webhook app served from its own thread and event loop, as a separate bot process would."""
+
+    def __init__(self, api_url: str, concurrency: int) -> None:
+        self.api_url: str = api_url
+        self.concurrency: int = concurrency
+        self.port: int = 0
+        self._ready: threading.Event = threading.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop: Optional[asyncio.Event] = None
+        self._thread: threading.Thread = threading.Thread(target=lambda: asyncio.run(self._serve()), daemon=True)
+
+    async def _serve(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        app: web.Application = create_webhook_app(
+            create_dispatcher(MemoryStorage()), create_bot('42:BENCH', self.api_url),
+            secret_token=SECRET, path=PATH, concurrency=self.concurrency,
+        )
+        runner: web.AppRunner = web.AppRunner(app)
+        await runner.setup()
+        site: web.TCPSite = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        await self._stop.wait()
+        # Shutting down waits for the updates still in progress
+        await runner.cleanup()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}{PATH}"
+
+    def start(self) -> 'WebhookServer':
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def stop(self) -> None:
+        self._loop.call_soon_threadsafe(self._stop.set)
+        self._thread.join()
+
+
+async def replay(url: str, updates: List[Dict[str, Any]], rate: float, connections: int) -> List[float]:
+    """Post updates, each chat's in order and the chats in parallel; return the acknowledgement latencies."""
+    per_chat: Dict[Any, List[Dict[str, Any]]] = defaultdict(list)
+    for update in updates:
+        per_chat[chat_of(update) or update['update_id']].append(update)
+
+    latencies: List[float] = []
+    next_slot: List[float] = [time.perf_counter()]
+    headers: Dict[str, str] = {'X-Telegram-Bot-Api-Secret-Token': SECRET}
+
+    async def pace() -> None:
+        if rate:
+            slot: float = max(next_slot[0], time.perf_counter())
+            next_slot[0] = slot + 1 / rate
+            await asyncio.sleep(slot - time.perf_counter())
+
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=connections)) as session:
+        async def send_chat(chat_updates: List[Dict[str, Any]]) -> None:
+            for update in chat_updates:
+                await pace()
+                started: float = time.perf_counter()
+                async with session.post(url, json=update, headers=headers) as response:
+                    response.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+
+        await asyncio.gather(*(send_chat(chat_updates) for chat_updates in per_chat.values()))
+    return latencies
+
+
+def run(label: str, updates: List[Dict[str, Any]], api: FakeTelegramServer, concurrency: int,
+        rate: float, connections: int) -> None:
+    """Replay the updates against a fresh webhook and print the throughput and latencies."""
+    Client.objects.all().delete()
+    api.calls.clear()
+    server: WebhookServer = WebhookServer(api.url, concurrency).start()
+
+    started: float = time.perf_counter()
+    latencies: List[float] = asyncio.run(replay(server.url, updates, rate, connections))
+    sent: float = time.perf_counter() - started
+    server.stop()
+    handled: float = time.perf_counter() - started
+
+    latencies.sort()
+    p50: float = statistics.median(latencies) * 1000
+    p99: float = latencies[int(len(latencies) * 0.99) - 1] * 1000
+    print(f"{label:<22} {len(updates) / sent:8.1f} upd/s posted  {len(updates) / handled:8.1f} upd/s handled  "
+          f"ack p50 {p50:6.1f} ms  p99 {p99:7.1f} ms  "
+          f"replies {len(api.calls_for('sendMessage'))}  registered {Client.objects.count()}")
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--chats', type=int, default=300)
+    parser.add_argument('--updates', help="JSON-lines file with recorded updates")
+    parser.add_argument('--rate', type=float, default=0, help="updates per second, 0 = as fast as possible")
+    parser.add_argument('--connections', type=int, default=40)
+    parser.add_argument('--concurrency', type=int, default=100)
+    parser.add_argument('--api-delay', type=float, default=0.05)
+    args: argparse.Namespace = parser.parse_args()
+
+    call_command('migrate', verbosity=0)
+    updates: List[Dict[str, Any]] = load_updates(args.updates) if args.updates else registration_updates(args.chats)
+    api: FakeTelegramServer = FakeTelegramServer().start()
+    api.delay = args.api_delay
+    print(f"{len(updates)} updates, Bot API round trip {args.api_delay * 1000:.0f} ms")
+
+    try:
+        run("one at a time", updates, api, 1, args.rate, args.connections)
+        run(f"concurrency {args.concurrency}", updates, api, args.concurrency, args.rate, args.connections)
+    finally:
+        api.stop()
+
+
+if __name__ == '__main__':
+    main()
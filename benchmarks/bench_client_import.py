@@ -0,0 +1,99 @@
+"""
+Measure the bulk client import against the one-form-per-row way.
+
+Writes a CSV with the requested number of clients (about 1% duplicate phones,
+some without phone or INN) and imports it into a fresh SQLite database (or
+`DATABASE_URL` if set). The form path is timed on a small sample and
+extrapolated, since running it on the full file takes minutes.
+
+Usage:
+    python benchmarks/bench_client_import.py --clients 100000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Final, List
+
+import django
+
+BASE_DIR: Final[str] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+DB_PATH: Final[str] = os.path.join(BASE_DIR, 'var', 'bench_client_import.sqlite3')
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'crm.settings')
+os.environ.setdefault('DATABASE_URL', f"sqlite:///{DB_PATH}")
+os.makedirs(os.path.join(BASE_DIR, 'var'), exist_ok=True)
+if os.path.exists(DB_PATH):
+    os.remove(DB_PATH)
+django.setup()
+
+from django.core.management import call_command
+from django.db import transaction
+
+from clients.forms import ClientForm
+from clients.importer import ImportReport, import_clients, read_rows
+from clients.models import Client
+
+FORM_SAMPLE: Final[int] = 2000
+NAMES: Final[List[str]] = ['Иван', 'Пётр', 'Анна', 'Мария', 'Сергей', 'Ольга', 'Алексей', 'Елена']
+
+
+def write_csv(path: str, clients: int) -> None:
+    """Write a CSV in the format Excel produces for a Russian locale."""
+    rng: random.Random = random.Random(7)
+    with open(path, 'w', encoding='utf-8-sig', newline='') as out:
+        out.write("Имя;Телефон;Email;ИНН;Заметки\n")
+        for n in range(clients):
+            # ~1% of the phones repeat an earlier one
+            number: int = rng.randrange(n) if n and rng.random() < 0.01 else n
+            digits: str = f"{number:07d}"
+            phone: str = f"8 (999) {digits[:3]}-{digits[3:5]}-{digits[5:]}" if n % 10 else ''
+            inn: str = f"{7700000000 + n}" if n % 3 == 0 else ''
+            out.write(f"{rng.choice(NAMES)} {n};{phone};client{n}@example.com;{inn};импорт\n")
+
+
+def bench_form(rows: int) -> float:
+    """Seconds per row of creating clients one by one through ClientForm."""
+    started: float = time.perf_counter()
+    with transaction.atomic():
+        for n in range(rows):
+            form: ClientForm = ClientForm(data={
+                'name': f"Form {n}", 'phone': f"8800{n:07d}",
+                'email': f"form{n}@example.com",
+            })
+            form.is_valid()
+            form.save()
+        transaction.set_rollback(True)
+    return (time.perf_counter() - started) / rows
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--clients', type=int, default=100000)
+    parser.add_argument('--batch-size', type=int, default=1000)
+    args: argparse.Namespace = parser.parse_args()
+
+    call_command('migrate', verbosity=0)
+    path: str = os.path.join(BASE_DIR, 'var', 'bench_clients.csv')
+    write_csv(path, args.clients)
+
+    per_row: float = bench_form(FORM_SAMPLE)
+    print(f"ClientForm, one by one: {per_row * 1000:.2f} ms/row -> ~{per_row * args.clients:.0f}s "
+          f"for {args.clients} rows (extrapolated from {FORM_SAMPLE})")
+
+    def progress(report: ImportReport) -> None:
+        if report.rows % (args.batch_size * 20) == 0:
+            print(f"  {report.rows} rows, {report.rate:.0f} rows/s")
+
+    with open(path, 'rb') as stream:
+        report: ImportReport = import_clients(read_rows(stream, path), args.batch_size, progress)
+    print(f"Bulk import: {report.rows} rows in {report.elapsed:.1f}s ({report.rate:.0f} rows/s): "
+          f"{report.created} created, {report.duplicates} duplicates, {report.invalid} invalid")
+    assert Client.objects.count() == report.created
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""
+Measure concurrent writes that update the dashboard counters: one row per counter vs sharded counters.
+
+`--writers` threads each save `--writes` times, every save one transaction
+creating a client, a project and `--tasks` tasks due today, as adding a
+client with its first project does. Each of them bumps the `clients`,
+`projects:new` and `open_tasks:<today>` counters, whose row locks are held
+until the transaction commits. `--db-latency` is added to every SQL
+statement to stand in for the network round trip to a database server.
+
+"before" runs with `DASHBOARD_COUNTER_SHARDS = 1`, so every writer queues
+for the same three rows; "after" with `--shards` rows per counter. Both
+runs check the counters against a full recount.
+
+Point `DATABASE_URL` at PostgreSQL for meaningful numbers: SQLite (the
+default, a fresh file) takes one writer at a time whatever the rows.
+
+Usage:
+    DATABASE_URL=postgres://... python benchmarks/bench_counter_writes.py --writers 20 --db-latency 0.005
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Final
+
+import django
+
+BASE_DIR: Final[str] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+DB_PATH: Final[str] = os.path.join(BASE_DIR, 'var', 'bench_counter_writes.sqlite3')
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'crm.settings')
+os.environ.setdefault('DATABASE_URL', f"sqlite:///{DB_PATH}")
+os.makedirs(os.path.join(BASE_DIR, 'var'), exist_ok=True)
+if os.path.exists(DB_PATH):
+    os.remove(DB_PATH)
+django.setup()
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.backends.signals import connection_created
+from django.utils import timezone
+
+from clients.models import Client
+from crm.counters import reconcile_counters
+from crm.models import DashboardCounter
+from projects.models import Project
+from tasks.models import Task
+
+
+def add_latency(latency: float) -> None:
+    """Delay every SQL statement of every connection by `latency` seconds."""
+    def slow_statement(execute: Callable, sql: str, params: Any, many: bool, context: Dict[str, Any]) -> Any:
+        time.sleep(latency)
+        return execute(sql, params, many, context)
+
+    def on_connection(sender: Any, connection: Any, **kwargs: Any) -> None:
+        if slow_statement not in connection.execute_wrappers:
+            connection.execute_wrappers.append(slow_statement)
+
+    connection_created.connect(on_connection, weak=False)
+
+
+def write(writer: int, args: argparse.Namespace) -> None:
+    """Save a client with a project and its tasks `args.writes` times, a transaction each."""
+    try:
+        for n in range(args.writes):
+            with transaction.atomic():
+                client: Client = Client.objects.create(name=f"Client {writer}-{n}")
+                project: Project = Project.objects.create(name=f"Project {writer}-{n}", client=client, status='new')
+                for task in range(args.tasks):
+                    Task.objects.create(project=project, title=f"Task {task}", deadline=timezone.now().date())
+    finally:
+        connection.close()
+
+
+def run(label: str, shards: int, args: argparse.Namespace) -> None:
+    """Let the writers save concurrently and print saves per second."""
+    settings.DASHBOARD_COUNTER_SHARDS = shards
+    Client.objects.all().delete()
+    DashboardCounter.objects.all().delete()
+
+    started: float = time.perf_counter()
+    with ThreadPoolExecutor(args.writers) as pool:
+        for future in [pool.submit(write, writer, args) for writer in range(args.writers)]:
+            future.result()
+    elapsed: float = time.perf_counter() - started
+
+    saves: int = args.writers * args.writes
+    consistent: bool = not reconcile_counters()
+    print(f"{label:<8} shards {shards:2d}  {elapsed:6.2f} s  {saves / elapsed:7.1f} saves/s  "
+          f"counter rows {DashboardCounter.objects.count():3d}  consistent {consistent}")
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--writers', type=int, default=20)
+    parser.add_argument('--writes', type=int, default=20)
+    parser.add_argument('--tasks', type=int, default=3)
+    parser.add_argument('--shards', type=int, default=settings.DASHBOARD_COUNTER_SHARDS)
+    parser.add_argument('--db-latency', type=float, default=0.005)
+    args: argparse.Namespace = parser.parse_args()
+
+    call_command('migrate', verbosity=0)
+    add_latency(args.db_latency)
+    print(f"{args.writers} writers x {args.writes} saves of a client, a project and {args.tasks} tasks, "
+          f"{args.db_latency * 1000:.0f} ms per SQL statement")
+
+    run('before', 1, args)
+    run('after', args.shards, args)
+
+
+if __name__ == '__main__':
+    main()
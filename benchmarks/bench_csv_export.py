@@ -0,0 +1,86 @@
+"""
+Measure the streaming CSV export on a large task table.
+
+Seeds its own SQLite database (or `DATABASE_URL` if set) with the requested
+number of tasks and reports the time to the first chunk, the total time and
+the peak Python memory (tracemalloc) of exporting all of them.
+
+Usage:
+    python benchmarks/bench_csv_export.py --tasks 1000000
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from typing import Final, List
+
+import django
+
+BASE_DIR: Final[str] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'crm.settings')
+os.environ.setdefault('DATABASE_URL', f"sqlite:///{os.path.join(BASE_DIR, 'var', 'bench_csv_export.sqlite3')}")
+os.makedirs(os.path.join(BASE_DIR, 'var'), exist_ok=True)
+django.setup()
+
+from django.core.management import call_command
+from django.db import transaction
+
+from clients.models import Client
+from crm.csv_export import stream_csv
+from projects.models import Project
+from tasks.models import Task
+
+BATCH: Final[int] = 10000
+
+
+def seed(tasks: int) -> None:
+    """Create the tasks (spread over 1000 projects) unless the table already has enough rows."""
+    if Task.objects.count() >= tasks:
+        return
+    print(f"Seeding {tasks} tasks...")
+    with transaction.atomic():
+        Task.objects.all().delete()
+        client: Client = Client.objects.create(name="Bench client")
+        projects: List[Project] = Project.objects.bulk_create(
+            [Project(name=f"Project {n}", client=client) for n in range(1000)]
+        )
+        for offset in range(0, tasks, BATCH):
+            Task.objects.bulk_create([
+                Task(project=projects[n % len(projects)], title=f"Task {n}", status='todo')
+                for n in range(offset, min(offset + BATCH, tasks))
+            ])
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tasks', type=int, default=1000000)
+    args: argparse.Namespace = parser.parse_args()
+
+    call_command('migrate', verbosity=0)
+    seed(args.tasks)
+
+    started: float = time.perf_counter()
+    first_rows: float = 0.0
+    size: int = 0
+    for number, chunk in enumerate(stream_csv('tasks')):
+        if number == 1:
+            first_rows = time.perf_counter() - started
+        size += len(chunk)
+    total: float = time.perf_counter() - started
+    print(f"First rows after {first_rows * 1000:.1f} ms, {size / 2 ** 20:.0f} MiB of CSV in {total:.1f}s")
+
+    # A second pass under tracemalloc (which slows it down) for the peak memory
+    tracemalloc.start()
+    for _ in stream_csv('tasks'):
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"Peak Python memory while exporting: {peak / 2 ** 20:.1f} MiB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+"""
+Measure dashboard statistics latency: six COUNT queries vs the two-query aggregation
+vs the materialized counters vs the cached snapshot.
+
+The benchmark uses its own SQLite database (or `DATABASE_URL` if set), seeds
+it once with the requested number of projects and tasks and then times the
+COUNT queries, the aggregation and the counters table with a cold cache, and
+the cached snapshot. Run it again with a larger dataset to check that the
+counters read stays flat as the tables grow.
+
+Usage:
+    python benchmarks/bench_dashboard.py --projects 100000 --tasks 1000000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+from typing import Callable, Dict, Final, List, Optional
+
+import django
+
+BASE_DIR: Final[str] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'crm.settings')
+os.environ.setdefault('DATABASE_URL', f"sqlite:///{os.path.join(BASE_DIR, 'var', 'bench_dashboard.sqlite3')}")
+os.makedirs(os.path.join(BASE_DIR, 'var'), exist_ok=True)
+django.setup()
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.models import Count, Func, IntegerField, Q, QuerySet, Subquery, Value
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from clients.models import Client
+from crm.counters import read_dashboard_stats, reconcile_counters
+from crm.dashboard import dashboard_stats
+from projects.models import Project
+from tasks.models import OPEN_TASK_STATUSES, Task
+
+BATCH: Final[int] = 10000
+
+
+def legacy_dashboard_stats() -> Dict[str, int]:
+    """The former implementation of the dashboard view: one COUNT per number."""
+    active_projects = Project.objects.exclude(status='canceled')
+    return {
+        'client_count': Client.objects.count(),
+        'project_total': active_projects.count(),
+        'project_new': active_projects.filter(status='new').count(),
+        'project_in_progress': active_projects.filter(status='in_progress').count(),
+        'project_done': active_projects.filter(status='done').count(),
+        'overdue_tasks': Task.objects.filter(
+            status__in=['todo', 'in_progress'], deadline__lt=timezone.now().date()
+        ).count(),
+    }
+
+
+class SubqueryCount(Subquery):
+    """
+    `(SELECT COUNT(*) FROM ...)` of another table, usable inside `aggregate()`.
+
+    Django only accepts aggregates in `aggregate()`; an uncorrelated scalar
+    subquery is evaluated once per statement, so it can safely be reported
+    as one. This lets the client count ride along with the project counters
+    instead of joining both tables or issuing a separate query.
+    """
+    contains_aggregate: bool = True
+    output_field = IntegerField()
+
+    def __init__(self, queryset: QuerySet) -> None:
+        super().__init__(queryset.order_by().annotate(_count=Func(Value(1), function='COUNT')).values('_count'))
+
+
+def aggregated_dashboard_stats(today: Optional[date] = None) -> Dict[str, int]:
+    """
+    Calculate the dashboard statistics from the source tables in two queries.
+
+    The first query scans projects once with conditional aggregates (and
+    counts clients in a scalar subquery); the second counts overdue tasks.
+    This was the dashboard view before the materialized counters of
+    `crm.counters` replaced it.
+
+    Returns:
+        Dict[str, int]: The dashboard template context values.
+    """
+    today = today or timezone.now().date()
+
+    stats: Dict[str, int] = Project.objects.aggregate(
+        client_count=SubqueryCount(Client.objects.all()),
+        project_total=Count('id', filter=~Q(status='canceled')),
+        project_new=Count('id', filter=Q(status='new')),
+        project_in_progress=Count('id', filter=Q(status='in_progress')),
+        project_done=Count('id', filter=Q(status='done')),
+    )
+    # A filtered COUNT (rather than a conditional aggregate) can use a (status, deadline) index
+    stats['overdue_tasks'] = Task.objects.filter(status__in=OPEN_TASK_STATUSES, deadline__lt=today).count()
+    return stats
+
+
+def seed(projects: int, tasks: int, clients: int) -> None:
+    """Fill the database with random data unless it already has the requested size."""
+    if Project.objects.count() >= projects and Task.objects.count() >= tasks:
+        return
+
+    print(f"Seeding {clients} clients, {projects} projects, {tasks} tasks...")
+    rng: random.Random = random.Random(42)
+    today = timezone.now().date()
+
+    with transaction.atomic():
+        Task.objects.all().delete()
+        Project.objects.all().delete()
+        Client.objects.all().delete()
+
+        Client.objects.bulk_create([Client(name=f"Client {i}") for i in range(clients)], batch_size=BATCH)
+        client_ids: List[int] = list(Client.objects.values_list('id', flat=True))
+
+        project_statuses: List[str] = [choice for choice, _ in Project.STATUS_CHOICES]
+        Project.objects.bulk_create([
+            Project(name=f"Project {i}", client_id=rng.choice(client_ids), status=rng.choice(project_statuses))
+            for i in range(projects)
+        ], batch_size=BATCH)
+        project_ids: List[int] = list(Project.objects.values_list('id', flat=True))
+
+        task_statuses: List[str] = [choice for choice, _ in Task.STATUS_CHOICES]
+        for offset in range(0, tasks, BATCH):
+            Task.objects.bulk_create([
+                Task(
+                    title=f"Task {offset + i}",
+                    project_id=rng.choice(project_ids),
+                    status=rng.choice(task_statuses),
+                    deadline=today + timedelta(days=rng.randint(-60, 60)),
+                )
+                for i in range(min(BATCH, tasks - offset))
+            ])
+
+
+def run(label: str, func: Callable[[], Dict[str, int]], repeats: int) -> Dict[str, int]:
+    """Time `func` and print the median latency and the number of queries."""
+    timings: List[float] = []
+    result: Dict[str, int] = {}
+    for _ in range(repeats):
+        with CaptureQueriesContext(connection) as queries:
+            started: float = time.perf_counter()
+            result = func()
+            timings.append(time.perf_counter() - started)
+
+    print(f"{label:<10} median {statistics.median(timings) * 1000:8.1f} ms  queries: {len(queries)}")
+    return result
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--projects', type=int, default=100000)
+    parser.add_argument('--tasks', type=int, default=1000000)
+    parser.add_argument('--clients', type=int, default=5000)
+    parser.add_argument('--repeats', type=int, default=5)
+    args: argparse.Namespace = parser.parse_args()
+
+    call_command('migrate', verbosity=0)
+    seed(args.projects, args.tasks, args.clients)
+    # bulk_create bypasses the counter signals
+    reconcile_counters()
+
+    before: Dict[str, int] = run('before', legacy_dashboard_stats, args.repeats)
+    aggregated: Dict[str, int] = run('aggregate', aggregated_dashboard_stats, args.repeats)
+    counters: Dict[str, int] = run('counters', read_dashboard_stats, args.repeats)
+    assert before == aggregated == counters, (before, aggregated, counters)
+
+    cache.clear()
+    dashboard_stats()
+    run('cached', dashboard_stats, args.repeats)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+Compare inline WeasyPrint rendering with the process-pool render engine.
+
+A number of concurrent "request threads" each render invoice PDFs; the
+script reports p50/p99 latency per PDF and overall PDFs/sec for both modes.
+
+Usage:
+    python benchmarks/bench_invoice_pdf.py --requests 60 --concurrency 8 --workers 4
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from decimal import Decimal
+from typing import Callable, Dict, List, Final
+
+import django
+
+BASE_DIR: Final[str] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'crm.settings')
+django.setup()
+
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from clients.models import Client
+from invoices.models import Invoice
+from invoices.pdf_cache import PDF_TEMPLATE_NAME
+from invoices.pdf_engine import PdfRenderEngine, render_html
+from projects.models import Project
+
+
+def build_html() -> str:
+    """Render the invoice template for an unsaved sample invoice."""
+    client: Client = Client(name="ООО Бенчмарк")
+    project: Project = Project(name="Нагрузочный проект", client=client)
+    invoice: Invoice = Invoice(
+        project=project,
+        number="INV-2026-001",
+        amount=Decimal('125000.00'),
+        issue_date=date.today(),
+        due_date=date.today(),
+        status='sent',
+    )
+    return render_to_string(PDF_TEMPLATE_NAME, {
+        'invoice': invoice,
+        'now': timezone.now(),
+        'logo_base64': '',
+        'qr_code_base64': '',
+    })
+
+
+def run(label: str, render: Callable[[str], bytes], html: str, requests: int, concurrency: int) -> Dict[str, float]:
+    """Fire `requests` renders from `concurrency` threads and collect latencies."""
+    latencies: List[float] = []
+
+    def one_request(_: int) -> None:
+        started: float = time.perf_counter()
+        render(html)
+        latencies.append(time.perf_counter() - started)
+
+    wall_started: float = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one_request, range(requests)))
+    wall: float = time.perf_counter() - wall_started
+
+    latencies.sort()
+    result: Dict[str, float] = {
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p99_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+        'pdf_per_sec': requests / wall,
+    }
+    print(f"{label:<8} p50={result['p50_ms']:8.1f} ms  p99={result['p99_ms']:8.1f} ms  "
+          f"throughput={result['pdf_per_sec']:6.2f} PDF/s")
+    return result
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=60)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2)
+    args: argparse.Namespace = parser.parse_args()
+
+    html: str = build_html()
+
+    # Warm up WeasyPrint in this process so the inline numbers are fair
+    render_html(html, None)
+    run('inline', lambda doc: render_html(doc, None), html, args.requests, args.concurrency)
+
+    engine: PdfRenderEngine = PdfRenderEngine(
+        workers=args.workers,
+        queue_depth=args.requests,
+        timeout=300,
+    )
+    try:
+        engine.render(html)
+        run('pool', engine.render, html, args.requests, args.concurrency)
+    finally:
+        engine.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Compare OFFSET pagination with keyset (cursor) pagination of the client list.
+
+Seeds its own SQLite database (or `DATABASE_URL` if set) with the requested
+number of clients and times the first page and a deep page in both modes.
+The OFFSET page gets slower with depth and needs a COUNT(*); the keyset
+page should stay flat.
+
+Usage:
+    python benchmarks/bench_pagination.py --clients 200000 --depth 20000
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import timedelta
+from typing import Callable, Final, List
+
+import django
+
+BASE_DIR: Final[str] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'crm.settings')
+os.environ.setdefault('DATABASE_URL', f"sqlite:///{os.path.join(BASE_DIR, 'var', 'bench_pagination.sqlite3')}")
+os.makedirs(os.path.join(BASE_DIR, 'var'), exist_ok=True)
+django.setup()
+
+from django.core.management import call_command
+from django.core.paginator import Paginator
+from django.db import connection, transaction
+from django.utils import timezone
+
+from clients.models import Client
+from crm.pagination import CursorPaginator
+
+BATCH: Final[int] = 10000
+PER_PAGE: Final[int] = 8
+ORDERING: Final = ('-created_at', '-id')
+
+
+def seed(clients: int) -> None:
+    """Fill the database with clients unless it already has the requested size."""
+    if Client.objects.count() >= clients:
+        return
+
+    print(f"Seeding {clients} clients...")
+    started = timezone.now()
+    with transaction.atomic():
+        Client.objects.all().delete()
+        for offset in range(0, clients, BATCH):
+            batch: List[Client] = [Client(name=f"Client {offset + i}") for i in range(min(BATCH, clients - offset))]
+            Client.objects.bulk_create(batch)
+        # auto_now_add gives a batch the same timestamp; spread them out like real sign-ups
+        for client_id in Client.objects.values_list('id', flat=True).iterator():
+            Client.objects.filter(id=client_id).update(created_at=started - timedelta(minutes=client_id))
+
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def run(label: str, func: Callable[[], object], repeats: int) -> None:
+    """Time `func` and print the median latency."""
+    timings: List[float] = []
+    for _ in range(repeats):
+        started: float = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    print(f"{label:<22} median {statistics.median(timings) * 1000:8.2f} ms")
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--clients', type=int, default=200000)
+    parser.add_argument('--depth', type=int, default=20000, help="page number of the deep page")
+    parser.add_argument('--repeats', type=int, default=5)
+    args: argparse.Namespace = parser.parse_args()
+
+    call_command('migrate', verbosity=0)
+    seed(args.clients)
+    queryset = Client.objects.all()
+
+    paginator: Paginator = Paginator(queryset.order_by(*ORDERING), PER_PAGE)
+    depth: int = min(args.depth, paginator.num_pages)
+    run('offset: page 1', lambda: list(Paginator(queryset.order_by(*ORDERING), PER_PAGE).page(1)), args.repeats)
+    run(f'offset: page {depth}', lambda: list(Paginator(queryset.order_by(*ORDERING), PER_PAGE).page(depth)),
+        args.repeats)
+
+    # The cursor of the deep page is the key of the last row before it
+    keyset: CursorPaginator = CursorPaginator(queryset, ORDERING, PER_PAGE)
+    before_deep: Client = queryset.order_by(*ORDERING)[(depth - 1) * PER_PAGE - 1] if depth > 1 else None
+    deep_cursor = keyset.encode_cursor(before_deep, 'n') if before_deep else None
+    assert [c.pk for c in keyset.page(deep_cursor)] == [c.pk for c in paginator.page(depth)]
+
+    run('keyset: page 1', lambda: list(keyset.page()), args.repeats)
+    run(f'keyset: page {depth}', lambda: list(keyset.page(deep_cursor)), args.repeats)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""
+Measure the project list page query as projects get more tasks.
+
+For each tasks-per-project size the script seeds its own SQLite database (or
+`DATABASE_URL` if set) with `--projects` projects and times the first page of
+the project list two ways:
+
+* annotate — five `Count('tasks', filter=...)` over a join, the old view;
+* counters — the denormalized counters stored on `Project`, the current view.
+
+Usage:
+    python benchmarks/bench_project_list.py --projects 2000 --sizes 10 100 1000
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from typing import Callable, Final, List
+
+import django
+
+BASE_DIR: Final[str] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+DB_PATH: Final[str] = os.path.join(BASE_DIR, 'var', 'bench_project_list.sqlite3')
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'crm.settings')
+os.environ.setdefault('DATABASE_URL', f"sqlite:///{DB_PATH}")
+os.makedirs(os.path.join(BASE_DIR, 'var'), exist_ok=True)
+django.setup()
+
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.models import Count, Q
+
+from clients.models import Client
+from crm.pagination import CursorPaginator
+from projects.models import Project
+from projects.task_counts import rebuild_task_counts
+from tasks.models import Task
+
+ORDERING: Final[tuple] = ('-created_at', '-id')
+PER_PAGE: Final[int] = 8
+STATUSES: Final[List[str]] = ['todo', 'in_progress', 'done', 'canceled']
+BATCH: Final[int] = 20000
+
+
+def seed(projects: int, tasks_per_project: int) -> None:
+    """Recreate the projects, each with `tasks_per_project` tasks, and fill the counters."""
+    print(f"Seeding {projects} projects x {tasks_per_project} tasks...")
+    with transaction.atomic():
+        Task.objects.all().delete()
+        Project.objects.all().delete()
+        client: Client = Client.objects.create(name="Bench client")
+        created: List[Project] = Project.objects.bulk_create(
+            [Project(name=f"Project {n}", client=client) for n in range(projects)], batch_size=BATCH
+        )
+        batch: List[Task] = []
+        for project in created:
+            for n in range(tasks_per_project):
+                batch.append(Task(project=project, title=f"Task {n}", status=STATUSES[n % len(STATUSES)]))
+                if len(batch) >= BATCH:
+                    Task.objects.bulk_create(batch)
+                    batch = []
+        Task.objects.bulk_create(batch)
+        rebuild_task_counts()
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+
+def run(label: str, func: Callable[[], object], repeats: int) -> float:
+    """Return the median latency of `func` in milliseconds."""
+    timings: List[float] = []
+    for _ in range(repeats):
+        started: float = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--projects', type=int, default=2000)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000], help="tasks per project")
+    parser.add_argument('--repeats', type=int, default=7)
+    args: argparse.Namespace = parser.parse_args()
+
+    call_command('migrate', verbosity=0)
+    annotated = Project.objects.select_related('client').annotate(
+        todo_count_a=Count('tasks', filter=Q(tasks__status='todo')),
+        in_progress_count_a=Count('tasks', filter=Q(tasks__status='in_progress')),
+        done_count_a=Count('tasks', filter=Q(tasks__status='done')),
+        canceled_count_a=Count('tasks', filter=Q(tasks__status='canceled')),
+        total_tasks_a=Count('tasks'),
+    )
+    plain = Project.objects.select_related('client')
+
+    print(f"{'tasks/project':>14} {'annotate, ms':>14} {'counters, ms':>14}")
+    for size in args.sizes:
+        seed(args.projects, size)
+        old: float = run('annotate', lambda: list(CursorPaginator(annotated, ORDERING, PER_PAGE).page()), args.repeats)
+        new: float = run('counters', lambda: list(CursorPaginator(plain, ORDERING, PER_PAGE).page()), args.repeats)
+        print(f"{size:>14} {old:>14.2f} {new:>14.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Measure Telegram send throughput: one connection per message vs the pooled client.
+
+Messages are sent to a local fake Bot API server, so the numbers show the
+connection setup overhead only (no TLS; against api.telegram.org the
+difference is larger because every new connection also pays a TLS handshake).
+
+Usage:
+    python benchmarks/bench_telegram_send.py --messages 500 --threads 8
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Final
+
+import django
+import requests
+
+BASE_DIR: Final[str] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'crm.settings')
+django.setup()
+
+from tasks.telegram import TelegramClient
+from tasks.tests.fake_telegram import FakeTelegramServer
+
+
+def run(label: str, send: Callable[[int], None], messages: int, threads: int, server: FakeTelegramServer) -> None:
+    """Send `messages` messages from `threads` threads and print messages/sec."""
+    connections_before: int = server.connections
+    started: float = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(send, range(messages)))
+    elapsed: float = time.perf_counter() - started
+
+    print(f"{label:<10} {messages / elapsed:8.1f} msg/s  "
+          f"connections opened: {server.connections - connections_before}")
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--messages', type=int, default=500)
+    parser.add_argument('--threads', type=int, default=8)
+    args: argparse.Namespace = parser.parse_args()
+
+    server: FakeTelegramServer = FakeTelegramServer().start()
+    url: str = f"{server.url}/botBENCH/sendMessage"
+
+    def send_unpooled(i: int) -> None:
+        requests.post(url, json={'chat_id': 1, 'text': f"msg {i}"}, timeout=10).raise_for_status()
+
+    client: TelegramClient = TelegramClient('BENCH', api_url=server.url, pool_size=args.threads)
+
+    def send_pooled(i: int) -> None:
+        client.send_message(1, f"msg {i}")
+
+    try:
+        run('before', send_unpooled, args.messages, args.threads, server)
+        run('after', send_pooled, args.messages, args.threads, server)
+    finally:
+        client.close()
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+from typing import Optional
+
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+from aiogram.fsm.storage.base import BaseStorage
+from aiogram.methods.base import Response
+from aiogram.types import Message
+from django.conf import settings
+
+from .handlers import create_router
+from .scheduler import ScheduledDispatcher, UpdateScheduler
+from .storage import build_event_isolation, build_fsm_storage
+from .throttling import build_throttling
+
+
+def share_response_models() -> None:
+    """
+    Create pydantic's cache of parametrized models in the current context.
+
+    aiogram validates every Bot API answer with `Response[<result type>]`.
+    pydantic caches such models in a ContextVar that is only set on first
+    use, so when that happens inside an update's task the cache dies with
+    the task and every reply rebuilds the model class (about 10 ms of CPU).
+    Set here, before the event loop starts its tasks, the cache is
+    inherited and shared by all of them.
+    """
+    for result_type in (Message, bool):
+        Response[result_type]
+
+
+def create_bot(token: Optional[str] = None, api_url: Optional[str] = None) -> Bot:
+    """
+    Create the bot client.
+
+    Call it from the thread that runs the bot's event loop, before the loop
+    starts handling updates (see `share_response_models`).
+
+    Args:
+        token: Bot token; defaults to `TELEGRAM_BOT_TOKEN`.
+        api_url: Bot API base URL; defaults to `TELEGRAM_API_URL` (a local Bot API server or a fake one in benchmarks).
+    """
+    share_response_models()
+    api: TelegramAPIServer = TelegramAPIServer.from_base(api_url or settings.TELEGRAM_API_URL)
+    return Bot(token=token or settings.TELEGRAM_BOT_TOKEN, session=AiohttpSession(api=api))
+
+
+def create_dispatcher(storage: Optional[BaseStorage] = None, concurrency: Optional[int] = None) -> ScheduledDispatcher:
+    """
+    Create the dispatcher with the registration dialog, used by both polling and the webhook.
+
+    Updates go through an `UpdateScheduler`: in order within a chat, up to
+    `TELEGRAM_BOT_CONCURRENCY` of different chats at a time. Chats flooding
+    the bot are throttled before the handlers (see `bot.throttling`).
+
+    Args:
+        storage: FSM storage; defaults to the one chosen by `TELEGRAM_BOT_FSM_STORAGE`.
+        concurrency: Updates handled at once; defaults to `TELEGRAM_BOT_CONCURRENCY`.
+    """
+    storage = storage or build_fsm_storage()
+    dispatcher: ScheduledDispatcher = ScheduledDispatcher(
+        storage=storage,
+        events_isolation=build_event_isolation(storage),
+        scheduler=UpdateScheduler(
+            concurrency or settings.TELEGRAM_BOT_CONCURRENCY,
+            report_interval=settings.TELEGRAM_BOT_STATS_INTERVAL,
+        ),
+        throttling=build_throttling(storage),
+    )
+    dispatcher.include_router(create_router())
+    return dispatcher
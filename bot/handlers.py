@@ -0,0 +1,213 @@
+import logging
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from aiogram import F, Router, types
+from aiogram.filters import Command
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.state import State, StatesGroup
+from aiogram.utils.keyboard import ReplyKeyboardBuilder
+
+from clients.models import Client
+
+from .repository import find_client_by_chat, save_registration
+
+
+class RegisterForm(StatesGroup):
+    """
+        Finite State Machine (FSM) states for the client registration process.
+
+        Attributes:
+            organization: State for capturing the legal entity or person name.
+            inn: State for capturing the tax identification number (INN/OGRN).
+            email: State for capturing the contact email for invoice copies.
+    """
+    organization: State = State()
+    inn: State = State()
+    email: State = State()
+
+
+async def btn_registration(message: types.Message, state: FSMContext) -> None:
+    """
+        Entry point for registration triggered by the reply keyboard button.
+
+        Args:
+            message: The incoming message from the user.
+            state: The FSM context for managing user registration flow.
+    """
+    await cmd_registration(message, state)
+
+
+async def cmd_start(message: types.Message) -> None:
+    """
+        Handles the /start command.
+
+        Provides a welcome message and initializes the main interaction menu;
+        chats already bound to a client are greeted by name.
+    """
+    builder: ReplyKeyboardBuilder = ReplyKeyboardBuilder()
+    builder.button(text="📝 Регистрация")
+    builder.adjust(1)
+
+    # Cached chat id -> client lookup (one indexed query on a miss)
+    client: Optional[Client] = await find_client_by_chat(message.chat.id)
+    if client is not None:
+        await message.answer(
+            f"С возвращением, {client.name}! 👋\n"
+            "Этот чат уже привязан к CRM, счета будут приходить сюда.\n\n"
+            "Чтобы обновить данные, отправь /registration",
+            reply_markup=builder.as_markup(resize_keyboard=True)
+        )
+        return
+
+    await message.answer(
+        "Привет! 👋\n"
+        "Я бот Freelance CRM. Здесь ты можешь получать счета за проекты автоматически.\n\n"
+        "Чтобы зарегистрироваться и привязать этот чат к твоему аккаунту в CRM, "
+        "отправь команду:\n"
+        "👉 /registration\n\n"
+        "Или нажми кнопку регистрации\n"
+        "После этого я попрошу ввести данные организации.\n",
+        reply_markup=builder.as_markup(resize_keyboard=True)
+    )
+
+
+async def cmd_registration(message: types.Message, state: FSMContext) -> None:
+    """
+        Processes the organization name and transitions to the INN input state.
+    """
+    await message.answer(
+        "Отлично, начинаем регистрацию! 📝\n\n"
+        "Напиши название организации (или ФИО, если ИП):"
+    )
+    await state.set_state(RegisterForm.organization)
+
+
+async def process_organization(message: types.Message, state: FSMContext) -> None:
+    """
+        Processes the organization name and transitions to the INN input state.
+    """
+    raw_text: Optional[str] = message.text
+    if not raw_text:
+        return
+
+    text: str = raw_text.strip()
+    if not text:
+        await message.answer("Название организации не может быть пустым. Попробуй ещё раз:")
+        return
+
+    await state.update_data(organization=text)
+    await message.answer("Отлично! Теперь ИНН или ОГРН:")
+    await state.set_state(RegisterForm.inn)
+
+
+async def process_inn(message: types.Message, state: FSMContext) -> None:
+    """
+            Validates the INN/OGRN format and transitions to the email input state.
+
+            Validation:
+                - Must be numeric.
+                - Must be 10 or 12 characters long.
+    """
+    raw_inn: Optional[str] = message.text
+    if not raw_inn:
+        return
+
+    inn: str = raw_inn.strip()
+
+    # Validate that INN contains only digits and has a proper length
+    if not inn.isdigit() or len(inn) not in [10, 12]:
+        await message.answer(
+            "⚠️ Некорректный ИНН.\n"
+            "ИНН должен состоять только из цифр и иметь длину 10 или 12 символов.\n"
+            "Попробуйте ещё раз:"
+        )
+        return
+
+    await state.update_data(inn=inn)
+    await message.answer(
+        "Последний шаг — email (для копий счетов).\n\n"
+        "Если не нужно — напишите «пропустить»."
+    )
+    await state.set_state(RegisterForm.email)
+
+
+async def process_email(message: types.Message, state: FSMContext) -> None:
+    """
+        Finalizes registration, validates email (or skip), and saves data to Django DB.
+
+        Note:
+            Saves through `bot.repository`, in the bot's pool of database threads.
+    """
+    raw_input: Optional[str] = message.text
+    if not raw_input:
+        return
+
+    email_raw: str = raw_input.strip()
+    skip_options: List[str] = ["-", "пропустить", "нет", "не нужно", "skip", "none", "обойдусь"]
+
+    # Client.email is NOT NULL: a skipped email is stored empty
+    email: str = ''
+    email_text: str = "не указан (копии на почту не будут приходить)"
+
+    # Check if the user chose to skip email registration
+    if email_raw.lower() not in skip_options:
+        email_pattern: str = r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$"
+
+        if not re.match(email_pattern, email_raw):
+            await message.answer(
+                "⚠️ **Ошибка в формате email.**\n\n"
+                "Пожалуйста, введите корректный адрес или напишите слово «пропустить»:"
+            )
+            return
+
+        email = email_raw
+        email_text = email
+
+    # Retrieve accumulated data from FSM storage
+    user_data: Dict[str, Any] = await state.get_data()
+    organization: str = user_data.get('organization', 'Unknown')
+    inn: str = user_data.get('inn', '')
+
+    try:
+        # Save or update client data in the Django database (single lookup on the unique INN)
+        db_result: Tuple[Client, bool] = await save_registration(
+            inn=inn, organization=organization, email=email, chat_id=message.chat.id,
+        )
+        client, created = db_result
+
+        status_text: str = "успешно зарегистрирован" if created else "ваши данные обновлены"
+
+        response: str = (
+            f"Готово! 🎉\n\n"
+            f"Вы {status_text}:\n"
+            f"🏢 **Организация:** {organization}\n"
+            f"🆔 **ИНН/ОГРН:** {inn}\n"
+            f"📧 **Email:** {email_text}\n\n"
+            f"Теперь счета будут приходить сюда автоматически. ✅\n"
+            f"Ваш ID в системе: `{client.id}`"
+        )
+
+        await message.answer(response, reply_markup=types.ReplyKeyboardRemove())
+        await state.clear()
+
+    except Exception as e:
+        logging.error(f"Error saving client to database: {e}")
+        await message.answer("❌ Произошла ошибка при сохранении данных.")
+
+
+def create_router() -> Router:
+    """
+        Router with the registration dialog handlers.
+
+        A router can be attached to one dispatcher only, so every dispatcher
+        (polling, webhook, tests, benchmarks) gets its own.
+    """
+    router: Router = Router(name='registration')
+    router.message.register(btn_registration, F.text == "📝 Регистрация")
+    router.message.register(cmd_start, Command("start"))
+    router.message.register(cmd_registration, Command("registration", "reg"))
+    router.message.register(process_organization, RegisterForm.organization)
+    router.message.register(process_inn, RegisterForm.inn)
+    router.message.register(process_email, RegisterForm.email)
+    return router
@@ -0,0 +1,75 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+from clients.lookup import ChatId, get_client_by_chat
+from clients.models import Client
+
+T = TypeVar('T')
+
+# Thread pools by size, so a changed TELEGRAM_BOT_DB_CONNECTIONS gets its own
+_executors: Dict[int, ThreadPoolExecutor] = {}
+_executors_lock: threading.Lock = threading.Lock()
+
+
+def _get_executor() -> Optional[ThreadPoolExecutor]:
+    """The bot's database threads, or None for Django's shared sync thread (`TELEGRAM_BOT_DB_CONNECTIONS = 0`)."""
+    workers: int = settings.TELEGRAM_BOT_DB_CONNECTIONS
+    if workers <= 0:
+        return None
+    with _executors_lock:
+        if workers not in _executors:
+            _executors[workers] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='bot-db')
+        return _executors[workers]
+
+
+def database_sync_to_async(func: Callable[..., T]) -> Callable[..., Awaitable[T]]:
+    """
+    Make a sync ORM function awaitable from the bot's handlers.
+
+    Calls run in a pool of `TELEGRAM_BOT_DB_CONNECTIONS` threads, each with
+    its own connection, so concurrent chats query in parallel instead of
+    queueing for the one thread `sync_to_async` (and the async ORM methods,
+    which wrap it) would use. The bot has no request cycle to recycle
+    connections, so every call is wrapped in `close_old_connections`: a
+    connection past `CONN_MAX_AGE`, broken or dropped by the server while
+    idle is replaced instead of failing the next update.
+    """
+    def run(*args: Any, **kwargs: Any) -> T:
+        close_old_connections()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    async def call(*args: Any, **kwargs: Any) -> T:
+        executor: Optional[ThreadPoolExecutor] = _get_executor()
+        if executor is None:
+            return await sync_to_async(run)(*args, **kwargs)
+        return await sync_to_async(run, thread_sensitive=False, executor=executor)(*args, **kwargs)
+
+    return call
+
+
+@database_sync_to_async
+def find_client_by_chat(chat_id: ChatId) -> Optional[Client]:
+    """Client registered for a chat (cached, see `clients.lookup`), or None."""
+    return get_client_by_chat(chat_id)
+
+
+@database_sync_to_async
+def save_registration(inn: str, organization: str, email: str, chat_id: ChatId) -> Tuple[Client, bool]:
+    """
+    Create the client with this INN, or update it with the registration dialog answers.
+
+    Returns:
+        Tuple[Client, bool]: The client and whether it was created.
+    """
+    return Client.objects.update_or_create(
+        inn=inn,
+        defaults={'name': organization, 'email': email, 'telegram_chat_id': str(chat_id)},
+    )
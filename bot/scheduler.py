@@ -0,0 +1,191 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Final, List, Optional, TypeVar
+
+from aiogram import Bot, Dispatcher
+from aiogram.dispatcher.middlewares.user_context import UserContextMiddleware
+from aiogram.types import Update
+
+from .throttling import ThrottlingMiddleware
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# Handling times of this many most recent updates are kept for the percentiles
+LATENCY_SAMPLES: Final[int] = 1000
+
+
+@dataclass
+class SchedulerStats:
+    """
+        Counters of an `UpdateScheduler`.
+
+        Attributes:
+            waiting: Updates waiting for the previous update of their chat or a free slot (the queue depth).
+            running: Updates being handled.
+            peak_waiting: Highest `waiting` so far.
+            handled: Updates finished, failed ones included.
+            failed: Updates whose handling raised.
+            wait_seconds: Total time updates spent waiting.
+            latencies: Handling times (seconds) of the most recent updates.
+    """
+    waiting: int = 0
+    running: int = 0
+    peak_waiting: int = 0
+    handled: int = 0
+    failed: int = 0
+    wait_seconds: float = 0.0
+    latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=LATENCY_SAMPLES))
+
+    @property
+    def average_wait(self) -> float:
+        """Seconds an update waited on average before its handling started."""
+        return self.wait_seconds / self.handled if self.handled else 0.0
+
+    def latency(self, quantile: float) -> float:
+        """Handling time (seconds) within which `quantile` of the recent updates finished; 0.0 before the first one."""
+        if not self.latencies:
+            return 0.0
+        ordered: List[float] = sorted(self.latencies)
+        return ordered[min(int(quantile * len(ordered)), len(ordered) - 1)]
+
+    def __str__(self) -> str:
+        return (
+            f"waiting={self.waiting} (peak {self.peak_waiting}) running={self.running} "
+            f"handled={self.handled} failed={self.failed} avg_wait={self.average_wait * 1000:.0f}ms "
+            f"p50={self.latency(0.5) * 1000:.0f}ms p95={self.latency(0.95) * 1000:.0f}ms"
+        )
+
+
+class UpdateScheduler:
+    """
+        Runs the updates of one chat in order and those of different chats concurrently.
+
+        An update waits until the previous update of its chat is finished,
+        then for one of `concurrency` slots shared by all chats. Waiting for
+        its chat does not take a slot, so a chat stuck on a slow step holds
+        one slot at most and other chats go on. Updates without a chat
+        (e.g. inline queries) only wait for a slot.
+
+        Attributes:
+            concurrency: Maximum number of updates handled at the same time.
+            report_interval: Seconds between `stats` log lines (0 disables them).
+            stats: Queue depth, latency and outcome counters.
+            extra_stats: Other counters logged on the same line, by label (e.g. the throttling's).
+    """
+
+    def __init__(self, concurrency: int, report_interval: float = 0.0) -> None:
+        self.concurrency: int = concurrency
+        self.report_interval: float = report_interval
+        self.stats: SchedulerStats = SchedulerStats()
+        self.extra_stats: Dict[str, Any] = {}
+        self._slots: asyncio.Semaphore = asyncio.Semaphore(concurrency)
+        # Lock held by the chat's update in progress, and the number of the chat's updates in the scheduler
+        self._chat_locks: Dict[int, asyncio.Lock] = {}
+        self._chat_updates: Dict[int, int] = {}
+        self._reported: float = time.monotonic()
+
+    @asynccontextmanager
+    async def _chat_turn(self, chat_id: Optional[int]) -> AsyncIterator[None]:
+        if chat_id is None:
+            yield
+            return
+        # asyncio.Lock wakes its waiters in the order they came, i.e. the order the updates arrived
+        lock: asyncio.Lock = self._chat_locks.setdefault(chat_id, asyncio.Lock())
+        self._chat_updates[chat_id] = self._chat_updates.get(chat_id, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            self._chat_updates[chat_id] -= 1
+            if not self._chat_updates[chat_id]:
+                del self._chat_updates[chat_id], self._chat_locks[chat_id]
+
+    async def run(self, chat_id: Optional[int], handle: Callable[[], Awaitable[T]]) -> T:
+        """
+        Handle an update when its turn comes.
+
+        Must be called in the order the updates arrived, with no await in
+        between: the place in the chat's queue is taken on the call.
+
+        Args:
+            chat_id: Chat the update belongs to, or None.
+            handle: Starts the handling of the update.
+
+        Returns:
+            T: What `handle` returned.
+        """
+        stats: SchedulerStats = self.stats
+        queued: float = time.monotonic()
+        stats.waiting += 1
+        stats.peak_waiting = max(stats.peak_waiting, stats.waiting)
+        started: Optional[float] = None
+        try:
+            async with self._chat_turn(chat_id), self._slots:
+                started = time.monotonic()
+                stats.waiting -= 1
+                stats.running += 1
+                stats.wait_seconds += started - queued
+                try:
+                    return await handle()
+                except Exception:
+                    stats.failed += 1
+                    raise
+                finally:
+                    stats.running -= 1
+                    stats.handled += 1
+                    stats.latencies.append(time.monotonic() - started)
+        finally:
+            if started is None:
+                # cancelled while waiting
+                stats.waiting -= 1
+            self._report()
+
+    def _report(self) -> None:
+        if not self.report_interval:
+            return
+        now: float = time.monotonic()
+        if now - self._reported >= self.report_interval:
+            self._reported = now
+            extra: str = ''.join(f"; {label}: {stats}" for label, stats in self.extra_stats.items())
+            logger.info("Bot updates: %s%s", self.stats, extra)
+
+
+class ScheduledDispatcher(Dispatcher):
+    """
+        Dispatcher that handles updates through an `UpdateScheduler`.
+
+        `feed_update` is where both long polling (an update task each) and
+        the webhook handler enter, in the order the updates arrived and
+        before anything is awaited, so each chat's queue keeps that order.
+        The chat's turn is waited for before the FSM middleware takes the
+        event isolation lock, which is not first come, first served with
+        Redis. Middlewares and handlers get the arrival time as
+        `update_received` (`time.monotonic()`).
+
+        Attributes:
+            scheduler: Orders and limits the handling of updates.
+            throttling: Holds back flooding chats before the handlers (None when off);
+                its counters are logged with the scheduler's.
+    """
+
+    def __init__(self, *, scheduler: UpdateScheduler, throttling: Optional[ThrottlingMiddleware] = None,
+                 **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.scheduler: UpdateScheduler = scheduler
+        self.throttling: Optional[ThrottlingMiddleware] = throttling
+        if throttling is not None:
+            self.update.outer_middleware(throttling)
+            scheduler.extra_stats['throttled'] = throttling.stats
+
+    async def feed_update(self, bot: Bot, update: Update, **kwargs: Any) -> Any:
+        # When the update came in, for middlewares that care how long it queued (see `bot.throttling`)
+        kwargs.setdefault('update_received', time.monotonic())
+        chat_id: Optional[int] = UserContextMiddleware.resolve_event_context(update).chat_id
+        feed: Callable[[], Awaitable[Any]] = lambda: super(ScheduledDispatcher, self).feed_update(bot, update, **kwargs)
+        return await self.scheduler.run(chat_id, feed)
@@ -0,0 +1,58 @@
+from typing import Any, Optional
+
+from aiogram.fsm.storage.base import BaseEventIsolation, BaseStorage
+from aiogram.fsm.storage.memory import MemoryStorage, SimpleEventIsolation
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+# Redis keys look like `crm_bot:<bot id>:<chat>:<user>:state`, apart from Celery and the rate limiter keys
+KEY_PREFIX: str = 'crm_bot'
+
+
+def build_fsm_storage(backend: Optional[str] = None, redis: Optional[Any] = None) -> BaseStorage:
+    """
+    Create the FSM storage that holds the registration dialog state.
+
+    `memory` keeps states in the bot process: fine for one instance, lost on
+    restart. `redis` (at `REDIS_URL`) is shared by every bot worker, so
+    several instances behind a webhook can continue each other's dialogs.
+    In Redis the state and data of a dialog expire `TELEGRAM_BOT_FSM_TTL`
+    seconds after its last step, so abandoned `RegisterForm` flows do not
+    pile up.
+
+    Args:
+        backend: `memory` or `redis`; defaults to `TELEGRAM_BOT_FSM_STORAGE`.
+        redis: Ready `redis.asyncio` client to use instead of `REDIS_URL`.
+
+    Raises:
+        ImproperlyConfigured: For an unknown backend.
+    """
+    backend = backend or settings.TELEGRAM_BOT_FSM_STORAGE
+    if backend == 'memory':
+        return MemoryStorage()
+    if backend != 'redis':
+        raise ImproperlyConfigured(f"Unknown TELEGRAM_BOT_FSM_STORAGE: {backend!r}")
+
+    from aiogram.fsm.storage.redis import DefaultKeyBuilder, RedisStorage
+
+    options: dict = {
+        'key_builder': DefaultKeyBuilder(prefix=KEY_PREFIX, with_bot_id=True),
+        'state_ttl': settings.TELEGRAM_BOT_FSM_TTL or None,
+        'data_ttl': settings.TELEGRAM_BOT_FSM_TTL or None,
+    }
+    if redis is not None:
+        return RedisStorage(redis, **options)
+    return RedisStorage.from_url(settings.REDIS_URL, **options)
+
+
+def build_event_isolation(storage: BaseStorage) -> BaseEventIsolation:
+    """
+    Lock that keeps updates of one chat from being handled at the same time.
+
+    With Redis the lock lives next to the states, so it holds across bot
+    workers: two quick answers of one user landing on different workers are
+    still applied in turn.
+    """
+    if hasattr(storage, 'create_isolation'):
+        return storage.create_isolation()
+    return SimpleEventIsolation()
@@ -0,0 +1,85 @@
+import asyncio
+import threading
+import time
+from typing import Any, Dict, List
+
+import pytest
+
+from bot.repository import database_sync_to_async, find_client_by_chat, save_registration
+from clients.models import Client
+
+
+@pytest.mark.django_db(transaction=True)
+class TestRepository:
+    """Tests for the bot data access"""
+
+    def test_registration_creates_then_updates_by_inn(self) -> None:
+        """Registering an INN again updates the client and binds the new chat"""
+        client, created = asyncio.run(save_registration("7707083893", "ООО Ромашка", "", 1001))
+        again, created_again = asyncio.run(save_registration("7707083893", "ООО Лютик", "a@b.ru", 2002))
+
+        assert created and not created_again
+        assert again.pk == client.pk
+        assert Client.objects.values_list('name', 'email', 'telegram_chat_id').get() == ("ООО Лютик", "a@b.ru", "2002")
+
+    def test_find_client_by_chat(self) -> None:
+        """A chat resolves to its client, an unknown chat to None"""
+        target: Client = Client.objects.create(name="Chat Owner", telegram_chat_id="1001")
+
+        assert asyncio.run(find_client_by_chat(1001)) == target
+        assert asyncio.run(find_client_by_chat(9999)) is None
+
+
+class TestDatabaseThreads:
+    """Tests for the bot's database thread pool"""
+
+    def test_concurrent_calls_run_in_parallel(self, settings: Any) -> None:
+        """Calls of concurrent updates do not queue for one thread"""
+        settings.TELEGRAM_BOT_DB_CONNECTIONS = 3
+        started: threading.Barrier = threading.Barrier(3, timeout=5)
+
+        @database_sync_to_async
+        def blocking_query() -> int:
+            # Every call waits for the others: with a shared thread this would never pass
+            started.wait()
+            return threading.get_ident()
+
+        async def scenario() -> List[int]:
+            return await asyncio.gather(*(blocking_query() for _ in range(3)))
+
+        assert len(set(asyncio.run(scenario()))) == 3
+
+    def test_pool_size_bounds_connections(self, settings: Any) -> None:
+        """No more than TELEGRAM_BOT_DB_CONNECTIONS calls run at once"""
+        settings.TELEGRAM_BOT_DB_CONNECTIONS = 2
+        running: Dict[str, int] = {'now': 0, 'peak': 0}
+        lock: threading.Lock = threading.Lock()
+
+        @database_sync_to_async
+        def query() -> None:
+            with lock:
+                running['now'] += 1
+                running['peak'] = max(running['peak'], running['now'])
+            time.sleep(0.02)
+            with lock:
+                running['now'] -= 1
+
+        async def scenario() -> None:
+            await asyncio.gather(*(query() for _ in range(6)))
+
+        asyncio.run(scenario())
+
+        assert running['peak'] == 2
+
+    def test_zero_uses_the_shared_thread(self, settings: Any) -> None:
+        """With TELEGRAM_BOT_DB_CONNECTIONS = 0 every call runs in Django's one sync thread"""
+        settings.TELEGRAM_BOT_DB_CONNECTIONS = 0
+
+        @database_sync_to_async
+        def thread_id() -> int:
+            return threading.get_ident()
+
+        async def scenario() -> List[int]:
+            return await asyncio.gather(*(thread_id() for _ in range(4)))
+
+        assert len(set(asyncio.run(scenario()))) == 1
@@ -0,0 +1,186 @@
+import asyncio
+from typing import Any, Dict, List, Optional
+
+import pytest
+from aiogram import Router, types
+from aiogram.fsm.storage.memory import MemoryStorage
+from asgiref.sync import async_to_sync
+
+from bot.dispatcher import create_bot, create_dispatcher
+from bot.scheduler import ScheduledDispatcher, UpdateScheduler
+from bot.tests.test_bot_webhook import TOKEN, message_update
+from tasks.tests.fake_telegram import FakeTelegramServer
+
+
+async def step(log: List[str], name: str, delay: float = 0.0) -> str:
+    """A handled update: sleeps `delay`, then records its name."""
+    await asyncio.sleep(delay)
+    log.append(name)
+    return name
+
+
+class TestUpdateScheduler:
+    """Tests for the per-chat update scheduler"""
+
+    def test_chat_updates_keep_their_order(self) -> None:
+        """A slow update is not overtaken by the next update of its chat"""
+        scheduler: UpdateScheduler = UpdateScheduler(concurrency=10)
+        log: List[str] = []
+
+        async def scenario() -> None:
+            await asyncio.gather(
+                scheduler.run(1, lambda: step(log, 'organization', delay=0.05)),
+                scheduler.run(1, lambda: step(log, 'inn')),
+                scheduler.run(1, lambda: step(log, 'email')),
+            )
+
+        asyncio.run(scenario())
+
+        assert log == ['organization', 'inn', 'email']
+
+    def test_other_chats_do_not_wait(self) -> None:
+        """A chat stuck on a slow update does not hold up other chats"""
+        scheduler: UpdateScheduler = UpdateScheduler(concurrency=10)
+        log: List[str] = []
+
+        async def scenario() -> None:
+            await asyncio.gather(
+                scheduler.run(1, lambda: step(log, 'slow', delay=0.1)),
+                scheduler.run(1, lambda: step(log, 'after slow')),
+                *(scheduler.run(chat, lambda chat=chat: step(log, f"chat {chat}")) for chat in range(2, 6)),
+            )
+
+        asyncio.run(scenario())
+
+        assert log[-2:] == ['slow', 'after slow']
+        assert sorted(log[:4]) == ['chat 2', 'chat 3', 'chat 4', 'chat 5']
+
+    def test_concurrency_is_bounded(self) -> None:
+        """Never more than `concurrency` updates are handled at once"""
+        scheduler: UpdateScheduler = UpdateScheduler(concurrency=3)
+        running: Dict[str, int] = {'now': 0, 'peak': 0}
+
+        async def handle() -> None:
+            running['now'] += 1
+            running['peak'] = max(running['peak'], running['now'])
+            await asyncio.sleep(0.02)
+            running['now'] -= 1
+
+        async def scenario() -> None:
+            await asyncio.gather(*(scheduler.run(chat, handle) for chat in range(10)))
+
+        asyncio.run(scenario())
+
+        assert running['peak'] == 3
+        assert scheduler.stats.handled == 10
+
+    def test_stats(self) -> None:
+        """Queue depth, failures and handling times are counted"""
+        scheduler: UpdateScheduler = UpdateScheduler(concurrency=1)
+        depth: List[int] = []
+
+        async def handle() -> None:
+            depth.append(scheduler.stats.waiting)
+            await asyncio.sleep(0.01)
+
+        async def fail() -> None:
+            raise RuntimeError("handler failed")
+
+        async def scenario() -> None:
+            await asyncio.gather(
+                *(scheduler.run(chat, handle) for chat in range(4)),
+                scheduler.run(None, fail),
+                return_exceptions=True,
+            )
+
+        asyncio.run(scenario())
+
+        stats = scheduler.stats
+        # the first update starts at once, the other four queue behind it for the only slot
+        assert depth == [0, 3, 2, 1]
+        assert (stats.waiting, stats.running, stats.peak_waiting) == (0, 0, 4)
+        assert (stats.handled, stats.failed) == (5, 1)
+        assert 0.01 <= stats.latency(0.5) < 0.1
+        assert stats.average_wait > 0
+
+    def test_cancelled_update_leaves_the_queue(self) -> None:
+        """An update cancelled while waiting is no longer counted and frees its chat"""
+        scheduler: UpdateScheduler = UpdateScheduler(concurrency=1)
+        log: List[str] = []
+
+        async def scenario() -> None:
+            first: asyncio.Task = asyncio.ensure_future(scheduler.run(1, lambda: step(log, 'first', delay=0.05)))
+            second: asyncio.Task = asyncio.ensure_future(scheduler.run(1, lambda: step(log, 'second')))
+            await asyncio.sleep(0)
+            second.cancel()
+            await asyncio.gather(first, second, return_exceptions=True)
+            await scheduler.run(1, lambda: step(log, 'third'))
+
+        asyncio.run(scenario())
+
+        assert log == ['first', 'third']
+        assert scheduler.stats.waiting == 0
+
+
+@pytest.mark.django_db
+class TestScheduledDispatcher:
+    """Tests for the dispatcher feeding updates through the scheduler"""
+
+    def test_dispatcher_is_scheduled(self, settings: Any) -> None:
+        """The bot dispatcher takes its concurrency from the settings"""
+        settings.TELEGRAM_BOT_CONCURRENCY = 7
+
+        dispatcher = create_dispatcher(MemoryStorage())
+
+        assert isinstance(dispatcher, ScheduledDispatcher)
+        assert dispatcher.scheduler.concurrency == 7
+
+    def test_dialog_steps_of_a_chat_run_in_order(self) -> None:
+        """Concurrently fed updates of one chat reach the handlers in arrival order, other chats in parallel"""
+        log: List[Optional[str]] = []
+        router: Router = Router()
+
+        @router.message()
+        async def record(message: types.Message) -> None:
+            # the first message of each chat is slow, like a registration step waiting for the database
+            await asyncio.sleep(0.05 if message.text == "1" else 0)
+            log.append(f"{message.chat.id}:{message.text}")
+
+        dispatcher: ScheduledDispatcher = ScheduledDispatcher(
+            storage=MemoryStorage(), scheduler=UpdateScheduler(concurrency=10),
+        )
+        dispatcher.include_router(router)
+
+        async def scenario() -> None:
+            bot = create_bot(TOKEN)
+            await asyncio.gather(*(
+                dispatcher.feed_raw_update(bot, message_update(chat * 10 + n, chat, str(n)))
+                for chat in (1001, 1002) for n in (1, 2, 3)
+            ))
+            await bot.session.close()
+
+        async_to_sync(scenario)()
+
+        assert [entry for entry in log if entry.startswith('1001')] == ['1001:1', '1001:2', '1001:3']
+        assert [entry for entry in log if entry.startswith('1002')] == ['1002:1', '1002:2', '1002:3']
+        assert dispatcher.scheduler.stats.peak_waiting >= 4
+
+    @pytest.mark.django_db(transaction=True)
+    def test_registration_dialog(self, fake_telegram: FakeTelegramServer) -> None:
+        """A whole registration dialog fed at once is answered step by step"""
+        dispatcher = create_dispatcher(MemoryStorage())
+        texts: List[str] = ['/registration', "ООО Ромашка", "7707083893", "пропустить"]
+
+        async def scenario() -> None:
+            bot = create_bot(TOKEN, fake_telegram.url)
+            await asyncio.gather(*(
+                dispatcher.feed_raw_update(bot, message_update(n, 1001, text)) for n, text in enumerate(texts)
+            ))
+            await bot.session.close()
+
+        async_to_sync(scenario)()
+
+        replies: List[str] = [call['params']['text'] for call in fake_telegram.calls_for('sendMessage')]
+        assert len(replies) == 4
+        assert replies[1].startswith("Отлично! Теперь ИНН")
+        assert replies[3].startswith("Готово!")
@@ -0,0 +1,87 @@
+import asyncio
+from typing import Any, Dict
+
+import pytest
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage, SimpleEventIsolation
+from django.core.exceptions import ImproperlyConfigured
+
+from bot.storage import build_event_isolation, build_fsm_storage
+
+fakeredis = pytest.importorskip('fakeredis')
+
+BOT_ID: int = 42
+CHAT_ID: int = 1001
+
+
+def context(storage: Any) -> FSMContext:
+    """FSM context of one private chat, as the dispatcher builds it."""
+    return FSMContext(storage=storage, key=StorageKey(bot_id=BOT_ID, chat_id=CHAT_ID, user_id=CHAT_ID))
+
+
+class TestFsmStorage:
+    """Tests for the bot dialog state storage"""
+
+    def test_memory_backend(self) -> None:
+        """The memory backend keeps states in the process"""
+        storage = build_fsm_storage('memory')
+
+        assert isinstance(storage, MemoryStorage)
+        assert isinstance(build_event_isolation(storage), SimpleEventIsolation)
+
+    def test_unknown_backend(self) -> None:
+        """A misspelled backend fails loudly"""
+        with pytest.raises(ImproperlyConfigured):
+            build_fsm_storage('memcached')
+
+    def test_dialog_continues_on_another_worker(self, settings: Any) -> None:
+        """State written by one bot worker is read by another one sharing Redis"""
+        server = fakeredis.FakeServer()
+
+        async def scenario() -> Dict[str, Any]:
+            first = build_fsm_storage('redis', redis=fakeredis.FakeAsyncRedis(server=server))
+            second = build_fsm_storage('redis', redis=fakeredis.FakeAsyncRedis(server=server))
+            await context(first).set_state('RegisterForm:inn')
+            await context(first).update_data(organization="ООО Ромашка")
+
+            state = await context(second).get_state()
+            data = await context(second).get_data()
+            await context(second).clear()
+            cleared = await context(first).get_state()
+            await first.close()
+            await second.close()
+            return {'state': state, 'data': data, 'cleared': cleared}
+
+        result: Dict[str, Any] = asyncio.run(scenario())
+
+        assert result['state'] == 'RegisterForm:inn'
+        assert result['data'] == {'organization': "ООО Ромашка"}
+        assert result['cleared'] is None
+
+    def test_abandoned_dialog_expires(self, settings: Any) -> None:
+        """State and data get the TELEGRAM_BOT_FSM_TTL expiry, renewed on every step"""
+        settings.TELEGRAM_BOT_FSM_TTL = 600
+        redis = fakeredis.FakeAsyncRedis()
+
+        async def scenario() -> Dict[str, int]:
+            storage = build_fsm_storage('redis', redis=redis)
+            await context(storage).set_state('RegisterForm:organization')
+            await context(storage).update_data(organization="ИП Петров")
+            ttls: Dict[str, int] = {key.decode(): await redis.ttl(key) for key in await redis.keys('*')}
+            await storage.close()
+            return ttls
+
+        ttls: Dict[str, int] = asyncio.run(scenario())
+
+        assert set(ttls) == {f"crm_bot:{BOT_ID}:{CHAT_ID}:{CHAT_ID}:state", f"crm_bot:{BOT_ID}:{CHAT_ID}:{CHAT_ID}:data"}
+        assert all(0 < ttl <= 600 for ttl in ttls.values())
+
+    def test_redis_isolation_lock(self) -> None:
+        """The per-chat update lock lives in Redis, shared by all workers"""
+        storage = build_fsm_storage('redis', redis=fakeredis.FakeAsyncRedis())
+
+        isolation = build_event_isolation(storage)
+
+        assert type(isolation).__name__ == 'RedisEventIsolation'
+        asyncio.run(storage.close())
@@ -0,0 +1,207 @@
+import asyncio
+import logging
+import time
+from typing import Any, List
+
+import pytest
+from aiogram import Dispatcher, Router, types
+from aiogram.fsm.storage.memory import MemoryStorage
+from django.core.exceptions import ImproperlyConfigured
+
+from bot.dispatcher import create_bot, create_dispatcher
+from bot.scheduler import ScheduledDispatcher, UpdateScheduler
+from bot.storage import build_fsm_storage
+from bot.tests.test_bot_webhook import TOKEN, message_update
+from bot.throttling import ChatThrottle, ThrottlingMiddleware, build_throttling
+
+
+def throttled_dispatcher(middleware: ThrottlingMiddleware, seen: List[str]) -> Dispatcher:
+    """Dispatcher that records the text of every message reaching the handlers."""
+    router: Router = Router()
+
+    @router.message()
+    async def record(message: types.Message) -> None:
+        seen.append(f"{message.chat.id}:{message.text}")
+
+    dispatcher: Dispatcher = Dispatcher(storage=MemoryStorage())
+    dispatcher.update.outer_middleware(middleware)
+    dispatcher.include_router(router)
+    return dispatcher
+
+
+def feed(dispatcher: Dispatcher, chat_texts: List[tuple]) -> None:
+    """Feed messages one after another, as a chat sending them quickly would."""
+    async def scenario() -> None:
+        bot = create_bot(TOKEN)
+        for update_id, (chat_id, text) in enumerate(chat_texts):
+            await dispatcher.feed_raw_update(bot, message_update(update_id, chat_id, text))
+        await bot.session.close()
+
+    asyncio.run(scenario())
+
+
+class TestChatThrottle:
+    """Tests for the per-chat token buckets"""
+
+    def test_burst_then_wait(self) -> None:
+        """A chat gets `burst` updates at once, then has to wait; other chats do not"""
+        throttle: ChatThrottle = ChatThrottle(rate=1, burst=3)
+
+        async def scenario() -> List[float]:
+            return [await throttle.take(1) for _ in range(4)] + [await throttle.take(2)]
+
+        waits: List[float] = asyncio.run(scenario())
+
+        assert waits[:3] == [0, 0, 0]
+        assert 0 < waits[3] <= 1
+        assert waits[4] == 0
+
+    def test_bucket_refills(self) -> None:
+        """Tokens come back at `rate` per second"""
+        throttle: ChatThrottle = ChatThrottle(rate=50, burst=1)
+
+        async def scenario() -> List[float]:
+            first: float = await throttle.take(1)
+            refused: float = await throttle.take(1)
+            await asyncio.sleep(refused)
+            return [first, refused, await throttle.take(1)]
+
+        first, refused, after_wait = asyncio.run(scenario())
+
+        assert first == 0 and refused > 0
+        assert after_wait == 0
+
+    def test_redis_buckets_are_shared(self) -> None:
+        """Two bot workers on one Redis draw from the same bucket of a chat"""
+        fakeredis = pytest.importorskip('fakeredis')
+        pytest.importorskip('lupa')  # Lua scripting in fakeredis
+
+        async def scenario() -> List[float]:
+            server = fakeredis.FakeServer()
+            first = ChatThrottle(rate=1, burst=2, redis=fakeredis.FakeAsyncRedis(server=server))
+            second = ChatThrottle(rate=1, burst=2, redis=fakeredis.FakeAsyncRedis(server=server))
+            return [await first.take(1), await second.take(1), await first.take(1), await second.take(2)]
+
+        waits: List[float] = asyncio.run(scenario())
+
+        assert waits[:2] == [0, 0]
+        assert waits[2] > 0
+        assert waits[3] == 0
+
+
+class TestThrottlingMiddleware:
+    """Tests for throttling updates before they reach the handlers"""
+
+    def test_drop_mode(self) -> None:
+        """A flood past the burst is dropped and counted; other chats are served"""
+        middleware: ThrottlingMiddleware = ThrottlingMiddleware(ChatThrottle(rate=0.1, burst=2), mode='drop')
+        seen: List[str] = []
+
+        feed(throttled_dispatcher(middleware, seen), [(1001, str(n)) for n in range(5)] + [(1002, "hi")])
+
+        assert seen == ['1001:0', '1001:1', '1002:hi']
+        assert (middleware.stats.passed, middleware.stats.delayed, middleware.stats.dropped) == (3, 0, 3)
+
+    def test_delay_mode(self) -> None:
+        """Updates over the limit wait for their token instead of being lost"""
+        middleware: ThrottlingMiddleware = ThrottlingMiddleware(ChatThrottle(rate=20, burst=1), max_delay=1)
+        seen: List[str] = []
+
+        started: float = time.monotonic()
+        feed(throttled_dispatcher(middleware, seen), [(1001, str(n)) for n in range(3)])
+
+        assert seen == ['1001:0', '1001:1', '1001:2']
+        assert (middleware.stats.passed, middleware.stats.delayed, middleware.stats.dropped) == (1, 2, 0)
+        assert time.monotonic() - started >= 0.09
+
+    def test_delay_longer_than_max_delay_drops(self) -> None:
+        """An update that would wait past `max_delay` is dropped"""
+        middleware: ThrottlingMiddleware = ThrottlingMiddleware(ChatThrottle(rate=0.1, burst=1), max_delay=0.5)
+        seen: List[str] = []
+
+        feed(throttled_dispatcher(middleware, seen), [(1001, "1"), (1001, "2")])
+
+        assert seen == ['1001:1']
+        assert middleware.stats.dropped == 1
+
+    def test_queued_flood_is_dropped(self) -> None:
+        """The delay counts from arrival, so a flood queued behind its chat is dropped, not drip-fed"""
+        middleware: ThrottlingMiddleware = ThrottlingMiddleware(ChatThrottle(rate=10, burst=1), max_delay=0.25)
+        seen: List[str] = []
+        router: Router = Router()
+
+        @router.message()
+        async def record(message: types.Message) -> None:
+            seen.append(message.text)
+
+        dispatcher: ScheduledDispatcher = ScheduledDispatcher(
+            storage=MemoryStorage(), scheduler=UpdateScheduler(concurrency=10),
+        )
+        dispatcher.update.outer_middleware(middleware)
+        dispatcher.include_router(router)
+
+        async def scenario() -> None:
+            bot = create_bot(TOKEN)
+            await asyncio.gather(*(
+                dispatcher.feed_raw_update(bot, message_update(n, 1001, str(n))) for n in range(20)
+            ))
+            await bot.session.close()
+
+        asyncio.run(scenario())
+
+        # one token at once, then one every 0.1 s while the 0.25 s budget lasts
+        assert seen == ['0', '1', '2']
+        assert (middleware.stats.delayed, middleware.stats.dropped) == (2, 17)
+
+    def test_unknown_mode(self) -> None:
+        """A misspelled mode fails loudly"""
+        with pytest.raises(ImproperlyConfigured):
+            ThrottlingMiddleware(ChatThrottle(rate=1, burst=1), mode='block')
+
+
+class TestThrottlingSettings:
+    """Tests for the throttling configured from the settings"""
+
+    def test_dispatcher_is_throttled(self, settings: Any) -> None:
+        """The bot dispatcher throttles with the configured rate and burst"""
+        settings.TELEGRAM_BOT_THROTTLE_RATE = 2
+        settings.TELEGRAM_BOT_THROTTLE_BURST = 4
+
+        dispatcher: ScheduledDispatcher = create_dispatcher(MemoryStorage())
+
+        middleware: ThrottlingMiddleware = next(
+            m for m in dispatcher.update.outer_middleware if isinstance(m, ThrottlingMiddleware)
+        )
+        assert dispatcher.throttling is middleware
+        assert (middleware.throttle.rate, middleware.throttle.capacity) == (2, 4)
+
+    def test_stats_are_logged_with_the_scheduler(self, settings: Any, caplog: Any) -> None:
+        """The throttling counters are reported on the periodic bot updates line"""
+        settings.TELEGRAM_BOT_THROTTLE_RATE = 1
+        settings.TELEGRAM_BOT_THROTTLE_BURST = 1
+        settings.TELEGRAM_BOT_THROTTLE_MODE = 'drop'
+        settings.TELEGRAM_BOT_STATS_INTERVAL = 0.001
+        dispatcher: ScheduledDispatcher = create_dispatcher(MemoryStorage())
+
+        with caplog.at_level(logging.INFO, logger='bot.scheduler'):
+            feed(dispatcher, [(7, "hello")] * 3)
+
+        assert (dispatcher.throttling.stats.passed, dispatcher.throttling.stats.dropped) == (1, 2)
+        assert caplog.messages[-1].startswith("Bot updates: ")
+        assert "; throttled: passed=" in caplog.messages[-1]
+
+    def test_rate_zero_disables(self, settings: Any) -> None:
+        """TELEGRAM_BOT_THROTTLE_RATE = 0 turns throttling off"""
+        settings.TELEGRAM_BOT_THROTTLE_RATE = 0
+
+        assert build_throttling(MemoryStorage()) is None
+
+    def test_redis_storage_shares_its_redis(self) -> None:
+        """With the Redis FSM storage the buckets live in the same Redis"""
+        fakeredis = pytest.importorskip('fakeredis')
+        storage = build_fsm_storage('redis', redis=fakeredis.FakeAsyncRedis())
+
+        middleware = build_throttling(storage)
+
+        assert middleware is not None
+        assert middleware.throttle._script is not None
@@ -0,0 +1,171 @@
+import asyncio
+import contextvars
+from typing import Any, Dict, List
+
+import pytest
+from aiogram import Dispatcher, Router, types
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.methods.base import Response
+from aiohttp.test_utils import TestClient, TestServer
+from asgiref.sync import async_to_sync
+from django.core.exceptions import ImproperlyConfigured
+
+from bot.dispatcher import create_bot, create_dispatcher
+from bot.scheduler import ScheduledDispatcher, UpdateScheduler
+from bot.webhook import create_webhook_app
+from tasks.tests.fake_telegram import FakeTelegramServer
+
+SECRET: str = 'webhook-secret'
+PATH: str = '/telegram/webhook/'
+TOKEN: str = '42:TEST'
+
+
+def message_update(update_id: int, chat_id: int, text: str) -> Dict[str, Any]:
+    """Telegram update with a private text message, as posted to the webhook."""
+    return {
+        'update_id': update_id,
+        'message': {
+            'message_id': update_id,
+            'date': 1700000000,
+            'chat': {'id': chat_id, 'type': 'private'},
+            'from': {'id': chat_id, 'is_bot': False, 'first_name': "Test"},
+            'text': text,
+        },
+    }
+
+
+def post_updates(app_factory: Any, updates: List[Dict[str, Any]], secret: str = SECRET) -> List[int]:
+    """Post updates to the webhook one request each; return the response statuses once all are handled."""
+    async def scenario() -> List[int]:
+        # leaving the client shuts the app down, which waits for the updates in progress
+        async with TestClient(TestServer(app_factory())) as client:
+            responses = await asyncio.gather(*(
+                client.post(PATH, json=update, headers={'X-Telegram-Bot-Api-Secret-Token': secret})
+                for update in updates
+            ))
+            return [response.status for response in responses]
+
+    return async_to_sync(scenario)()
+
+
+@pytest.mark.django_db
+class TestWebhook:
+    """Tests for the bot webhook endpoint"""
+
+    def test_update_reaches_handlers(self, fake_telegram: FakeTelegramServer) -> None:
+        """A /start update is acknowledged and answered by the registration handlers"""
+        def app() -> Any:
+            return create_webhook_app(
+                create_dispatcher(MemoryStorage()), create_bot(TOKEN, fake_telegram.url), secret_token=SECRET, path=PATH,
+            )
+
+        assert post_updates(app, [message_update(1, 1001, '/start')]) == [200]
+
+        sent: List[Dict[str, Any]] = fake_telegram.calls_for('sendMessage')
+        assert len(sent) == 1
+        assert sent[0]['params']['chat_id'] == '1001'
+        assert "/registration" in sent[0]['params']['text']
+
+    def test_wrong_secret_is_refused(self, fake_telegram: FakeTelegramServer) -> None:
+        """Requests without the right secret header are 401 and never reach the handlers"""
+        def app() -> Any:
+            return create_webhook_app(
+                create_dispatcher(MemoryStorage()), create_bot(TOKEN, fake_telegram.url), secret_token=SECRET, path=PATH,
+            )
+
+        assert post_updates(app, [message_update(1, 1001, '/start')], secret='guess') == [401]
+        assert fake_telegram.calls_for('sendMessage') == []
+
+    def test_secret_is_required(self, settings: Any) -> None:
+        """The webhook does not start without a secret token"""
+        settings.TELEGRAM_WEBHOOK_SECRET = ''
+
+        with pytest.raises(ImproperlyConfigured):
+            create_webhook_app(Dispatcher(), create_bot(TOKEN))
+
+    def test_updates_run_concurrently_up_to_the_limit(self) -> None:
+        """Updates are handled in parallel, never more than `concurrency` at a time"""
+        running: Dict[str, int] = {'now': 0, 'peak': 0, 'done': 0}
+        router: Router = Router()
+
+        @router.message()
+        async def slow(message: types.Message) -> None:
+            running['now'] += 1
+            running['peak'] = max(running['peak'], running['now'])
+            await asyncio.sleep(0.05)
+            running['now'] -= 1
+            running['done'] += 1
+
+        def app() -> Any:
+            dispatcher: Dispatcher = Dispatcher(storage=MemoryStorage())
+            dispatcher.include_router(router)
+            return create_webhook_app(dispatcher, create_bot(TOKEN), secret_token=SECRET, path=PATH, concurrency=3)
+
+        # different chats: updates of one chat are serialized by the dispatcher's event isolation
+        statuses: List[int] = post_updates(app, [message_update(i, 2000 + i, "hi") for i in range(9)])
+
+        assert statuses == [200] * 9
+        assert running['done'] == 9
+        assert running['peak'] == 3
+
+    def test_blocked_chat_takes_one_slot(self) -> None:
+        """A chat stuck on a slow step does not keep the webhook from answering and handling other chats"""
+        async def scenario() -> List[int]:
+            gate: asyncio.Event = asyncio.Event()
+            handled: List[int] = []
+            router: Router = Router()
+
+            @router.message()
+            async def step(message: types.Message) -> None:
+                if message.chat.id == 1:
+                    await gate.wait()
+                handled.append(message.chat.id)
+
+            dispatcher: ScheduledDispatcher = ScheduledDispatcher(
+                storage=MemoryStorage(), scheduler=UpdateScheduler(concurrency=10),
+            )
+            dispatcher.include_router(router)
+            app: Any = create_webhook_app(dispatcher, create_bot(TOKEN), secret_token=SECRET, path=PATH, concurrency=2)
+            headers: Dict[str, str] = {'X-Telegram-Bot-Api-Secret-Token': SECRET}
+            async with TestClient(TestServer(app)) as client:
+                try:
+                    statuses: List[int] = []
+                    for update in [message_update(i, 1, "slow") for i in range(5)] + [message_update(9, 2, "hi")]:
+                        response = await asyncio.wait_for(client.post(PATH, json=update, headers=headers), 2)
+                        statuses.append(response.status)
+                    for _ in range(200):
+                        if handled:
+                            break
+                        await asyncio.sleep(0.01)
+                    assert handled == [2]
+                finally:
+                    gate.set()
+            assert handled == [2, 1, 1, 1, 1, 1]
+            return statuses
+
+        assert async_to_sync(scenario)() == [200] * 6
+
+    def test_update_tasks_share_response_models(self) -> None:
+        """Bot API answer models built in one update task are reused by the next ones"""
+        async def scenario() -> List[Any]:
+            create_bot(TOKEN)
+
+            async def reply_model() -> Any:
+                return Response[types.Message]
+
+            return await asyncio.gather(*(asyncio.create_task(reply_model()) for _ in range(3)))
+
+        # a blank context, as in a fresh bot process
+        models: List[Any] = contextvars.Context().run(asyncio.run, scenario())
+
+        assert models[0] is models[1] is models[2]
+
+    def test_malformed_body(self) -> None:
+        """A body that is not JSON is a 400"""
+        async def scenario() -> int:
+            app = create_webhook_app(Dispatcher(), create_bot(TOKEN), secret_token=SECRET, path=PATH)
+            async with TestClient(TestServer(app)) as client:
+                response = await client.post(PATH, data=b'{', headers={'X-Telegram-Bot-Api-Secret-Token': SECRET})
+                return response.status
+
+        assert async_to_sync(scenario)() == 400
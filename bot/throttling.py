@@ -0,0 +1,195 @@
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from aiogram import BaseMiddleware
+from aiogram.dispatcher.middlewares.user_context import EventContext
+from aiogram.fsm.storage.base import BaseStorage
+from aiogram.types import TelegramObject
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from .storage import KEY_PREFIX
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Refills the chat bucket and takes one token, or returns how long to wait
+# without taking anything (the per-chat half of tasks.ratelimit's script).
+# KEYS: chat bucket. ARGV: rate, capacity.
+_TAKE_LUA: str = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+
+local rate, capacity = tonumber(ARGV[1]), tonumber(ARGV[2])
+local data = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(data[1]) or capacity
+local ts = tonumber(data[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+if tokens < 1 then
+    return tostring((1 - tokens) / rate)
+end
+
+tokens = tokens - 1
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+local ttl = math.ceil(((capacity - tokens) / rate + 1) * 1000)
+redis.call('PEXPIRE', KEYS[1], math.max(ttl, 1000))
+return '0'
+"""
+
+
+class ChatThrottle:
+    """
+        Token bucket per chat for incoming updates.
+
+        `take(chat_id)` either takes a token and returns 0, or returns the
+        number of seconds until the chat has a token again (taking nothing).
+        Buckets live in process memory or, shared by every bot worker, in
+        the Redis of the FSM storage. The bucket math is the per-chat part
+        of `tasks.ratelimit.TelegramRateLimiter`, whose blocking Redis
+        client does not fit the bot's event loop.
+
+        Attributes:
+            rate: Updates per second a chat gets on average.
+            capacity: Updates a chat may send in a burst.
+    """
+
+    def __init__(self, rate: float, burst: float, redis: Optional[Any] = None,
+                 key_prefix: str = f"{KEY_PREFIX}:throttle") -> None:
+        self.rate: float = rate
+        self.capacity: float = max(burst, 1.0)
+        self.key_prefix: str = key_prefix
+
+        self._lock: threading.Lock = threading.Lock()
+        self._buckets: Dict[int, Tuple[float, float]] = {}
+        self._script = redis.register_script(_TAKE_LUA) if redis is not None else None
+
+    async def take(self, chat_id: int) -> float:
+        """Take an update slot for the chat; return 0 on success or seconds to wait."""
+        if self._script is not None:
+            result = await self._script(keys=[f"{self.key_prefix}:{chat_id}"], args=[self.rate, self.capacity])
+            return float(result)
+
+        with self._lock:
+            now: float = time.monotonic()
+            tokens, ts = self._buckets.get(chat_id, (self.capacity, now))
+            tokens = min(self.capacity, tokens + max(0.0, now - ts) * self.rate)
+            if tokens < 1:
+                return (1 - tokens) / self.rate
+            self._buckets[chat_id] = (tokens - 1, now)
+            self._prune(now)
+            return 0.0
+
+    def _prune(self, now: float) -> None:
+        """Forget chats whose bucket is full again so memory does not grow with every chat ever seen."""
+        if len(self._buckets) < 10000:
+            return
+        for chat_id, (tokens, ts) in list(self._buckets.items()):
+            if tokens + (now - ts) * self.rate >= self.capacity:
+                del self._buckets[chat_id]
+
+
+@dataclass
+class ThrottleStats:
+    """
+        Counters of a `ThrottlingMiddleware`.
+
+        Attributes:
+            passed: Updates let through without waiting.
+            delayed: Updates let through after waiting for a token.
+            dropped: Updates discarded before reaching the handlers.
+            delay_seconds: Total time delayed updates waited.
+    """
+    passed: int = 0
+    delayed: int = 0
+    dropped: int = 0
+    delay_seconds: float = 0.0
+
+    def __str__(self) -> str:
+        return (f"passed={self.passed} delayed={self.delayed} dropped={self.dropped} "
+                f"delay={self.delay_seconds:.1f}s")
+
+
+class ThrottlingMiddleware(BaseMiddleware):
+    """
+        Holds back chats that send updates faster than their token bucket allows.
+
+        In `delay` mode an update over the limit waits for a token if one
+        comes within `max_delay` seconds of its arrival and is dropped
+        otherwise; in `drop` mode it is dropped at once. The delay counts
+        from `update_received` (set by `ScheduledDispatcher`): updates of
+        one chat are handled in turn, so the rest of a flood has queued
+        behind its first updates for a while and is dropped instead of
+        being drip-fed to the handlers. A delayed update holds back only
+        its own chat. Updates without a chat or user are not throttled.
+
+        Attributes:
+            throttle: Per-chat token buckets.
+            mode: `delay` or `drop`.
+            max_delay: Longest wait for a token in `delay` mode, in seconds.
+            stats: Passed, delayed and dropped updates.
+    """
+
+    def __init__(self, throttle: ChatThrottle, mode: str = 'delay', max_delay: float = 2.0) -> None:
+        if mode not in ('delay', 'drop'):
+            raise ImproperlyConfigured(f"Unknown TELEGRAM_BOT_THROTTLE_MODE: {mode!r}")
+        self.throttle: ChatThrottle = throttle
+        self.mode: str = mode
+        self.max_delay: float = max_delay
+        self.stats: ThrottleStats = ThrottleStats()
+
+    async def __call__(
+            self,
+            handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+            event: TelegramObject,
+            data: Dict[str, Any],
+    ) -> Any:
+        context: Optional[EventContext] = data.get('event_context')
+        chat_id: Optional[int] = None
+        if context is not None:
+            chat_id = context.chat_id or context.user_id
+        if chat_id is None:
+            return await handler(event, data)
+
+        received: float = data.get('update_received', time.monotonic())
+        waited: float = 0.0
+        wait: float = await self.throttle.take(chat_id)
+        while wait:
+            if self.mode == 'drop' or time.monotonic() - received + wait > self.max_delay:
+                self.stats.dropped += 1
+                logger.debug("Dropped an update of chat %s: over the rate limit", chat_id)
+                return None
+            await asyncio.sleep(wait)
+            waited += wait
+            wait = await self.throttle.take(chat_id)
+
+        if waited:
+            self.stats.delayed += 1
+            self.stats.delay_seconds += waited
+        else:
+            self.stats.passed += 1
+        return await handler(event, data)
+
+
+def build_throttling(storage: BaseStorage) -> Optional[ThrottlingMiddleware]:
+    """
+    Create the throttling middleware configured by `TELEGRAM_BOT_THROTTLE_*`, or None when it is off.
+
+    With the Redis FSM storage the buckets share its Redis, so a chat is
+    limited across all bot workers; otherwise they live in the process.
+    """
+    if settings.TELEGRAM_BOT_THROTTLE_RATE <= 0:
+        return None
+    throttle: ChatThrottle = ChatThrottle(
+        rate=settings.TELEGRAM_BOT_THROTTLE_RATE,
+        burst=settings.TELEGRAM_BOT_THROTTLE_BURST,
+        redis=getattr(storage, 'redis', None),
+    )
+    return ThrottlingMiddleware(
+        throttle,
+        mode=settings.TELEGRAM_BOT_THROTTLE_MODE,
+        max_delay=settings.TELEGRAM_BOT_THROTTLE_MAX_DELAY,
+    )
@@ -0,0 +1,143 @@
+import asyncio
+import logging
+from functools import partial
+from typing import Any, Optional, Set
+
+from aiogram import Bot, Dispatcher
+from aiogram.dispatcher.middlewares.user_context import UserContextMiddleware
+from aiogram.methods import TelegramMethod
+from aiogram.types import Update
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+class WebhookRequestHandler(SimpleRequestHandler):
+    """
+        Webhook endpoint that feeds Telegram updates into the dispatcher.
+
+        Requests without the `X-Telegram-Bot-Api-Secret-Token` header set at
+        `setWebhook` are refused with 401. An accepted update is answered
+        at once and handled in a background task, so updates are processed
+        concurrently. At most `concurrency` chats have updates in progress;
+        past that the response waits for a free slot, which makes Telegram
+        hold further updates instead of this process queueing them in
+        memory. A chat takes one slot however many of its updates are
+        unfinished: they are handled in turn by the dispatcher's scheduler
+        anyway, so a flooding chat or one stuck on a slow step never keeps
+        the endpoint from answering the others.
+
+        Attributes:
+            concurrency: Maximum number of chats with updates in progress.
+    """
+
+    def __init__(self, dispatcher: Dispatcher, bot: Bot, secret_token: str, concurrency: int, **data: Any) -> None:
+        super().__init__(dispatcher, bot, handle_in_background=True, secret_token=secret_token, **data)
+        self.concurrency: int = concurrency
+        self._slots: asyncio.Semaphore = asyncio.Semaphore(concurrency)
+        # Chats whose unfinished update holds a slot
+        self._slot_chats: Set[int] = set()
+
+    async def _handle_request_background(self, bot: Bot, request: web.Request) -> web.Response:
+        try:
+            update: Update = Update.model_validate(await request.json(loads=bot.session.json_loads),
+                                                   context={'bot': bot})
+        except ValueError:
+            return web.Response(status=400, text="Bad Request")
+
+        chat_id: Optional[int] = UserContextMiddleware.resolve_event_context(update).chat_id
+        slot: bool = chat_id not in self._slot_chats
+        if slot:
+            if chat_id is not None:
+                # Taken before waiting, so the chat's next updates do not queue for slots too
+                self._slot_chats.add(chat_id)
+            try:
+                await self._slots.acquire()
+            except BaseException:
+                self._slot_chats.discard(chat_id)
+                raise
+        task: asyncio.Task = asyncio.create_task(self._feed(bot, update))
+        self._background_feed_update_tasks.add(task)
+        task.add_done_callback(partial(self._finished, chat_id if slot else None, slot))
+        return web.json_response({}, dumps=bot.session.json_dumps)
+
+    async def _feed(self, bot: Bot, update: Update) -> None:
+        try:
+            result: Any = await self.dispatcher.feed_update(bot, update, **self.data)
+            if isinstance(result, TelegramMethod):
+                await self.dispatcher.silent_call_request(bot=bot, result=result)
+        except Exception:
+            # Telegram already got its 200; a failed update is logged, not redelivered
+            logger.exception("Failed to handle update %s", update.update_id)
+
+    def _finished(self, chat_id: Optional[int], slot: bool, task: asyncio.Task) -> None:
+        self._background_feed_update_tasks.discard(task)
+        if slot:
+            self._slot_chats.discard(chat_id)
+            self._slots.release()
+
+    async def close(self) -> None:
+        """Let the updates in progress finish, then close the bot session."""
+        if self._background_feed_update_tasks:
+            await asyncio.gather(*self._background_feed_update_tasks, return_exceptions=True)
+        await super().close()
+
+
+def create_webhook_app(dispatcher: Dispatcher, bot: Bot, secret_token: Optional[str] = None,
+                       path: Optional[str] = None, concurrency: Optional[int] = None) -> web.Application:
+    """
+    Build the aiohttp application serving the bot webhook.
+
+    Dispatcher startup and shutdown hooks run with the application, so the
+    FSM storage is closed on shutdown just as after polling.
+
+    Args:
+        dispatcher: Dispatcher with the bot handlers.
+        bot: Bot the updates are addressed to.
+        secret_token: Expected secret header; defaults to `TELEGRAM_WEBHOOK_SECRET`.
+        path: URL path of the endpoint; defaults to `TELEGRAM_WEBHOOK_PATH`.
+        concurrency: Chats with updates in progress; defaults to `TELEGRAM_WEBHOOK_CONCURRENCY`.
+
+    Raises:
+        ImproperlyConfigured: If no secret token is set: anyone knowing the URL could post fake updates.
+    """
+    secret_token = secret_token or settings.TELEGRAM_WEBHOOK_SECRET
+    if not secret_token:
+        raise ImproperlyConfigured("TELEGRAM_WEBHOOK_SECRET must be set to run the bot webhook")
+
+    app: web.Application = web.Application()
+    WebhookRequestHandler(
+        dispatcher, bot,
+        secret_token=secret_token,
+        concurrency=concurrency or settings.TELEGRAM_WEBHOOK_CONCURRENCY,
+    ).register(app, path=path or settings.TELEGRAM_WEBHOOK_PATH)
+    setup_application(app, dispatcher, bot=bot)
+    return app
+
+
+async def register_webhook(bot: Bot, dispatcher: Dispatcher) -> None:
+    """
+    Point Telegram at `TELEGRAM_WEBHOOK_URL` with the secret token (dispatcher startup hook).
+
+    Only the update types the handlers use are requested. Without
+    `TELEGRAM_WEBHOOK_URL` the webhook is expected to be registered elsewhere.
+    """
+    if not settings.TELEGRAM_WEBHOOK_URL:
+        logger.info("TELEGRAM_WEBHOOK_URL is empty, leaving the webhook registration as it is")
+        return
+    await bot.set_webhook(
+        url=settings.TELEGRAM_WEBHOOK_URL.rstrip('/') + settings.TELEGRAM_WEBHOOK_PATH,
+        secret_token=settings.TELEGRAM_WEBHOOK_SECRET,
+        allowed_updates=dispatcher.resolve_used_update_types(),
+        max_connections=settings.TELEGRAM_WEBHOOK_MAX_CONNECTIONS,
+    )
+
+
+def run_webhook(dispatcher: Dispatcher, bot: Bot) -> None:
+    """Serve the webhook on `TELEGRAM_WEBHOOK_HOST:TELEGRAM_WEBHOOK_PORT` until interrupted."""
+    app: web.Application = create_webhook_app(dispatcher, bot)
+    dispatcher.startup.register(register_webhook)
+    web.run_app(app, host=settings.TELEGRAM_WEBHOOK_HOST, port=settings.TELEGRAM_WEBHOOK_PORT, print=None)
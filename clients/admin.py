@@ -3,6 +3,6 @@ from .models import Client
 
 @admin.register(Client)
 class ClientAdmin(admin.ModelAdmin):
-    list_display = ('name', 'email', 'phone', 'created_at')
-    search_fields = ('name', 'email')
+    list_display = ('name', 'inn', 'email', 'phone', 'requisites', 'created_at')
+    search_fields = ('name', 'inn', 'email', 'telegram_chat_id')
     list_filter = ('created_at',)
\ No newline at end of file
@@ -1,6 +1,7 @@
 from django import forms
-from typing import Optional, Dict, Final, List
+from typing import Any, Optional, Dict, Final, List
 from .models import Client
+from .validators import normalize_inn, normalize_phone
 
 
 class ClientForm(forms.ModelForm):
@@ -12,10 +13,11 @@ class ClientForm(forms.ModelForm):
             'focus:ring-2 focus:ring-blue-400 outline-none transition-all'
         )
         model = Client
-        fields: List[str] = ['name', 'email', 'phone', 'notes', 'telegram_chat_id']
+        fields: List[str] = ['name', 'inn', 'email', 'phone', 'notes', 'telegram_chat_id']
 
         widgets: Dict[str, forms.Widget] = {
             'name': forms.TextInput(attrs={'class': COMMON_CLASSES, 'placeholder': 'Имя или Название компании'}),
+            'inn': forms.TextInput(attrs={'class': COMMON_CLASSES, 'placeholder': '10 или 12 цифр'}),
             'email': forms.EmailInput(attrs={'class': COMMON_CLASSES, 'placeholder': 'example@mail.com'}),
             'phone': forms.TextInput(attrs={'class': COMMON_CLASSES, 'placeholder': '79991234567'}),
             'notes': forms.Textarea(
@@ -26,35 +28,44 @@ class ClientForm(forms.ModelForm):
             }),
         }
 
+    def clean_inn(self) -> Optional[str]:
+        """
+        Validate the INN: digits only, 10 (organization) or 12 (individual) long.
+        """
+        return normalize_inn(self.cleaned_data.get('inn'))
+
     def clean_phone(self) -> Optional[str]:
         """
         Validate and format the phone number field.
         """
         # Explicitly typing the retrieved value
-        phone: Optional[str] = self.cleaned_data.get('phone')
+        phone: Optional[str] = normalize_phone(self.cleaned_data.get('phone'))
 
         if not phone:
             return phone
 
-        # Extract only digits from the input string
-        digits: str = ''.join(filter(str.isdigit, phone))
-
-        # 1. Normalize formatting to start with '7'
-        if digits.startswith('8'):
-            digits = '7' + digits[1:]
-        elif len(digits) == 10:
-            digits = '7' + digits
+        # Database uniqueness check excluding current instance
+        if Client.objects.filter(phone=phone).exclude(pk=self.instance.pk).exists():
+            raise forms.ValidationError("Этот номер телефона уже используется")
 
-        # 2. Length validation
-        if len(digits) != 11:
-            raise forms.ValidationError("Номер должен содержать ровно 11 цифр (включая 7)")
+        return phone
 
-        # 3. Leading digit validation
-        if not digits.startswith('7'):
-            raise forms.ValidationError("Номер должен начинаться с 7 или 8")
 
-        # 4. Database uniqueness check excluding current instance
-        if Client.objects.filter(phone=digits).exclude(pk=self.instance.pk).exists():
-            raise forms.ValidationError("Этот номер телефона уже используется")
+class ClientImportForm(forms.Form):
+    """Upload of a CSV or XLSX file with clients for the bulk import."""
+    file = forms.FileField(
+        label="Файл CSV или XLSX",
+        widget=forms.ClearableFileInput(attrs={'accept': '.csv,.xlsx', 'class': 'block w-full text-sm'}),
+    )
+    encoding = forms.ChoiceField(
+        label="Кодировка CSV",
+        choices=[('utf-8-sig', 'UTF-8'), ('cp1251', 'Windows-1251 (Excel)')],
+        initial='utf-8-sig',
+    )
 
-        return digits
\ No newline at end of file
+    def clean_file(self) -> Any:
+        """Accept only .csv and .xlsx files."""
+        upload = self.cleaned_data['file']
+        if not upload.name.lower().endswith(('.csv', '.xlsx')):
+            raise forms.ValidationError("Поддерживаются только файлы .csv и .xlsx")
+        return upload
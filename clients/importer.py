@@ -0,0 +1,296 @@
+import csv
+import io
+import itertools
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+
+from crm.counters import CLIENTS_KEY, bump
+from search.index import index_new_instances
+
+from .lookup import forget_chat
+from .models import Client
+from .validators import normalize_inn, normalize_phone
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+BATCH_SIZE: int = 1000
+# Only the first errors are kept for the report; the rest are just counted
+MAX_REPORTED_ERRORS: int = 100
+
+# Lower-cased column header -> Client field
+COLUMN_ALIASES: Dict[str, str] = {
+    'name': 'name', 'имя': 'name', 'имя / компания': 'name', 'клиент': 'name', 'компания': 'name',
+    'email': 'email', 'e-mail': 'email', 'почта': 'email',
+    'phone': 'phone', 'телефон': 'phone',
+    'inn': 'inn', 'инн': 'inn',
+    'notes': 'notes', 'заметки': 'notes', 'комментарий': 'notes',
+    'telegram_chat_id': 'telegram_chat_id', 'telegram chat id': 'telegram_chat_id', 'chat id': 'telegram_chat_id',
+}
+
+# (line number in the file, {field: raw value})
+Row = Tuple[int, Dict[str, str]]
+
+
+@dataclass
+class ImportReport:
+    """
+        Running totals of a client import, passed to the progress callback after every batch.
+
+        Attributes:
+            rows: Data rows read so far.
+            created: Clients inserted.
+            duplicates: Rows skipped because the phone or INN already exists (in the CRM or earlier in the file).
+            invalid: Rows rejected by validation.
+            errors: `(line, message)` of the first rejected rows.
+            started: `time.monotonic()` at the start of the import.
+    """
+    rows: int = 0
+    created: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    errors: List[Tuple[int, str]] = field(default_factory=list)
+    started: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the import started."""
+        return time.monotonic() - self.started
+
+    @property
+    def rate(self) -> float:
+        """Rows processed per second."""
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def reject(self, line: int, message: str) -> None:
+        """Count an invalid row and keep its message if the report is not full yet."""
+        self.invalid += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, message))
+
+
+def _map_header(header: Iterable[Any]) -> List[Optional[str]]:
+    """
+    Translate column headers into Client field names (None for unknown columns).
+
+    Raises:
+        ValueError: If there is no name column.
+    """
+    columns: List[Optional[str]] = [COLUMN_ALIASES.get(str(title or '').strip().lower()) for title in header]
+    if 'name' not in columns:
+        raise ValueError("В файле нет колонки с именем клиента (name / Имя)")
+    return columns
+
+
+def _cell_text(value: Any) -> str:
+    """Spreadsheet cell as text; numbers typed as floats (phones, INN) lose the `.0`."""
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+def _rows(columns: List[Optional[str]], records: Iterable[Iterable[Any]], first_line: int) -> Iterator[Row]:
+    for line, record in enumerate(records, start=first_line):
+        row: Dict[str, str] = {
+            column: _cell_text(value) for column, value in zip(columns, record) if column is not None
+        }
+        if any(row.values()):
+            yield line, row
+
+
+def read_csv(stream: IO[bytes], encoding: str = 'utf-8-sig') -> Iterator[Row]:
+    """
+    Stream rows of a CSV file; `;`, `,` and tab delimiters are detected from the header.
+
+    Raises:
+        ValueError: If the file is empty or has no name column.
+    """
+    text: IO[str] = io.TextIOWrapper(stream, encoding=encoding, newline='')
+    header_line: str = text.readline()
+    if not header_line.strip():
+        raise ValueError("Файл пуст")
+    delimiter: str = max(';,\t', key=header_line.count)
+
+    reader = csv.reader(itertools.chain([header_line], text), delimiter=delimiter)
+    columns: List[Optional[str]] = _map_header(next(reader))
+    yield from _rows(columns, reader, first_line=2)
+
+
+def read_xlsx(stream: IO[bytes]) -> Iterator[Row]:
+    """
+    Stream rows of the first sheet of an XLSX workbook.
+
+    The workbook is opened in read-only mode, so rows are parsed one by one
+    instead of loading the whole sheet. openpyxl is imported only here.
+
+    Raises:
+        ValueError: If openpyxl is not installed, the sheet is empty or has no name column.
+    """
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ValueError("Для импорта XLSX установите openpyxl (pip install openpyxl)") from None
+
+    workbook = load_workbook(stream, read_only=True, data_only=True)
+    try:
+        records = workbook.active.iter_rows(values_only=True)
+        header = next(records, None)
+        if header is None:
+            raise ValueError("Файл пуст")
+        yield from _rows(_map_header(header), records, first_line=2)
+    finally:
+        workbook.close()
+
+
+def read_rows(stream: IO[bytes], filename: str, encoding: str = 'utf-8-sig') -> Iterator[Row]:
+    """Stream rows of an uploaded file, picking the reader by extension (.xlsx or CSV)."""
+    if filename.lower().endswith('.xlsx'):
+        return read_xlsx(stream)
+    return read_csv(stream, encoding=encoding)
+
+
+def _build_client(row: Dict[str, str]) -> Client:
+    """
+    Validate and normalize one row with the same rules as `ClientForm`.
+
+    Raises:
+        ValidationError: With the message of the first failing field.
+    """
+    name: str = row.get('name', '')
+    if not name:
+        raise ValidationError("Не указано имя")
+    if len(name) > 255:
+        raise ValidationError("Имя длиннее 255 символов")
+
+    email: str = row.get('email', '')
+    if email:
+        validate_email(email)
+
+    chat_id: str = row.get('telegram_chat_id', '')
+    if len(chat_id) > 50:
+        raise ValidationError("Telegram Chat ID длиннее 50 символов")
+
+    return Client(
+        name=name,
+        email=email,
+        phone=normalize_phone(row.get('phone', '')),
+        inn=normalize_inn(row.get('inn')),
+        notes=row.get('notes', ''),
+        telegram_chat_id=chat_id or None,
+    )
+
+
+class ClientImporter:
+    """
+        Bulk insert of clients read from a file.
+
+        Rows are handled in batches: each batch is validated in memory, checked
+        for duplicates with one `phone IN (...)` and one `inn IN (...)` query,
+        and inserted with `bulk_create`, instead of a form validation and an
+        existence query per row. Phones and INNs seen earlier in the file are
+        remembered, so the file cannot introduce duplicates either.
+
+        `bulk_create` sends no signals, so each batch also bumps the client
+        dashboard counter, indexes the new clients for search and drops cached
+        chat lookups, in the same transaction as the insert.
+
+        Attributes:
+            batch_size: Rows per batch (one transaction each).
+            progress: Called with the report after every batch.
+            report: Running totals.
+    """
+
+    def __init__(
+            self,
+            batch_size: int = BATCH_SIZE,
+            progress: Optional[Callable[[ImportReport], None]] = None,
+    ) -> None:
+        self.batch_size: int = batch_size
+        self.progress: Optional[Callable[[ImportReport], None]] = progress
+        self.report: ImportReport = ImportReport()
+        self.seen_phones: Set[str] = set()
+        self.seen_inns: Set[str] = set()
+
+    def run(self, rows: Iterable[Row]) -> ImportReport:
+        """Import all rows and return the final report."""
+        iterator: Iterator[Row] = iter(rows)
+        while batch := list(itertools.islice(iterator, self.batch_size)):
+            self.import_batch(batch)
+            if self.progress is not None:
+                self.progress(self.report)
+        logger.info(
+            "Client import: %s rows, %s created, %s duplicates, %s invalid in %.1fs",
+            self.report.rows, self.report.created, self.report.duplicates, self.report.invalid, self.report.elapsed,
+        )
+        return self.report
+
+    def import_batch(self, batch: List[Row]) -> None:
+        """Validate, deduplicate and insert one batch of rows."""
+        self.report.rows += len(batch)
+        candidates: List[Client] = []
+        for line, row in batch:
+            try:
+                candidates.append(_build_client(row))
+            except ValidationError as exc:
+                self.report.reject(line, f"Строка {line}: {' '.join(exc.messages)}")
+
+        existing_phones: Set[str] = set(
+            Client.objects.filter(phone__in={c.phone for c in candidates if c.phone})
+            .values_list('phone', flat=True)
+        )
+        existing_inns: Set[str] = set(
+            Client.objects.filter(inn__in={c.inn for c in candidates if c.inn}).values_list('inn', flat=True)
+        )
+
+        new_clients: List[Client] = []
+        for client in candidates:
+            if client.phone in existing_phones or client.phone in self.seen_phones \
+                    or client.inn in existing_inns or client.inn in self.seen_inns:
+                self.report.duplicates += 1
+                continue
+            if client.phone:
+                self.seen_phones.add(client.phone)
+            if client.inn:
+                self.seen_inns.add(client.inn)
+            new_clients.append(client)
+
+        try:
+            with transaction.atomic():
+                self._insert(new_clients)
+        except IntegrityError:
+            # An INN was taken concurrently: insert one by one and skip the clashing rows
+            for client in new_clients:
+                client.pk = None
+                try:
+                    with transaction.atomic():
+                        self._insert([client])
+                except IntegrityError:
+                    self.report.duplicates += 1
+
+    def _insert(self, clients: List[Client]) -> None:
+        """Insert clients and do what their `post_save` signals would have done."""
+        if not clients:
+            return
+        created: List[Client] = Client.objects.bulk_create(clients, batch_size=self.batch_size)
+        bump(CLIENTS_KEY, len(created))
+        index_new_instances(created)
+        for client in created:
+            if client.telegram_chat_id:
+                forget_chat(client.telegram_chat_id)
+        self.report.created += len(created)
+
+
+def import_clients(
+        rows: Iterable[Row],
+        batch_size: int = BATCH_SIZE,
+        progress: Optional[Callable[[ImportReport], None]] = None,
+) -> ImportReport:
+    """Import clients from `read_rows` output; see `ClientImporter`."""
+    return ClientImporter(batch_size=batch_size, progress=progress).run(rows)
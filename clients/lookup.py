@@ -0,0 +1,46 @@
+from typing import Any, Optional, Union
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Client
+
+ChatId = Union[int, str]
+
+# Distinguishes "not cached" from a cached "no client for this chat"
+_MISSING: Any = object()
+
+
+def chat_cache_key(chat_id: ChatId) -> str:
+    """Cache key of the client bound to a Telegram chat."""
+    return f"clients:chat:{str(chat_id).strip()}"
+
+
+def get_client_by_chat(chat_id: ChatId) -> Optional[Client]:
+    """
+    Return the client registered for a Telegram chat, or None.
+
+    A miss is one lookup on the indexed `telegram_chat_id` column. The
+    client found, or "no client", is cached for `CLIENT_CHAT_CACHE_TTL`
+    seconds, so a hit costs no query. The client signals drop the cached
+    entries whenever a client is saved or deleted; changes that bypass
+    them (`QuerySet.update`, raw SQL) must call `forget_chat`, or are seen
+    once the entry expires.
+    """
+    chat: str = str(chat_id).strip()
+    ttl: int = settings.CLIENT_CHAT_CACHE_TTL
+    if ttl > 0:
+        cached: Optional[Client] = cache.get(chat_cache_key(chat), _MISSING)
+        if cached is not _MISSING:
+            return cached
+
+    client: Optional[Client] = Client.objects.filter(telegram_chat_id=chat).order_by('-created_at').first()
+    if ttl > 0:
+        cache.set(chat_cache_key(chat), client, ttl)
+    return client
+
+
+def forget_chat(chat_id: Optional[ChatId]) -> None:
+    """Drop the cached client of a chat."""
+    if chat_id:
+        cache.delete(chat_cache_key(chat_id))
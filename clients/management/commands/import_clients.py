@@ -0,0 +1,50 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from clients.importer import BATCH_SIZE, ImportReport, import_clients, read_rows
+
+
+class Command(BaseCommand):
+    """
+        Import clients from a CSV or XLSX file.
+
+        Columns are matched by header (`name`/`Имя`, `phone`/`Телефон`, `email`,
+        `inn`/`ИНН`, `notes`/`Заметки`, `telegram_chat_id`); rows whose phone or
+        INN already exists are skipped.
+
+        Example:
+            python manage.py import_clients clients.csv --batch-size 2000
+    """
+    help = "Bulk import clients from a CSV or XLSX file"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('path', help="CSV or XLSX file")
+        parser.add_argument('--encoding', default='utf-8-sig', help="Encoding of a CSV file (e.g. cp1251)")
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help="Rows inserted per transaction")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        def progress(report: ImportReport) -> None:
+            self.stdout.write(
+                f"{report.rows} rows: {report.created} created, {report.duplicates} duplicates, "
+                f"{report.invalid} invalid ({report.rate:.0f} rows/s)"
+            )
+
+        try:
+            with open(options['path'], 'rb') as stream:
+                report: ImportReport = import_clients(
+                    read_rows(stream, options['path'], encoding=options['encoding']),
+                    batch_size=options['batch_size'],
+                    progress=progress,
+                )
+        except (OSError, UnicodeDecodeError, ValueError) as exc:
+            raise CommandError(str(exc))
+
+        for _, message in report.errors:
+            self.stderr.write(message)
+        if report.invalid > len(report.errors):
+            self.stderr.write(f"... and {report.invalid - len(report.errors)} more invalid rows")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {report.created} clients from {report.rows} rows in {report.elapsed:.1f}s"
+        ))
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.10 on 2026-10-18 18:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0005_alter_client_telegram_chat_id'),
+        ('invoices', '0004_paymentrequisites'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='client',
+            name='requisites',
+            field=models.ForeignKey(blank=True, help_text='Если не указаны, используются реквизиты по умолчанию', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='clients', to='invoices.paymentrequisites', verbose_name='Реквизиты исполнителя'),
+        ),
+    ]
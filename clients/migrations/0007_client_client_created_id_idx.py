@@ -0,0 +1,18 @@
+# Generated by Django 5.2.10 on 2026-10-18 18:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0006_client_requisites'),
+        ('invoices', '0006_invoice_invoice_project_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['created_at', 'id'], name='client_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.10 on 2026-10-18 19:06
+
+from django.db import migrations, models
+from django.db.models.functions import Trim
+
+
+def normalize_chat_ids(apps, schema_editor):
+    """
+    Strip stray whitespace and store "no chat" as NULL, so lookups by chat
+    id are exact matches on the new index.
+    """
+    Client = apps.get_model('clients', 'Client')
+    Client.objects.exclude(telegram_chat_id=None).update(telegram_chat_id=Trim('telegram_chat_id'))
+    Client.objects.filter(telegram_chat_id='').update(telegram_chat_id=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0007_client_client_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='client',
+            name='inn',
+            field=models.CharField(blank=True, help_text='10 цифр для организации, 12 для ИП', max_length=12, null=True, unique=True, verbose_name='ИНН'),
+        ),
+        migrations.AlterField(
+            model_name='client',
+            name='telegram_chat_id',
+            field=models.CharField(blank=True, db_index=True, help_text='Личный ID чата клиента в Telegram', max_length=50, null=True, verbose_name='Telegram Chat ID'),
+        ),
+        migrations.RunPython(normalize_chat_ids, migrations.RunPython.noop),
+    ]
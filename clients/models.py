@@ -12,7 +12,9 @@ class Client(models.Model):
             name: The primary name of the client or organization.
             email: Contact email address for sending documents and notifications.
             phone: Primary contact number, normalized during form submission.
+            inn: Taxpayer identification number (10 or 12 digits), unique; set by the bot registration.
             telegram_chat_id: Unique identifier for the Telegram bot to send direct messages.
+            requisites: Legal entity that bills this client (default requisites if empty).
             created_at: Timestamp when the client record was initialized.
     """
     name = models.CharField(max_length=255, verbose_name="Имя / Компания")
@@ -20,18 +22,40 @@ class Client(models.Model):
     phone = models.CharField(max_length=20, blank=True, verbose_name="Телефон")
     notes = models.TextField(blank=True, verbose_name="Заметки")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Создан")
+    inn = models.CharField(
+        max_length=12,
+        unique=True,
+        blank=True,
+        null=True,
+        verbose_name="ИНН",
+        help_text="10 цифр для организации, 12 для ИП"
+    )
     telegram_chat_id = models.CharField(
         max_length=50,
         blank=True,
         null=True,
+        db_index=True,
         verbose_name="Telegram Chat ID",
         help_text="Личный ID чата клиента в Telegram"
     )
+    requisites = models.ForeignKey(
+        'invoices.PaymentRequisites',
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name='clients',
+        verbose_name="Реквизиты исполнителя",
+        help_text="Если не указаны, используются реквизиты по умолчанию"
+    )
 
     class Meta:
         verbose_name = "Клиент"
         verbose_name_plural = "Клиенты"
         ordering = ["-created_at"]
+        indexes = [
+            # Keyset pagination of the client list: WHERE (created_at, id) < (...) ORDER BY created_at DESC, id DESC
+            models.Index(fields=['created_at', 'id'], name='client_created_id_idx'),
+        ]
 
     def __str__(self) -> str:
         """Returns the client's name as its string representation."""
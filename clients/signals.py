@@ -0,0 +1,30 @@
+from typing import Any
+
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from .lookup import forget_chat
+from .models import Client
+
+# Attribute holding the chat id the instance had when it was loaded or last saved
+SNAPSHOT_ATTR: str = '_cached_chat_id'
+
+
+@receiver(post_init, sender=Client)
+def remember_chat_id(sender: Any, instance: Client, **kwargs: Any) -> None:
+    """Remember the loaded chat id, to invalidate it when it changes."""
+    setattr(instance, SNAPSHOT_ATTR, instance.__dict__.get('telegram_chat_id'))
+
+
+@receiver(post_save, sender=Client)
+def invalidate_chat_on_save(sender: Any, instance: Client, **kwargs: Any) -> None:
+    """Drop the cached lookups of the old and the new chat id."""
+    forget_chat(getattr(instance, SNAPSHOT_ATTR, None))
+    forget_chat(instance.telegram_chat_id)
+    setattr(instance, SNAPSHOT_ATTR, instance.telegram_chat_id)
+
+
+@receiver(post_delete, sender=Client)
+def invalidate_chat_on_delete(sender: Any, instance: Client, **kwargs: Any) -> None:
+    """Drop the cached lookup of a deleted client's chat."""
+    forget_chat(instance.telegram_chat_id)
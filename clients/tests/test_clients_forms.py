@@ -70,4 +70,26 @@ class TestClientForm:
         """
         form: ClientForm = ClientForm(data={'name': 'Only Name', 'phone': ''})
         assert form.is_valid()
-        assert form.cleaned_data.get('phone') == ''
\ No newline at end of file
+        assert form.cleaned_data.get('phone') == ''
+
+    def test_inn_validation(self) -> None:
+        """
+        Verify the INN accepts 10 or 12 digits and rejects anything else
+        """
+        assert ClientForm(data={'name': 'Org', 'inn': '7707083893'}).is_valid()
+        assert ClientForm(data={'name': 'IP', 'inn': '500100732259'}).is_valid()
+
+        form: ClientForm = ClientForm(data={'name': 'Bad', 'inn': '77070838'})
+        assert not form.is_valid()
+        assert "ИНН должен состоять из 10 или 12 цифр" in form.errors['inn']
+
+    def test_empty_inn_is_stored_as_null(self) -> None:
+        """
+        Verify clients without an INN do not collide on the unique constraint
+        """
+        for name in ('First', 'Second'):
+            form: ClientForm = ClientForm(data={'name': name, 'inn': ''})
+            assert form.is_valid()
+            form.save()
+
+        assert Client.objects.filter(inn__isnull=True).count() == 2
@@ -0,0 +1,150 @@
+import io
+from typing import Any, List
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import Client as DjangoTestClient
+from django.urls import reverse
+
+from clients.importer import ImportReport, import_clients, read_rows
+from clients.lookup import get_client_by_chat
+from clients.models import Client
+from crm.counters import read_dashboard_stats
+from search.backends import search
+
+CSV_HEADER: str = "Имя;Телефон;Email;ИНН;Заметки;telegram_chat_id\n"
+
+
+def csv_rows(text: str, encoding: str = 'utf-8') -> io.BytesIO:
+    """Wrap CSV text into a binary stream as an upload would provide it."""
+    return io.BytesIO(text.encode(encoding))
+
+
+@pytest.mark.django_db
+class TestClientImporter:
+    """Tests for parsing, validation and bulk insert in clients.importer"""
+
+    def test_imports_and_normalizes_like_the_form(self) -> None:
+        """Phones get the ClientForm normalization, empty INN becomes NULL"""
+        data = csv_rows(CSV_HEADER + "Иван;8 (999) 111-22-33;ivan@example.com;;;\n"
+                                     "ООО Ромашка;9991112244;;7701234567;Опт;\n")
+
+        report: ImportReport = import_clients(read_rows(data, 'clients.csv'))
+
+        assert (report.rows, report.created, report.duplicates, report.invalid) == (2, 2, 0, 0)
+        ivan: Client = Client.objects.get(name="Иван")
+        assert ivan.phone == '79991112233'
+        assert ivan.inn is None
+        assert Client.objects.get(name="ООО Ромашка").inn == '7701234567'
+
+    def test_duplicates_in_crm_and_in_file_are_skipped(self) -> None:
+        """A phone or INN already in the CRM or earlier in the file is skipped"""
+        Client.objects.create(name="Existing", phone='79990000000')
+        Client.objects.create(name="With INN", inn='7701234567')
+        data = csv_rows(CSV_HEADER + "A;89990000000;;;;\n"
+                                     "B;;;7701234567;;\n"
+                                     "C;79995554433;;;;\n"
+                                     "D;+7 999 555-44-33;;;;\n")
+
+        report: ImportReport = import_clients(read_rows(data, 'clients.csv'), batch_size=2)
+
+        assert (report.created, report.duplicates) == (1, 3)
+        assert Client.objects.filter(name="C").exists()
+
+    def test_invalid_rows_are_reported_with_line_numbers(self) -> None:
+        """Bad rows are rejected with the form's messages and the rest is imported"""
+        data = csv_rows(CSV_HEADER + ";79990000000;;;;\n"
+                                     "Bad phone;123;;;;\n"
+                                     "Bad INN;;;12345;;\n"
+                                     "Good;;;;;\n")
+
+        report: ImportReport = import_clients(read_rows(data, 'clients.csv'))
+
+        assert (report.created, report.invalid) == (1, 3)
+        assert report.errors[1] == (3, "Строка 3: Номер должен содержать ровно 11 цифр (включая 7)")
+        assert "ИНН должен состоять из 10 или 12 цифр" in report.errors[2][1]
+
+    def test_batches_use_constant_number_of_queries(self, django_assert_max_num_queries: Any) -> None:
+        """Duplicate checks are one query per batch, not one per row"""
+        lines: List[str] = [f"Client {i},7999{i:07d}\n" for i in range(300)]
+        data = csv_rows("name,phone\n" + ''.join(lines))
+
+        with django_assert_max_num_queries(3 * 8):
+            report: ImportReport = import_clients(read_rows(data, 'clients.csv'), batch_size=100)
+
+        assert report.created == 300
+
+    def test_counters_search_and_chat_cache_follow_the_import(self, chat_cache: Any) -> None:
+        """bulk_create bypasses signals, so the importer updates counters, search and the chat cache itself"""
+        assert get_client_by_chat('555') is None
+        data = csv_rows("name,telegram_chat_id\nImported Studio,555\n")
+
+        import_clients(read_rows(data, 'clients.csv'))
+
+        assert read_dashboard_stats()['client_count'] == 1
+        assert [hit.title for hit in search("Studio")] == ["Imported Studio"]
+        assert get_client_by_chat('555').name == "Imported Studio"
+
+    def test_cp1251_and_missing_name_column(self) -> None:
+        """Excel-style Windows-1251 files are read; a file without a name column is refused"""
+        report: ImportReport = import_clients(
+            read_rows(csv_rows("Имя;Телефон\nПётр;89990001122\n", 'cp1251'), 'c.csv', encoding='cp1251')
+        )
+        assert report.created == 1
+
+        with pytest.raises(ValueError):
+            list(read_rows(csv_rows("phone\n79990001122\n"), 'c.csv'))
+
+    def test_xlsx(self) -> None:
+        """XLSX sheets are read in read-only mode; numeric cells keep their digits"""
+        openpyxl = pytest.importorskip('openpyxl')
+        workbook = openpyxl.Workbook()
+        workbook.active.append(['Имя', 'Телефон', 'ИНН'])
+        workbook.active.append(['Sheet Client', 89991234567, 770123456789])
+        buffer = io.BytesIO()
+        workbook.save(buffer)
+        buffer.seek(0)
+
+        report: ImportReport = import_clients(read_rows(buffer, 'clients.xlsx'))
+
+        assert report.created == 1
+        client: Client = Client.objects.get()
+        assert (client.phone, client.inn) == ('79991234567', '770123456789')
+
+
+@pytest.mark.django_db
+class TestClientImportEntryPoints:
+    """Tests for the import_clients command and the upload view"""
+
+    def test_command_prints_progress(self, tmp_path: Any) -> None:
+        """The command reports progress after every batch"""
+        path = tmp_path / 'clients.csv'
+        path.write_text("name\n" + ''.join(f"Client {i}\n" for i in range(5)), encoding='utf-8')
+        out = io.StringIO()
+
+        call_command('import_clients', str(path), '--batch-size', '2', stdout=out)
+
+        output: str = out.getvalue()
+        assert "2 rows: 2 created" in output
+        assert "Imported 5 clients from 5 rows" in output
+        assert Client.objects.count() == 5
+
+    def test_upload_view(self, client: DjangoTestClient) -> None:
+        """Uploading a CSV creates the clients and shows the report"""
+        upload = SimpleUploadedFile('clients.csv', "name,phone\nUploaded,89990001122\n".encode('utf-8'))
+
+        response = client.post(reverse('clients:import'), {'file': upload, 'encoding': 'utf-8-sig'})
+
+        assert response.status_code == 200
+        assert response.context['report'].created == 1
+        assert Client.objects.get().phone == '79990001122'
+
+    def test_upload_view_rejects_other_files(self, client: DjangoTestClient) -> None:
+        """Only .csv and .xlsx uploads are accepted"""
+        upload = SimpleUploadedFile('clients.txt', b"name\nX\n")
+
+        response = client.post(reverse('clients:import'), {'file': upload, 'encoding': 'utf-8-sig'})
+
+        assert response.context['form'].errors['file']
+        assert not Client.objects.exists()
@@ -0,0 +1,72 @@
+import pytest
+from django.db import IntegrityError
+
+from clients.lookup import get_client_by_chat
+from clients.models import Client
+
+
+@pytest.mark.django_db
+class TestClientLookup:
+    """Tests for the unique INN and the cached chat id -> client lookup"""
+
+    def test_inn_is_unique(self) -> None:
+        """Two clients cannot share an INN"""
+        Client.objects.create(name="First", inn="7707083893")
+
+        with pytest.raises(IntegrityError):
+            Client.objects.create(name="Second", inn="7707083893")
+
+    def test_bot_registration_updates_by_inn(self) -> None:
+        """Re-registering the same INN updates the existing client instead of creating one"""
+        Client.objects.create(name="Old Org", inn="7707083893")
+
+        client, created = Client.objects.update_or_create(
+            inn="7707083893", defaults={'name': "New Org", 'telegram_chat_id': "555"}
+        )
+
+        assert not created
+        assert Client.objects.get().name == "New Org"
+
+    def test_lookup_is_cached(self, chat_cache, django_assert_num_queries) -> None:
+        """The second lookup of a chat is served from the cache without a query"""
+        target: Client = Client.objects.create(name="Chat Owner", telegram_chat_id="1001")
+
+        with django_assert_num_queries(1):
+            assert get_client_by_chat(1001) == target
+        with django_assert_num_queries(0):
+            assert get_client_by_chat("1001").name == "Chat Owner"
+
+    def test_saved_changes_are_served(self, chat_cache) -> None:
+        """Saving a client drops its cached entry, so the next lookup returns the new fields"""
+        client: Client = Client.objects.create(name="Old Name", telegram_chat_id="5005")
+        assert get_client_by_chat(5005).name == "Old Name"
+
+        client.name = "New Name"
+        client.save()
+
+        assert get_client_by_chat(5005).name == "New Name"
+
+    def test_unknown_chat_is_cached_until_registered(self, chat_cache, django_assert_num_queries) -> None:
+        """A miss is cached too, and binding the chat to a client invalidates it"""
+        assert get_client_by_chat(2002) is None
+        with django_assert_num_queries(0):
+            assert get_client_by_chat(2002) is None
+
+        client: Client = Client.objects.create(name="Newcomer")
+        client.telegram_chat_id = "2002"
+        client.save()
+
+        assert get_client_by_chat(2002) == client
+
+    def test_chat_change_and_delete_invalidate(self, chat_cache) -> None:
+        """Moving a client to another chat or deleting it drops the cached entries"""
+        client: Client = Client.objects.create(name="Mover", telegram_chat_id="3003")
+        assert get_client_by_chat(3003) == client
+
+        client.telegram_chat_id = "4004"
+        client.save()
+        assert get_client_by_chat(3003) is None
+        assert get_client_by_chat(4004) == client
+
+        client.delete()
+        assert get_client_by_chat(4004) is None
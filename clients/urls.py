@@ -5,6 +5,7 @@ from .views import (
     client_detail,
     client_update,
     client_delete,
+    client_import,
 )
 
 app_name = 'clients'
@@ -12,6 +13,7 @@ app_name = 'clients'
 urlpatterns = [
     path('', client_list, name='list'),
     path('add/', client_create, name='create'),
+    path('import/', client_import, name='import'),
     path('<int:pk>/', client_detail, name='detail'),
     path('<int:pk>/update/', client_update, name='update'),
     path('<int:pk>/delete/', client_delete, name='delete'),
@@ -0,0 +1,59 @@
+from typing import Optional
+
+from django.core.exceptions import ValidationError
+
+PHONE_LENGTH_ERROR: str = "Номер должен содержать ровно 11 цифр (включая 7)"
+PHONE_PREFIX_ERROR: str = "Номер должен начинаться с 7 или 8"
+INN_ERROR: str = "ИНН должен состоять из 10 или 12 цифр"
+
+
+def normalize_phone(phone: Optional[str]) -> Optional[str]:
+    """
+    Bring a phone number to the stored form: 11 digits starting with 7.
+
+    A leading 8 becomes 7 and a 10-digit number gets the 7 prepended.
+    Empty values are returned unchanged. Shared by `ClientForm` and the
+    bulk import, so both store the same numbers.
+
+    Raises:
+        ValidationError: If the number cannot be normalized.
+    """
+    if not phone:
+        return phone
+
+    # Extract only digits from the input string
+    digits: str = ''.join(filter(str.isdigit, phone))
+
+    # 1. Normalize formatting to start with '7'
+    if digits.startswith('8'):
+        digits = '7' + digits[1:]
+    elif len(digits) == 10:
+        digits = '7' + digits
+
+    # 2. Length validation
+    if len(digits) != 11:
+        raise ValidationError(PHONE_LENGTH_ERROR)
+
+    # 3. Leading digit validation
+    if not digits.startswith('7'):
+        raise ValidationError(PHONE_PREFIX_ERROR)
+
+    return digits
+
+
+def normalize_inn(inn: Optional[str]) -> Optional[str]:
+    """
+    Validate the INN: digits only, 10 (organization) or 12 (individual) long.
+
+    Empty values become None, so they do not clash in the unique column.
+
+    Raises:
+        ValidationError: If the value is not a valid INN.
+    """
+    if not inn:
+        return None
+
+    inn = inn.strip()
+    if not inn.isdigit() or len(inn) not in (10, 12):
+        raise ValidationError(INN_ERROR)
+    return inn
@@ -1,4 +1,4 @@
-from django.core.paginator import Paginator, Page
+from django.core.paginator import Page
 from django.shortcuts import render, get_object_or_404, redirect
 from django.views.decorators.http import require_POST
 from django.contrib import messages
@@ -7,7 +7,9 @@ from django.template.response import TemplateResponse
 from django.db.models import QuerySet
 from typing import Union, Optional
 
-from .forms import ClientForm
+from crm.pagination import CursorPage, paginate
+from .forms import ClientForm, ClientImportForm
+from .importer import ImportReport, import_clients, read_rows
 from .models import Client
 
 # Define a type alias for view responses that render templates
@@ -32,20 +34,48 @@ def client_create(request: HttpRequest) -> RenderResponse:
     return render(request, 'clients/create.html', {'form': form})
 
 
+def client_import(request: HttpRequest) -> HttpResponse:
+    """
+    Bulk import clients from an uploaded CSV or XLSX file.
+
+    The file is parsed as a stream and inserted in batches (see
+    `clients.importer`); the page shows how many rows were created, skipped
+    as duplicates or rejected. Very large files are better imported with
+    `python manage.py import_clients`.
+    """
+    report: Optional[ImportReport] = None
+    if request.method == 'POST':
+        form: ClientImportForm = ClientImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            upload = form.cleaned_data['file']
+            try:
+                report = import_clients(read_rows(upload, upload.name, encoding=form.cleaned_data['encoding']))
+            except (UnicodeDecodeError, ValueError) as exc:
+                form.add_error('file', str(exc))
+            else:
+                messages.success(request, f'Импортировано клиентов: {report.created}')
+    else:
+        form = ClientImportForm()
+
+    return render(request, 'clients/import.html', {'form': form, 'report': report})
+
+
 def client_list(request: HttpRequest) -> HttpResponse:
-    """Display a paginated list of all clients."""
-    clients_query: QuerySet[Client] = Client.objects.all().order_by('-created_at')
+    """
+    Display a list of all clients, newest first, 8 per page.
 
-    # Pagination: 8 clients per page
-    paginator: Paginator = Paginator(clients_query, 8)
-    page_number: Optional[str] = request.GET.get('page')
-    page_obj: Page = paginator.get_page(page_number)
+    Pages are keyset-based (`?cursor=...`) unless a page number is requested
+    (`?page=N`). HTMX infinite-scroll requests get only the next table rows.
+    """
+    clients_query: QuerySet[Client] = Client.objects.all()
+    page_obj: Union[CursorPage, Page] = paginate(request, clients_query, ('-created_at', '-id'), 8)
 
     context: dict = {
         'page_obj': page_obj,
         'clients': page_obj,
     }
-    return render(request, 'clients/list.html', context)
+    template: str = 'clients/_rows.html' if request.htmx else 'clients/list.html'
+    return render(request, template, context)
 
 
 def client_detail(request: HttpRequest, pk: int) -> HttpResponse:
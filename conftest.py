@@ -2,7 +2,11 @@ import pytest
 from clients.models import Client
 from projects.models import Project
 from invoices.models import Invoice
+from django.core.cache import cache
 from django.utils import timezone
+from tasks.telegram import reset_telegram_client
+from tasks.ratelimit import reset_rate_limiter
+from tasks.tests.fake_telegram import FakeTelegramServer
 
 @pytest.fixture
 def project(db):
@@ -23,4 +27,26 @@ def invoice(db, project):
         amount=500.00,
         due_date=timezone.now().date(),
         status='draft'
-    )
\ No newline at end of file
+    )
+
+@pytest.fixture
+def fake_telegram(settings):
+    """Фикстура локального сервера Telegram Bot API (клиент CRM направляется на него)"""
+    server = FakeTelegramServer().start()
+    settings.TELEGRAM_API_URL = server.url
+    settings.TELEGRAM_BOT_TOKEN = 'TEST:TOKEN'
+    reset_telegram_client()
+    reset_rate_limiter()
+    yield server
+    reset_telegram_client()
+    reset_rate_limiter()
+    server.stop()
+
+
+@pytest.fixture
+def chat_cache(settings):
+    """Фикстура кэша «чат Telegram → клиент» (включён, очищен до и после теста)"""
+    settings.CLIENT_CHAT_CACHE_TTL = 60
+    cache.clear()
+    yield cache
+    cache.clear()
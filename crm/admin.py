@@ -0,0 +1,9 @@
+from django.contrib import admin
+from .models import DashboardCounter
+
+
+@admin.register(DashboardCounter)
+class DashboardCounterAdmin(admin.ModelAdmin):
+    list_display = ('key', 'shard', 'value', 'day', 'updated_at')
+    search_fields = ('key',)
+    readonly_fields = ('key', 'shard', 'day', 'value', 'updated_at')
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class CrmConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'crm'
+
+    def ready(self) -> None:
+        # Register dashboard counter handlers
+        from . import signals  # noqa: F401
@@ -0,0 +1,179 @@
+import logging
+import random
+import threading
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Q, QuerySet
+from django.utils import timezone
+
+from clients.models import Client
+from projects.models import Project
+from tasks.models import OPEN_TASK_STATUSES, Task
+
+from .models import DashboardCounter
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+CLIENTS_KEY: str = 'clients'
+
+# Random number of each thread, picking the counter shard it writes to (see `_shard`)
+_writer: threading.local = threading.local()
+
+
+def project_key(status: str) -> str:
+    """Counter key of projects in the given status."""
+    return f"projects:{status}"
+
+
+def open_tasks_key(deadline: date) -> str:
+    """Counter key of unfinished tasks due on the given day."""
+    return f"open_tasks:{deadline.isoformat()}"
+
+
+def task_counter(status: Optional[str], deadline: Optional[date]) -> Optional[Tuple[str, date]]:
+    """Return the `(key, day)` counter a task contributes to, or None if it is finished or undated."""
+    if status in OPEN_TASK_STATUSES and deadline is not None:
+        return open_tasks_key(deadline), deadline
+    return None
+
+
+def _shard() -> int:
+    """
+    Return the counter shard the current thread writes to.
+
+    Django keeps a database connection per thread, and each thread writes
+    all its increments to one shard picked at random on its first bump. A
+    transaction that bumps a counter twice (e.g. creates two tasks due the
+    same day) therefore locks a single row of it, so two transactions can
+    never deadlock by locking two shards of one counter in opposite order,
+    while concurrent writers (other threads and processes) spread over the
+    shards.
+    """
+    seed: Optional[int] = getattr(_writer, 'seed', None)
+    if seed is None:
+        seed = _writer.seed = random.getrandbits(32)
+    return seed % max(settings.DASHBOARD_COUNTER_SHARDS, 1)
+
+
+def bump(key: str, delta: int, day: Optional[date] = None) -> None:
+    """
+    Atomically add `delta` to a counter, creating it on first use.
+
+    The increment is a single `UPDATE ... SET value = value + delta` on one
+    of the counter's `DASHBOARD_COUNTER_SHARDS` rows (see `_shard`), so
+    concurrent writers never overwrite each other and seldom wait for the
+    same row lock. It runs in the caller's transaction and is rolled back
+    together with the change it reflects.
+    """
+    if not delta:
+        return
+    shard: int = _shard()
+    counter: QuerySet = DashboardCounter.objects.filter(key=key, shard=shard)
+    if counter.update(value=F('value') + delta, updated_at=timezone.now()):
+        return
+    # First write to this shard; another writer may be creating it at the same time
+    DashboardCounter.objects.bulk_create([DashboardCounter(key=key, shard=shard, day=day)], ignore_conflicts=True)
+    counter.update(value=F('value') + delta, updated_at=timezone.now())
+
+
+def move(old: Optional[Tuple[str, Optional[date]]], new: Optional[Tuple[str, Optional[date]]]) -> None:
+    """Move one unit from the `old` counter to the `new` one (either may be None)."""
+    if old == new:
+        return
+    if old is not None:
+        bump(old[0], -1, old[1])
+    if new is not None:
+        bump(new[0], 1, new[1])
+
+
+def read_dashboard_stats(today: Optional[date] = None) -> Dict[str, int]:
+    """
+    Read the dashboard statistics from the counters table in one query.
+
+    Only the client and project counters and the open-task counters of past
+    days are fetched (zero rows are dropped by the reconciliation), so the
+    query touches a handful of rows (times the shards of each counter)
+    however large the source tables are.
+
+    Returns:
+        Dict[str, int]: The dashboard template context values.
+    """
+    today = today or timezone.now().date()
+    rows = DashboardCounter.objects.filter(Q(day__isnull=True) | Q(day__lt=today)).values_list('key', 'value')
+
+    values: Dict[str, int] = {}
+    overdue: int = 0
+    for key, value in rows:
+        if key.startswith('open_tasks:'):
+            overdue += value
+        else:
+            values[key] = values.get(key, 0) + value
+
+    return {
+        'client_count': values.get(CLIENTS_KEY, 0),
+        'project_total': sum(
+            value for key, value in values.items()
+            if key.startswith('projects:') and key != project_key('canceled')
+        ),
+        'project_new': values.get(project_key('new'), 0),
+        'project_in_progress': values.get(project_key('in_progress'), 0),
+        'project_done': values.get(project_key('done'), 0),
+        'overdue_tasks': overdue,
+    }
+
+
+def expected_counters() -> Dict[str, Tuple[int, Optional[date]]]:
+    """Recompute every counter from the source tables as `{key: (value, day)}`."""
+    counters: Dict[str, Tuple[int, Optional[date]]] = {CLIENTS_KEY: (Client.objects.count(), None)}
+
+    for row in Project.objects.order_by().values('status').annotate(total=Count('id')):
+        counters[project_key(row['status'])] = (row['total'], None)
+
+    open_tasks: Iterable[Dict] = (
+        Task.objects.filter(status__in=OPEN_TASK_STATUSES, deadline__isnull=False)
+        .order_by().values('deadline').annotate(total=Count('id'))
+    )
+    for row in open_tasks:
+        counters[open_tasks_key(row['deadline'])] = (row['total'], row['deadline'])
+    return counters
+
+
+@transaction.atomic
+def reconcile_counters() -> Dict[str, Tuple[int, int]]:
+    """
+    Recompute all counters from scratch and fix the stored values.
+
+    Incremental updates miss changes that bypass model signals
+    (`QuerySet.update`, raw SQL, `bulk_create`); this brings the table back
+    in line and reports what was off. A counter that drifted is collapsed
+    into a single shard holding the exact value.
+
+    Returns:
+        Dict[str, Tuple[int, int]]: `{key: (stored, actual)}` for every counter that drifted.
+    """
+    expected: Dict[str, Tuple[int, Optional[date]]] = expected_counters()
+    stored: Dict[str, int] = defaultdict(int)
+    for key, value in DashboardCounter.objects.select_for_update().values_list('key', 'value'):
+        stored[key] += value
+
+    drift: Dict[str, Tuple[int, int]] = {}
+    for key, (value, day) in expected.items():
+        total: int = stored.pop(key, 0)
+        if total != value:
+            drift[key] = (total, value)
+            DashboardCounter.objects.filter(key=key).delete()
+            DashboardCounter.objects.create(key=key, day=day, value=value)
+
+    # Whatever is left has no rows behind it any more
+    for key, total in stored.items():
+        if total:
+            drift[key] = (total, 0)
+    DashboardCounter.objects.filter(key__in=list(stored)).delete()
+
+    if drift:
+        logger.warning("Dashboard counters drifted: %s", drift)
+    return drift
@@ -0,0 +1,122 @@
+import csv
+from datetime import tzinfo
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Type
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.utils import timezone
+
+from clients.models import Client
+from invoices.models import Invoice
+from projects.models import Project
+from tasks.models import Task
+
+# Rows fetched from the database per round-trip and written per response chunk
+CHUNK_SIZE: int = 2000
+# Excel recognizes UTF-8 (and `;` in Russian locales) only with the byte order mark
+BOM: str = '\ufeff'
+DELIMITER: str = ';'
+
+# export name -> (model, ((column header, field lookup), ...))
+EXPORTS: Dict[str, Tuple[Type[models.Model], Tuple[Tuple[str, str], ...]]] = {
+    'clients': (Client, (
+        ('ID', 'id'), ('Имя', 'name'), ('Телефон', 'phone'), ('Email', 'email'), ('ИНН', 'inn'),
+        ('Заметки', 'notes'), ('telegram_chat_id', 'telegram_chat_id'), ('Создан', 'created_at'),
+    )),
+    'projects': (Project, (
+        ('ID', 'id'), ('Название', 'name'), ('Клиент', 'client__name'), ('Статус', 'status'),
+        ('Бюджет', 'budget'), ('Дедлайн', 'deadline'), ('Создан', 'created_at'),
+    )),
+    'tasks': (Task, (
+        ('ID', 'id'), ('Задача', 'title'), ('Проект', 'project__name'), ('Статус', 'status'),
+        ('Дедлайн', 'deadline'), ('Создана', 'created_at'),
+    )),
+    'invoices': (Invoice, (
+        ('ID', 'id'), ('Номер', 'number'), ('Проект', 'project__name'), ('Клиент', 'project__client__name'),
+        ('Сумма', 'amount'), ('Статус', 'status'), ('Дата выставления', 'issue_date'), ('Срок оплаты', 'due_date'),
+    )),
+}
+
+
+class _Echo:
+    """File-like object whose `write` returns the line instead of storing it, for `csv.writer`."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def _resolve_field(model: Type[models.Model], lookup: str) -> models.Field:
+    """Follow a `project__client__name` style lookup to the final model field."""
+    *relations, name = lookup.split('__')
+    for relation in relations:
+        model = model._meta.get_field(relation).related_model
+    return model._meta.get_field(name)
+
+
+def _formatter(field: models.Field, tz: tzinfo) -> Callable[[Any], Any]:
+    """Per-column conversion: choice codes to labels, datetimes to local time, NULL to an empty cell."""
+    if field.choices:
+        labels: Dict[Any, str] = dict(field.flatchoices)
+        return lambda value: labels.get(value, value)
+    if isinstance(field, models.DateTimeField):
+        # `tz` is resolved once: `timezone.localtime` per row costs more than the rest of the row
+        return lambda value: value.astimezone(tz).strftime('%Y-%m-%d %H:%M') if value else ''
+    return lambda value: '' if value is None else value
+
+
+def export_rows(name: str, status: Optional[str] = None) -> models.QuerySet:
+    """
+    Queryset of raw column tuples for an export, in primary key order.
+
+    `values_list` returns plain tuples, so no model instances are built and
+    related names come from a join instead of a query per row.
+
+    Raises:
+        KeyError: If there is no export with this name.
+        ValueError: If `status` is not a status of the exported model.
+    """
+    model, columns = EXPORTS[name]
+    queryset: models.QuerySet = model.objects.order_by('id')
+    if status:
+        try:
+            choices: Dict[str, str] = dict(model._meta.get_field('status').flatchoices)
+        except FieldDoesNotExist:
+            raise ValueError(f"Экспорт {name} не фильтруется по статусу") from None
+        if status not in choices:
+            raise ValueError(f"Неизвестный статус: {status}")
+        queryset = queryset.filter(status=status)
+    return queryset.values_list(*(lookup for _, lookup in columns))
+
+
+def stream_csv(name: str, status: Optional[str] = None, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """
+    Yield an export as CSV text in chunks of `chunk_size` rows.
+
+    Rows are read with `iterator(chunk_size=...)` (a server-side cursor on
+    PostgreSQL), so memory use does not depend on the table size and the
+    first bytes go out before the last rows are read.
+
+    Raises:
+        KeyError: If there is no export with this name.
+        ValueError: If `status` is not a status of the exported model.
+    """
+    model, columns = EXPORTS[name]
+    rows: models.QuerySet = export_rows(name, status)
+    tz: tzinfo = timezone.get_current_timezone()
+    formatters: List[Callable[[Any], Any]] = [
+        _formatter(_resolve_field(model, lookup), tz) for _, lookup in columns
+    ]
+    writer = csv.writer(_Echo(), delimiter=DELIMITER)
+
+    def generate() -> Iterator[str]:
+        yield BOM + writer.writerow([header for header, _ in columns])
+        lines: List[str] = []
+        for row in rows.iterator(chunk_size=chunk_size):
+            lines.append(writer.writerow([convert(value) for convert, value in zip(formatters, row)]))
+            if len(lines) >= chunk_size:
+                yield ''.join(lines)
+                lines = []
+        if lines:
+            yield ''.join(lines)
+
+    return generate()
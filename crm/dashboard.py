@@ -0,0 +1,31 @@
+from datetime import date
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .counters import read_dashboard_stats
+
+DASHBOARD_CACHE_KEY: str = 'crm:dashboard:{day}'
+
+
+def dashboard_stats() -> Dict[str, int]:
+    """
+    Return the dashboard statistics, shared across requests for `DASHBOARD_CACHE_TTL` seconds.
+
+    Values are read from the materialized counters in one query. The cache
+    key includes the current date, so the overdue counter never outlives the
+    day it was computed for. A TTL of 0 disables caching.
+    """
+    ttl: int = settings.DASHBOARD_CACHE_TTL
+    today: date = timezone.now().date()
+    if ttl <= 0:
+        return read_dashboard_stats(today)
+
+    key: str = DASHBOARD_CACHE_KEY.format(day=today.isoformat())
+    stats: Optional[Dict[str, int]] = cache.get(key)
+    if stats is None:
+        stats = read_dashboard_stats(today)
+        cache.set(key, stats, ttl)
+    return stats
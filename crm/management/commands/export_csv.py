@@ -0,0 +1,37 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from crm.csv_export import EXPORTS, stream_csv
+
+
+class Command(BaseCommand):
+    """
+        Export clients, projects, tasks or invoices to CSV.
+
+        Example:
+            python manage.py export_csv tasks --status todo --output tasks.csv
+    """
+    help = "Stream a table to a CSV file (or stdout) with constant memory use"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('name', choices=sorted(EXPORTS), help="What to export")
+        parser.add_argument('--status', help="Only rows with this status code")
+        parser.add_argument('--output', help="Path of the CSV file, stdout if omitted")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        try:
+            chunks = stream_csv(options['name'], status=options['status'])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        if not options['output']:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
+            return
+
+        with open(options['output'], 'w', encoding='utf-8', newline='') as out:
+            for chunk in chunks:
+                out.write(chunk)
+
+        self.stdout.write(self.style.SUCCESS(f"Exported {options['name']} to {options['output']}"))
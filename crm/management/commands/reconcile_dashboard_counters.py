@@ -0,0 +1,25 @@
+from typing import Any, Dict, Tuple
+
+from django.core.management.base import BaseCommand
+
+from crm.counters import reconcile_counters
+
+
+class Command(BaseCommand):
+    """
+        Recompute the dashboard counters from the client, project and task tables.
+
+        Example:
+            python manage.py reconcile_dashboard_counters
+    """
+    help = "Recount dashboard counters from scratch and report drift"
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        drift: Dict[str, Tuple[int, int]] = reconcile_counters()
+        if not drift:
+            self.stdout.write(self.style.SUCCESS("Dashboard counters are consistent"))
+            return
+
+        for key, (stored, actual) in sorted(drift.items()):
+            self.stdout.write(f"{key}: {stored} → {actual}")
+        self.stdout.write(self.style.WARNING(f"Corrected {len(drift)} counters"))
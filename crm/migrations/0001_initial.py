@@ -0,0 +1,58 @@
+# Generated by Django 5.2.10 on 2026-10-18 18:47
+
+from django.db import migrations, models
+from django.db.models import Count
+
+OPEN_TASK_STATUSES = ('todo', 'in_progress')
+
+
+def fill_counters(apps, schema_editor):
+    """Compute the initial counters from existing clients, projects and tasks."""
+    Client = apps.get_model('clients', 'Client')
+    Project = apps.get_model('projects', 'Project')
+    Task = apps.get_model('tasks', 'Task')
+    DashboardCounter = apps.get_model('crm', 'DashboardCounter')
+
+    counters = [DashboardCounter(key='clients', value=Client.objects.count())]
+    for row in Project.objects.order_by().values('status').annotate(total=Count('id')):
+        counters.append(DashboardCounter(key=f"projects:{row['status']}", value=row['total']))
+    open_tasks = (
+        Task.objects.filter(status__in=OPEN_TASK_STATUSES, deadline__isnull=False)
+        .order_by().values('deadline').annotate(total=Count('id'))
+    )
+    for row in open_tasks:
+        counters.append(DashboardCounter(
+            key=f"open_tasks:{row['deadline'].isoformat()}", day=row['deadline'], value=row['total']
+        ))
+    DashboardCounter.objects.bulk_create(counters)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('clients', '0006_client_requisites'),
+        ('projects', '0002_alter_project_client'),
+        ('tasks', '0003_deadlettermessage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=64, unique=True, verbose_name='Ключ')),
+                ('day', models.DateField(blank=True, null=True, verbose_name='День')),
+                ('value', models.BigIntegerField(default=0, verbose_name='Значение')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Счётчик дашборда',
+                'verbose_name_plural': 'Счётчики дашборда',
+                'ordering': ['key'],
+                'indexes': [models.Index(fields=['day'], name='dashboard_counter_day_idx')],
+            },
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.10 on 2026-10-18 20:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='dashboardcounter',
+            options={'ordering': ['key', 'shard'], 'verbose_name': 'Счётчик дашборда', 'verbose_name_plural': 'Счётчики дашборда'},
+        ),
+        migrations.AddField(
+            model_name='dashboardcounter',
+            name='shard',
+            field=models.PositiveSmallIntegerField(default=0, verbose_name='Шард'),
+        ),
+        migrations.AlterField(
+            model_name='dashboardcounter',
+            name='key',
+            field=models.CharField(max_length=64, verbose_name='Ключ'),
+        ),
+        migrations.AddConstraint(
+            model_name='dashboardcounter',
+            constraint=models.UniqueConstraint(fields=('key', 'shard'), name='dashboard_counter_key_shard_uniq'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+from django.db import models
+
+
+class DashboardCounter(models.Model):
+    """
+        Materialized counter shown on the dashboard.
+
+        Counters are kept up to date incrementally by the signal handlers in
+        `crm.signals` and recomputed from scratch by the nightly
+        reconciliation task, so the dashboard never has to scan the
+        client, project and task tables.
+
+        A counter is split into up to `DASHBOARD_COUNTER_SHARDS` rows with
+        the same key; a write updates one of them at random and a read sums
+        them, so concurrent writers rarely wait for each other's row lock.
+
+        Keys:
+            `clients` — number of clients;
+            `projects:<status>` — number of projects in each status;
+            `open_tasks:<YYYY-MM-DD>` — unfinished tasks with that deadline
+            (summed over past days to get the overdue count).
+
+        Attributes:
+            key: Counter name (see above).
+            shard: Number of the row within the counter.
+            day: Deadline date of `open_tasks` counters, empty for the others.
+            value: Current value.
+            updated_at: Time of the last change.
+    """
+    key = models.CharField(max_length=64, verbose_name="Ключ")
+    shard = models.PositiveSmallIntegerField(default=0, verbose_name="Шард")
+    day = models.DateField(null=True, blank=True, verbose_name="День")
+    value = models.BigIntegerField(default=0, verbose_name="Значение")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Счётчик дашборда"
+        verbose_name_plural = "Счётчики дашборда"
+        ordering = ['key', 'shard']
+        constraints = [
+            models.UniqueConstraint(fields=['key', 'shard'], name='dashboard_counter_key_shard_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['day'], name='dashboard_counter_day_idx'),
+        ]
+
+    def __str__(self) -> str:
+        """Return the key and value"""
+        return f"{self.key} = {self.value}"
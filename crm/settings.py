@@ -38,6 +38,8 @@ INSTALLED_APPS = [
     'projects',
     'tasks',
     'invoices',
+    'crm',
+    'search',
 ]
 
 CRISPY_ALLOWED_TEMPLATE_PACKS = "tailwind"
@@ -51,6 +53,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'django_htmx.middleware.HtmxMiddleware',
 ]
 
 ROOT_URLCONF = 'crm.urls'
@@ -82,6 +85,20 @@ DATABASES = {
     )
 }
 
+# SQLite (local development): take the write lock at BEGIN and wait for it, so concurrent writers
+# (the bot handles updates in parallel) queue up instead of failing with "database is locked"
+if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    DATABASES['default'].setdefault('OPTIONS', {}).update({'transaction_mode': 'IMMEDIATE', 'timeout': 20})
+
+# --- CACHE ---
+
+# Per process by default. Deployments with more than one process (web workers, Celery, the bot) point it
+# at Redis, e.g. rediscache://127.0.0.1:6379/1: it carries the requisites version and the chat -> client
+# lookups they invalidate for each other
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+}
+
 # --- PASSWORD VALIDATION ---
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -106,9 +123,45 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# --- INVOICE PDF CACHE ---
+
+INVOICE_PDF_CACHE_DIR = env('INVOICE_PDF_CACHE_DIR', default=str(BASE_DIR / 'var' / 'invoice_pdf_cache'))
+INVOICE_PDF_CACHE_MAX_BYTES = env.int('INVOICE_PDF_CACHE_MAX_BYTES', default=256 * 1024 * 1024)
+
+# --- INVOICE PDF RENDERING ---
+
+# Worker processes for WeasyPrint (0 renders inline in the request thread)
+INVOICE_PDF_WORKERS = env.int('INVOICE_PDF_WORKERS', default=2)
+INVOICE_PDF_QUEUE_DEPTH = env.int('INVOICE_PDF_QUEUE_DEPTH', default=8)
+INVOICE_PDF_RENDER_TIMEOUT = env.float('INVOICE_PDF_RENDER_TIMEOUT', default=30.0)
+# Pool jobs the bulk exports of a process may hold together, so the PDF view keeps the rest
+INVOICE_PDF_EXPORT_SLOTS = env.int('INVOICE_PDF_EXPORT_SLOTS', default=max(INVOICE_PDF_WORKERS // 2, 1))
+
+# Payment QR codes: image format ('png' or 'svg') and number of memoized images
+INVOICE_QR_FORMAT = env('INVOICE_QR_FORMAT', default='png')
+INVOICE_QR_CACHE_SIZE = env.int('INVOICE_QR_CACHE_SIZE', default=512)
+
+# --- DASHBOARD ---
+
+# Seconds the aggregated dashboard counters are shared between requests (0 disables the cache)
+DASHBOARD_CACHE_TTL = env.int('DASHBOARD_CACHE_TTL', default=30)
+
+# Rows each dashboard counter is split into, so concurrent writes do not queue on one row lock
+DASHBOARD_COUNTER_SHARDS = env.int('DASHBOARD_COUNTER_SHARDS', default=8)
+
+# --- CLIENTS ---
+
+# Seconds a Telegram chat id -> client lookup is cached (invalidated on client changes). The web and
+# bot processes invalidate each other's entries, so a per-process cache turns the lookup cache off
+CLIENT_CHAT_CACHE_TTL = env.int('CLIENT_CHAT_CACHE_TTL', default=300)
+if CACHES['default']['BACKEND'] == 'django.core.cache.backends.locmem.LocMemCache':
+    CLIENT_CHAT_CACHE_TTL = 0
+
 # --- CELERY ---
 
-CELERY_BROKER_URL = env('REDIS_URL', default='redis://127.0.0.1:6379/0')
+REDIS_URL = env('REDIS_URL', default='redis://127.0.0.1:6379/0')
+
+CELERY_BROKER_URL = REDIS_URL
 CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
@@ -122,6 +175,14 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'tasks.tasks.send_telegram_notifications',
         'schedule': crontab(hour=18, minute=0),
     },
+    'reconcile_dashboard_counters': {
+        'task': 'crm.tasks.reconcile_dashboard_counters',
+        'schedule': crontab(hour=3, minute=30),
+    },
+    'rebuild_project_task_counts': {
+        'task': 'projects.tasks.rebuild_project_task_counts',
+        'schedule': crontab(hour=3, minute=40),
+    },
 }
 
 # --- TELEGRAM & SECURITY ---
@@ -129,16 +190,92 @@ CELERY_BEAT_SCHEDULE = {
 TELEGRAM_BOT_TOKEN = env('TELEGRAM_BOT_TOKEN', default='')
 TELEGRAM_CHAT_ID = env('TELEGRAM_CHAT_ID', default='')
 
+# Shared Bot API client: base URL (overridable for a local API server), pool size and timeouts
+TELEGRAM_API_URL = env('TELEGRAM_API_URL', default='https://api.telegram.org')
+TELEGRAM_POOL_SIZE = env.int('TELEGRAM_POOL_SIZE', default=10)
+TELEGRAM_CONNECT_TIMEOUT = env.float('TELEGRAM_CONNECT_TIMEOUT', default=5.0)
+TELEGRAM_READ_TIMEOUT = env.float('TELEGRAM_READ_TIMEOUT', default=15.0)
+
+# Outbound rate limits (Telegram allows ~30 msg/s overall and 1 msg/s per chat).
+# 'redis' shares the token buckets between all Celery workers, 'memory' keeps them per process.
+TELEGRAM_RATE_BACKEND = env('TELEGRAM_RATE_BACKEND', default='redis')
+TELEGRAM_RATE_GLOBAL = env.float('TELEGRAM_RATE_GLOBAL', default=30.0)
+TELEGRAM_RATE_PER_CHAT = env.float('TELEGRAM_RATE_PER_CHAT', default=1.0)
+# Waits up to this many seconds are slept in the worker, longer ones become Celery retries
+TELEGRAM_RATE_MAX_WAIT = env.float('TELEGRAM_RATE_MAX_WAIT', default=2.0)
+TELEGRAM_MAX_RETRIES = env.int('TELEGRAM_MAX_RETRIES', default=5)
+TELEGRAM_RETRY_DELAY = env.int('TELEGRAM_RETRY_DELAY', default=10)
+
+# Bot dialog (FSM) state: 'redis' is shared by all bot workers, 'memory' lives in one process.
+# Unfinished registration dialogs expire from Redis this many seconds after their last step (0 = never).
+TELEGRAM_BOT_FSM_STORAGE = env('TELEGRAM_BOT_FSM_STORAGE', default='redis')
+TELEGRAM_BOT_FSM_TTL = env.int('TELEGRAM_BOT_FSM_TTL', default=60 * 60)
+# Database threads (and connections) of the bot process; 0 runs the bot's queries in Django's one shared thread
+TELEGRAM_BOT_DB_CONNECTIONS = env.int('TELEGRAM_BOT_DB_CONNECTIONS', default=10)
+# Updates handled at once per bot process (each chat's updates still one after another), updates taken
+# by long polling and not finished yet, and seconds between queue/latency log lines (0 = off)
+TELEGRAM_BOT_CONCURRENCY = env.int('TELEGRAM_BOT_CONCURRENCY', default=100)
+TELEGRAM_BOT_QUEUE_SIZE = env.int('TELEGRAM_BOT_QUEUE_SIZE', default=1000)
+TELEGRAM_BOT_STATS_INTERVAL = env.float('TELEGRAM_BOT_STATS_INTERVAL', default=60.0)
+# Incoming updates per chat: RATE per second on average with bursts of BURST (RATE 0 = no throttling).
+# Updates over the limit wait for a token up to MAX_DELAY seconds after arriving ('delay') or are dropped at once ('drop').
+TELEGRAM_BOT_THROTTLE_RATE = env.float('TELEGRAM_BOT_THROTTLE_RATE', default=1.0)
+TELEGRAM_BOT_THROTTLE_BURST = env.float('TELEGRAM_BOT_THROTTLE_BURST', default=5.0)
+TELEGRAM_BOT_THROTTLE_MODE = env('TELEGRAM_BOT_THROTTLE_MODE', default='delay')
+TELEGRAM_BOT_THROTTLE_MAX_DELAY = env.float('TELEGRAM_BOT_THROTTLE_MAX_DELAY', default=2.0)
+
+# Bot update delivery: 'polling' (local development) or 'webhook' (Telegram posts updates to bot/bot.py).
+# The webhook listens on HOST:PORT at PATH behind the public https base URL, which is registered on startup
+# (left alone when empty). Requests must carry SECRET in X-Telegram-Bot-Api-Secret-Token.
+TELEGRAM_BOT_MODE = env('TELEGRAM_BOT_MODE', default='polling')
+TELEGRAM_WEBHOOK_URL = env('TELEGRAM_WEBHOOK_URL', default='')
+TELEGRAM_WEBHOOK_PATH = env('TELEGRAM_WEBHOOK_PATH', default='/telegram/webhook/')
+TELEGRAM_WEBHOOK_SECRET = env('TELEGRAM_WEBHOOK_SECRET', default='')
+TELEGRAM_WEBHOOK_HOST = env('TELEGRAM_WEBHOOK_HOST', default='0.0.0.0')
+TELEGRAM_WEBHOOK_PORT = env.int('TELEGRAM_WEBHOOK_PORT', default=8081)
+# Chats with updates in progress per bot process before responses wait, and parallel connections
+# Telegram may open (1-100)
+TELEGRAM_WEBHOOK_CONCURRENCY = env.int('TELEGRAM_WEBHOOK_CONCURRENCY', default=100)
+TELEGRAM_WEBHOOK_MAX_CONNECTIONS = env.int('TELEGRAM_WEBHOOK_MAX_CONNECTIONS', default=40)
+
+# Documents handed between tasks are stored here ('file' or 'redis') and only referenced in broker messages
+TELEGRAM_BLOB_BACKEND = env('TELEGRAM_BLOB_BACKEND', default='file')
+TELEGRAM_BLOB_DIR = env('TELEGRAM_BLOB_DIR', default=str(BASE_DIR / 'var' / 'telegram_blobs'))
+TELEGRAM_BLOB_TTL = env.int('TELEGRAM_BLOB_TTL', default=24 * 60 * 60)
+
 USE_X_FORWARDED_HOST = True
 SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
 
+import atexit
+import shutil
 import sys
+import tempfile
 
 # If tests are running, switch to a fast SQLite database
 if 'test' in sys.argv or 'pytest' in sys.modules:
+    # Files of this test run (database, PDF cache, blobs), apart from other checkouts, CI jobs and xdist workers
+    TEST_TMP_DIR = tempfile.mkdtemp(prefix='freelance_crm_test_')
+    atexit.register(shutil.rmtree, TEST_TMP_DIR, ignore_errors=True)
     DATABASES = {
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
             'NAME': ':memory:',
+            # A file, so threads of the concurrency tests get their own connections that wait for the
+            # write lock (shared-cache :memory: fails at once with "database table is locked")
+            'TEST': {'NAME': os.path.join(TEST_TMP_DIR, 'freelance_crm_test.sqlite3')},
+            'OPTIONS': {'transaction_mode': 'IMMEDIATE', 'timeout': 20},
+        }
+    }
+    INVOICE_PDF_WORKERS = 0
+    TELEGRAM_RATE_BACKEND = 'memory'
+    TELEGRAM_BOT_FSM_STORAGE = 'memory'
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
         }
-    }
\ No newline at end of file
+    }
+    DASHBOARD_CACHE_TTL = 0
+    CLIENT_CHAT_CACHE_TTL = 0
+    INVOICE_PDF_CACHE_DIR = os.path.join(TEST_TMP_DIR, 'pdf_cache')
+    TELEGRAM_BLOB_BACKEND = 'file'
+    TELEGRAM_BLOB_DIR = os.path.join(TEST_TMP_DIR, 'blobs')
\ No newline at end of file
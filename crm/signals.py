@@ -0,0 +1,80 @@
+from datetime import date
+from typing import Any, Optional, Tuple
+
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from clients.models import Client
+from projects.models import Project
+from tasks.models import Task
+from .counters import CLIENTS_KEY, bump, move, project_key, task_counter
+
+# Attribute holding the counter an instance contributed to when it was loaded or last saved
+SNAPSHOT_ATTR: str = '_dashboard_counter'
+
+Counter = Optional[Tuple[str, Optional[date]]]
+
+# Marks a snapshot that could not be taken (the field was deferred)
+UNKNOWN: Tuple[str, None] = ('', None)
+
+
+def _project_counter(instance: Project) -> Counter:
+    status: Optional[str] = instance.__dict__.get('status')
+    return UNKNOWN if status is None else (project_key(status), None)
+
+
+def _task_counter(instance: Task) -> Counter:
+    if 'status' not in instance.__dict__ or 'deadline' not in instance.__dict__:
+        return UNKNOWN
+    # The deadline may have been assigned as a string (e.g. `deadline='2020-01-01'`)
+    deadline: Optional[date] = Task._meta.get_field('deadline').to_python(instance.deadline)
+    return task_counter(instance.status, deadline)
+
+
+COUNTERS = {
+    Project: _project_counter,
+    Task: _task_counter,
+}
+
+
+@receiver(post_init, sender=Project)
+@receiver(post_init, sender=Task)
+def remember_counter(sender: Any, instance: Any, **kwargs: Any) -> None:
+    """Remember which counter the loaded instance is part of, to detect status/deadline changes on save."""
+    setattr(instance, SNAPSHOT_ATTR, COUNTERS[sender](instance))
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=Task)
+def update_counter_on_save(sender: Any, instance: Any, created: bool, **kwargs: Any) -> None:
+    """Move the instance between counters when it is created or its status/deadline changes."""
+    old: Counter = None if created else getattr(instance, SNAPSHOT_ATTR, UNKNOWN)
+    new: Counter = COUNTERS[sender](instance)
+    if old == UNKNOWN or new == UNKNOWN:
+        # Saved from a partially loaded instance: leave it to the reconciliation job
+        setattr(instance, SNAPSHOT_ATTR, new)
+        return
+    move(old, new)
+    setattr(instance, SNAPSHOT_ATTR, new)
+
+
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=Task)
+def update_counter_on_delete(sender: Any, instance: Any, **kwargs: Any) -> None:
+    """Remove a deleted project or task from its counter."""
+    old: Counter = getattr(instance, SNAPSHOT_ATTR, UNKNOWN)
+    if old != UNKNOWN:
+        move(old, None)
+
+
+@receiver(post_save, sender=Client)
+def count_created_client(sender: Any, instance: Client, created: bool, **kwargs: Any) -> None:
+    """Increment the client counter."""
+    if created:
+        bump(CLIENTS_KEY, 1)
+
+
+@receiver(post_delete, sender=Client)
+def count_deleted_client(sender: Any, instance: Client, **kwargs: Any) -> None:
+    """Decrement the client counter."""
+    bump(CLIENTS_KEY, -1)
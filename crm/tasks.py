@@ -0,0 +1,11 @@
+from typing import Dict, Tuple
+
+from celery import shared_task
+
+from .counters import reconcile_counters
+
+
+@shared_task
+def reconcile_dashboard_counters() -> Dict[str, Tuple[int, int]]:
+    """Nightly recount of the dashboard counters; returns the drift that was corrected."""
+    return reconcile_counters()
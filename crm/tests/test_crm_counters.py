@@ -0,0 +1,162 @@
+import pytest
+import threading
+from collections import defaultdict
+from datetime import date, timedelta
+from io import StringIO
+from typing import Any, Dict
+
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.utils import timezone
+
+from clients.models import Client
+from crm.counters import expected_counters, read_dashboard_stats, reconcile_counters
+from crm.models import DashboardCounter
+from projects.models import Project
+from tasks.models import Task
+
+
+def _assert_consistent() -> None:
+    """Counters must match a full recount of the source tables"""
+    stored: Dict[str, int] = defaultdict(int)
+    for key, value in DashboardCounter.objects.values_list('key', 'value'):
+        stored[key] += value
+    expected: Dict[str, int] = {key: value for key, (value, _) in expected_counters().items()}
+    assert {key: value for key, value in stored.items() if value} == {
+        key: value for key, value in expected.items() if value
+    }
+
+
+@pytest.mark.django_db
+class TestDashboardCounters:
+    """Tests for incrementally maintained dashboard counters"""
+
+    def test_project_lifecycle(self) -> None:
+        """Verify that creating, re-statusing and deleting projects keeps counters exact"""
+        owner: Client = Client.objects.create(name="Owner")
+        project: Project = Project.objects.create(name="P", client=owner, status='new')
+        _assert_consistent()
+
+        project.status = 'done'
+        project.save()
+        project.save()
+        _assert_consistent()
+        assert read_dashboard_stats()['project_done'] == 1
+
+        Project.objects.get(pk=project.pk).delete()
+        _assert_consistent()
+
+    def test_task_status_and_deadline_changes(self, project: Project) -> None:
+        """Verify that overdue tasks move between days and leave the counter when finished"""
+        yesterday: date = timezone.now().date() - timedelta(days=1)
+        task: Task = Task.objects.create(project=project, title="T", deadline=yesterday)
+        assert read_dashboard_stats()['overdue_tasks'] == 1
+
+        task.deadline = yesterday + timedelta(days=5)
+        task.save()
+        assert read_dashboard_stats()['overdue_tasks'] == 0
+
+        task.deadline = yesterday
+        task.status = 'done'
+        task.save()
+        assert read_dashboard_stats()['overdue_tasks'] == 0
+        _assert_consistent()
+
+    def test_deadline_given_as_string(self, project: Project) -> None:
+        """Verify that a deadline assigned as an ISO string is counted like a date"""
+        task: Task = Task.objects.create(project=project, title="T", deadline='2020-01-01')
+        assert read_dashboard_stats()['overdue_tasks'] == 1
+
+        task.deadline = '2099-01-01'
+        task.save()
+        assert read_dashboard_stats()['overdue_tasks'] == 0
+        _assert_consistent()
+
+    def test_overdue_grows_with_time(self, project: Project) -> None:
+        """Verify that per-day counters turn overdue without any write once the day passes"""
+        tomorrow: date = timezone.now().date() + timedelta(days=1)
+        Task.objects.create(project=project, title="T", deadline=tomorrow)
+
+        assert read_dashboard_stats()['overdue_tasks'] == 0
+        assert read_dashboard_stats(today=tomorrow + timedelta(days=1))['overdue_tasks'] == 1
+
+    def test_cascade_delete(self, project: Project) -> None:
+        """Verify that deleting a client removes its projects and tasks from the counters"""
+        Task.objects.create(project=project, title="T", deadline=date(2020, 1, 1))
+
+        project.client.delete()
+
+        assert read_dashboard_stats() == {
+            'client_count': 0, 'project_total': 0, 'project_new': 0,
+            'project_in_progress': 0, 'project_done': 0, 'overdue_tasks': 0,
+        }
+
+    def test_rolled_back_changes_not_counted(self) -> None:
+        """Verify that counter updates share the transaction of the change"""
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                Client.objects.create(name="Ghost")
+                raise RuntimeError
+
+        assert read_dashboard_stats()['client_count'] == 0
+
+    def test_reconcile_reports_and_fixes_drift(self, project: Project) -> None:
+        """Verify that bulk updates bypassing signals are detected and corrected"""
+        Project.objects.filter(pk=project.pk).update(status='done')
+
+        drift: Any = reconcile_counters()
+
+        assert drift == {'projects:new': (1, 0), 'projects:done': (0, 1)}
+        _assert_consistent()
+        assert reconcile_counters() == {}
+
+    @pytest.mark.django_db(transaction=True)
+    def test_counters_spread_over_shards(self, settings: Any) -> None:
+        """Verify that concurrent writers write to different rows of a counter and reads add them up"""
+        settings.DASHBOARD_COUNTER_SHARDS = 4
+
+        def write(n: int) -> None:
+            try:
+                with transaction.atomic():
+                    Client.objects.create(name=f"Client {n}")
+            finally:
+                connection.close()
+
+        # A thread each, so each has its own connection and shard
+        for n in range(16):
+            writer: threading.Thread = threading.Thread(target=write, args=(n,))
+            writer.start()
+            writer.join()
+
+        assert DashboardCounter.objects.filter(key='clients').count() > 1
+        assert read_dashboard_stats()['client_count'] == 16
+        assert reconcile_counters() == {}
+
+    def test_transaction_writes_one_shard(self, project: Project, settings: Any) -> None:
+        """Verify that one transaction bumping a counter repeatedly locks a single row of it"""
+        settings.DASHBOARD_COUNTER_SHARDS = 8
+        with transaction.atomic():
+            for n in range(10):
+                Task.objects.create(project=project, title=f"T{n}", deadline=date(2020, 1, 1))
+
+        assert DashboardCounter.objects.filter(key='open_tasks:2020-01-01').count() == 1
+
+    def test_reconcile_collapses_drifted_shards(self, settings: Any) -> None:
+        """Verify that a drifted counter is reported with its shards summed and rewritten as one row"""
+        settings.DASHBOARD_COUNTER_SHARDS = 4
+        for n in range(20):
+            Client.objects.create(name=f"Client {n}")
+        Client.objects.bulk_create([Client(name="Bulk")])
+
+        assert reconcile_counters() == {'clients': (20, 21)}
+        assert list(DashboardCounter.objects.filter(key='clients').values_list('value', flat=True)) == [21]
+
+    def test_reconcile_command(self, project: Project) -> None:
+        """Verify that the management command prints corrected counters"""
+        DashboardCounter.objects.filter(key='clients').delete()
+        DashboardCounter.objects.create(key='clients', value=10)
+        out: StringIO = StringIO()
+
+        call_command('reconcile_dashboard_counters', stdout=out)
+
+        assert 'clients: 10 → 1' in out.getvalue()
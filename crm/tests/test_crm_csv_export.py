@@ -0,0 +1,102 @@
+import csv
+import io
+from typing import Any, List
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import Client as DjangoTestClient
+from django.urls import reverse
+from django.utils import timezone
+
+from clients.importer import import_clients, read_rows
+from clients.models import Client
+from crm.csv_export import BOM, stream_csv
+from invoices.models import Invoice
+from projects.models import Project
+from tasks.models import Task
+
+
+def parse(text: str) -> List[List[str]]:
+    """Split exported CSV text into rows of cells."""
+    assert text.startswith(BOM)
+    return list(csv.reader(io.StringIO(text[len(BOM):]), delimiter=';'))
+
+
+@pytest.mark.django_db
+class TestStreamCsv:
+    """Tests for crm.csv_export"""
+
+    def test_tasks_with_related_names_and_status_labels(self, project: Project) -> None:
+        """Related names come from the join and status codes become labels"""
+        Task.objects.create(project=project, title="Write; \"quoted\"\ntext", status='in_progress')
+
+        rows: List[List[str]] = parse(''.join(stream_csv('tasks')))
+
+        assert rows[0] == ['ID', 'Задача', 'Проект', 'Статус', 'Дедлайн', 'Создана']
+        assert rows[1][1:5] == ["Write; \"quoted\"\ntext", "Fixture Project", "В работе", '']
+
+    def test_rows_are_chunked_and_read_in_one_query(self, project: Project, django_assert_num_queries: Any) -> None:
+        """Rows are values_list tuples read in one query and yielded in chunks of chunk_size rows"""
+        for i in range(5):
+            Invoice.objects.create(project=project, number=f"N-{i}", amount=10, due_date=timezone.now().date())
+
+        with django_assert_num_queries(1):
+            chunks: List[str] = list(stream_csv('invoices', chunk_size=2))
+
+        assert len(chunks) == 4  # header + 2 + 2 + 1 rows
+        rows: List[List[str]] = parse(''.join(chunks))
+        assert [row[1] for row in rows[1:]] == [f"N-{i}" for i in range(5)]
+        assert rows[1][3:6] == ["Fixture Client", "10.00", "Черновик"]
+
+    def test_status_filter(self, project: Project) -> None:
+        """Only rows with the requested status are exported; unknown statuses are refused"""
+        Project.objects.create(name="Done", client=project.client, status='done')
+
+        rows: List[List[str]] = parse(''.join(stream_csv('projects', status='done')))
+
+        assert [row[1] for row in rows[1:]] == ["Done"]
+        with pytest.raises(ValueError):
+            stream_csv('projects', status='bogus')
+        with pytest.raises(ValueError):
+            stream_csv('clients', status='done')
+
+    def test_client_export_can_be_imported_back(self) -> None:
+        """The client export uses the headers the bulk import understands"""
+        Client.objects.create(name="Roundtrip", phone='79991234567', inn='7701234567')
+        exported: bytes = ''.join(stream_csv('clients')).encode('utf-8')
+        Client.objects.all().delete()
+
+        report = import_clients(read_rows(io.BytesIO(exported), 'clients.csv'))
+
+        assert report.created == 1
+        assert Client.objects.get().inn == '7701234567'
+
+
+@pytest.mark.django_db
+class TestCsvExportEntryPoints:
+    """Tests for the export endpoint and the export_csv command"""
+
+    def test_view_streams_attachment(self, client: DjangoTestClient, project: Project) -> None:
+        """The endpoint answers with a streaming CSV attachment"""
+        response = client.get(reverse('export_csv', args=['projects']))
+
+        assert response.streaming
+        assert response['Content-Disposition'] == 'attachment; filename="projects.csv"'
+        rows: List[List[str]] = parse(b''.join(response.streaming_content).decode('utf-8'))
+        assert rows[1][1] == "Fixture Project"
+
+    def test_view_errors(self, client: DjangoTestClient, db: Any) -> None:
+        """Unknown exports are 404, unknown statuses 400"""
+        assert client.get(reverse('export_csv', args=['users'])).status_code == 404
+        assert client.get(reverse('export_csv', args=['tasks']), {'status': 'x'}).status_code == 400
+
+    def test_command_writes_file(self, tmp_path: Any, project: Project) -> None:
+        """The command writes the CSV to the given path"""
+        path = tmp_path / 'projects.csv'
+
+        call_command('export_csv', 'projects', '--output', str(path), stdout=io.StringIO())
+
+        assert parse(path.read_text(encoding='utf-8'))[1][1] == "Fixture Project"
+        with pytest.raises(CommandError):
+            call_command('export_csv', 'tasks', '--status', 'bogus', stdout=io.StringIO())
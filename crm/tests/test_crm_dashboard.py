@@ -4,9 +4,12 @@ from django.utils import timezone
 from django.test import Client as DjangoTestClient
 from django.template.response import TemplateResponse
 from datetime import timedelta, date
+from django.core.cache import cache
 from typing import Final, Any
 
 from clients.models import Client
+from crm.counters import read_dashboard_stats
+from crm.dashboard import dashboard_stats
 from projects.models import Project
 from tasks.models import Task
 
@@ -56,4 +59,53 @@ class TestDashboardView:
         assert response.context['project_total'] == 4
 
         # Only incomplete tasks with past deadlines should be counted as overdue
-        assert response.context['overdue_tasks'] == 1
\ No newline at end of file
+        assert response.context['overdue_tasks'] == 1
+
+
+@pytest.mark.django_db
+class TestDashboardAggregation:
+    """Tests for the aggregated and cached dashboard counters"""
+
+    def test_counts_by_status(self) -> None:
+        """Verify that every project status is counted and canceled projects are excluded"""
+        test_client: Client = Client.objects.create(name="Test Client")
+        Client.objects.create(name="Client without projects")
+        for status in ('new', 'new', 'in_progress', 'done', 'canceled'):
+            Project.objects.create(name=status, status=status, client=test_client)
+
+        stats: dict = read_dashboard_stats()
+
+        assert stats == {
+            'client_count': 2,
+            'project_total': 4,
+            'project_new': 2,
+            'project_in_progress': 1,
+            'project_done': 1,
+            'overdue_tasks': 0,
+        }
+
+    def test_dashboard_query_count(self, client: DjangoTestClient, project: Project,
+                                   django_assert_num_queries: Any) -> None:
+        """Verify that the dashboard reads its counters in one query regardless of data volume"""
+        yesterday: date = timezone.now().date() - timedelta(days=1)
+        for i in range(20):
+            Task.objects.create(title=f"T{i}", deadline=yesterday, project=project)
+
+        with django_assert_num_queries(1):
+            response: TemplateResponse | Any = client.get(reverse('dashboard'))
+
+        assert response.context['overdue_tasks'] == 20
+
+    def test_snapshot_is_cached(self, project: Project, settings: Any,
+                                django_assert_num_queries: Any) -> None:
+        """Verify that repeated reads within the TTL are served from the cache"""
+        settings.DASHBOARD_CACHE_TTL = 60
+        cache.clear()
+
+        with django_assert_num_queries(1):
+            first: dict = dashboard_stats()
+        with django_assert_num_queries(0):
+            second: dict = dashboard_stats()
+
+        assert first == second
+        cache.clear()
@@ -0,0 +1,165 @@
+from datetime import timedelta
+from typing import List
+
+import pytest
+from django.test import Client as DjangoTestClient
+from django.urls import reverse
+from django.utils import timezone
+
+from clients.models import Client
+from crm.pagination import CursorPage, CursorPaginator, InvalidCursor
+from projects.models import Project
+from tasks.models import Task
+
+ORDERING = ('-created_at', '-id')
+
+
+def walk_forward(paginator: CursorPaginator) -> List[List[int]]:
+    """Collect the ids of every page from the first one following `next_cursor`."""
+    pages: List[List[int]] = []
+    page: CursorPage = paginator.page()
+    while True:
+        pages.append([obj.pk for obj in page])
+        if not page.has_next():
+            return pages
+        page = paginator.page(page.next_cursor)
+
+
+@pytest.mark.django_db
+class TestCursorPaginator:
+    """Tests for keyset pagination in crm.pagination"""
+
+    def test_walks_all_rows_once_in_order(self) -> None:
+        """Following next cursors visits every row exactly once, newest first"""
+        clients: List[Client] = [Client.objects.create(name=f"Client {i}") for i in range(7)]
+
+        pages: List[List[int]] = walk_forward(CursorPaginator(Client.objects.all(), ORDERING, 3))
+
+        assert [len(page) for page in pages] == [3, 3, 1]
+        assert sum(pages, []) == [client.pk for client in reversed(clients)]
+
+    def test_ties_on_first_field_are_broken_by_id(self) -> None:
+        """Rows sharing the same timestamp are neither skipped nor repeated"""
+        for i in range(5):
+            Client.objects.create(name=f"Client {i}")
+        Client.objects.update(created_at=timezone.now())
+
+        pages: List[List[int]] = walk_forward(CursorPaginator(Client.objects.all(), ORDERING, 2))
+
+        assert sum(pages, []) == sorted(Client.objects.values_list('id', flat=True), reverse=True)
+
+    def test_previous_cursor_returns_the_preceding_page(self) -> None:
+        """Going back from the second page returns the first page in the same order"""
+        for i in range(6):
+            Client.objects.create(name=f"Client {i}")
+        paginator: CursorPaginator = CursorPaginator(Client.objects.all(), ORDERING, 2)
+
+        first: CursorPage = paginator.page()
+        second: CursorPage = paginator.page(first.next_cursor)
+        back: CursorPage = paginator.page(second.previous_cursor)
+
+        assert not first.has_previous()
+        assert second.has_previous() and second.has_next()
+        assert [obj.pk for obj in back] == [obj.pk for obj in first]
+        assert not back.has_previous()
+        assert back.has_next()
+
+    def test_ascending_date_ordering(self, project: Project) -> None:
+        """Overdue ordering by (deadline, id) pages through dates in ascending order"""
+        today = timezone.now().date()
+        for days in (5, 1, 3, 3, 2):
+            Task.objects.create(project=project, title=f"Task {days}", deadline=today - timedelta(days=days))
+
+        pages: List[List[int]] = walk_forward(CursorPaginator(Task.objects.all(), ('deadline', 'id'), 2))
+
+        expected: List[int] = list(Task.objects.order_by('deadline', 'id').values_list('id', flat=True))
+        assert sum(pages, []) == expected
+
+    def test_deep_page_does_not_use_offset_or_count(self, django_assert_num_queries) -> None:
+        """A page after a cursor is one query with a keyset filter and no OFFSET"""
+        for i in range(5):
+            Client.objects.create(name=f"Client {i}")
+        paginator: CursorPaginator = CursorPaginator(Client.objects.all(), ORDERING, 2)
+        cursor: str = paginator.page().next_cursor
+
+        with django_assert_num_queries(1) as captured:
+            paginator.page(cursor)
+
+        sql: str = captured.captured_queries[0]['sql'].upper()
+        assert 'OFFSET' not in sql
+        assert 'COUNT' not in sql
+
+    @pytest.mark.parametrize('token', ['garbage', 'eyJkIjoibiJ9', 'eyJkIjoieCIsInYiOlsxLDJdfQ'])
+    def test_invalid_cursor_is_rejected(self, token: str) -> None:
+        """Malformed tokens and tokens for another ordering raise InvalidCursor"""
+        paginator: CursorPaginator = CursorPaginator(Client.objects.all(), ORDERING, 2)
+
+        with pytest.raises(InvalidCursor):
+            paginator.page(token)
+
+
+@pytest.mark.django_db
+class TestCursorPaginationViews:
+    """Tests for cursor mode, page-number mode and HTMX rows in the list views"""
+
+    def test_client_list_next_cursor(self, client: DjangoTestClient) -> None:
+        """The second keyset page of the client list holds the remaining clients"""
+        for i in range(10):
+            Client.objects.create(name=f"Client {i}")
+        url: str = reverse('clients:list')
+
+        first = client.get(url).context['page_obj']
+        response = client.get(url, {'cursor': first.next_cursor})
+
+        assert [c.name for c in response.context['clients']] == ["Client 1", "Client 0"]
+        assert not response.context['page_obj'].has_next()
+
+    def test_page_number_mode_is_kept(self, client: DjangoTestClient) -> None:
+        """`?page=N` still uses the numbered paginator"""
+        for i in range(10):
+            Client.objects.create(name=f"Client {i}")
+
+        response = client.get(reverse('clients:list'), {'page': 2})
+
+        page_obj = response.context['page_obj']
+        assert page_obj.number == 2
+        assert len(page_obj) == 2
+        assert b'?page=1' in response.content
+
+    def test_broken_cursor_falls_back_to_first_page(self, client: DjangoTestClient) -> None:
+        """A tampered cursor shows the first page instead of an error"""
+        for i in range(3):
+            Client.objects.create(name=f"Client {i}")
+
+        response = client.get(reverse('clients:list'), {'cursor': 'not-a-cursor'})
+
+        assert response.status_code == 200
+        assert response.context['clients'][0].name == "Client 2"
+
+    def test_htmx_request_returns_rows_only(self, client: DjangoTestClient, project: Project) -> None:
+        """Infinite scroll requests get the table rows and the next trigger, without the layout"""
+        for i in range(9):
+            Project.objects.create(name=f"Bulk {i}", client=project.client)
+        url: str = reverse('projects:list')
+
+        full = client.get(url)
+        assert b'hx-trigger="revealed"' in full.content
+
+        rows = client.get(url, {'cursor': full.context['page_obj'].next_cursor}, HTTP_HX_REQUEST='true')
+
+        assert rows.status_code == 200
+        assert b'<html' not in rows.content
+        assert rows.content.lstrip().startswith(b'<tr')
+        assert len(rows.context['projects']) == 2
+        assert b'hx-trigger="revealed"' not in rows.content
+
+    def test_overdue_total_without_count_query(self, client: DjangoTestClient, project: Project) -> None:
+        """The overdue total comes from the counters, not from COUNT(*) over tasks"""
+        yesterday = timezone.now().date() - timedelta(days=1)
+        for i in range(3):
+            Task.objects.create(project=project, title=f"Late {i}", deadline=yesterday)
+
+        response = client.get(reverse('projects:overdue_tasks'))
+
+        assert response.context['total_overdue'] == 3
+        assert len(response.context['page_obj']) == 3
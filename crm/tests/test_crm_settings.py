@@ -1,3 +1,4 @@
+import os
 import pytest
 from django.conf import settings
 from typing import List, Dict, Any, Final
@@ -21,11 +22,12 @@ class TestProjectSettings:
         assert settings.LANGUAGE_CODE == 'ru-ru'
 
     def test_database_is_sqlite_in_tests(self) -> None:
-        """Verify that a fast in-memory SQLite database is used for testing"""
+        """Verify that a local SQLite file whose writers wait for each other is used for testing"""
         db_config: Dict[str, Any] = settings.DATABASES['default']
 
         assert db_config['ENGINE'] == 'django.db.backends.sqlite3'
-        assert 'memory' in db_config['NAME']
+        assert db_config['TEST']['NAME'] == os.path.join(settings.TEST_TMP_DIR, 'freelance_crm_test.sqlite3')
+        assert db_config['OPTIONS'] == {'transaction_mode': 'IMMEDIATE', 'timeout': 20}
 
     def test_celery_schedule_exists(self) -> None:
         """Verify that notification tasks are registered within Celery Beat schedule"""
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .views import dashboard
+from .views import dashboard, export_csv
 from django.views.generic.base import RedirectView
 from django.contrib.staticfiles.storage import staticfiles_storage
 from django.urls import path, include
@@ -7,9 +7,11 @@ from django.urls import path, include
 urlpatterns = [
     path('', dashboard, name='dashboard'),
     path('admin/', admin.site.urls),
+    path('export/<slug:name>.csv', export_csv, name='export_csv'),
     path('projects/', include('projects.urls')),
     path('clients/', include('clients.urls')),
     path('tasks/', include('tasks.urls')),
     path('invoices/', include('invoices.urls')),
+    path('search/', include('search.urls')),
     path('favicon.ico', RedirectView.as_view(url=staticfiles_storage.url('favicon.ico'))),
 ]
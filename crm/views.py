@@ -1,13 +1,10 @@
 from django.shortcuts import render
-from django.utils import timezone
-from django.http import HttpRequest, HttpResponse
+from django.http import Http404, HttpRequest, HttpResponse, HttpResponseBadRequest, StreamingHttpResponse
 from django.template.response import TemplateResponse
-from django.db.models import QuerySet
 from typing import Union, Any, Dict
 
-from clients.models import Client
-from projects.models import Project
-from tasks.models import Task
+from crm.csv_export import EXPORTS, stream_csv
+from crm.dashboard import dashboard_stats
 
 # Type alias for the view response
 ViewResponse = Union[HttpResponse, TemplateResponse]
@@ -16,32 +13,30 @@ ViewResponse = Union[HttpResponse, TemplateResponse]
 def dashboard(request: HttpRequest) -> ViewResponse:
     """
     Main dashboard view calculating project and task statistics.
+
+    The counters come from `crm.dashboard.dashboard_stats`, which reads the
+    materialized dashboard counters and caches the snapshot briefly.
+    """
+    context: Dict[str, Any] = dict(dashboard_stats())
+
+    return render(request, 'dashboard.html', context)
+
+
+def export_csv(request: HttpRequest, name: str) -> HttpResponse:
+    """
+    Stream clients, projects, tasks or invoices as a CSV download.
+
+    Rows are written as they are read from the database, so the download
+    starts at once and memory use stays flat for any table size. Projects,
+    tasks and invoices can be narrowed with `?status=<code>`.
     """
-    client_count: int = Client.objects.count()
-
-    # Define active projects by excluding 'canceled' status
-    active_projects: QuerySet[Project] = Project.objects.exclude(status='canceled')
-
-    # Project statistics
-    project_total: int = active_projects.count()
-    project_new: int = active_projects.filter(status='new').count()
-    project_in_progress: int = active_projects.filter(status='in_progress').count()
-    project_done: int = active_projects.filter(status='completed').count()
-
-    # Task statistics: filter for incomplete tasks with past deadlines
-    overdue_tasks_count: int = Task.objects.filter(
-        status__in=['todo', 'in_progress'],
-        deadline__lt=timezone.now().date()
-    ).count()
-
-    # Construct context dictionary with explicit typing
-    context: Dict[str, Any] = {
-        'client_count': client_count,
-        'project_total': project_total,
-        'project_new': project_new,
-        'project_in_progress': project_in_progress,
-        'project_done': project_done,
-        'overdue_tasks': overdue_tasks_count,
-    }
-
-    return render(request, 'dashboard.html', context)
\ No newline at end of file
+    if name not in EXPORTS:
+        raise Http404("Нет такого экспорта")
+    try:
+        chunks = stream_csv(name, status=request.GET.get('status') or None)
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+
+    response: StreamingHttpResponse = StreamingHttpResponse(chunks, content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{name}.csv"'
+    return response
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'crm.settings')
 
 application = get_wsgi_application()
+
+# Start the PDF render workers with the web process, so the first invoice does not wait for WeasyPrint to load
+from invoices.pdf_engine import get_render_engine  # noqa: E402
+
+get_render_engine()
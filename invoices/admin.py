@@ -1,8 +1,19 @@
 from django.contrib import admin
-from .models import Invoice
+from .models import Invoice, InvoiceSequence, PaymentRequisites
 
 @admin.register(Invoice)
 class InvoiceAdmin(admin.ModelAdmin):
     list_display = ('number', 'project', 'amount', 'status', 'due_date')
     search_fields = ('number', 'project__name')
-    list_filter = ('status', 'due_date')
\ No newline at end of file
+    list_filter = ('status', 'due_date')
+
+@admin.register(PaymentRequisites)
+class PaymentRequisitesAdmin(admin.ModelAdmin):
+    list_display = ('name', 'inn', 'bank_name', 'account', 'is_default')
+    search_fields = ('name', 'full_name', 'inn')
+    list_filter = ('is_default',)
+
+@admin.register(InvoiceSequence)
+class InvoiceSequenceAdmin(admin.ModelAdmin):
+    list_display = ('prefix', 'year', 'last_number')
+    list_filter = ('prefix', 'year')
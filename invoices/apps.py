@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class InvoicesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'invoices'
+
+    def ready(self) -> None:
+        # Register PDF cache invalidation handlers
+        from . import signals  # noqa: F401
@@ -0,0 +1,187 @@
+import io
+import logging
+import threading
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Deque, Iterable, Iterator, List, Optional, Tuple, Union
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import QuerySet
+from django.template.loader import get_template
+
+from invoices.models import Invoice
+from invoices.pdf import render_invoice_pdf
+from invoices.pdf_cache import PDF_TEMPLATE_NAME, get_pdf_cache
+from invoices.pdf_engine import RendererSaturated, get_render_engine
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+_export_slots: Optional[threading.BoundedSemaphore] = None
+_export_slots_lock: threading.Lock = threading.Lock()
+
+
+def filter_invoices(
+        project_id: Optional[int] = None,
+        client_id: Optional[int] = None,
+        month: Optional[str] = None,
+) -> QuerySet[Invoice]:
+    """
+    Select invoices for a bulk export.
+
+    Args:
+        project_id: Limit to one project.
+        client_id: Limit to the projects of one client.
+        month: Issue month in `YYYY-MM` format.
+
+    Raises:
+        ValueError: If `month` is not a valid `YYYY-MM` string.
+    """
+    invoices: QuerySet[Invoice] = Invoice.objects.select_related('project__client').order_by('issue_date', 'id')
+
+    if project_id:
+        invoices = invoices.filter(project_id=project_id)
+    if client_id:
+        invoices = invoices.filter(project__client_id=client_id)
+    if month:
+        year_str, _, month_str = month.partition('-')
+        year, month_num = int(year_str), int(month_str)
+        if not 1 <= month_num <= 12:
+            raise ValueError(f"Invalid month: {month}")
+        invoices = invoices.filter(issue_date__year=year, issue_date__month=month_num)
+
+    return invoices
+
+
+def get_export_slots() -> threading.BoundedSemaphore:
+    """Return the process-wide semaphore of `INVOICE_PDF_EXPORT_SLOTS` render jobs shared by all exports."""
+    global _export_slots
+    with _export_slots_lock:
+        if _export_slots is None:
+            _export_slots = threading.BoundedSemaphore(max(settings.INVOICE_PDF_EXPORT_SLOTS, 1))
+        return _export_slots
+
+
+def _render_in_share(invoice: Invoice, template: object, deadline: float) -> bytes:
+    """Render one invoice once one of the exports' slots is free."""
+    slots: threading.BoundedSemaphore = get_export_slots()
+    if not slots.acquire(timeout=max(deadline - time.monotonic(), 0)):
+        raise RendererSaturated(get_render_engine().retry_after)
+    try:
+        return render_invoice_pdf(invoice, None, template)
+    finally:
+        slots.release()
+
+
+def _render_with_backoff(invoice: Invoice, template: object) -> bytes:
+    """
+    Render one invoice through the cache within the exports' share of the pool.
+
+    Exports hold at most `INVOICE_PDF_EXPORT_SLOTS` render jobs at a time,
+    so interactive renders keep the rest of the pool. While no slot is
+    free, or the pool is saturated anyway, the render is retried until
+    `INVOICE_PDF_RENDER_TIMEOUT` has passed.
+
+    Raises:
+        RendererSaturated: If the render could not start in time.
+    """
+    deadline: float = time.monotonic() + settings.INVOICE_PDF_RENDER_TIMEOUT
+    while True:
+        try:
+            return get_pdf_cache().get_or_render(invoice, lambda: _render_in_share(invoice, template, deadline))
+        except RendererSaturated as exc:
+            remaining: float = deadline - time.monotonic()
+            if remaining <= 0:
+                raise
+            time.sleep(min(exc.retry_after, 1, remaining))
+
+
+def _export_render(invoice: Invoice, template: object) -> Union[bytes, Exception]:
+    """Worker of `iter_invoice_pdfs`: the PDF, or the exception its render raised."""
+    try:
+        return _render_with_backoff(invoice, template)
+    except Exception as exc:
+        logger.exception("Export of invoice %s failed", invoice.number)
+        return exc
+    finally:
+        # The fingerprint may have queried the database from this pool thread
+        close_old_connections()
+
+
+def iter_invoice_pdfs(
+        invoices: Iterable[Invoice],
+        parallel: Optional[int] = None,
+) -> Iterator[Tuple[Invoice, Union[bytes, Exception]]]:
+    """
+    Render invoices in parallel and yield `(invoice, pdf_bytes)` in input order.
+
+    At most `parallel` renders are in flight, so memory stays flat no matter
+    how many invoices are exported. The template is loaded once per batch.
+    An invoice whose render failed is yielded with the exception instead of
+    its PDF, so one failure does not end the export.
+    """
+    parallel = parallel or max(settings.INVOICE_PDF_WORKERS, 1)
+    template = get_template(PDF_TEMPLATE_NAME)
+    pending: Deque[Tuple[Invoice, Future]] = deque()
+
+    with ThreadPoolExecutor(max_workers=parallel) as pool:
+        for invoice in invoices:
+            pending.append((invoice, pool.submit(_export_render, invoice, template)))
+            if len(pending) >= parallel:
+                done_invoice, future = pending.popleft()
+                yield done_invoice, future.result()
+
+        while pending:
+            done_invoice, future = pending.popleft()
+            yield done_invoice, future.result()
+
+
+class _ZipStreamBuffer(io.RawIOBase):
+    """Write-only, non-seekable sink that hands written bytes back to a generator."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._position: int = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        """Return and forget everything written since the previous call."""
+        data: bytes = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_invoices_zip(invoices: Iterable[Invoice], parallel: Optional[int] = None) -> Iterator[bytes]:
+    """
+    Yield a ZIP archive of invoice PDFs chunk by chunk.
+
+    Each PDF is written to the archive and flushed to the consumer as soon as
+    it is rendered; only the small central directory is kept until the end.
+    The response is already under way when a render fails, so the invoice
+    gets an `invoice_<number>.error.txt` entry with the reason instead, and
+    the archive is still complete.
+    """
+    buffer: _ZipStreamBuffer = _ZipStreamBuffer()
+
+    with zipfile.ZipFile(buffer, mode='w', compression=zipfile.ZIP_STORED) as archive:
+        for invoice, rendered in iter_invoice_pdfs(invoices, parallel):
+            if isinstance(rendered, Exception):
+                archive.writestr(f"invoice_{invoice.number}.error.txt", f"Не удалось сформировать PDF: {rendered}")
+            else:
+                archive.writestr(f"invoice_{invoice.number}.pdf", rendered)
+            yield buffer.drain()
+
+    yield buffer.drain()
@@ -0,0 +1,43 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from invoices.export import filter_invoices, stream_invoices_zip
+
+
+class Command(BaseCommand):
+    """
+        Export invoice PDFs into a ZIP archive.
+
+        Example:
+            python manage.py export_invoices --month 2026-03 --output march.zip
+    """
+    help = "Render invoice PDFs in parallel and write them into a ZIP archive"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--project', type=int, help="Project ID")
+        parser.add_argument('--client', type=int, help="Client ID")
+        parser.add_argument('--month', help="Issue month in YYYY-MM format")
+        parser.add_argument('--parallel', type=int, help="Number of PDFs rendered at once")
+        parser.add_argument('--output', default='invoices.zip', help="Path of the resulting archive")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        try:
+            invoices = filter_invoices(
+                project_id=options['project'],
+                client_id=options['client'],
+                month=options['month'],
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        total: int = invoices.count()
+        written: int = 0
+        with open(options['output'], 'wb') as archive:
+            for chunk in stream_invoices_zip(invoices.iterator(chunk_size=200), options['parallel']):
+                archive.write(chunk)
+                written += len(chunk)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Exported {total} invoices to {options['output']} ({written} bytes)"
+        ))
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.10 on 2026-10-18 18:29
+
+from django.db import migrations, models
+
+
+def create_default_requisites(apps, schema_editor):
+    """Move the requisites previously hard-coded in the PDF view into the database."""
+    PaymentRequisites = apps.get_model('invoices', 'PaymentRequisites')
+    PaymentRequisites.objects.create(
+        name='ИП Иванов И.И.',
+        full_name='ИП Иванов Иван Иванович',
+        inn='123456789012',
+        account='40802810400000001234',
+        bank_name='Сбербанк',
+        bik='044525974',
+        correspondent_account='30101810145250000974',
+        sbp_phone='+7 (999) 123-45-67',
+        signer='Иванов И.И. / ИП',
+        is_default=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('invoices', '0003_remove_invoice_pdf_file_invoice_updated_at_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PaymentRequisites',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, verbose_name='Краткое наименование')),
+                ('full_name', models.CharField(max_length=255, verbose_name='Полное наименование')),
+                ('inn', models.CharField(max_length=12, verbose_name='ИНН')),
+                ('account', models.CharField(max_length=20, verbose_name='Расчётный счёт')),
+                ('bank_name', models.CharField(max_length=255, verbose_name='Банк')),
+                ('bik', models.CharField(blank=True, max_length=9, verbose_name='БИК')),
+                ('correspondent_account', models.CharField(blank=True, max_length=20, verbose_name='Корр. счёт')),
+                ('sbp_phone', models.CharField(blank=True, max_length=30, verbose_name='Телефон СБП')),
+                ('signer', models.CharField(blank=True, max_length=255, verbose_name='Подпись')),
+                ('is_default', models.BooleanField(default=False, verbose_name='По умолчанию')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Реквизиты исполнителя',
+                'verbose_name_plural': 'Реквизиты исполнителей',
+                'ordering': ['-is_default', 'name'],
+            },
+        ),
+        migrations.AlterModelOptions(
+            name='invoice',
+            options={'ordering': ['-created_at', '-id'], 'verbose_name': 'Счёт', 'verbose_name_plural': 'Счета'},
+        ),
+        migrations.RunPython(create_default_requisites, migrations.RunPython.noop),
+    ]
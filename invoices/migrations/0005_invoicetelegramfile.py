@@ -0,0 +1,29 @@
+# Generated by Django 5.2.10 on 2026-10-18 18:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('invoices', '0004_paymentrequisites'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InvoiceTelegramFile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fingerprint', models.CharField(max_length=64, verbose_name='Отпечаток PDF')),
+                ('file_id', models.CharField(max_length=255, verbose_name='Telegram file_id')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('invoice', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='telegram_files', to='invoices.invoice', verbose_name='Счёт')),
+            ],
+            options={
+                'verbose_name': 'Файл счёта в Telegram',
+                'verbose_name_plural': 'Файлы счетов в Telegram',
+                'constraints': [models.UniqueConstraint(fields=('invoice', 'fingerprint'), name='unique_invoice_telegram_file')],
+            },
+        ),
+    ]
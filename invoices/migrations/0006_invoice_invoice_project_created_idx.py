@@ -0,0 +1,18 @@
+# Generated by Django 5.2.10 on 2026-10-18 18:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('invoices', '0005_invoicetelegramfile'),
+        ('projects', '0002_alter_project_client'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(fields=['project', 'created_at'], name='invoice_project_created_idx'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.10 on 2026-10-18 19:08
+
+import re
+
+from django.db import migrations, models
+
+NUMBER_RE = re.compile(r'^(?P<prefix>[A-Za-z]+)-(?P<year>\d{4})-(?P<number>\d+)$')
+
+
+def seed_sequences(apps, schema_editor):
+    """Continue every existing `PREFIX-YEAR-N` series after its highest number."""
+    Invoice = apps.get_model('invoices', 'Invoice')
+    InvoiceSequence = apps.get_model('invoices', 'InvoiceSequence')
+
+    last = {}
+    for number in Invoice.objects.values_list('number', flat=True).iterator():
+        match = NUMBER_RE.match(number)
+        if match:
+            key = (match['prefix'], int(match['year']))
+            last[key] = max(last.get(key, 0), int(match['number']))
+
+    InvoiceSequence.objects.bulk_create([
+        InvoiceSequence(prefix=prefix, year=year, last_number=value) for (prefix, year), value in last.items()
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('invoices', '0006_invoice_invoice_project_created_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InvoiceSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('prefix', models.CharField(max_length=20, verbose_name='Серия')),
+                ('year', models.PositiveSmallIntegerField(verbose_name='Год')),
+                ('last_number', models.PositiveIntegerField(default=0, verbose_name='Последний номер')),
+            ],
+            options={
+                'verbose_name': 'Нумерация счетов',
+                'verbose_name_plural': 'Нумерация счетов',
+                'constraints': [models.UniqueConstraint(fields=('prefix', 'year'), name='unique_invoice_sequence')],
+            },
+        ),
+        migrations.RunPython(seed_sequences, migrations.RunPython.noop),
+    ]
@@ -41,7 +41,112 @@ class Invoice(models.Model):
         verbose_name = "Счёт"
         verbose_name_plural = "Счета"
         ordering = ['-created_at', '-id']
+        indexes = [
+            models.Index(fields=['project', 'created_at'], name='invoice_project_created_idx'),
+        ]
 
     def __str__(self) -> str:
         """Return a formatted string representation of the invoice"""
-        return f"Счёт {self.number} — {self.project.name}"
\ No newline at end of file
+        return f"Счёт {self.number} — {self.project.name}"
+
+class PaymentRequisites(models.Model):
+    """
+        Legal entity issuing invoices and its bank details.
+
+        Requisites are printed on the invoice PDF and encoded into the payment
+        QR code (ST00012). A client may be bound to specific requisites;
+        otherwise the default entry is used.
+
+        Attributes:
+            name: Short payee name used in the QR code (e.g. "ИП Иванов И.И.").
+            full_name: Full legal name of the payee.
+            inn: Taxpayer identification number of the payee.
+            account: Settlement account number.
+            bank_name: Name of the bank.
+            bik: Bank identification code.
+            correspondent_account: Correspondent account of the bank.
+            sbp_phone: Phone number for fast payments (SBP).
+            signer: Signature line printed at the bottom of the invoice.
+            is_default: Whether these requisites apply to clients without their own.
+    """
+    name = models.CharField(max_length=255, verbose_name="Краткое наименование")
+    full_name = models.CharField(max_length=255, verbose_name="Полное наименование")
+    inn = models.CharField(max_length=12, verbose_name="ИНН")
+    account = models.CharField(max_length=20, verbose_name="Расчётный счёт")
+    bank_name = models.CharField(max_length=255, verbose_name="Банк")
+    bik = models.CharField(max_length=9, blank=True, verbose_name="БИК")
+    correspondent_account = models.CharField(max_length=20, blank=True, verbose_name="Корр. счёт")
+    sbp_phone = models.CharField(max_length=30, blank=True, verbose_name="Телефон СБП")
+    signer = models.CharField(max_length=255, blank=True, verbose_name="Подпись")
+    is_default = models.BooleanField(default=False, verbose_name="По умолчанию")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Реквизиты исполнителя"
+        verbose_name_plural = "Реквизиты исполнителей"
+        ordering = ['-is_default', 'name']
+
+    def __str__(self) -> str:
+        """Return the short payee name"""
+        return str(self.name)
+
+
+class InvoiceTelegramFile(models.Model):
+    """
+        Telegram `file_id` of an uploaded invoice PDF.
+
+        Telegram keeps uploaded documents and lets them be sent again by
+        `file_id`. The id is stored together with the content fingerprint of
+        the PDF, so an invoice is uploaded again only after its document changed.
+
+        Attributes:
+            invoice: The invoice the document belongs to.
+            fingerprint: Content fingerprint of the PDF (see `invoices.pdf_cache.invoice_fingerprint`).
+            file_id: Identifier returned by Telegram after the upload.
+            created_at: When the document was uploaded.
+    """
+    invoice = models.ForeignKey(Invoice, on_delete=models.CASCADE, related_name='telegram_files', verbose_name="Счёт")
+    fingerprint = models.CharField(max_length=64, verbose_name="Отпечаток PDF")
+    file_id = models.CharField(max_length=255, verbose_name="Telegram file_id")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Файл счёта в Telegram"
+        verbose_name_plural = "Файлы счетов в Telegram"
+        constraints = [
+            models.UniqueConstraint(fields=['invoice', 'fingerprint'], name='unique_invoice_telegram_file'),
+        ]
+
+    def __str__(self) -> str:
+        """Return the invoice number and file id"""
+        return f"{self.invoice.number}: {self.file_id}"
+
+
+class InvoiceSequence(models.Model):
+    """
+        Counter of issued invoice numbers per series and year.
+
+        Each series (`prefix`) restarts from 1 every year. The row is bumped
+        atomically by `invoices.numbering.allocate_number` in the same
+        transaction that saves the invoice, so concurrent creators never get
+        the same number and a rolled-back invoice gives its number back.
+
+        Attributes:
+            prefix: Series of the numbers (e.g. "INV"), one per issuer.
+            year: Calendar year of the series.
+            last_number: Last number handed out in this series and year.
+    """
+    prefix = models.CharField(max_length=20, verbose_name="Серия")
+    year = models.PositiveSmallIntegerField(verbose_name="Год")
+    last_number = models.PositiveIntegerField(default=0, verbose_name="Последний номер")
+
+    class Meta:
+        verbose_name = "Нумерация счетов"
+        verbose_name_plural = "Нумерация счетов"
+        constraints = [
+            models.UniqueConstraint(fields=['prefix', 'year'], name='unique_invoice_sequence'),
+        ]
+
+    def __str__(self) -> str:
+        """Return the series, year and last number"""
+        return f"{self.prefix}-{self.year}: {self.last_number}"
@@ -0,0 +1,62 @@
+from typing import Optional
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import InvoiceSequence
+
+DEFAULT_PREFIX: str = 'INV'
+
+# Backends with `INSERT ... ON CONFLICT DO UPDATE ... RETURNING` (SQLite 3.35+, PostgreSQL)
+UPSERT_VENDORS = ('sqlite', 'postgresql')
+
+
+def _allocate_upsert(prefix: str, year: int) -> int:
+    """Create or bump the counter row and read the new value in one statement."""
+    table: str = connection.ops.quote_name(InvoiceSequence._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} (prefix, year, last_number) VALUES (%s, %s, 1) "
+            f"ON CONFLICT (prefix, year) DO UPDATE SET last_number = {table}.last_number + 1 "
+            f"RETURNING last_number",
+            [prefix, year],
+        )
+        return cursor.fetchone()[0]
+
+
+def _allocate_locked(prefix: str, year: int) -> int:
+    """Portable fallback: lock the counter row with `SELECT ... FOR UPDATE`."""
+    with transaction.atomic():
+        sequence, _ = InvoiceSequence.objects.select_for_update().get_or_create(prefix=prefix, year=year)
+        sequence.last_number += 1
+        sequence.save(update_fields=['last_number'])
+        return sequence.last_number
+
+
+def allocate_number(prefix: str = DEFAULT_PREFIX, year: Optional[int] = None) -> int:
+    """
+    Hand out the next number of a series for the given year (the current one by default).
+
+    The counter row is created on the first invoice of a year, so numbering
+    restarts from 1 on rollover. The upsert runs in one round-trip and holds
+    the row lock until the caller's transaction ends: call it inside the
+    transaction that saves the invoice, so a failed save returns the number.
+
+    Returns:
+        int: The allocated number, unique within the series and year.
+    """
+    year = year or timezone.localdate().year
+    if connection.vendor in UPSERT_VENDORS:
+        return _allocate_upsert(prefix, year)
+    return _allocate_locked(prefix, year)
+
+
+def format_invoice_number(number: int, prefix: str = DEFAULT_PREFIX, year: Optional[int] = None) -> str:
+    """Render a number as `PREFIX-YEAR-NNN` (e.g. INV-2026-001)."""
+    return f"{prefix}-{year or timezone.localdate().year}-{number:03d}"
+
+
+def next_invoice_number(prefix: str = DEFAULT_PREFIX, year: Optional[int] = None) -> str:
+    """Allocate and format the next invoice number."""
+    year = year or timezone.localdate().year
+    return format_invoice_number(allocate_number(prefix, year), prefix, year)
@@ -0,0 +1,152 @@
+import base64
+import os
+import threading
+import time
+from collections import Counter
+from functools import lru_cache
+from io import BytesIO
+from typing import Any, Dict, Optional, Tuple
+
+import qrcode
+import qrcode.image.svg
+from django.conf import settings
+from django.template.backends.django import Template
+from django.template.loader import get_template
+from django.utils import timezone
+
+from invoices.models import Invoice
+from invoices.pdf_cache import PDF_TEMPLATE_NAME, default_logo_path
+from invoices.pdf_engine import get_render_engine
+from invoices.requisites import CompiledRequisites, requisites_registry
+
+# Counters of the asset memoization layer (loads, hits and time spent building)
+asset_stats: Counter = Counter()
+_logo_lock: threading.Lock = threading.Lock()
+_logo_cache: Dict[str, Tuple[float, str]] = {}
+
+
+def load_logo_base64(path: Optional[str] = None) -> str:
+    """
+    Return the base64-encoded logo, reading the file only when it changed.
+
+    The encoded value is kept per process and refreshed when the file mtime
+    changes; a missing file yields an empty string.
+    """
+    path = path or default_logo_path()
+    try:
+        mtime: float = os.stat(path).st_mtime
+    except FileNotFoundError:
+        return ""
+
+    cached: Optional[Tuple[float, str]] = _logo_cache.get(path)
+    if cached and cached[0] == mtime:
+        asset_stats['logo_hits'] += 1
+        return cached[1]
+
+    with _logo_lock:
+        started: float = time.perf_counter()
+        with open(path, "rb") as image_file:
+            encoded: str = base64.b64encode(image_file.read()).decode('utf-8')
+        _logo_cache[path] = (mtime, encoded)
+        asset_stats['logo_loads'] += 1
+        asset_stats['logo_seconds'] += time.perf_counter() - started
+    return encoded
+
+
+@lru_cache(maxsize=settings.INVOICE_QR_CACHE_SIZE)
+def _build_qr(payload: str, image_format: str) -> Tuple[str, str]:
+    started: float = time.perf_counter()
+
+    if image_format == 'svg':
+        qr_engine: qrcode.QRCode = qrcode.QRCode(
+            version=1, box_size=10, border=5, image_factory=qrcode.image.svg.SvgPathImage
+        )
+        qr_engine.add_data(payload)
+        qr_engine.make(fit=True)
+        mime: str = 'image/svg+xml'
+        raw: bytes = qr_engine.make_image().to_string()
+    else:
+        qr_engine = qrcode.QRCode(version=1, box_size=10, border=5)
+        qr_engine.add_data(payload)
+        qr_engine.make(fit=True)
+
+        qr_img: Any = qr_engine.make_image(fill_color="black", back_color="white")
+        qr_buffer: BytesIO = BytesIO()
+        qr_img.save(qr_buffer, format="PNG")
+        mime = 'image/png'
+        raw = qr_buffer.getvalue()
+
+    asset_stats['qr_seconds'] += time.perf_counter() - started
+    return mime, base64.b64encode(raw).decode('utf-8')
+
+
+def qr_code_image(payload: str, image_format: Optional[str] = None) -> Tuple[str, str]:
+    """
+    Return `(mime_type, base64_data)` of the payment QR code for a payload.
+
+    Images are memoized by payload in a bounded LRU, so invoices with the
+    same amount and requisites reuse one image. `image_format` is `png`
+    (default) or `svg`, which skips PIL encoding entirely.
+    """
+    return _build_qr(payload, image_format or settings.INVOICE_QR_FORMAT)
+
+
+def asset_cache_stats() -> Dict[str, float]:
+    """
+    Report hit/miss counters and the estimated time saved per PDF.
+
+    Savings are estimated as the average cost of a miss multiplied by the
+    number of hits.
+    """
+    qr_info = _build_qr.cache_info()
+    logo_loads: int = asset_stats['logo_loads']
+    avg_logo: float = asset_stats['logo_seconds'] / logo_loads if logo_loads else 0.0
+    avg_qr: float = asset_stats['qr_seconds'] / qr_info.misses if qr_info.misses else 0.0
+    saved: float = asset_stats['logo_hits'] * avg_logo + qr_info.hits * avg_qr
+    renders: int = logo_loads + asset_stats['logo_hits']
+
+    return {
+        'logo_hits': asset_stats['logo_hits'],
+        'logo_loads': logo_loads,
+        'qr_hits': qr_info.hits,
+        'qr_misses': qr_info.misses,
+        'qr_cached': qr_info.currsize,
+        'saved_seconds_total': saved,
+        'saved_ms_per_pdf': saved / renders * 1000 if renders else 0.0,
+    }
+
+
+def render_invoice_html(invoice: Invoice, template: Optional[Template] = None) -> str:
+    """
+    Render the invoice HTML with the memoized logo and payment QR code.
+
+    Args:
+        invoice: Invoice to render (project and client should be preloaded).
+        template: Already loaded template, reused across a batch of invoices.
+    """
+    # Payee details and QR code payload for payment
+    requisites: CompiledRequisites = requisites_registry.for_client(invoice.project.client)
+    qr_data: str = requisites.qr_payload(invoice.amount)
+    qr_code_mime, qr_code_base64 = qr_code_image(qr_data) if qr_data else ('', '')
+
+    template = template or get_template(PDF_TEMPLATE_NAME)
+    return template.render({
+        'invoice': invoice,
+        'now': timezone.now(),
+        'requisites': requisites,
+        'logo_base64': load_logo_base64(),
+        'qr_code_mime': qr_code_mime,
+        'qr_code_base64': qr_code_base64,
+    })
+
+
+def render_invoice_pdf(invoice: Invoice, base_url: Optional[str], template: Optional[Template] = None) -> bytes:
+    """
+    Render the invoice template and convert it to PDF via the render engine.
+
+    Raises:
+        RendererSaturated: If the render pool has no free queue slots.
+        RenderTimeout: If WeasyPrint did not finish in time.
+    """
+    html_string: str = render_invoice_html(invoice, template)
+    return get_render_engine().render(html_string, base_url)
@@ -0,0 +1,204 @@
+import hashlib
+import os
+import tempfile
+import threading
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.template.loader import get_template
+
+from invoices.models import Invoice
+from invoices.requisites import requisites_registry
+
+PDF_TEMPLATE_NAME: str = 'invoices/pdf_invoice.html'
+
+
+@lru_cache(maxsize=None)
+def template_version(template_name: str = PDF_TEMPLATE_NAME) -> str:
+    """
+    Return a short hash of the PDF template source.
+
+    Editing the template produces a new version and therefore new cache keys.
+    The value is computed once per process.
+    """
+    origin_name: str = get_template(template_name).origin.name
+    with open(origin_name, 'rb') as template_file:
+        return hashlib.sha256(template_file.read()).hexdigest()[:16]
+
+
+def default_logo_path() -> str:
+    """Return the path of the logo embedded into invoice PDFs."""
+    return os.path.join(settings.BASE_DIR, 'static', 'logo.png')
+
+
+def logo_version(path: Optional[str] = None) -> str:
+    """Return the mtime of the logo file ('' without one), which `invoices.pdf` refreshes its copy on."""
+    try:
+        return str(os.stat(path or default_logo_path()).st_mtime)
+    except FileNotFoundError:
+        return ''
+
+
+def invoice_fingerprint(invoice: Invoice) -> str:
+    """
+    Build a content fingerprint of everything that ends up in the invoice PDF.
+
+    The fingerprint covers the invoice fields (including `updated_at`),
+    the project and client fields shown in the document, the payee
+    requisites, the logo file and the template version, so any change to
+    them yields a different cache key.
+
+    Returns:
+        str: Hex SHA-256 digest.
+    """
+    project = invoice.project
+    client = project.client
+    parts: List[str] = [
+        template_version(),
+        logo_version(),
+        settings.INVOICE_QR_FORMAT,
+        str(invoice.pk),
+        invoice.number,
+        str(invoice.amount),
+        str(invoice.issue_date),
+        str(invoice.due_date),
+        invoice.status,
+        invoice.updated_at.isoformat() if invoice.updated_at else '',
+        str(project.pk),
+        project.name,
+        str(client.pk),
+        client.name,
+        requisites_registry.for_client(client).version,
+    ]
+    return hashlib.sha256('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+
+class InvoicePdfCache:
+    """
+        Size-bounded on-disk cache of rendered invoice PDFs.
+
+        Files are stored as `<invoice_id>-<fingerprint>.pdf`, so all versions
+        of one invoice can be purged with a single glob. A hit refreshes the
+        file mtime, and eviction removes the least recently used files once
+        the directory grows beyond `max_bytes`.
+
+        Attributes:
+            directory: Folder holding the cached PDF files.
+            max_bytes: Upper bound for the total size of cached files.
+            stats: Hit / miss / store / eviction / invalidation counters.
+    """
+
+    def __init__(self, directory: str, max_bytes: int) -> None:
+        self.directory: Path = Path(directory)
+        self.max_bytes: int = max_bytes
+        self.stats: Counter = Counter()
+        self._lock: threading.Lock = threading.Lock()
+
+    def _path(self, invoice_id: int, fingerprint: str) -> Path:
+        return self.directory / f"{invoice_id}-{fingerprint}.pdf"
+
+    def get(self, invoice_id: int, fingerprint: str) -> Optional[bytes]:
+        """Return cached PDF bytes or None, updating the hit/miss counters."""
+        path: Path = self._path(invoice_id, fingerprint)
+        try:
+            content: bytes = path.read_bytes()
+        except FileNotFoundError:
+            self.stats['misses'] += 1
+            return None
+
+        # Mark as recently used for LRU eviction
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        self.stats['hits'] += 1
+        return content
+
+    def put(self, invoice_id: int, fingerprint: str, content: bytes) -> None:
+        """Store PDF bytes atomically and evict old entries if over budget."""
+        if len(content) > self.max_bytes:
+            return
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        # Older versions of the same invoice can never be requested again
+        self.invalidate(invoice_id, count=False)
+
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as tmp_file:
+            tmp_file.write(content)
+        os.replace(tmp_name, self._path(invoice_id, fingerprint))
+        self.stats['stores'] += 1
+
+        self._evict()
+
+    def get_or_render(self, invoice: Invoice, render: Callable[[], bytes]) -> bytes:
+        """Return cached bytes for the invoice or render, store and return them."""
+        fingerprint: str = invoice_fingerprint(invoice)
+        cached: Optional[bytes] = self.get(invoice.pk, fingerprint)
+        if cached is not None:
+            return cached
+
+        content: bytes = render()
+        self.put(invoice.pk, fingerprint, content)
+        return content
+
+    def invalidate(self, invoice_id: int, count: bool = True) -> None:
+        """Remove every cached version of the given invoice."""
+        for path in self.directory.glob(f"{invoice_id}-*.pdf"):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                continue
+            if count:
+                self.stats['invalidations'] += 1
+
+    def _evict(self) -> None:
+        """Delete least recently used files until the size budget is met."""
+        with self._lock:
+            entries: List[Tuple[float, int, Path]] = []
+            total: int = 0
+            for path in self.directory.glob('*.pdf'):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+            if total <= self.max_bytes:
+                return
+
+            for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+                total -= size
+                self.stats['evictions'] += 1
+                if total <= self.max_bytes:
+                    break
+
+    def snapshot(self) -> Dict[str, int]:
+        """Return a copy of the counters with all keys present."""
+        return {
+            key: self.stats[key]
+            for key in ('hits', 'misses', 'stores', 'evictions', 'invalidations')
+        }
+
+
+_cache: Optional[InvoicePdfCache] = None
+
+
+def get_pdf_cache() -> InvoicePdfCache:
+    """Return the process-wide cache configured from Django settings."""
+    global _cache
+    directory: str = str(settings.INVOICE_PDF_CACHE_DIR)
+    max_bytes: int = settings.INVOICE_PDF_CACHE_MAX_BYTES
+
+    if _cache is None or str(_cache.directory) != directory or _cache.max_bytes != max_bytes:
+        _cache = InvoicePdfCache(directory, max_bytes)
+    return _cache
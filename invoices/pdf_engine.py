@@ -0,0 +1,158 @@
+import atexit
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Callable, Optional
+
+from django.conf import settings
+
+# Type alias for the function executed inside a worker process
+RenderFunc = Callable[[str, Optional[str]], bytes]
+
+# Markup rendered once per worker so WeasyPrint loads fonts and caches before the first job
+WARMUP_HTML: str = (
+    '<html><body style="font-family: Arial, Helvetica, sans-serif">'
+    '<h1>Счёт</h1><table><tr><td>warmup</td></tr></table></body></html>'
+)
+
+
+class RendererSaturated(Exception):
+    """Raised when the render queue is full and the job was not accepted."""
+
+    def __init__(self, retry_after: int) -> None:
+        super().__init__(f"PDF renderer is saturated, retry in {retry_after}s")
+        self.retry_after: int = retry_after
+
+
+class RenderTimeout(Exception):
+    """Raised when a render job does not finish within the configured timeout."""
+
+
+def render_html(html_string: str, base_url: Optional[str]) -> bytes:
+    """Convert an HTML document into PDF bytes with WeasyPrint."""
+    from weasyprint import HTML
+
+    return HTML(string=html_string, base_url=base_url).write_pdf()
+
+
+def _warm_worker() -> None:
+    """Process initializer: import WeasyPrint and render a small document."""
+    render_html(WARMUP_HTML, None)
+
+
+def _noop() -> None:
+    """Job submitted once per worker at startup, so the pool starts (and warms up) every worker at once."""
+
+
+class PdfRenderEngine:
+    """
+        Pool of pre-warmed worker processes that turn HTML into PDF.
+
+        Django renders the invoice template in the calling process (using the
+        cached template loader), and only the expensive WeasyPrint layout runs
+        in the pool. The number of accepted but unfinished jobs is limited to
+        `workers + queue_depth`; further submissions fail fast with
+        `RendererSaturated` instead of piling up behind the pool.
+
+        The pool is started when the engine is created: `ProcessPoolExecutor`
+        spawns workers only for submitted jobs, so one no-op job per worker
+        starts all of them, and each imports WeasyPrint and renders `warmup`
+        in the background before the first real render arrives.
+
+        Attributes:
+            workers: Number of worker processes (0 renders inline in the caller).
+            queue_depth: Jobs allowed to wait in addition to the running ones.
+            timeout: Seconds to wait for a single job result.
+    """
+
+    def __init__(
+            self,
+            workers: int,
+            queue_depth: int,
+            timeout: float,
+            render_func: RenderFunc = render_html,
+            prewarm: bool = True,
+            warmup: Callable[[], None] = _warm_worker,
+    ) -> None:
+        self.workers: int = workers
+        self.queue_depth: int = queue_depth
+        self.timeout: float = timeout
+        self._render_func: RenderFunc = render_func
+        self._warmup: Optional[Callable[[], None]] = warmup if prewarm else None
+        self._slots: threading.BoundedSemaphore = threading.BoundedSemaphore(max(workers + queue_depth, 1))
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock: threading.Lock = threading.Lock()
+        if workers > 0:
+            self._get_executor()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=self._warmup,
+                )
+                if self._warmup is not None:
+                    for _ in range(self.workers):
+                        self._executor.submit(_noop)
+            return self._executor
+
+    @property
+    def retry_after(self) -> int:
+        """Rough number of seconds until a slot frees up."""
+        return max(1, int(self.timeout // max(self.workers, 1)))
+
+    def render(self, html_string: str, base_url: Optional[str] = None) -> bytes:
+        """
+        Render HTML to PDF, in the pool when workers are configured.
+
+        Raises:
+            RendererSaturated: If the queue is full.
+            RenderTimeout: If the job did not finish in time.
+        """
+        if self.workers <= 0:
+            return self._render_func(html_string, base_url)
+
+        if not self._slots.acquire(blocking=False):
+            raise RendererSaturated(self.retry_after)
+
+        try:
+            future: Future = self._get_executor().submit(self._render_func, html_string, base_url)
+        except Exception:
+            self._slots.release()
+            raise
+
+        # The slot is held until the worker is done, even if the caller gave up waiting
+        future.add_done_callback(lambda _: self._slots.release())
+
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise RenderTimeout(f"PDF rendering exceeded {self.timeout}s")
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+_engine: Optional[PdfRenderEngine] = None
+_engine_lock: threading.Lock = threading.Lock()
+
+
+def get_render_engine() -> PdfRenderEngine:
+    """Return the process-wide render engine configured from Django settings."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = PdfRenderEngine(
+                workers=settings.INVOICE_PDF_WORKERS,
+                queue_depth=settings.INVOICE_PDF_QUEUE_DEPTH,
+                timeout=settings.INVOICE_PDF_RENDER_TIMEOUT,
+            )
+            atexit.register(_engine.shutdown)
+        return _engine
@@ -0,0 +1,145 @@
+import threading
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, Optional
+
+from django.core.cache import BaseCache, cache as default_cache
+
+from clients.models import Client
+from invoices.models import PaymentRequisites
+
+# Shared cache key bumped whenever requisites change, so every process reloads
+REQUISITES_VERSION_KEY: str = 'invoices:requisites:version'
+
+
+def _qr_value(value: str) -> str:
+    """Strip characters that would break the ST00012 field separator."""
+    return value.replace('|', ' ').strip()
+
+
+@dataclass(frozen=True)
+class CompiledRequisites:
+    """
+        Immutable snapshot of payment requisites with a precompiled QR template.
+
+        Attributes:
+            pk: Primary key of the source row (None for the empty fallback).
+            version: Changes whenever the row is edited; part of the PDF fingerprint.
+            qr_prefix: ST00012 payload up to the `Sum=` field.
+    """
+    pk: Optional[int]
+    version: str
+    name: str
+    full_name: str
+    inn: str
+    account: str
+    bank_name: str
+    bik: str
+    correspondent_account: str
+    sbp_phone: str
+    signer: str
+    qr_prefix: str
+
+    @classmethod
+    def from_model(cls, requisites: PaymentRequisites) -> 'CompiledRequisites':
+        """Snapshot a model row and prebuild its QR payload prefix."""
+        fields: Dict[str, str] = {
+            'Name': requisites.name,
+            'PersonalAcc': requisites.account,
+            'BankName': requisites.bank_name,
+            'BIC': requisites.bik,
+            'CorrespAcc': requisites.correspondent_account,
+            'PayeeINN': requisites.inn,
+        }
+        qr_prefix: str = 'ST00012|' + ''.join(
+            f"{key}={_qr_value(value)}|" for key, value in fields.items() if value
+        )
+        return cls(
+            pk=requisites.pk,
+            version=f"{requisites.pk}:{requisites.updated_at.isoformat() if requisites.updated_at else ''}",
+            name=requisites.name,
+            full_name=requisites.full_name,
+            inn=requisites.inn,
+            account=requisites.account,
+            bank_name=requisites.bank_name,
+            bik=requisites.bik,
+            correspondent_account=requisites.correspondent_account,
+            sbp_phone=requisites.sbp_phone,
+            signer=requisites.signer,
+            qr_prefix=qr_prefix,
+        )
+
+    def qr_payload(self, amount: Decimal) -> str:
+        """Return the ST00012 payload for the given amount in rubles ('' without an account)."""
+        if not self.account:
+            return ''
+        return f"{self.qr_prefix}Sum={int(amount * 100)}"
+
+
+EMPTY_REQUISITES: CompiledRequisites = CompiledRequisites(
+    pk=None, version='', name='', full_name='', inn='', account='', bank_name='',
+    bik='', correspondent_account='', sbp_phone='', signer='', qr_prefix='',
+)
+
+
+class RequisitesRegistry:
+    """
+        Process-local registry of compiled payment requisites.
+
+        All requisites are loaded with one query and reused for every render.
+        Before each lookup the registry compares its loaded version with the
+        shared version key in Django's cache (no database access) and reloads
+        only after requisites were saved or deleted somewhere. The cache must
+        be shared by every process (`CACHE_URL`), or edits made in one never
+        reach the others.
+
+        Attributes:
+            cache: Holds the version key; Django's default cache when not given.
+    """
+
+    def __init__(self, cache: Optional[BaseCache] = None) -> None:
+        self.cache: BaseCache = cache if cache is not None else default_cache
+        self._by_id: Dict[int, CompiledRequisites] = {}
+        self._default: CompiledRequisites = EMPTY_REQUISITES
+        self._version: Optional[int] = None
+        self._lock: threading.Lock = threading.Lock()
+
+    def _ensure_loaded(self) -> None:
+        current: int = self.cache.get_or_set(REQUISITES_VERSION_KEY, 1, timeout=None)
+        if current == self._version:
+            return
+
+        with self._lock:
+            by_id: Dict[int, CompiledRequisites] = {}
+            default: CompiledRequisites = EMPTY_REQUISITES
+            for row in PaymentRequisites.objects.all():
+                compiled: CompiledRequisites = CompiledRequisites.from_model(row)
+                by_id[row.pk] = compiled
+                if row.is_default and default is EMPTY_REQUISITES:
+                    default = compiled
+
+            self._by_id = by_id
+            self._default = default
+            self._version = current
+
+    def get(self, requisites_id: Optional[int]) -> CompiledRequisites:
+        """Return requisites by id, falling back to the default entry."""
+        self._ensure_loaded()
+        if requisites_id is not None and requisites_id in self._by_id:
+            return self._by_id[requisites_id]
+        return self._default
+
+    def for_client(self, client: Client) -> CompiledRequisites:
+        """Return the requisites that bill the given client."""
+        return self.get(client.requisites_id)
+
+    def invalidate(self) -> None:
+        """Force every process to reload requisites on its next lookup."""
+        try:
+            self.cache.incr(REQUISITES_VERSION_KEY)
+        except ValueError:
+            self.cache.set(REQUISITES_VERSION_KEY, 1, timeout=None)
+        self._version = None
+
+
+requisites_registry: RequisitesRegistry = RequisitesRegistry()
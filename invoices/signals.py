@@ -0,0 +1,45 @@
+from typing import Any
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from clients.models import Client
+from projects.models import Project
+from .models import Invoice, PaymentRequisites
+from .pdf_cache import get_pdf_cache
+from .requisites import requisites_registry
+
+
+@receiver(post_save, sender=Invoice)
+@receiver(post_delete, sender=Invoice)
+def invalidate_invoice_pdf(sender: Any, instance: Invoice, **kwargs: Any) -> None:
+    """Drop cached PDFs of an invoice that was changed or deleted."""
+    get_pdf_cache().invalidate(instance.pk)
+
+
+@receiver(post_save, sender=Project)
+def invalidate_project_pdfs(sender: Any, instance: Project, created: bool, **kwargs: Any) -> None:
+    """Drop cached PDFs of every invoice belonging to the saved project."""
+    if created:
+        return
+    cache = get_pdf_cache()
+    for invoice_id in Invoice.objects.filter(project=instance).values_list('pk', flat=True):
+        cache.invalidate(invoice_id)
+
+
+@receiver(post_save, sender=Client)
+def invalidate_client_pdfs(sender: Any, instance: Client, created: bool, **kwargs: Any) -> None:
+    """Drop cached PDFs of every invoice issued to the saved client."""
+    if created:
+        return
+    cache = get_pdf_cache()
+    for invoice_id in Invoice.objects.filter(project__client=instance).values_list('pk', flat=True):
+        cache.invalidate(invoice_id)
+
+
+@receiver(post_save, sender=PaymentRequisites)
+@receiver(post_delete, sender=PaymentRequisites)
+def invalidate_requisites(sender: Any, instance: PaymentRequisites, **kwargs: Any) -> None:
+    """Reload the requisites registry in every process once the change is committed."""
+    transaction.on_commit(requisites_registry.invalidate)
@@ -0,0 +1,200 @@
+import io
+import threading
+import time
+import zipfile
+import pytest
+from datetime import date
+from pathlib import Path
+from typing import Any, List, Optional
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import Client as DjangoTestClient
+from django.urls import reverse
+
+from clients.models import Client
+from invoices.export import iter_invoice_pdfs
+from invoices.models import Invoice
+from invoices.pdf_engine import RendererSaturated
+from projects.models import Project
+
+
+def _fake_pdf(invoice: Invoice, base_url: Optional[str], template: Any = None) -> bytes:
+    """Stand-in for the renderer that tags the output with the invoice number"""
+    return f"%PDF-{invoice.number}".encode('utf-8')
+
+
+@pytest.fixture
+def invoices_batch(db: Any, project: Project) -> List[Invoice]:
+    """Three invoices: two for the fixture project in March, one for another client in April"""
+    other_client: Client = Client.objects.create(name="Other Client")
+    other_project: Project = Project.objects.create(name="Other Project", client=other_client)
+    return [
+        Invoice.objects.create(project=project, number="INV-2026-101", amount=100,
+                               issue_date=date(2026, 3, 1), due_date=date(2026, 3, 15)),
+        Invoice.objects.create(project=project, number="INV-2026-102", amount=200,
+                               issue_date=date(2026, 3, 20), due_date=date(2026, 4, 5)),
+        Invoice.objects.create(project=other_project, number="INV-2026-103", amount=300,
+                               issue_date=date(2026, 4, 2), due_date=date(2026, 4, 16)),
+    ]
+
+
+@pytest.mark.django_db
+@patch('invoices.export.render_invoice_pdf', side_effect=_fake_pdf)
+class TestInvoiceExport:
+    """Tests for the streamed ZIP export of invoice PDFs"""
+
+    def test_export_by_project(
+            self,
+            mock_render: Any,
+            settings: Any,
+            tmp_path: Path,
+            client: DjangoTestClient,
+            project: Project,
+            invoices_batch: List[Invoice]
+    ) -> None:
+        """Verify that the archive contains only the PDFs of the requested project"""
+        settings.INVOICE_PDF_CACHE_DIR = str(tmp_path)
+
+        response: Any = client.get(reverse('invoices:export_zip'), {'project': project.pk})
+
+        assert response.status_code == 200
+        assert response.streaming
+        archive: zipfile.ZipFile = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+        assert archive.namelist() == ['invoice_INV-2026-101.pdf', 'invoice_INV-2026-102.pdf']
+        assert archive.read('invoice_INV-2026-102.pdf') == b'%PDF-INV-2026-102'
+
+    def test_export_by_month(
+            self,
+            mock_render: Any,
+            settings: Any,
+            tmp_path: Path,
+            client: DjangoTestClient,
+            invoices_batch: List[Invoice]
+    ) -> None:
+        """Verify filtering by issue month"""
+        settings.INVOICE_PDF_CACHE_DIR = str(tmp_path)
+
+        response: Any = client.get(reverse('invoices:export_zip'), {'month': '2026-04'})
+
+        archive: zipfile.ZipFile = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+        assert archive.namelist() == ['invoice_INV-2026-103.pdf']
+
+    def test_invalid_month_returns_400(self, mock_render: Any, client: DjangoTestClient) -> None:
+        """Verify that a malformed month parameter is rejected"""
+        response: Any = client.get(reverse('invoices:export_zip'), {'month': '2026-13'})
+        assert response.status_code == 400
+
+    @pytest.mark.parametrize('param, message', [('project', 'id проекта'), ('client', 'id клиента')])
+    def test_invalid_id_returns_400(self, mock_render: Any, client: DjangoTestClient, param: str,
+                                    message: str) -> None:
+        """Verify that a non-numeric project or client id is rejected with its own message"""
+        response: Any = client.get(reverse('invoices:export_zip'), {param: 'abc'})
+
+        assert response.status_code == 400
+        assert message in response.content.decode()
+
+    def test_exports_keep_to_their_share_of_the_pool(
+            self,
+            mock_render: Any,
+            settings: Any,
+            monkeypatch: Any,
+            tmp_path: Path,
+            invoices_batch: List[Invoice]
+    ) -> None:
+        """Verify that parallel export renders never hold more than INVOICE_PDF_EXPORT_SLOTS jobs"""
+        settings.INVOICE_PDF_CACHE_DIR = str(tmp_path)
+        settings.INVOICE_PDF_EXPORT_SLOTS = 1
+        monkeypatch.setattr('invoices.export._export_slots', None)
+        lock: threading.Lock = threading.Lock()
+        running: List[int] = [0, 0]
+
+        def slow_render(invoice: Invoice, base_url: Optional[str], template: Any = None) -> bytes:
+            with lock:
+                running[0] += 1
+                running[1] = max(running[1], running[0])
+            time.sleep(0.05)
+            with lock:
+                running[0] -= 1
+            return _fake_pdf(invoice, base_url)
+
+        mock_render.side_effect = slow_render
+
+        rendered: List[bytes] = [pdf for _, pdf in iter_invoice_pdfs(invoices_batch, parallel=3)]
+
+        assert rendered == [b'%PDF-INV-2026-101', b'%PDF-INV-2026-102', b'%PDF-INV-2026-103']
+        assert running[1] == 1
+
+    def test_saturated_pool_fails_after_the_render_timeout(
+            self,
+            mock_render: Any,
+            settings: Any,
+            tmp_path: Path,
+            invoices_batch: List[Invoice]
+    ) -> None:
+        """Verify that an export stops retrying a saturated pool once INVOICE_PDF_RENDER_TIMEOUT has passed"""
+        settings.INVOICE_PDF_CACHE_DIR = str(tmp_path)
+        settings.INVOICE_PDF_RENDER_TIMEOUT = 0.2
+        mock_render.side_effect = RendererSaturated(1)
+
+        started: float = time.monotonic()
+        [(_, rendered)] = list(iter_invoice_pdfs(invoices_batch[:1]))
+
+        assert isinstance(rendered, RendererSaturated)
+        assert time.monotonic() - started < 2
+
+    def test_failed_render_keeps_the_archive_complete(
+            self,
+            mock_render: Any,
+            settings: Any,
+            tmp_path: Path,
+            client: DjangoTestClient,
+            invoices_batch: List[Invoice]
+    ) -> None:
+        """Verify that a render failing mid-stream becomes an error entry of a valid archive"""
+        settings.INVOICE_PDF_CACHE_DIR = str(tmp_path)
+
+        def flaky_render(invoice: Invoice, base_url: Optional[str], template: Any = None) -> bytes:
+            if invoice.number == "INV-2026-102":
+                raise RuntimeError("template error")
+            return _fake_pdf(invoice, base_url)
+
+        mock_render.side_effect = flaky_render
+
+        response: Any = client.get(reverse('invoices:export_zip'))
+
+        archive: zipfile.ZipFile = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+        assert archive.namelist() == [
+            'invoice_INV-2026-101.pdf', 'invoice_INV-2026-102.error.txt', 'invoice_INV-2026-103.pdf',
+        ]
+        assert "template error" in archive.read('invoice_INV-2026-102.error.txt').decode()
+
+    def test_render_threads_close_their_connections(
+            self,
+            mock_render: Any,
+            settings: Any,
+            tmp_path: Path,
+            invoices_batch: List[Invoice]
+    ) -> None:
+        """Verify that every export render lets its pool thread close its database connection"""
+        settings.INVOICE_PDF_CACHE_DIR = str(tmp_path)
+
+        with patch('invoices.export.close_old_connections') as close:
+            list(iter_invoice_pdfs(invoices_batch, parallel=2))
+
+        assert close.call_count == 3
+
+    def test_management_command(
+            self,
+            mock_render: Any,
+            settings: Any,
+            tmp_path: Path,
+            invoices_batch: List[Invoice]
+    ) -> None:
+        """Verify that the export command writes a valid archive to disk"""
+        settings.INVOICE_PDF_CACHE_DIR = str(tmp_path / 'cache')
+        output: Path = tmp_path / 'all.zip'
+
+        call_command('export_invoices', output=str(output), parallel=2)
+
+        assert len(zipfile.ZipFile(output).namelist()) == 3
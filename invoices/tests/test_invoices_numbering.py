@@ -0,0 +1,110 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any, List
+
+import pytest
+from django.db import connection, transaction
+from django.test import Client as DjangoTestClient
+from django.urls import reverse
+from django.utils import timezone
+
+from invoices.models import Invoice, InvoiceSequence
+from invoices.numbering import _allocate_locked, allocate_number, next_invoice_number
+from projects.models import Project
+
+THREADS: int = 8
+INVOICES_PER_THREAD: int = 25
+
+
+@pytest.mark.django_db
+class TestInvoiceNumbering:
+    """Tests for the invoice number allocator"""
+
+    def test_numbers_are_sequential(self) -> None:
+        """Consecutive allocations count up from 1 within the current year"""
+        year: int = timezone.localdate().year
+
+        assert [next_invoice_number() for _ in range(3)] == [
+            f"INV-{year}-001", f"INV-{year}-002", f"INV-{year}-003",
+        ]
+
+    def test_year_rollover_restarts_series(self) -> None:
+        """Each year and each series has its own counter"""
+        allocate_number(year=2025)
+        allocate_number(year=2025)
+
+        assert allocate_number(year=2026) == 1
+        assert allocate_number(year=2025) == 3
+        assert allocate_number(prefix='ACME', year=2025) == 1
+        assert InvoiceSequence.objects.count() == 3
+
+    def test_allocation_is_one_query(self, django_assert_num_queries: Any) -> None:
+        """Creating or bumping the counter is a single round-trip"""
+        with django_assert_num_queries(1):
+            allocate_number(year=2030)
+        with django_assert_num_queries(1):
+            assert allocate_number(year=2030) == 2
+
+    def test_locked_fallback_matches_upsert(self) -> None:
+        """The select_for_update path continues the same counter"""
+        allocate_number(year=2031)
+
+        assert _allocate_locked('INV', 2031) == 2
+        assert allocate_number(year=2031) == 3
+
+    def test_failed_save_returns_the_number(self, project: Project) -> None:
+        """A rolled-back invoice does not leave a gap in the series"""
+        Invoice.objects.create(project=project, number="TAKEN", amount=1, due_date=timezone.now().date())
+
+        with pytest.raises(Exception):
+            with transaction.atomic():
+                allocate_number(year=2032)
+                Invoice.objects.create(project=project, number="TAKEN", amount=1, due_date=timezone.now().date())
+
+        assert allocate_number(year=2032) == 1
+
+    def test_view_uses_allocator_across_projects(self, client: DjangoTestClient, project: Project) -> None:
+        """Invoices of different projects draw from one series, so numbers never collide"""
+        other: Project = Project.objects.create(name="Other", client=project.client)
+        data = {'amount': '100.00', 'due_date': (timezone.now().date() + timedelta(days=7)).isoformat(),
+                'status': 'draft'}
+
+        for target in (project, other, project):
+            response = client.post(reverse('invoices:create_from_project', args=[target.pk]), data)
+            assert response.status_code == 302
+
+        year: int = timezone.localdate().year
+        assert sorted(Invoice.objects.values_list('number', flat=True)) == [
+            f"INV-{year}-001", f"INV-{year}-002", f"INV-{year}-003",
+        ]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_parallel_creators_get_unique_numbers(project: Project) -> None:
+    """Many threads creating invoices at once get distinct, gap-free numbers"""
+    start: threading.Barrier = threading.Barrier(THREADS)
+    due = timezone.now().date()
+
+    def create_invoices(_: int) -> List[str]:
+        numbers: List[str] = []
+        start.wait()
+        try:
+            for _ in range(INVOICES_PER_THREAD):
+                with transaction.atomic():
+                    invoice: Invoice = Invoice.objects.create(
+                        project=project, number=next_invoice_number(), amount=1, due_date=due
+                    )
+                numbers.append(invoice.number)
+        finally:
+            connection.close()
+        return numbers
+
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        results: List[List[str]] = list(pool.map(create_invoices, range(THREADS)))
+
+    numbers: List[str] = [number for chunk in results for number in chunk]
+    total: int = THREADS * INVOICES_PER_THREAD
+    assert len(set(numbers)) == total
+    assert sorted(int(number.rsplit('-', 1)[1]) for number in numbers) == list(range(1, total + 1))
+    assert Invoice.objects.count() == total
@@ -0,0 +1,52 @@
+import base64
+import os
+from pathlib import Path
+from typing import Dict, Tuple
+
+from invoices.pdf import asset_cache_stats, load_logo_base64, qr_code_image
+
+
+class TestPdfAssets:
+    """Tests for logo and QR code memoization used by invoice PDFs"""
+
+    def test_logo_reloaded_only_on_mtime_change(self, tmp_path: Path) -> None:
+        """Verify that the logo is read once and refreshed after the file changes"""
+        logo: Path = tmp_path / 'logo.png'
+        logo.write_bytes(b'first')
+
+        before: Dict[str, float] = asset_cache_stats()
+        assert load_logo_base64(str(logo)) == base64.b64encode(b'first').decode()
+        assert load_logo_base64(str(logo)) == base64.b64encode(b'first').decode()
+        after: Dict[str, float] = asset_cache_stats()
+        assert after['logo_loads'] - before['logo_loads'] == 1
+        assert after['logo_hits'] - before['logo_hits'] == 1
+
+        logo.write_bytes(b'second')
+        stat = logo.stat()
+        os.utime(logo, (stat.st_atime, stat.st_mtime + 10))
+        assert load_logo_base64(str(logo)) == base64.b64encode(b'second').decode()
+
+    def test_missing_logo_returns_empty_string(self, tmp_path: Path) -> None:
+        """Verify that a missing logo file does not break rendering"""
+        assert load_logo_base64(str(tmp_path / 'absent.png')) == ""
+
+    def test_qr_memoized_by_payload(self) -> None:
+        """Verify that identical payloads are served from the LRU cache"""
+        payload: str = "ST00012|Name=Test|Sum=4242"
+        before: Dict[str, float] = asset_cache_stats()
+
+        first: Tuple[str, str] = qr_code_image(payload, 'png')
+        second: Tuple[str, str] = qr_code_image(payload, 'png')
+
+        after: Dict[str, float] = asset_cache_stats()
+        assert first == second
+        assert first[0] == 'image/png'
+        assert after['qr_hits'] - before['qr_hits'] == 1
+        assert after['saved_seconds_total'] >= 0
+
+    def test_svg_qr(self) -> None:
+        """Verify that SVG output bypasses PIL and returns SVG markup"""
+        mime, data = qr_code_image("ST00012|Name=Test|Sum=100", 'svg')
+
+        assert mime == 'image/svg+xml'
+        assert base64.b64decode(data).startswith(b'<svg')
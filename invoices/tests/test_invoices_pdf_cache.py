@@ -0,0 +1,80 @@
+import os
+import pytest
+from pathlib import Path
+from typing import Any, List
+
+from invoices.models import Invoice
+from invoices.pdf_cache import InvoicePdfCache, get_pdf_cache, invoice_fingerprint
+
+
+@pytest.mark.django_db
+class TestInvoicePdfCache:
+    """Tests for the content-addressed invoice PDF cache"""
+
+    def test_get_or_render_uses_cache(self, tmp_path: Path, invoice: Invoice) -> None:
+        """Verify that the renderer runs once for repeated requests of an unchanged invoice"""
+        cache: InvoicePdfCache = InvoicePdfCache(str(tmp_path), 1024 * 1024)
+        calls: List[int] = []
+
+        def render() -> bytes:
+            calls.append(1)
+            return b'%PDF-fake'
+
+        assert cache.get_or_render(invoice, render) == b'%PDF-fake'
+        assert cache.get_or_render(invoice, render) == b'%PDF-fake'
+
+        assert len(calls) == 1
+        assert cache.snapshot()['hits'] == 1
+        assert cache.snapshot()['misses'] == 1
+
+    def test_fingerprint_changes_with_invoice_and_client(self, invoice: Invoice) -> None:
+        """Verify that edits to the invoice or its client produce a new fingerprint"""
+        original: str = invoice_fingerprint(invoice)
+
+        invoice.amount = 777
+        invoice.save()
+        after_invoice_edit: str = invoice_fingerprint(invoice)
+        assert after_invoice_edit != original
+
+        invoice.project.client.name = "Renamed Client"
+        assert invoice_fingerprint(invoice) != after_invoice_edit
+
+    def test_fingerprint_changes_with_logo(self, monkeypatch: Any, tmp_path: Path, invoice: Invoice) -> None:
+        """Verify that replacing the logo file produces a new fingerprint"""
+        logo: Path = tmp_path / 'logo.png'
+        logo.write_bytes(b'first')
+        os.utime(logo, (1000, 1000))
+        monkeypatch.setattr('invoices.pdf_cache.default_logo_path', lambda: str(logo))
+        original: str = invoice_fingerprint(invoice)
+
+        logo.write_bytes(b'second')
+        os.utime(logo, (2000, 2000))
+
+        assert invoice_fingerprint(invoice) != original
+
+    def test_lru_eviction(self, tmp_path: Path) -> None:
+        """Verify that least recently used files are evicted once the budget is exceeded"""
+        cache: InvoicePdfCache = InvoicePdfCache(str(tmp_path), 25)
+
+        cache.put(1, 'a', b'x' * 10)
+        cache.put(2, 'b', b'x' * 10)
+        # Touch invoice 1 so that invoice 2 becomes the oldest entry
+        Path(tmp_path / '2-b.pdf').touch()
+        Path(tmp_path / '1-a.pdf').touch()
+        cache.get(1, 'a')
+        cache.put(3, 'c', b'x' * 10)
+
+        assert cache.get(1, 'a') is not None
+        assert cache.get(3, 'c') is not None
+        assert cache.snapshot()['evictions'] >= 1
+
+    def test_project_save_invalidates(self, settings: Any, tmp_path: Path, invoice: Invoice) -> None:
+        """Verify that saving the related project purges cached PDFs of its invoices"""
+        settings.INVOICE_PDF_CACHE_DIR = str(tmp_path)
+        cache: InvoicePdfCache = get_pdf_cache()
+        cache.put(invoice.pk, invoice_fingerprint(invoice), b'%PDF-fake')
+
+        invoice.project.name = "Renamed Project"
+        invoice.project.save()
+
+        assert list(tmp_path.glob(f"{invoice.pk}-*.pdf")) == []
@@ -0,0 +1,76 @@
+import multiprocessing
+import threading
+import time
+import pytest
+from typing import List, Optional
+
+from invoices.pdf_engine import PdfRenderEngine, RendererSaturated, RenderTimeout
+
+
+def _echo_render(html_string: str, base_url: Optional[str]) -> bytes:
+    """Stand-in for WeasyPrint that returns the markup as bytes"""
+    return html_string.encode('utf-8')
+
+
+def _slow_render(html_string: str, base_url: Optional[str]) -> bytes:
+    """Stand-in for WeasyPrint that keeps the worker busy"""
+    time.sleep(1.5)
+    return html_string.encode('utf-8')
+
+
+def _quick_warmup() -> None:
+    """Stand-in for the WeasyPrint warm-up"""
+
+
+class TestPdfRenderEngine:
+    """Tests for the process-pool PDF render engine"""
+
+    def test_inline_mode(self) -> None:
+        """Verify that zero workers render synchronously in the caller"""
+        engine: PdfRenderEngine = PdfRenderEngine(0, 0, 5, render_func=_echo_render, prewarm=False)
+        assert engine.render('<p>1</p>') == b'<p>1</p>'
+
+    def test_pool_renders_in_worker(self) -> None:
+        """Verify that jobs submitted to the pool return the worker result"""
+        engine: PdfRenderEngine = PdfRenderEngine(1, 1, 30, render_func=_echo_render, prewarm=False)
+        try:
+            assert engine.render('<p>pool</p>') == b'<p>pool</p>'
+        finally:
+            engine.shutdown()
+
+    def test_workers_start_with_the_engine(self) -> None:
+        """Verify that every worker process is started and warmed up before the first render"""
+        before: int = len(multiprocessing.active_children())
+        engine: PdfRenderEngine = PdfRenderEngine(2, 0, 30, render_func=_echo_render, warmup=_quick_warmup)
+        try:
+            assert len(multiprocessing.active_children()) - before == 2
+            assert engine.render('<p>warm</p>') == b'<p>warm</p>'
+        finally:
+            engine.shutdown()
+
+    def test_saturated_queue_rejects_jobs(self) -> None:
+        """Verify backpressure once all worker and queue slots are taken"""
+        engine: PdfRenderEngine = PdfRenderEngine(1, 0, 30, render_func=_slow_render, prewarm=False)
+        results: List[bytes] = []
+        busy: threading.Thread = threading.Thread(target=lambda: results.append(engine.render('<p>slow</p>')))
+        busy.start()
+        time.sleep(0.1)
+
+        try:
+            with pytest.raises(RendererSaturated) as exc_info:
+                engine.render('<p>rejected</p>')
+            assert exc_info.value.retry_after >= 1
+        finally:
+            busy.join()
+            engine.shutdown()
+
+        assert results == [b'<p>slow</p>']
+
+    def test_job_timeout(self) -> None:
+        """Verify that a job exceeding the timeout raises RenderTimeout"""
+        engine: PdfRenderEngine = PdfRenderEngine(1, 0, 0.2, render_func=_slow_render, prewarm=False)
+        try:
+            with pytest.raises(RenderTimeout):
+                engine.render('<p>too slow</p>')
+        finally:
+            engine.shutdown()
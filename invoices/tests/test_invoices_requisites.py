@@ -0,0 +1,73 @@
+import pytest
+from decimal import Decimal
+from typing import Any
+
+from django.core.cache.backends.locmem import LocMemCache
+
+from clients.models import Client
+from invoices.models import PaymentRequisites
+from invoices.requisites import CompiledRequisites, RequisitesRegistry, requisites_registry
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry() -> None:
+    """Drop requisites loaded by previous tests (their rows were rolled back)"""
+    requisites_registry.invalidate()
+
+
+@pytest.mark.django_db
+class TestRequisitesRegistry:
+    """Tests for the cached payment requisites registry"""
+
+    def test_default_requisites_from_migration(self) -> None:
+        """Verify that the migrated default requisites produce a complete ST00012 payload"""
+        requisites: CompiledRequisites = requisites_registry.get(None)
+
+        assert requisites.name == 'ИП Иванов И.И.'
+        assert requisites.qr_payload(Decimal('500.00')) == (
+            'ST00012|Name=ИП Иванов И.И.|PersonalAcc=40802810400000001234|BankName=Сбербанк'
+            '|BIC=044525974|CorrespAcc=30101810145250000974|PayeeINN=123456789012|Sum=50000'
+        )
+
+    def test_client_specific_requisites(self) -> None:
+        """Verify that a client bound to other requisites gets them instead of the default"""
+        other: PaymentRequisites = PaymentRequisites.objects.create(
+            name='ООО Вектор', full_name='ООО «Вектор»', inn='7700000000',
+            account='40702810000000000001', bank_name='Т-Банк'
+        )
+        requisites_registry.invalidate()
+        client: Client = Client.objects.create(name="Client", requisites=other)
+
+        assert requisites_registry.for_client(client).name == 'ООО Вектор'
+        assert requisites_registry.for_client(Client(name="No requisites")).name == 'ИП Иванов И.И.'
+
+    def test_lookups_do_not_hit_database(self, django_assert_num_queries: Any) -> None:
+        """Verify that repeated renders reuse the loaded registry without queries"""
+        requisites_registry.get(None)
+
+        with django_assert_num_queries(0):
+            for _ in range(10):
+                requisites_registry.get(None).qr_payload(Decimal('1.00'))
+
+    def test_registry_reloads_after_change(self, django_capture_on_commit_callbacks: Any) -> None:
+        """Verify that saving requisites invalidates the registry after commit"""
+        assert requisites_registry.get(None).bank_name == 'Сбербанк'
+
+        with django_capture_on_commit_callbacks(execute=True):
+            row: PaymentRequisites = PaymentRequisites.objects.get(is_default=True)
+            row.bank_name = 'Альфа-Банк'
+            row.save()
+
+        assert requisites_registry.get(None).bank_name == 'Альфа-Банк'
+
+    def test_invalidation_reaches_other_processes(self) -> None:
+        """Verify that a registry reloads when another process bumps the version in the shared cache"""
+        # Two cache clients of one store, as a web and a Celery worker see the same Redis
+        worker: RequisitesRegistry = RequisitesRegistry(LocMemCache('requisites-shared', {}))
+        web: RequisitesRegistry = RequisitesRegistry(LocMemCache('requisites-shared', {}))
+        assert worker.get(None).bank_name == 'Сбербанк'
+
+        PaymentRequisites.objects.filter(is_default=True).update(bank_name='Альфа-Банк')
+        web.invalidate()
+
+        assert worker.get(None).bank_name == 'Альфа-Банк'
@@ -0,0 +1,104 @@
+import json
+import pytest
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+from invoices.models import Invoice, InvoiceTelegramFile
+from tasks.models import DeadLetterMessage
+from invoices.views import send_invoice_to_telegram
+from tasks.ratelimit import reset_rate_limiter
+from tasks.tasks import send_telegram
+from tasks.tests.fake_telegram import FakeTelegramServer
+
+
+def _run_through_broker(**kwargs: Any) -> str:
+    """Execute send_telegram in-process with kwargs serialized like a broker message"""
+    return send_telegram.run(**json.loads(json.dumps(kwargs)))
+
+
+@pytest.fixture
+def pdf_cache_dir(settings: Any, tmp_path: Path) -> None:
+    """Isolate the PDF cache so every test renders through the mocked renderer"""
+    settings.INVOICE_PDF_CACHE_DIR = str(tmp_path)
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('pdf_cache_dir')
+@patch('invoices.views.send_telegram.delay', side_effect=_run_through_broker)
+@patch('invoices.views.render_invoice_pdf', return_value=b'%PDF-invoice')
+class TestInvoiceFileReuse:
+    """Tests for re-sending invoice PDFs by Telegram file_id"""
+
+    def test_upload_stores_file_id(self, mock_render: Any, mock_delay: Any, invoice: Invoice,
+                                   fake_telegram: FakeTelegramServer) -> None:
+        """Verify that the file_id returned by Telegram is stored for the invoice"""
+        send_invoice_to_telegram.run(invoice.pk, 42)
+
+        stored: InvoiceTelegramFile = InvoiceTelegramFile.objects.get(invoice=invoice)
+        assert stored.file_id.startswith('FAKE-FILE-')
+        assert fake_telegram.calls_for('sendDocument')[0]['files']
+
+    def test_resend_by_file_id(self, mock_render: Any, mock_delay: Any, invoice: Invoice,
+                               fake_telegram: FakeTelegramServer) -> None:
+        """Verify that an unchanged invoice is sent by reference without rendering or uploading"""
+        send_invoice_to_telegram.run(invoice.pk, 42)
+        file_id: str = InvoiceTelegramFile.objects.get().file_id
+        mock_render.reset_mock()
+
+        result: str = send_invoice_to_telegram.run(invoice.pk, 43)
+
+        assert result == "Отправлено повторно"
+        mock_render.assert_not_called()
+        call: Any = fake_telegram.calls_for('sendDocument')[1]
+        assert call['params']['document'] == file_id
+        assert not call['files']
+
+    def test_changed_invoice_uploaded_again(self, mock_render: Any, mock_delay: Any, invoice: Invoice,
+                                            fake_telegram: FakeTelegramServer) -> None:
+        """Verify that editing the invoice replaces the stored file_id with a new upload"""
+        send_invoice_to_telegram.run(invoice.pk, 42)
+        invoice.amount = 750
+        invoice.save()
+
+        send_invoice_to_telegram.run(invoice.pk, 43)
+
+        assert mock_render.call_count == 2
+        assert len(fake_telegram.calls_for('sendDocument')[1]['files']) == 1
+        assert InvoiceTelegramFile.objects.count() == 1
+
+    def test_rejected_file_id_falls_back_to_upload(self, mock_render: Any, mock_delay: Any, invoice: Invoice,
+                                                   fake_telegram: FakeTelegramServer, settings: Any) -> None:
+        """Verify that a file_id Telegram no longer accepts triggers a fresh upload"""
+        settings.TELEGRAM_RATE_PER_CHAT = 1000.0
+        reset_rate_limiter()
+        send_invoice_to_telegram.run(invoice.pk, 42)
+        stale_id: str = InvoiceTelegramFile.objects.get().file_id
+        fake_telegram.enqueue_response('sendDocument', 400, {
+            'ok': False, 'error_code': 400, 'description': 'Bad Request: wrong file identifier'
+        })
+
+        send_invoice_to_telegram.run(invoice.pk, 43)
+
+        uploads = [call for call in fake_telegram.calls_for('sendDocument') if call['files']]
+        assert len(uploads) == 2
+        assert InvoiceTelegramFile.objects.get().file_id != stale_id
+
+    def test_chat_error_keeps_file_id(self, mock_render: Any, mock_delay: Any, invoice: Invoice,
+                                      fake_telegram: FakeTelegramServer, settings: Any) -> None:
+        """Verify that a chat error is dead-lettered without dropping the file_id or uploading again"""
+        settings.TELEGRAM_RATE_PER_CHAT = 1000.0
+        reset_rate_limiter()
+        send_invoice_to_telegram.run(invoice.pk, 42)
+        fake_telegram.enqueue_response('sendDocument', 400, {
+            'ok': False, 'error_code': 400, 'description': 'Bad Request: chat not found'
+        })
+
+        result: str = send_invoice_to_telegram.run(invoice.pk, 43)
+
+        assert result.startswith("Ошибка отправки")
+        assert mock_render.call_count == 1
+        assert len(fake_telegram.calls_for('sendDocument')) == 2
+        assert InvoiceTelegramFile.objects.count() == 1
+        dead: DeadLetterMessage = DeadLetterMessage.objects.get()
+        assert (dead.chat_id, dead.payload) == ('43', {'invoice_id': invoice.pk})
@@ -5,6 +5,7 @@ from django.test import Client as DjangoTestClient
 from typing import Any, Final
 
 from invoices.models import Invoice
+from invoices.pdf_engine import RendererSaturated
 
 
 @pytest.mark.django_db
@@ -34,4 +35,20 @@ class TestInvoiceViews:
         assert response.json().get('status') == 'success'
 
         # 4. Verify that the Celery task was triggered with correct arguments
-        mock_delay.assert_called_once_with(invoice.pk, chat_id)
\ No newline at end of file
+        mock_delay.assert_called_once_with(invoice.pk, chat_id)
+
+    @patch('invoices.views.render_invoice_pdf')
+    def test_pdf_returns_503_when_renderer_saturated(
+            self,
+            mock_render: MagicMock,
+            client: DjangoTestClient,
+            invoice: Invoice
+    ) -> None:
+        """Verify that a saturated render pool yields 503 with a Retry-After header"""
+        mock_render.side_effect = RendererSaturated(retry_after=7)
+
+        url: str = reverse('invoices:pdf', kwargs={'invoice_id': invoice.pk})
+        response: Any = client.get(url)
+
+        assert response.status_code == 503
+        assert response['Retry-After'] == '7'
@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import invoice_create_from_project, generate_invoice_pdf, invoice_update, invoice_delete,send_invoice_telegram
+from .views import invoice_create_from_project, generate_invoice_pdf, invoice_update, invoice_delete,send_invoice_telegram, invoice_export_zip
 app_name = 'invoices'
 
 urlpatterns = [
@@ -8,4 +8,5 @@ urlpatterns = [
     path('<int:pk>/update/', invoice_update, name='update'),
     path('<int:pk>/delete/', invoice_delete, name='delete'),
     path('<int:pk>/send-telegram/', send_invoice_telegram, name='send_telegram'),
+    path('export/zip/', invoice_export_zip, name='export_zip'),
 ]
@@ -3,18 +3,20 @@ from django.contrib import messages
 from .forms import InvoiceForm
 from projects.models import Project
 from datetime import timedelta
-from django.http import HttpRequest, HttpResponse, JsonResponse
-from django.template.loader import render_to_string
-from weasyprint import HTML
+from django.http import HttpRequest, HttpResponse, HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
 from django.utils import timezone
-import base64
-import os
 from django.conf import settings
-import qrcode
-from io import BytesIO
+from django.db import transaction
 from celery import shared_task
-from invoices.models import Invoice
-from django.test import RequestFactory
+from invoices.models import Invoice, InvoiceTelegramFile
+from invoices.export import filter_invoices, stream_invoices_zip
+from invoices.numbering import next_invoice_number
+from invoices.pdf import render_invoice_pdf
+from invoices.pdf_cache import get_pdf_cache, invoice_fingerprint
+from invoices.pdf_engine import RendererSaturated, RenderTimeout
+from tasks.blobs import get_blob_store
+from tasks.outbound import RetryLater, deliver, retry_or_dead_letter, store_dead_letter
+from tasks.telegram import TelegramAPIError
 from tasks.tasks import send_telegram
 from django.views.decorators.http import require_POST
 from typing import Union, Optional, Any, Dict
@@ -33,12 +35,11 @@ def invoice_create_from_project(request: HttpRequest, project_id: int) -> ViewRe
             invoice: Invoice = form.save(commit=False)
             invoice.project = project
 
-            # Generate sequential invoice number
-            last_invoice: Optional[Invoice] = Invoice.objects.filter(project=project).order_by('-id').first()
-            next_num: int = 1 if not last_invoice else int(last_invoice.number.split('-')[-1]) + 1
-            invoice.number = f"INV-{timezone.now().year}-{next_num:03d}"
-
-            invoice.save()
+            # The number is allocated in the same transaction as the save: no duplicates
+            # under concurrent creates, and a failed save does not burn a number
+            with transaction.atomic():
+                invoice.number = next_invoice_number()
+                invoice.save()
             messages.success(request, f'Счёт {invoice.number} успешно создан!')
             return redirect('projects:detail', pk=project.pk)
     else:
@@ -54,36 +55,26 @@ def invoice_create_from_project(request: HttpRequest, project_id: int) -> ViewRe
 
 
 def generate_invoice_pdf(request: HttpRequest, invoice_id: int) -> HttpResponse:
-    """Generate and return a PDF document for the given invoice."""
-    invoice: Invoice = get_object_or_404(Invoice, pk=invoice_id)
-
-    # Logo processing
-    logo_path: str = os.path.join(settings.BASE_DIR, 'static', 'logo.png')
-    logo_base64: str = ""
-    if os.path.exists(logo_path):
-        with open(logo_path, "rb") as image_file:
-            logo_base64 = base64.b64encode(image_file.read()).decode('utf-8')
-
-    # QR Code generation for payment
-    qr_data: str = f"ST00012|Name=ИП Иванов И.И.|PersonalAcc=40802810400000001234|BankName=Сбербанк|Sum={int(invoice.amount * 100)}"
-    qr_engine: qrcode.QRCode = qrcode.QRCode(version=1, box_size=10, border=5)
-    qr_engine.add_data(qr_data)
-    qr_engine.make(fit=True)
-
-    qr_img: Any = qr_engine.make_image(fill_color="black", back_color="white")
-    qr_buffer: BytesIO = BytesIO()
-    qr_img.save(qr_buffer, format="PNG")
-    qr_code_base64: str = base64.b64encode(qr_buffer.getvalue()).decode('utf-8')
-
-    html_string: str = render_to_string('invoices/pdf_invoice.html', {
-        'invoice': invoice,
-        'now': timezone.now(),
-        'logo_base64': logo_base64,
-        'qr_code_base64': qr_code_base64,
-    })
+    """
+    Return the PDF document for the given invoice.
 
-    html: HTML = HTML(string=html_string, base_url=request.build_absolute_uri('/'))
-    pdf_content: bytes = html.write_pdf()
+    Unchanged invoices are served from the on-disk PDF cache without
+    touching WeasyPrint. When the render pool is saturated the view answers
+    503 with a `Retry-After` header instead of blocking the worker.
+    """
+    invoice: Invoice = get_object_or_404(Invoice.objects.select_related('project__client'), pk=invoice_id)
+    base_url: str = request.build_absolute_uri('/')
+
+    try:
+        pdf_content: bytes = get_pdf_cache().get_or_render(
+            invoice, lambda: render_invoice_pdf(invoice, base_url)
+        )
+    except RendererSaturated as exc:
+        busy: HttpResponse = HttpResponse('PDF-сервис перегружен, попробуйте позже', status=503)
+        busy['Retry-After'] = str(exc.retry_after)
+        return busy
+    except RenderTimeout:
+        return HttpResponse('Превышено время генерации PDF', status=504)
 
     response: HttpResponse = HttpResponse(content_type='application/pdf')
     response['Content-Disposition'] = f'attachment; filename="invoice_{invoice.number}.pdf"'
@@ -122,16 +113,25 @@ def invoice_delete(request: HttpRequest, pk: int) -> ViewResponse:
     return redirect('projects:detail', pk=project_pk)
 
 
-@shared_task
-def send_invoice_to_telegram(invoice_id: int, chat_id: Union[int, str]) -> str:
-    """Background task to send invoice PDF to Telegram."""
-    try:
-        invoice: Invoice = Invoice.objects.get(id=invoice_id)
+@shared_task(bind=True, max_retries=settings.TELEGRAM_MAX_RETRIES)
+def send_invoice_to_telegram(self: Any, invoice_id: int, chat_id: Union[int, str]) -> str:
+    """
+    Background task to send invoice PDF to Telegram.
 
-        factory: RequestFactory = RequestFactory()
-        fake_request: HttpRequest = factory.get('/')
-        pdf_response: HttpResponse = generate_invoice_pdf(fake_request, invoice_id)
-        pdf_bytes: bytes = pdf_response.content
+    If this version of the PDF was already uploaded, it is sent again by its
+    Telegram `file_id` without rendering or uploading anything; a `file_id`
+    Telegram no longer accepts falls back to a fresh upload, and any other
+    API error (e.g. chat not found) goes to the dead-letter store.
+
+    Otherwise the PDF is taken from the cache or submitted to the render engine;
+    a saturated engine makes the task retry later instead of failing.
+    The rendered file is handed to `send_telegram` through the blob store,
+    so the broker message carries only a reference, and rate-limit retries
+    of the upload do not render the PDF again.
+    """
+    try:
+        invoice: Invoice = Invoice.objects.select_related('project__client').get(id=invoice_id)
+        fingerprint: str = invoice_fingerprint(invoice)
 
         caption: str = (
             f"<b>Счёт №{invoice.number}</b>\n"
@@ -141,20 +141,89 @@ def send_invoice_to_telegram(invoice_id: int, chat_id: Union[int, str]) -> str:
             f"Статус: {invoice.get_status_display()}"
         )
 
-        result: str = send_telegram.run(
+        known: Optional[InvoiceTelegramFile] = invoice.telegram_files.filter(fingerprint=fingerprint).first()
+        if known is not None:
+            try:
+                deliver(chat_id, document=known.file_id, caption=caption)
+                return "Отправлено повторно"
+            except TelegramAPIError as exc:
+                if not exc.is_file_id_error:
+                    store_dead_letter(chat_id, 'sendDocument', {'invoice_id': invoice_id}, str(exc),
+                                      self.request.retries + 1)
+                    return f"Ошибка отправки: {exc}"
+                # The file is no longer available to the bot: upload it again
+                known.delete()
+
+        pdf_bytes: bytes = get_pdf_cache().get_or_render(
+            invoice, lambda: render_invoice_pdf(invoice, None)
+        )
+
+        send_telegram.delay(
             chat_id=chat_id,
-            document_bytes=pdf_bytes,
+            document_ref=get_blob_store().put(pdf_bytes),
             filename=f"счёт_{invoice.number}.pdf",
-            caption=caption
+            caption=caption,
+            on_uploaded=remember_invoice_file_id.s(invoice.pk, fingerprint),
         )
-        return result
+        return "Поставлено в очередь отправки"
 
     except Invoice.DoesNotExist:
         return f"Invoice {invoice_id} not found"
+    except RendererSaturated as exc:
+        raise self.retry(exc=exc, countdown=exc.retry_after)
+    except RetryLater as exc:
+        return retry_or_dead_letter(self, exc, chat_id, 'sendDocument', {'invoice_id': invoice_id})
     except Exception as e:
         return f"Error: {str(e)}"
 
 
+@shared_task
+def remember_invoice_file_id(file_id: str, invoice_id: int, fingerprint: str) -> None:
+    """
+    Store the `file_id` of an uploaded invoice PDF, replacing ids of outdated versions.
+
+    Used as the `on_uploaded` callback of `send_telegram`, which (like any
+    Celery callback) passes the new value as the first argument.
+    """
+    InvoiceTelegramFile.objects.filter(invoice_id=invoice_id).exclude(fingerprint=fingerprint).delete()
+    InvoiceTelegramFile.objects.update_or_create(
+        invoice_id=invoice_id, fingerprint=fingerprint, defaults={'file_id': file_id}
+    )
+
+
+def invoice_export_zip(request: HttpRequest) -> HttpResponse:
+    """
+    Stream a ZIP archive with the PDFs of the selected invoices.
+
+    Query parameters `project`, `client` and `month` (`YYYY-MM`) narrow the
+    selection. PDFs are rendered in parallel and written to the response as
+    they are produced.
+    """
+    ids: Dict[str, Optional[int]] = {}
+    for param, label in (('project', 'проекта'), ('client', 'клиента')):
+        value: str = request.GET.get(param, '')
+        try:
+            ids[param] = int(value) if value else None
+        except ValueError:
+            return HttpResponseBadRequest(f'Некорректный id {label}, ожидается целое число')
+
+    try:
+        invoices = filter_invoices(
+            project_id=ids['project'],
+            client_id=ids['client'],
+            month=request.GET.get('month') or None,
+        )
+    except ValueError:
+        return HttpResponseBadRequest('Некорректный месяц, ожидается формат YYYY-MM')
+
+    response: StreamingHttpResponse = StreamingHttpResponse(
+        stream_invoices_zip(invoices.iterator(chunk_size=200)),
+        content_type='application/zip',
+    )
+    response['Content-Disposition'] = 'attachment; filename="invoices.zip"'
+    return response
+
+
 @require_POST
 def send_invoice_telegram(request: HttpRequest, pk: int) -> JsonResponse:
     """Trigger the background task to send an invoice via Telegram."""
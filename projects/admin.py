@@ -3,6 +3,7 @@ from .models import Project
 
 @admin.register(Project)
 class ProjectAdmin(admin.ModelAdmin):
-    list_display = ('name', 'client', 'status', 'budget', 'deadline')
+    list_display = ('name', 'client', 'status', 'budget', 'deadline', 'total_tasks')
+    readonly_fields = ('todo_count', 'in_progress_count', 'done_count', 'canceled_count', 'total_tasks')
     search_fields = ('name', 'client__name')
     list_filter = ('status', 'deadline')
\ No newline at end of file
@@ -0,0 +1,24 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from projects.task_counts import rebuild_task_counts
+
+
+class Command(BaseCommand):
+    """
+        Recount the per-project task counters from the task table.
+
+        Needed after bulk task changes that bypass model signals.
+
+        Example:
+            python manage.py rebuild_project_task_counts
+    """
+    help = "Recount todo/in progress/done/canceled/total tasks of every project"
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        corrected: int = rebuild_task_counts()
+        if corrected:
+            self.stdout.write(self.style.WARNING(f"Corrected task counters of {corrected} projects"))
+        else:
+            self.stdout.write(self.style.SUCCESS("Project task counters are consistent"))
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.10 on 2026-10-18 18:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0006_client_requisites'),
+        ('projects', '0002_alter_project_client'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['status', 'created_at'], name='project_status_created_idx'),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.10 on 2026-10-18 19:22
+
+from django.db import migrations, models
+from django.db.models import Count
+
+STATUS_FIELDS = {
+    'todo': 'todo_count',
+    'in_progress': 'in_progress_count',
+    'done': 'done_count',
+    'canceled': 'canceled_count',
+}
+
+
+def fill_task_counts(apps, schema_editor):
+    """Count the existing tasks of every project."""
+    Project = apps.get_model('projects', 'Project')
+    Task = apps.get_model('tasks', 'Task')
+
+    counts = {}
+    rows = Task.objects.order_by().values_list('project_id', 'status').annotate(total=Count('id'))
+    for project_id, status, total in rows:
+        fields = counts.setdefault(project_id, {'total_tasks': 0})
+        if status in STATUS_FIELDS:
+            fields[STATUS_FIELDS[status]] = fields.get(STATUS_FIELDS[status], 0) + total
+        fields['total_tasks'] += total
+
+    for project_id, fields in counts.items():
+        Project.objects.filter(pk=project_id).update(**fields)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0004_project_project_created_id_idx'),
+        ('tasks', '0005_task_open_deadline_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='canceled_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Задач отменено'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='done_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Задач завершено'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='in_progress_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Задач в работе'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='todo_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Задач к выполнению'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='total_tasks',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Всего задач'),
+        ),
+        migrations.RunPython(fill_task_counts, migrations.RunPython.noop),
+    ]
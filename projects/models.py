@@ -1,6 +1,15 @@
 from django.db import models
 from clients.models import Client
-from typing import List, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Task status -> Project field counting the project's tasks in that status
+TASK_COUNT_FIELDS: Dict[str, str] = {
+    'todo': 'todo_count',
+    'in_progress': 'in_progress_count',
+    'done': 'done_count',
+    'canceled': 'canceled_count',
+}
+COUNTER_FIELDS: Tuple[str, ...] = (*TASK_COUNT_FIELDS.values(), 'total_tasks')
 
 class Project(models.Model):
     """
@@ -18,6 +27,9 @@ class Project(models.Model):
             status: Current phase (new, in_progress, done, canceled).
             deadline: Targeted completion date.
             created_at: Automatic timestamp of project initialization.
+            todo_count, in_progress_count, done_count, canceled_count: Number of the
+                project's tasks per status, kept up to date by `projects.signals`.
+            total_tasks: Number of all tasks of the project.
     """
 
     STATUS_CHOICES: List[Tuple[str, str]] = [
@@ -35,11 +47,38 @@ class Project(models.Model):
     deadline = models.DateField(blank=True, null=True, verbose_name="Дедлайн")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Создан")
 
+    # Denormalized task statistics for the project list (see projects.task_counts)
+    todo_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="Задач к выполнению")
+    in_progress_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="Задач в работе")
+    done_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="Задач завершено")
+    canceled_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="Задач отменено")
+    total_tasks = models.PositiveIntegerField(default=0, editable=False, verbose_name="Всего задач")
+
     class Meta:
         verbose_name = "Проект"
         verbose_name_plural = "Проекты"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='project_status_created_idx'),
+            # Keyset pagination of the project list
+            models.Index(fields=['created_at', 'id'], name='project_created_id_idx'),
+        ]
 
     def __str__(self) -> str:
         """Return the project name and its associated client as a string"""
-        return f"{self.name} ({self.client})"
\ No newline at end of file
+        return f"{self.name} ({self.client})"
+
+    def _do_update(self, base_qs: models.QuerySet, using: str, pk_val: Any, values: List[Tuple[Any, Any, Any]],
+                   update_fields: Optional[Iterable[str]], forced_update: bool) -> bool:
+        """
+        Leave the task counters out of the `UPDATE` of a full save.
+
+        The counters are changed by atomic `UPDATE`s when tasks change; a full
+        save from an instance loaded earlier (e.g. the edit form) would
+        otherwise overwrite them with stale values. Everything else about
+        `save()` is unchanged: fields passed in `update_fields` are written as
+        given, and a row deleted in the meantime is inserted again.
+        """
+        if update_fields is None:
+            values = [value for value in values if value[0].name not in COUNTER_FIELDS]
+        return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
@@ -0,0 +1,46 @@
+from typing import Any, Optional
+
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from tasks.models import Task
+from .task_counts import TaskKey, move_task
+
+# Attribute holding the (project, status) a task was counted under when it was loaded or last saved
+SNAPSHOT_ATTR: str = '_project_task_key'
+
+# Marks a snapshot that could not be taken (a field was deferred)
+UNKNOWN: TaskKey = (0, '')
+
+
+def _task_key(instance: Task) -> Optional[TaskKey]:
+    if 'project_id' not in instance.__dict__ or 'status' not in instance.__dict__:
+        return UNKNOWN
+    if instance.project_id is None:
+        return None
+    return instance.project_id, instance.status
+
+
+@receiver(post_init, sender=Task)
+def remember_task_key(sender: Any, instance: Task, **kwargs: Any) -> None:
+    """Remember which project counter the loaded task is part of, to detect moves on save."""
+    setattr(instance, SNAPSHOT_ATTR, _task_key(instance))
+
+
+@receiver(post_save, sender=Task)
+def update_task_counts_on_save(sender: Any, instance: Task, created: bool, **kwargs: Any) -> None:
+    """Count a new task, or move it when its status or project changes."""
+    old: Optional[TaskKey] = None if created else getattr(instance, SNAPSHOT_ATTR, UNKNOWN)
+    new: Optional[TaskKey] = _task_key(instance)
+    if old != UNKNOWN and new != UNKNOWN:
+        move_task(old, new)
+    # Otherwise saved from a partially loaded task: left to `rebuild_project_task_counts`
+    setattr(instance, SNAPSHOT_ATTR, new)
+
+
+@receiver(post_delete, sender=Task)
+def update_task_counts_on_delete(sender: Any, instance: Task, **kwargs: Any) -> None:
+    """Remove a deleted task from its project's counters."""
+    old: Optional[TaskKey] = getattr(instance, SNAPSHOT_ATTR, UNKNOWN)
+    if old != UNKNOWN:
+        move_task(old, None)
@@ -0,0 +1,88 @@
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Count, F
+from django.db.models.functions import Greatest
+
+from tasks.models import Task
+
+from .models import COUNTER_FIELDS, TASK_COUNT_FIELDS, Project
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+BATCH_SIZE: int = 1000
+
+# (project id, task status) a task is counted under
+TaskKey = Tuple[int, str]
+
+
+def move_task(old: Optional[TaskKey], new: Optional[TaskKey]) -> None:
+    """
+    Move one task between the per-project counters (either side may be None).
+
+    Each affected project gets a single `UPDATE ... SET x_count = x_count ± 1`,
+    so concurrent changes never overwrite each other; a status change inside
+    one project leaves `total_tasks` alone. Statuses without a counter field
+    only count towards the total. Runs in the caller's transaction.
+    """
+    if old == new:
+        return
+    deltas: Dict[int, Dict[str, int]] = {}
+    for key, delta in ((old, -1), (new, 1)):
+        if key is None:
+            continue
+        project_deltas: Dict[str, int] = deltas.setdefault(key[0], {})
+        for field in ('total_tasks', TASK_COUNT_FIELDS.get(key[1])):
+            if field is not None:
+                project_deltas[field] = project_deltas.get(field, 0) + delta
+
+    for project_id, project_deltas in deltas.items():
+        updates: Dict[str, Any] = {
+            # Clamped at zero: a task added by `bulk_create` was never counted, deleting it must not fail
+            field: F(field) + delta if delta > 0 else Greatest(F(field) + delta, 0)
+            for field, delta in project_deltas.items() if delta
+        }
+        if updates:
+            Project.objects.filter(pk=project_id).update(**updates)
+
+
+def expected_task_counts() -> Dict[int, Dict[str, int]]:
+    """Count tasks per project and status with one `GROUP BY` as `{project id: {counter field: value}}`."""
+    counts: Dict[int, Dict[str, int]] = {}
+    rows = Task.objects.order_by().values_list('project_id', 'status').annotate(total=Count('id'))
+    for project_id, status, total in rows:
+        fields: Dict[str, int] = counts.setdefault(project_id, dict.fromkeys(COUNTER_FIELDS, 0))
+        if status in TASK_COUNT_FIELDS:
+            fields[TASK_COUNT_FIELDS[status]] += total
+        fields['total_tasks'] += total
+    return counts
+
+
+@transaction.atomic
+def rebuild_task_counts() -> int:
+    """
+    Recompute the task counters of every project and fix the ones that drifted.
+
+    Incremental updates miss task changes that bypass model signals
+    (`QuerySet.update`, `bulk_create`, raw SQL); this recounts them with one
+    aggregate query and rewrites only the projects whose counters differ.
+
+    Returns:
+        int: Number of corrected projects.
+    """
+    expected: Dict[int, Dict[str, int]] = expected_task_counts()
+    zero: Dict[str, int] = dict.fromkeys(COUNTER_FIELDS, 0)
+
+    stale: List[Project] = []
+    for project in Project.objects.select_for_update().only('pk', *COUNTER_FIELDS).iterator(chunk_size=BATCH_SIZE):
+        actual: Dict[str, int] = expected.get(project.pk, zero)
+        if any(getattr(project, field) != value for field, value in actual.items()):
+            for field, value in actual.items():
+                setattr(project, field, value)
+            stale.append(project)
+
+    Project.objects.bulk_update(stale, COUNTER_FIELDS, batch_size=BATCH_SIZE)
+    if stale:
+        logger.warning("Corrected task counters of %s projects", len(stale))
+    return len(stale)
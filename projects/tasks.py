@@ -0,0 +1,9 @@
+from celery import shared_task
+
+from .task_counts import rebuild_task_counts
+
+
+@shared_task
+def rebuild_project_task_counts() -> int:
+    """Nightly recount of the per-project task counters; returns the number of corrected projects."""
+    return rebuild_task_counts()
@@ -0,0 +1,127 @@
+import io
+from typing import Any, Dict
+
+import pytest
+from django.core.management import call_command
+from django.test import Client as DjangoTestClient
+from django.urls import reverse
+
+from projects.models import COUNTER_FIELDS, Project
+from projects.task_counts import rebuild_task_counts
+from tasks.models import Task
+
+
+def counters(project: Project) -> Dict[str, int]:
+    """Read the stored task counters of a project."""
+    return Project.objects.values(*COUNTER_FIELDS).get(pk=project.pk)
+
+
+def expect(todo: int = 0, in_progress: int = 0, done: int = 0, canceled: int = 0) -> Dict[str, int]:
+    """Counter values for the given number of tasks per status."""
+    return {
+        'todo_count': todo, 'in_progress_count': in_progress, 'done_count': done, 'canceled_count': canceled,
+        'total_tasks': todo + in_progress + done + canceled,
+    }
+
+
+@pytest.mark.django_db
+class TestProjectTaskCounters:
+    """Tests for the denormalized task counters on Project"""
+
+    def test_create_status_change_and_delete(self, project: Project) -> None:
+        """Counters follow task creation, status changes and deletion"""
+        task: Task = Task.objects.create(project=project, title="T", status='todo')
+        Task.objects.create(project=project, title="T2", status='done')
+        assert counters(project) == expect(todo=1, done=1)
+
+        task.status = 'in_progress'
+        task.save()
+        assert counters(project) == expect(in_progress=1, done=1)
+
+        task.delete()
+        assert counters(project) == expect(done=1)
+
+    def test_moving_task_to_another_project(self, project: Project) -> None:
+        """A task moved between projects leaves one counter and enters the other"""
+        other: Project = Project.objects.create(name="Other", client=project.client)
+        task: Task = Task.objects.create(project=project, title="T", status='todo')
+
+        task.project = other
+        task.status = 'done'
+        task.save()
+
+        assert counters(project) == expect()
+        assert counters(other) == expect(done=1)
+
+    def test_project_form_save_keeps_counters(self, client: DjangoTestClient, project: Project) -> None:
+        """Editing a project loaded before a task was added does not overwrite the counters"""
+        stale: Project = Project.objects.get(pk=project.pk)
+        Task.objects.create(project=project, title="T", status='todo')
+
+        stale.name = "Renamed"
+        stale.save()
+
+        assert counters(project) == expect(todo=1)
+        assert Project.objects.get(pk=project.pk).name == "Renamed"
+
+    def test_save_of_deleted_project_inserts_it_again(self, project: Project) -> None:
+        """A full save of a project deleted in the meantime re-inserts the row like any other model"""
+        Project.objects.filter(pk=project.pk).delete()
+
+        project.name = "Restored"
+        project.save()
+
+        assert Project.objects.get(pk=project.pk).name == "Restored"
+
+    def test_explicit_update_fields_are_written(self, project: Project) -> None:
+        """Fields the caller lists in update_fields are saved as given, counters included"""
+        project.name = "Renamed"
+        project.description = "Not saved"
+        project.total_tasks = 5
+        project.save(update_fields=['name', 'total_tasks'])
+
+        saved: Project = Project.objects.get(pk=project.pk)
+        assert (saved.name, saved.description, saved.total_tasks) == ("Renamed", "", 5)
+
+    def test_uncounted_task_deletion_does_not_go_negative(self, project: Project) -> None:
+        """Deleting a task created by bulk_create clamps the counters at zero"""
+        Task.objects.bulk_create([Task(project=project, title="Bulk", status='todo')])
+
+        Task.objects.get().delete()
+
+        assert counters(project) == expect()
+
+    def test_rebuild_fixes_drift(self, project: Project) -> None:
+        """The rebuild recounts changes made with bulk_create and QuerySet.update"""
+        Task.objects.create(project=project, title="Counted", status='todo')
+        Task.objects.bulk_create([Task(project=project, title=f"Bulk {i}", status='todo') for i in range(3)])
+        Task.objects.filter(title="Counted").update(status='canceled')
+        empty: Project = Project.objects.create(name="Empty", client=project.client)
+        Project.objects.filter(pk=empty.pk).update(done_count=5, total_tasks=5)
+
+        assert rebuild_task_counts() == 2
+        assert counters(project) == expect(todo=3, canceled=1)
+        assert counters(empty) == expect()
+        assert rebuild_task_counts() == 0
+
+    def test_rebuild_command(self, project: Project) -> None:
+        """The command reports how many projects were corrected"""
+        Task.objects.bulk_create([Task(project=project, title="Bulk", status='done')])
+        out = io.StringIO()
+
+        call_command('rebuild_project_task_counts', stdout=out)
+
+        assert "Corrected task counters of 1 projects" in out.getvalue()
+        assert counters(project) == expect(done=1)
+
+    def test_project_list_does_not_touch_tasks(self, client: DjangoTestClient, project: Project,
+                                               django_assert_num_queries: Any) -> None:
+        """The list page reads the counters from the project rows without joining tasks"""
+        for i in range(3):
+            Task.objects.create(project=project, title=f"T{i}", status='todo')
+
+        with django_assert_num_queries(1) as captured:
+            response = client.get(reverse('projects:list'))
+
+        assert response.context['projects'][0].todo_count == 3
+        assert 'tasks_task' not in captured.captured_queries[0]['sql']
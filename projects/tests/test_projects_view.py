@@ -4,6 +4,7 @@ from django.test import Client as DjangoTestClient
 from django.template.response import TemplateResponse
 from projects.models import Project
 from tasks.models import Task
+from invoices.models import Invoice
 from django.utils import timezone
 from datetime import timedelta, date
 from typing import Any, Dict, Final
@@ -59,6 +60,27 @@ class TestProjectViews:
         assert response.context['project'].name == project.name
         assert len(response.context['tasks']) == 1
 
+    def test_project_detail_query_budget(self, client: DjangoTestClient, project: Project,
+                                         django_assert_num_queries: Any) -> None:
+        """Verify the detail page runs the same number of queries however many rows it shows"""
+        project.client.telegram_chat_id = "12345"
+        project.client.save()
+        url: str = reverse('projects:detail', kwargs={'pk': project.pk})
+        yesterday: date = timezone.now().date() - timedelta(days=1)
+
+        for rows in (1, 4):
+            for i in range(rows):
+                Task.objects.create(project=project, title=f"Task {rows}-{i}", deadline=yesterday)
+                Invoice.objects.create(project=project, number=f"INV-{rows}-{i}", amount=100, due_date=yesterday)
+
+            # project + client, then COUNT and page for tasks and for invoices
+            with django_assert_num_queries(5):
+                response: TemplateResponse | Any = client.get(url)
+
+        assert all(task.overdue for task in response.context['tasks'])
+        assert response.context['can_send_telegram'] is True
+        assert b'sendToTelegram(event' in response.content
+
     def test_overdue_tasks_logic(self, client: DjangoTestClient, project: Project) -> None:
         """Verify the filtering logic for overdue tasks across projects"""
         today: date = timezone.now().date()
@@ -83,6 +105,15 @@ class TestProjectViews:
         assert response.context['total_overdue'] == 1
         assert response.context['page_obj'][0].title == "Overdue"
 
+    def test_overdue_total_counts_bulk_changes(self, client: DjangoTestClient, project: Project) -> None:
+        """Verify that the overdue total matches the list even for tasks created without signals"""
+        yesterday: date = timezone.now().date() - timedelta(days=1)
+        Task.objects.bulk_create([Task(project=project, title=f"Bulk {n}", deadline=yesterday) for n in range(3)])
+
+        response: TemplateResponse | Any = client.get(reverse('projects:overdue_tasks'))
+
+        assert response.context['total_overdue'] == 3
+
     def test_project_delete_post(self, client: DjangoTestClient, project: Project) -> None:
         """Verify successful project deletion via POST"""
         project_pk: int = project.pk
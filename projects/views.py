@@ -1,36 +1,36 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.core.paginator import Paginator, Page
-from django.db.models import Count, Q, QuerySet
+from django.db.models import QuerySet
 from django.utils import timezone
+from datetime import date
 from django.http import HttpRequest, HttpResponse
 from typing import Union, Any, Dict, Optional
 
 from .models import Project
 from .forms import ProjectForm
-from tasks.models import Task
+from crm.pagination import CursorPage, paginate
+from tasks.models import OPEN_TASK_STATUSES, Task
 
 ViewResponse = Union[HttpResponse, Any]
 
 def project_list(request: HttpRequest) -> ViewResponse:
-    """Display a list of projects with task statistics annotations."""
-    projects: QuerySet[Project] = Project.objects.all().order_by('-created_at').annotate(
-        todo_count=Count('tasks', filter=Q(tasks__status='todo')),
-        in_progress_count=Count('tasks', filter=Q(tasks__status='in_progress')),
-        done_count=Count('tasks', filter=Q(tasks__status='done')),
-        canceled_count=Count('tasks', filter=Q(tasks__status='canceled')),
-        total_tasks=Count('tasks'),
-    )
-
-    paginator: Paginator = Paginator(projects, 8)
-    page_number: Optional[str] = request.GET.get('page')
-    page_obj: Page = paginator.get_page(page_number)
+    """
+    Display a list of projects with task statistics, keyset-paginated like the client list.
+
+    The statistics are the denormalized counters on `Project` (see
+    `projects.task_counts`), so a page is one query on the project table
+    with no join or `GROUP BY` over tasks.
+    """
+    projects: QuerySet[Project] = Project.objects.select_related('client')
+    page_obj: Union[CursorPage, Page] = paginate(request, projects, ('-created_at', '-id'), 8)
 
     context: Dict[str, Any] = {
         'page_obj': page_obj,
         'projects': page_obj,
     }
-    return render(request, 'projects/list.html', context)
+    template: str = 'projects/_rows.html' if request.htmx else 'projects/list.html'
+    return render(request, template, context)
 
 
 def project_create(request: HttpRequest) -> ViewResponse:
@@ -53,14 +53,25 @@ def project_create(request: HttpRequest) -> ViewResponse:
 
 
 def project_detail(request: HttpRequest, pk: int) -> ViewResponse:
-    """Display detailed project information, including paginated tasks and invoices."""
-    project: Project = get_object_or_404(Project, pk=pk)
+    """
+    Display detailed project information, including paginated tasks and invoices.
+
+    The page renders in a fixed number of queries however many tasks and
+    invoices the project has: the client is joined to the project, and the
+    per-row flags (overdue task, Telegram button) are computed here once
+    instead of in the template, which would hit `timezone.now()` and
+    `invoice.project.client` on every row.
+    """
+    project: Project = get_object_or_404(Project.objects.select_related('client'), pk=pk)
+    today: date = timezone.now().date()
 
     # Tasks pagination
     tasks: QuerySet[Task] = project.tasks.all().order_by('deadline')
     task_paginator: Paginator = Paginator(tasks, 4)
     task_page_number: Optional[str] = request.GET.get('task_page')
     task_page_obj: Page = task_paginator.get_page(task_page_number)
+    for task in task_page_obj:
+        task.overdue = task.is_overdue_on(today)
 
     # Invoices pagination
     invoices: Any = project.invoices.all().order_by('-created_at')
@@ -70,11 +81,16 @@ def project_detail(request: HttpRequest, pk: int) -> ViewResponse:
 
     context: Dict[str, Any] = {
         'project': project,
+        'project_overdue': bool(
+            project.deadline and project.deadline < today and project.status not in ('done', 'canceled')
+        ),
         'page_obj': task_page_obj,
         'tasks': task_page_obj,
-        'today': timezone.now().date(),
+        'today': today,
         'invoices': invoice_page_obj,
         'invoice_paginator': invoice_paginator,
+        # Same client for every invoice row
+        'can_send_telegram': bool(project.client.telegram_chat_id),
     }
     return render(request, 'projects/detail.html', context)
 
@@ -106,21 +122,27 @@ def project_delete(request: HttpRequest, pk: int) -> ViewResponse:
 
 
 def overdue_tasks(request: HttpRequest) -> ViewResponse:
-    """Display a global list of overdue tasks across all projects."""
+    """
+    Display a global list of overdue tasks across all projects.
+
+    The keyset pages need no `COUNT(*)`; the total is one exact count that
+    the partial index on open tasks answers, so it always matches the list
+    (the dashboard counters lag behind bulk changes until reconciled).
+    """
     today: timezone.datetime.date = timezone.now().date()
 
     overdue_queryset: QuerySet[Task] = Task.objects.filter(
         deadline__lt=today,
-        status__in=['todo', 'in_progress']
-    ).select_related('project').order_by('deadline')
-
-    paginator: Paginator = Paginator(overdue_queryset, 12)
-    page_number: Optional[str] = request.GET.get('page')
-    page_obj: Page = paginator.get_page(page_number)
+        status__in=OPEN_TASK_STATUSES
+    ).select_related('project')
+    page_obj: Union[CursorPage, Page] = paginate(request, overdue_queryset, ('deadline', 'id'), 12)
 
     context: Dict[str, Any] = {
         'page_obj': page_obj,
-        'total_overdue': overdue_queryset.count(),
         'today': today,
     }
-    return render(request, 'projects/overdue.html', context)
\ No newline at end of file
+    if request.htmx:
+        return render(request, 'projects/_overdue_rows.html', context)
+
+    context['total_overdue'] = overdue_queryset.count()
+    return render(request, 'projects/overdue.html', context)
@@ -0,0 +1,9 @@
+from django.contrib import admin
+from .models import SearchEntry
+
+
+@admin.register(SearchEntry)
+class SearchEntryAdmin(admin.ModelAdmin):
+    list_display = ('kind', 'object_id', 'title', 'updated_at')
+    list_filter = ('kind',)
+    readonly_fields = ('kind', 'object_id', 'title', 'body', 'updated_at')
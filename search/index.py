@@ -0,0 +1,142 @@
+import logging
+from typing import Any, Callable, Dict, Iterator, List, Tuple, Type
+
+from django.db import IntegrityError, models, transaction
+from django.urls import reverse
+from django.utils import timezone
+
+from clients.models import Client
+from invoices.models import Invoice
+from projects.models import Project
+from tasks.models import Task
+
+from .models import SearchEntry
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+BATCH_SIZE: int = 2000
+
+
+def _join(*parts: Any) -> str:
+    return ' '.join(str(part) for part in parts if part)
+
+
+def client_document(client: Client) -> Tuple[str, str]:
+    """Clients are found by name, INN, email, phone and notes."""
+    return client.name, _join(client.inn, client.email, client.phone, client.telegram_chat_id, client.notes)
+
+
+def project_document(project: Project) -> Tuple[str, str]:
+    """Projects are found by name and description."""
+    return project.name, project.description
+
+
+def task_document(task: Task) -> Tuple[str, str]:
+    """Tasks are found by title and description."""
+    return task.title, task.description
+
+
+def invoice_document(invoice: Invoice) -> Tuple[str, str]:
+    """Invoices are found by number."""
+    return invoice.number, ''
+
+
+# model -> (kind, document builder, detail URL name)
+DOCUMENTS: Dict[Type[models.Model], Tuple[str, Callable[[Any], Tuple[str, str]], str]] = {
+    Client: ('client', client_document, 'clients:detail'),
+    Project: ('project', project_document, 'projects:detail'),
+    Task: ('task', task_document, 'tasks:detail'),
+    Invoice: ('invoice', invoice_document, 'invoices:update'),
+}
+
+URL_NAMES: Dict[str, str] = {kind: url_name for kind, _, url_name in DOCUMENTS.values()}
+
+
+def entry_url(entry: SearchEntry) -> str:
+    """Link to the page of the object behind a search entry."""
+    return reverse(URL_NAMES[entry.kind], args=[entry.object_id])
+
+
+def index_instance(instance: models.Model) -> None:
+    """
+    Create or refresh the search entry of a saved object.
+
+    The refresh is a single `UPDATE`; the entry is inserted only for new
+    objects. Runs in the caller's transaction.
+    """
+    kind, build, _ = DOCUMENTS[type(instance)]
+    title, body = build(instance)
+    title = (title or '')[:255]
+    entries = SearchEntry.objects.filter(kind=kind, object_id=instance.pk)
+    if entries.update(title=title, body=body or '', updated_at=timezone.now()):
+        return
+    try:
+        with transaction.atomic():
+            SearchEntry.objects.create(kind=kind, object_id=instance.pk, title=title, body=body or '')
+    except IntegrityError:
+        # Indexed concurrently by another writer
+        entries.update(title=title, body=body or '', updated_at=timezone.now())
+
+
+def remove_instance(instance: models.Model) -> None:
+    """Delete the search entry of a deleted object."""
+    kind, _, _ = DOCUMENTS[type(instance)]
+    SearchEntry.objects.filter(kind=kind, object_id=instance.pk).delete()
+
+
+def build_entry(instance: models.Model) -> SearchEntry:
+    """Build a fresh (unsaved) search entry for a saved object."""
+    kind, build, _ = DOCUMENTS[type(instance)]
+    title, body = build(instance)
+    return SearchEntry(kind=kind, object_id=instance.pk, title=(title or '')[:255], body=body or '')
+
+
+def build_entries(model: Type[models.Model]) -> Iterator[SearchEntry]:
+    """Yield fresh (unsaved) entries for every row of a model."""
+    for instance in model.objects.order_by().iterator(chunk_size=BATCH_SIZE):
+        yield build_entry(instance)
+
+
+def index_new_instances(instances: List[models.Model]) -> int:
+    """
+    Index objects that were just inserted with `bulk_create`.
+
+    `bulk_create` sends no signals, so its rows would stay unsearchable until
+    the next rebuild. Objects without a primary key (backends that cannot
+    return ids from bulk inserts) are skipped and need `rebuild_search_index`.
+
+    Returns:
+        int: Number of indexed objects.
+    """
+    entries: List[SearchEntry] = [build_entry(instance) for instance in instances if instance.pk is not None]
+    SearchEntry.objects.bulk_create(entries, batch_size=BATCH_SIZE)
+    return len(entries)
+
+
+@transaction.atomic
+def rebuild_index() -> Dict[str, int]:
+    """
+    Rebuild the whole search index from the source tables.
+
+    Changes that bypass model signals (`bulk_create`, `QuerySet.update`,
+    raw SQL) are not indexed; this recreates every entry.
+
+    Returns:
+        Dict[str, int]: Number of indexed objects per kind.
+    """
+    SearchEntry.objects.all().delete()
+    counts: Dict[str, int] = {}
+    for model, (kind, _, _) in DOCUMENTS.items():
+        batch: List[SearchEntry] = []
+        counts[kind] = 0
+        for entry in build_entries(model):
+            batch.append(entry)
+            if len(batch) >= BATCH_SIZE:
+                SearchEntry.objects.bulk_create(batch)
+                counts[kind] += len(batch)
+                batch = []
+        if batch:
+            SearchEntry.objects.bulk_create(batch)
+            counts[kind] += len(batch)
+    logger.info("Search index rebuilt: %s", counts)
+    return counts
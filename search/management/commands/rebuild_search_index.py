@@ -0,0 +1,23 @@
+from typing import Any, Dict
+
+from django.core.management.base import BaseCommand
+
+from search.index import rebuild_index
+
+
+class Command(BaseCommand):
+    """
+        Rebuild the search index from the client, project, task and invoice tables.
+
+        Needed after bulk imports or updates that bypass model signals.
+
+        Example:
+            python manage.py rebuild_search_index
+    """
+    help = "Reindex all clients, projects, tasks and invoices for the global search"
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        counts: Dict[str, int] = rebuild_index()
+        for kind, count in counts.items():
+            self.stdout.write(f"{kind}: {count}")
+        self.stdout.write(self.style.SUCCESS(f"Indexed {sum(counts.values())} objects"))
@@ -0,0 +1,115 @@
+# Generated by Django 5.2.10 on 2026-10-18 18:57
+
+from django.db import migrations, models
+
+FTS_TABLE = 'search_searchentry_fts'
+BATCH_SIZE = 2000
+
+SQLITE_FORWARD = [
+    # External-content FTS5 index over search_searchentry; prefix indexes serve type-ahead
+    f"""CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        title, body,
+        content='search_searchentry', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 0', prefix='2 3'
+    )""",
+    f"""CREATE TRIGGER search_searchentry_ai AFTER INSERT ON search_searchentry BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END""",
+    f"""CREATE TRIGGER search_searchentry_ad AFTER DELETE ON search_searchentry BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+    END""",
+    f"""CREATE TRIGGER search_searchentry_au AFTER UPDATE OF title, body ON search_searchentry BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO {FTS_TABLE}(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END""",
+]
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS search_searchentry_au",
+    "DROP TRIGGER IF EXISTS search_searchentry_ad",
+    "DROP TRIGGER IF EXISTS search_searchentry_ai",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+POSTGRES_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """ALTER TABLE search_searchentry ADD COLUMN document tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', title), 'A') || setweight(to_tsvector('simple', body), 'B')
+    ) STORED""",
+    "CREATE INDEX search_entry_document_gin ON search_searchentry USING gin (document)",
+    "CREATE INDEX search_entry_title_trgm ON search_searchentry USING gin (title gin_trgm_ops)",
+]
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS search_entry_title_trgm",
+    "DROP INDEX IF EXISTS search_entry_document_gin",
+    "ALTER TABLE search_searchentry DROP COLUMN IF EXISTS document",
+]
+
+
+def _run(schema_editor, statements):
+    for statement in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+def create_fulltext_index(apps, schema_editor):
+    """Create the FTS5 table (SQLite) or the tsvector/trigram indexes (PostgreSQL)."""
+    _run(schema_editor, {'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRES_FORWARD})
+
+
+def drop_fulltext_index(apps, schema_editor):
+    _run(schema_editor, {'sqlite': SQLITE_BACKWARD, 'postgresql': POSTGRES_BACKWARD})
+
+
+def fill_entries(apps, schema_editor):
+    """Index the existing clients, projects, tasks and invoices."""
+    SearchEntry = apps.get_model('search', 'SearchEntry')
+    sources = [
+        ('client', apps.get_model('clients', 'Client'),
+         lambda c: (c.name, ' '.join(filter(None, [c.email, c.phone, c.telegram_chat_id, c.notes])))),
+        ('project', apps.get_model('projects', 'Project'), lambda p: (p.name, p.description)),
+        ('task', apps.get_model('tasks', 'Task'), lambda t: (t.title, t.description)),
+        ('invoice', apps.get_model('invoices', 'Invoice'), lambda i: (i.number, '')),
+    ]
+    for kind, model, build in sources:
+        # Written every BATCH_SIZE rows, so memory does not grow with the table
+        entries = []
+        for obj in model.objects.order_by().iterator(chunk_size=BATCH_SIZE):
+            title, body = build(obj)
+            entries.append(SearchEntry(kind=kind, object_id=obj.pk, title=(title or '')[:255], body=body or ''))
+            if len(entries) >= BATCH_SIZE:
+                SearchEntry.objects.bulk_create(entries)
+                entries = []
+        if entries:
+            SearchEntry.objects.bulk_create(entries)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('clients', '0007_client_client_created_id_idx'),
+        ('invoices', '0006_invoice_invoice_project_created_idx'),
+        ('projects', '0004_project_project_created_id_idx'),
+        ('tasks', '0005_task_open_deadline_id_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('client', 'Клиент'), ('project', 'Проект'), ('task', 'Задача'), ('invoice', 'Счёт')], max_length=20, verbose_name='Тип')),
+                ('object_id', models.PositiveBigIntegerField(verbose_name='ID объекта')),
+                ('title', models.CharField(max_length=255, verbose_name='Заголовок')),
+                ('body', models.TextField(blank=True, verbose_name='Текст')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Обновлено')),
+            ],
+            options={
+                'verbose_name': 'Запись поиска',
+                'verbose_name_plural': 'Записи поиска',
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id'), name='search_entry_kind_object_uniq')],
+            },
+        ),
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+        migrations.RunPython(fill_entries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+from typing import List, Tuple
+
+from django.db import models
+
+
+class SearchEntry(models.Model):
+    """
+        One searchable document: a client, project, task or invoice.
+
+        The rows are the single source the full-text index is built from.
+        On SQLite an FTS5 table mirrors them through triggers, on PostgreSQL
+        a generated `tsvector` column with a GIN index and a trigram index
+        on the title are added by the migration; the model itself holds only
+        portable fields.
+
+        Attributes:
+            kind: Type of the indexed object.
+            object_id: Primary key of the indexed object.
+            title: Main text shown in the results (name, title or number).
+            body: Secondary searchable text (email, phone, description...).
+            updated_at: When the entry was last reindexed.
+    """
+    KIND_CHOICES: List[Tuple[str, str]] = [
+        ('client', 'Клиент'),
+        ('project', 'Проект'),
+        ('task', 'Задача'),
+        ('invoice', 'Счёт'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, verbose_name="Тип")
+    object_id = models.PositiveBigIntegerField(verbose_name="ID объекта")
+    title = models.CharField(max_length=255, verbose_name="Заголовок")
+    body = models.TextField(blank=True, verbose_name="Текст")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Обновлено")
+
+    class Meta:
+        verbose_name = "Запись поиска"
+        verbose_name_plural = "Записи поиска"
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='search_entry_kind_object_uniq'),
+        ]
+
+    def __str__(self) -> str:
+        """Return the kind and the title"""
+        return f"{self.get_kind_display()}: {self.title}"
@@ -0,0 +1,31 @@
+from typing import Any
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from clients.models import Client
+from invoices.models import Invoice
+from projects.models import Project
+from tasks.models import Task
+from .index import index_instance, remove_instance
+
+
+@receiver(post_save, sender=Client)
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=Invoice)
+def update_search_entry(sender: Any, instance: Any, raw: bool = False, **kwargs: Any) -> None:
+    """Reindex the object in the same transaction as its change."""
+    if raw:
+        # Fixture loading: the rows are indexed by rebuild_search_index
+        return
+    index_instance(instance)
+
+
+@receiver(post_delete, sender=Client)
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=Invoice)
+def delete_search_entry(sender: Any, instance: Any, **kwargs: Any) -> None:
+    """Drop the object from the index, including rows removed by cascade."""
+    remove_instance(instance)
@@ -0,0 +1,110 @@
+from importlib import import_module
+from typing import Any, List
+
+import pytest
+from django.apps import apps
+from django.utils import timezone
+
+from clients.models import Client
+from invoices.models import Invoice
+from projects.models import Project
+from search.backends import SearchBackend, search, tokenize
+from search.index import entry_url, rebuild_index
+from search.models import SearchEntry
+from tasks.models import Task
+
+
+def titles(query: str) -> List[str]:
+    return [entry.title for entry in search(query)]
+
+
+@pytest.mark.django_db
+class TestSearchIndex:
+    """Tests for keeping the search index in sync and querying it"""
+
+    def test_client_found_by_name_email_and_phone(self) -> None:
+        """A client is found by a name prefix, an email part and a phone prefix"""
+        Client.objects.create(name="Иванов Сергей", email="sergey@example.com", phone="79991112233")
+        Client.objects.create(name="Петров", email="petrov@example.com")
+
+        assert titles("иван") == ["Иванов Сергей"]
+        assert titles("sergey@example") == ["Иванов Сергей"]
+        assert titles("7999") == ["Иванов Сергей"]
+
+    def test_all_words_must_match(self) -> None:
+        """Every word of the query narrows the results"""
+        Client.objects.create(name="Alpha Studio")
+        Client.objects.create(name="Alpha Bank")
+
+        assert titles("alpha ban") == ["Alpha Bank"]
+
+    def test_projects_tasks_and_invoices_are_indexed(self, project: Project) -> None:
+        """All four kinds of objects are searchable and link to their pages"""
+        task: Task = Task.objects.create(project=project, title="Сверстать лендинг", description="макет")
+        invoice: Invoice = Invoice.objects.create(
+            project=project, number="INV-2026-042", amount=100, due_date=timezone.now().date()
+        )
+
+        (task_entry,) = search("лендинг")
+        (invoice_entry,) = search("2026 042")
+
+        assert task_entry.kind == 'task'
+        assert entry_url(task_entry) == f"/tasks/tasks/{task.pk}/"
+        assert invoice_entry.object_id == invoice.pk
+        assert titles("fixture project") == ["Fixture Project"]
+
+    def test_update_and_delete_keep_index_in_sync(self) -> None:
+        """Renaming reindexes the object, deleting removes it, including cascades"""
+        client: Client = Client.objects.create(name="Old Name")
+        project: Project = Project.objects.create(name="Cascade Project", client=client)
+
+        client.name = "New Name"
+        client.save()
+        assert titles("old") == []
+        assert titles("new") == ["New Name"]
+
+        client.delete()
+        assert titles("new") == []
+        assert titles("cascade") == []
+        assert not SearchEntry.objects.filter(kind='project', object_id=project.pk).exists()
+
+    def test_rebuild_index_covers_bulk_created_rows(self) -> None:
+        """Rows created without signals are indexed by the rebuild"""
+        Client.objects.bulk_create([Client(name=f"Bulk {i}") for i in range(3)])
+        assert titles("bulk") == []
+
+        counts = rebuild_index()
+
+        assert counts['client'] == 3
+        assert len(titles("bulk")) == 3
+
+    def test_migration_fills_index_in_batches(self, monkeypatch: Any) -> None:
+        """The initial migration writes entries every BATCH_SIZE rows instead of one list per table"""
+        migration: Any = import_module('search.migrations.0001_initial')
+        monkeypatch.setattr(migration, 'BATCH_SIZE', 2)
+        Client.objects.bulk_create([Client(name=f"Old {i}") for i in range(5)])
+        batches: List[int] = []
+        bulk_create = SearchEntry.objects.bulk_create
+
+        def record(entries: List[SearchEntry], *args: Any, **kwargs: Any) -> Any:
+            batches.append(len(entries))
+            return bulk_create(entries, *args, **kwargs)
+
+        monkeypatch.setattr(SearchEntry.objects, 'bulk_create', record)
+        migration.fill_entries(apps, None)
+
+        assert max(batches) == 2
+        assert len(titles("old")) == 5
+
+    def test_backend_must_implement_search(self) -> None:
+        """SearchBackend is abstract"""
+        with pytest.raises(TypeError):
+            SearchBackend()
+
+    def test_query_operators_are_not_interpreted(self) -> None:
+        """FTS syntax in user input is treated as plain words"""
+        Client.objects.create(name="Acme")
+
+        assert tokenize('"ac* OR -(x') == ['ac', 'or', 'x']
+        assert titles('"acme') == ["Acme"]
+        assert titles('***') == []
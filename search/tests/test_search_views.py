@@ -0,0 +1,45 @@
+import pytest
+from django.test import Client as DjangoTestClient
+from django.urls import reverse
+
+from clients.models import Client
+
+
+@pytest.mark.django_db
+class TestSearchViews:
+    """Tests for the global search page and the HTMX type-ahead"""
+
+    def test_results_page(self, client: DjangoTestClient) -> None:
+        """The full page lists matches with links to the objects"""
+        target: Client = Client.objects.create(name="Searchable Client")
+
+        response = client.get(reverse('search:search'), {'q': 'searchable'})
+
+        assert response.status_code == 200
+        assert [entry.title for entry in response.context['results']] == ["Searchable Client"]
+        assert reverse('clients:detail', args=[target.pk]).encode() in response.content
+        assert b'<html' in response.content
+
+    def test_typeahead_returns_dropdown_only(self, client: DjangoTestClient) -> None:
+        """HTMX requests get the dropdown fragment"""
+        Client.objects.create(name="Typeahead Client")
+
+        response = client.get(reverse('search:search'), {'q': 'type'}, HTTP_HX_REQUEST='true')
+
+        assert b'<html' not in response.content
+        assert b'Typeahead Client' in response.content
+
+    def test_short_query_closes_dropdown(self, client: DjangoTestClient) -> None:
+        """One-letter type-ahead queries return an empty body without searching"""
+        Client.objects.create(name="Typeahead Client")
+
+        response = client.get(reverse('search:search'), {'q': 't'}, HTTP_HX_REQUEST='true')
+
+        assert response.status_code == 200
+        assert response.content == b''
+
+    def test_search_box_in_layout(self, client: DjangoTestClient) -> None:
+        """Every page has the type-ahead box"""
+        response = client.get(reverse('dashboard'))
+
+        assert b'hx-get="/search/"' in response.content
@@ -0,0 +1,8 @@
+from django.urls import path
+from .views import global_search
+
+app_name = 'search'
+
+urlpatterns = [
+    path('', global_search, name='search'),
+]
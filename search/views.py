@@ -0,0 +1,38 @@
+from typing import Any, Dict, List
+
+from django.http import HttpRequest, HttpResponse
+from django.shortcuts import render
+
+from .backends import search
+from .index import entry_url
+from .models import SearchEntry
+
+# Shorter queries match too much to be useful in type-ahead
+MIN_QUERY_LENGTH: int = 2
+TYPEAHEAD_LIMIT: int = 8
+PAGE_LIMIT: int = 50
+
+
+def global_search(request: HttpRequest) -> HttpResponse:
+    """
+    Search clients, projects, tasks and invoices.
+
+    HTMX requests from the type-ahead box in the header get only the
+    dropdown; a normal request (Enter in the box) renders the results page.
+    """
+    query: str = request.GET.get('q', '').strip()
+    if request.htmx and len(query) < MIN_QUERY_LENGTH:
+        # Empty body closes the dropdown
+        return HttpResponse('')
+    limit: int = TYPEAHEAD_LIMIT if request.htmx else PAGE_LIMIT
+
+    entries: List[SearchEntry] = search(query, limit) if len(query) >= MIN_QUERY_LENGTH else []
+    for entry in entries:
+        entry.url = entry_url(entry)
+
+    context: Dict[str, Any] = {
+        'query': query,
+        'results': entries,
+    }
+    template: str = 'search/_results.html' if request.htmx else 'search/results.html'
+    return render(request, template, context)
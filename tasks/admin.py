@@ -1,8 +1,8 @@
 from django.contrib import admin
-from .models import Task
-
-from django.contrib import admin
-from .models import Task
+from django.db.models import OuterRef, Subquery
+from clients.models import Client
+from .models import Task, DeadLetterMessage
+from .tasks import send_telegram
 
 @admin.register(Task)
 class TaskAdmin(admin.ModelAdmin):
@@ -15,4 +15,44 @@ class TaskAdmin(admin.ModelAdmin):
     def is_overdue(self, obj):
         return obj.is_overdue
     is_overdue.boolean = True
-    is_overdue.short_description = 'Просрочена'
\ No newline at end of file
+    is_overdue.short_description = 'Просрочена'
+
+
+@admin.register(DeadLetterMessage)
+class DeadLetterMessageAdmin(admin.ModelAdmin):
+    list_display = ('method', 'chat_id', 'client', 'attempts', 'created_at')
+    list_filter = ('method',)
+    search_fields = ('chat_id', 'error')
+    readonly_fields = ('created_at',)
+    actions = ('resend',)
+
+    def get_queryset(self, request):
+        # Client names of the whole page in the same query, by the indexed chat id
+        clients = Client.objects.filter(telegram_chat_id=OuterRef('chat_id')).order_by('-created_at')
+        return super().get_queryset(request).annotate(client_name=Subquery(clients.values('name')[:1]))
+
+    def client(self, obj):
+        return obj.client_name or '—'
+    client.short_description = 'Клиент'
+
+    def resend(self, request, queryset):
+        # Queued again as new sends; a failed one comes back here as a new row
+        from invoices.views import send_invoice_to_telegram
+
+        count = 0
+        for letter in queryset:
+            payload = letter.payload
+            if 'invoice_id' in payload:
+                send_invoice_to_telegram.delay(payload['invoice_id'], letter.chat_id)
+            else:
+                send_telegram.delay(
+                    chat_id=letter.chat_id,
+                    text=payload.get('text'),
+                    filename=payload.get('filename'),
+                    caption=payload.get('caption'),
+                    document_ref=payload.get('document_ref'),
+                )
+            letter.delete()
+            count += 1
+        self.message_user(request, f"Отправлено повторно: {count}")
+    resend.short_description = 'Отправить повторно'
@@ -0,0 +1,170 @@
+import io
+import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import BinaryIO, Optional, Union
+
+from django.conf import settings
+
+# References are generated by `put`; anything else is rejected before touching storage
+_REF_RE = re.compile(r'^[0-9a-f]{32}$')
+
+
+class BlobNotFound(Exception):
+    """The referenced blob expired or was already consumed."""
+
+
+def _check_ref(ref: str) -> str:
+    if not _REF_RE.match(ref or ''):
+        raise BlobNotFound(f"Invalid blob reference: {ref!r}")
+    return ref
+
+
+class FileBlobStore:
+    """
+        Blob store on a local or shared directory.
+
+        Used to hand large documents (rendered PDFs) from one Celery task to
+        another: the producer writes the bytes here and enqueues only the
+        short reference, the consumer opens the file and streams it into the
+        upload. Blobs older than `ttl` seconds are swept on write.
+
+        Attributes:
+            directory: Directory holding the blobs.
+            ttl: Lifetime of a blob in seconds.
+    """
+
+    def __init__(self, directory: Union[str, Path], ttl: int) -> None:
+        self.directory: Path = Path(directory)
+        self.ttl: int = ttl
+        self._last_sweep: float = 0.0
+        self._lock: threading.Lock = threading.Lock()
+
+    def _path(self, ref: str) -> Path:
+        return self.directory / f"{_check_ref(ref)}.blob"
+
+    def put(self, content: bytes) -> str:
+        """Store bytes atomically and return their reference."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        ref: str = uuid.uuid4().hex
+
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as tmp_file:
+            tmp_file.write(content)
+        os.replace(tmp_name, self._path(ref))
+
+        self._sweep()
+        return ref
+
+    def open(self, ref: str) -> BinaryIO:
+        """
+        Open a blob for reading.
+
+        Raises:
+            BlobNotFound: If the blob does not exist (expired or deleted).
+        """
+        try:
+            return open(self._path(ref), 'rb')
+        except FileNotFoundError:
+            raise BlobNotFound(f"Blob {ref} not found") from None
+
+    def delete(self, ref: str) -> None:
+        """Remove a blob once it has been delivered."""
+        try:
+            self._path(ref).unlink()
+        except FileNotFoundError:
+            pass
+
+    def purge_expired(self) -> int:
+        """Delete blobs older than `ttl` and return how many were removed."""
+        removed: int = 0
+        deadline: float = time.time() - self.ttl
+        for path in self.directory.glob('*.blob'):
+            try:
+                if path.stat().st_mtime < deadline:
+                    path.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                continue
+        return removed
+
+    def _sweep(self) -> None:
+        """Purge expired blobs at most once a minute."""
+        with self._lock:
+            now: float = time.monotonic()
+            if now - self._last_sweep < 60:
+                return
+            self._last_sweep = now
+        self.purge_expired()
+
+
+class RedisBlobStore:
+    """
+        Blob store in Redis with a per-key TTL, for workers without a shared disk.
+
+        Attributes:
+            ttl: Lifetime of a blob in seconds.
+            key_prefix: Prefix of the Redis keys.
+    """
+
+    def __init__(self, redis_url: str, ttl: int, key_prefix: str = 'blob') -> None:
+        import redis
+
+        self.ttl: int = ttl
+        self.key_prefix: str = key_prefix
+        self._redis = redis.Redis.from_url(redis_url)
+
+    def _key(self, ref: str) -> str:
+        return f"{self.key_prefix}:{_check_ref(ref)}"
+
+    def put(self, content: bytes) -> str:
+        """Store bytes with the configured TTL and return their reference."""
+        ref: str = uuid.uuid4().hex
+        self._redis.set(self._key(ref), content, ex=self.ttl)
+        return ref
+
+    def open(self, ref: str) -> BinaryIO:
+        """
+        Open a blob for reading.
+
+        Raises:
+            BlobNotFound: If the key expired or was deleted.
+        """
+        content: Optional[bytes] = self._redis.get(self._key(ref))
+        if content is None:
+            raise BlobNotFound(f"Blob {ref} not found")
+        return io.BytesIO(content)
+
+    def delete(self, ref: str) -> None:
+        """Remove a blob once it has been delivered."""
+        self._redis.delete(self._key(ref))
+
+
+BlobStore = Union[FileBlobStore, RedisBlobStore]
+
+_store: Optional[BlobStore] = None
+_store_config: Optional[tuple] = None
+_store_lock: threading.Lock = threading.Lock()
+
+
+def get_blob_store() -> BlobStore:
+    """Return the process-wide blob store configured from Django settings."""
+    global _store, _store_config
+    config: tuple = (
+        settings.TELEGRAM_BLOB_BACKEND,
+        str(settings.TELEGRAM_BLOB_DIR),
+        settings.TELEGRAM_BLOB_TTL,
+    )
+    with _store_lock:
+        if _store is None or _store_config != config:
+            backend, directory, ttl = config
+            if backend == 'redis':
+                _store = RedisBlobStore(settings.REDIS_URL, ttl)
+            else:
+                _store = FileBlobStore(directory, ttl)
+            _store_config = config
+        return _store
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.10 on 2026-10-18 18:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0002_alter_task_options_rename_name_task_title_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeadLetterMessage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('chat_id', models.CharField(max_length=50, verbose_name='Chat ID')),
+                ('method', models.CharField(max_length=50, verbose_name='Метод')),
+                ('payload', models.JSONField(default=dict, verbose_name='Параметры')),
+                ('error', models.TextField(verbose_name='Ошибка')),
+                ('attempts', models.PositiveIntegerField(default=1, verbose_name='Попыток')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Создано')),
+            ],
+            options={
+                'verbose_name': 'Недоставленное сообщение',
+                'verbose_name_plural': 'Недоставленные сообщения',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.10 on 2026-10-18 18:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0003_project_project_status_created_idx'),
+        ('tasks', '0003_deadlettermessage'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['status', 'deadline'], name='task_status_deadline_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('status__in', ('todo', 'in_progress'))), fields=['deadline'], name='task_open_deadline_idx'),
+        ),
+    ]
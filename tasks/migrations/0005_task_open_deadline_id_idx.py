@@ -0,0 +1,22 @@
+# Generated by Django 5.2.10 on 2026-10-18 18:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0004_project_project_created_id_idx'),
+        ('tasks', '0004_task_task_status_deadline_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_open_deadline_idx',
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('status__in', ('todo', 'in_progress'))), fields=['deadline', 'id'], name='task_open_deadline_idx'),
+        ),
+    ]
@@ -4,6 +4,10 @@ from django.utils import timezone
 from typing import List, Tuple, Optional
 from datetime import date
 
+# Statuses of tasks that still need work; such tasks past their deadline are overdue
+OPEN_TASK_STATUSES: Tuple[str, ...] = ('todo', 'in_progress')
+
+
 class Task(models.Model):
     """
         Represents an atomic unit of work within a Project.
@@ -37,6 +41,17 @@ class Task(models.Model):
         verbose_name = "Задача"
         verbose_name_plural = "Задачи"
         ordering = ['deadline', '-created_at']
+        indexes = [
+            # Overdue / due-tomorrow lookups: status equality + deadline range
+            models.Index(fields=['status', 'deadline'], name='task_status_deadline_idx'),
+            # Only unfinished tasks can be overdue; a partial index keeps the hot path small.
+            # `id` makes it match the keyset ordering of the overdue page.
+            models.Index(
+                fields=['deadline', 'id'],
+                condition=models.Q(status__in=OPEN_TASK_STATUSES),
+                name='task_open_deadline_idx',
+            ),
+        ]
 
     def __str__(self) -> str:
         """Return the task title and its associated project name."""
@@ -55,9 +70,49 @@ class Task(models.Model):
         Returns:
             bool: True if the task is overdue, False otherwise.
         """
-        current_date: date = timezone.now().date()
+        return self.is_overdue_on(timezone.now().date())
+
+    def is_overdue_on(self, current_date: date) -> bool:
+        """
+        Same check as `is_overdue` against a given date.
+
+        Lets a list compute the flag for many rows with a single "today".
+        """
         return bool(
             self.deadline and
             self.deadline < current_date and
             self.status != 'done'
-        )
\ No newline at end of file
+        )
+
+
+class DeadLetterMessage(models.Model):
+    """
+        Telegram message that could not be delivered after all retries.
+
+        Failed sends are kept here instead of being lost, so they can be
+        inspected and re-sent from the admin (the "Отправить повторно"
+        action queues them again and removes them from the store).
+
+        Attributes:
+            chat_id: Target Telegram chat.
+            method: Bot API method (sendMessage or sendDocument).
+            payload: Message parameters (text, caption, filename).
+            error: Last error reported by Telegram or the network layer.
+            attempts: Number of delivery attempts made.
+            created_at: When the message was moved to the dead-letter store.
+    """
+    chat_id = models.CharField(max_length=50, verbose_name="Chat ID")
+    method = models.CharField(max_length=50, verbose_name="Метод")
+    payload = models.JSONField(default=dict, verbose_name="Параметры")
+    error = models.TextField(verbose_name="Ошибка")
+    attempts = models.PositiveIntegerField(default=1, verbose_name="Попыток")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Создано")
+
+    class Meta:
+        verbose_name = "Недоставленное сообщение"
+        verbose_name_plural = "Недоставленные сообщения"
+        ordering = ['-created_at']
+
+    def __str__(self) -> str:
+        """Return the method and target chat"""
+        return f"{self.method} → {self.chat_id}"
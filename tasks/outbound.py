@@ -0,0 +1,126 @@
+import logging
+import time
+from typing import Any, Dict, Optional
+
+import requests
+from celery import Task as CeleryTask
+from django.conf import settings
+
+from clients.lookup import get_client_by_chat
+from clients.models import Client
+from .models import DeadLetterMessage
+from .ratelimit import ChatId, get_rate_limiter
+from .telegram import DocumentContent, TelegramAPIError, get_telegram_client
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+class RetryLater(Exception):
+    """
+        Delivery should be retried after `delay` seconds.
+
+        Raised when the rate limiter asks for a long wait, when Telegram
+        answers 429 with `retry_after`, or on transient network/server errors.
+    """
+
+    def __init__(self, delay: float, reason: str) -> None:
+        super().__init__(reason)
+        self.delay: float = delay
+
+
+def wait_for_slot(chat_id: ChatId) -> None:
+    """
+    Block until the global and per-chat buckets allow a send.
+
+    Short waits are slept in place so throughput stays right at the limit;
+    waits longer than `TELEGRAM_RATE_MAX_WAIT` are handed back to Celery.
+    """
+    limiter = get_rate_limiter()
+    wait: float = limiter.acquire(chat_id)
+    while wait > 0:
+        if wait > settings.TELEGRAM_RATE_MAX_WAIT:
+            raise RetryLater(wait, f"Rate limit for chat {chat_id}, wait {wait:.1f}s")
+        time.sleep(wait)
+        wait = limiter.acquire(chat_id)
+
+
+def deliver(
+        chat_id: ChatId,
+        text: Optional[str] = None,
+        document: Optional[DocumentContent] = None,
+        filename: Optional[str] = None,
+        caption: Optional[str] = None,
+) -> Any:
+    """
+    Send one message or document within Telegram's rate limits.
+
+    Returns:
+        The `result` object of the Bot API call.
+
+    Raises:
+        RetryLater: If the message should be retried later.
+        TelegramAPIError: On permanent API errors (e.g. chat not found).
+    """
+    wait_for_slot(chat_id)
+    client = get_telegram_client()
+
+    try:
+        if document is not None:
+            return client.send_document(
+                chat_id,
+                document,
+                filename=filename or 'file.pdf',
+                caption=caption,
+                # Using HTML for caption if explicitly requested via structure
+                parse_mode='HTML' if caption else None,
+            )
+        return client.send_message(
+            chat_id,
+            text or 'Сообщение без текста',
+            parse_mode='HTML' if caption else 'Markdown',
+        )
+    except TelegramAPIError as exc:
+        if exc.retry_after:
+            get_rate_limiter().penalize(chat_id, exc.retry_after)
+            raise RetryLater(exc.retry_after, str(exc)) from exc
+        if exc.error_code and exc.error_code >= 500:
+            raise RetryLater(settings.TELEGRAM_RETRY_DELAY, str(exc)) from exc
+        raise
+    except requests.RequestException as exc:
+        raise RetryLater(settings.TELEGRAM_RETRY_DELAY, str(exc)) from exc
+
+
+def store_dead_letter(chat_id: ChatId, method: str, payload: Dict[str, Any], error: str, attempts: int) -> DeadLetterMessage:
+    """Persist a message that could not be delivered."""
+    client: Optional[Client] = get_client_by_chat(chat_id)
+    logger.warning(
+        "Telegram %s to %s (%s) moved to dead letters: %s",
+        method, chat_id, client.name if client else "no client", error,
+    )
+    return DeadLetterMessage.objects.create(
+        chat_id=str(chat_id),
+        method=method,
+        payload=payload,
+        error=error,
+        attempts=attempts,
+    )
+
+
+def retry_or_dead_letter(
+        task: CeleryTask,
+        exc: RetryLater,
+        chat_id: ChatId,
+        method: str,
+        payload: Dict[str, Any],
+) -> str:
+    """
+    Schedule a Celery retry honoring `exc.delay`, or dead-letter the message.
+
+    Raises:
+        celery.exceptions.Retry: When a retry was scheduled.
+    """
+    if not task.request.called_directly and task.request.retries < task.max_retries:
+        raise task.retry(exc=exc, countdown=exc.delay)
+
+    store_dead_letter(chat_id, method, payload, str(exc), task.request.retries + 1)
+    return f"Ошибка отправки: {exc}"
@@ -0,0 +1,170 @@
+import threading
+import time
+from typing import Dict, Optional, Tuple, Union
+
+from django.conf import settings
+
+ChatId = Union[int, str]
+
+# Atomically refills the global and the per-chat bucket and takes one token
+# from both, or returns how long to wait without taking anything.
+# KEYS: global bucket, chat bucket. ARGV: global rate, global capacity,
+# chat rate, chat capacity, penalty seconds (0 = acquire, >0 = block chat).
+_ACQUIRE_LUA: str = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+
+local function load(key, rate, capacity)
+    local data = redis.call('HMGET', key, 'tokens', 'ts')
+    local tokens = tonumber(data[1]) or capacity
+    local ts = tonumber(data[2]) or now
+    return math.min(capacity, tokens + math.max(0, now - ts) * rate)
+end
+
+local function store(key, tokens, rate, capacity)
+    redis.call('HSET', key, 'tokens', tostring(tokens), 'ts', tostring(now))
+    local ttl = math.ceil(((capacity - tokens) / rate + 1) * 1000)
+    redis.call('PEXPIRE', key, math.max(ttl, 1000))
+end
+
+local g_rate, g_cap = tonumber(ARGV[1]), tonumber(ARGV[2])
+local c_rate, c_cap = tonumber(ARGV[3]), tonumber(ARGV[4])
+local penalty = tonumber(ARGV[5])
+
+local g = load(KEYS[1], g_rate, g_cap)
+local c = load(KEYS[2], c_rate, c_cap)
+
+if penalty > 0 then
+    store(KEYS[2], math.min(c, -penalty * c_rate), c_rate, c_cap)
+    return '0'
+end
+
+local wait = 0
+if g < 1 then wait = math.max(wait, (1 - g) / g_rate) end
+if c < 1 then wait = math.max(wait, (1 - c) / c_rate) end
+
+if wait == 0 then
+    store(KEYS[1], g - 1, g_rate, g_cap)
+    store(KEYS[2], c - 1, c_rate, c_cap)
+end
+return tostring(wait)
+"""
+
+
+class TelegramRateLimiter:
+    """
+        Token buckets matching Telegram's limits: one global, one per chat.
+
+        `acquire(chat_id)` either takes a token from both buckets and returns
+        0, or returns the number of seconds until both have a token again
+        (taking nothing). `penalize` empties a chat bucket for the
+        `retry_after` period reported by a 429 response.
+
+        Buckets live in process memory or, for several Celery workers, in
+        Redis, where a Lua script keeps the check-and-take atomic.
+
+        Attributes:
+            global_rate: Messages per second across all chats.
+            chat_rate: Messages per second to a single chat.
+    """
+
+    def __init__(
+            self,
+            global_rate: float = 30.0,
+            chat_rate: float = 1.0,
+            redis_url: Optional[str] = None,
+            key_prefix: str = 'tg:rate',
+    ) -> None:
+        self.global_rate: float = global_rate
+        self.chat_rate: float = chat_rate
+        self.global_capacity: float = max(global_rate, 1.0)
+        self.chat_capacity: float = max(chat_rate, 1.0)
+        self.key_prefix: str = key_prefix
+
+        self._lock: threading.Lock = threading.Lock()
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._script = None
+        if redis_url:
+            import redis
+
+            self._script = redis.Redis.from_url(redis_url).register_script(_ACQUIRE_LUA)
+
+    def _keys(self, chat_id: ChatId) -> Tuple[str, str]:
+        return f"{self.key_prefix}:global", f"{self.key_prefix}:chat:{chat_id}"
+
+    def _run_script(self, chat_id: ChatId, penalty: float) -> float:
+        result = self._script(keys=list(self._keys(chat_id)), args=[
+            self.global_rate, self.global_capacity, self.chat_rate, self.chat_capacity, penalty,
+        ])
+        return float(result)
+
+    def _refill(self, key: str, rate: float, capacity: float, now: float) -> float:
+        tokens, ts = self._buckets.get(key, (capacity, now))
+        return min(capacity, tokens + max(0.0, now - ts) * rate)
+
+    def acquire(self, chat_id: ChatId) -> float:
+        """Take a send slot for the chat; return 0 on success or seconds to wait."""
+        if self._script is not None:
+            return self._run_script(chat_id, 0)
+
+        global_key, chat_key = self._keys(chat_id)
+        with self._lock:
+            now: float = time.monotonic()
+            global_tokens: float = self._refill(global_key, self.global_rate, self.global_capacity, now)
+            chat_tokens: float = self._refill(chat_key, self.chat_rate, self.chat_capacity, now)
+
+            wait: float = 0.0
+            if global_tokens < 1:
+                wait = max(wait, (1 - global_tokens) / self.global_rate)
+            if chat_tokens < 1:
+                wait = max(wait, (1 - chat_tokens) / self.chat_rate)
+
+            if wait == 0:
+                self._buckets[global_key] = (global_tokens - 1, now)
+                self._buckets[chat_key] = (chat_tokens - 1, now)
+                self._prune(now)
+            return wait
+
+    def penalize(self, chat_id: ChatId, seconds: float) -> None:
+        """Block the chat for `seconds` (honoring a 429 `retry_after`)."""
+        if self._script is not None:
+            self._run_script(chat_id, seconds)
+            return
+
+        _, chat_key = self._keys(chat_id)
+        with self._lock:
+            now: float = time.monotonic()
+            tokens: float = self._refill(chat_key, self.chat_rate, self.chat_capacity, now)
+            self._buckets[chat_key] = (min(tokens, -seconds * self.chat_rate), now)
+
+    def _prune(self, now: float) -> None:
+        """Forget idle chat buckets so memory does not grow with every chat ever seen."""
+        if len(self._buckets) < 10000:
+            return
+        for key, (tokens, ts) in list(self._buckets.items()):
+            if tokens + (now - ts) * self.chat_rate >= self.chat_capacity:
+                del self._buckets[key]
+
+
+_limiter: Optional[TelegramRateLimiter] = None
+_limiter_lock: threading.Lock = threading.Lock()
+
+
+def get_rate_limiter() -> TelegramRateLimiter:
+    """Return the process-wide limiter configured from Django settings."""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = TelegramRateLimiter(
+                global_rate=settings.TELEGRAM_RATE_GLOBAL,
+                chat_rate=settings.TELEGRAM_RATE_PER_CHAT,
+                redis_url=settings.REDIS_URL if settings.TELEGRAM_RATE_BACKEND == 'redis' else None,
+            )
+        return _limiter
+
+
+def reset_rate_limiter() -> None:
+    """Drop the limiter so the next call picks up changed settings."""
+    global _limiter
+    with _limiter_lock:
+        _limiter = None
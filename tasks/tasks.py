@@ -1,24 +1,27 @@
-import requests
 from django.conf import settings
 from django.utils import timezone
 from datetime import timedelta, date
-from celery import shared_task
-from .models import Task
+from celery import shared_task, signature
+from .blobs import get_blob_store
+from .models import OPEN_TASK_STATUSES, Task
+from .outbound import RetryLater, deliver, retry_or_dead_letter, store_dead_letter
 from django.db.models import QuerySet
 from typing import Dict, List, Optional, Union, Any
 
 
-@shared_task
-def send_telegram_notifications() -> str:
+@shared_task(bind=True, max_retries=settings.TELEGRAM_MAX_RETRIES)
+def send_telegram_notifications(self: Any) -> str:
     """Identify overdue and upcoming tasks and send a summary report to Telegram."""
     now: date = timezone.now().date()
     tomorrow: date = now + timedelta(days=1)
 
-    # Note: Using 'completed' instead of 'done' based on your provided task logic
-    overdue: QuerySet[Task] = Task.objects.filter(deadline__lt=now).exclude(status='completed').select_related(
-        'project')
-    upcoming: QuerySet[Task] = Task.objects.filter(deadline=tomorrow).exclude(status='completed').select_related(
-        'project')
+    # Only unfinished tasks are reported; the filter matches the partial index on open tasks
+    overdue: QuerySet[Task] = Task.objects.filter(
+        deadline__lt=now, status__in=OPEN_TASK_STATUSES
+    ).select_related('project')
+    upcoming: QuerySet[Task] = Task.objects.filter(
+        deadline=tomorrow, status__in=OPEN_TASK_STATUSES
+    ).select_related('project')
 
     if not overdue.exists() and not upcoming.exists():
         return "No tasks to notify"
@@ -53,60 +56,66 @@ def send_telegram_notifications() -> str:
     message += format_section(overdue, "🔴", "ПРОСРОЧЕНО")
     message += format_section(upcoming, "🟡", "КРАЙНИЙ СРОК ЗАВТРА")
 
-    url: str = f"https://api.telegram.org/bot{settings.TELEGRAM_BOT_TOKEN}/sendMessage"
-    payload: Dict[str, Any] = {
-        "chat_id": settings.TELEGRAM_CHAT_ID,
-        "text": message,
-        "parse_mode": "Markdown"
-    }
-
     try:
-        response: requests.Response = requests.post(url, json=payload, timeout=10)
-        response.raise_for_status()
+        deliver(settings.TELEGRAM_CHAT_ID, text=message)
         return "Success"
+    except RetryLater as exc:
+        return retry_or_dead_letter(self, exc, settings.TELEGRAM_CHAT_ID, 'sendMessage', {'text': message})
     except Exception as e:
+        store_dead_letter(settings.TELEGRAM_CHAT_ID, 'sendMessage', {'text': message}, str(e), self.request.retries + 1)
         return f"Error: {str(e)}"
 
 
-@shared_task
+@shared_task(bind=True, max_retries=settings.TELEGRAM_MAX_RETRIES)
 def send_telegram(
+        self: Any,
         chat_id: Union[int, str],
         text: Optional[str] = None,
         document_bytes: Optional[bytes] = None,
         filename: Optional[str] = None,
-        caption: Optional[str] = None
+        caption: Optional[str] = None,
+        document_ref: Optional[str] = None,
+        on_uploaded: Optional[Dict[str, Any]] = None,
 ) -> str:
     """
     Unified task for Telegram messaging:
     - Sends text messages via sendMessage
     - Sends files (PDF, images) via sendDocument
+
+    Documents queued through the broker are passed as `document_ref`, a
+    reference into the blob store (see `tasks.blobs`); the file is streamed
+    into the upload and removed after delivery. `document_bytes` is only for
+    in-process calls (`send_telegram.run`), since bytes do not fit in JSON
+    broker messages.
+
+    `on_uploaded` is an optional Celery signature called with the `file_id`
+    Telegram assigned to an uploaded document, so the caller can send the
+    same file again by reference.
+
+    Sends respect the global and per-chat rate limits. Throttled sends and
+    429 responses are retried by Celery after `retry_after`; messages that
+    still fail end up in the dead-letter store.
     """
-    base_url: str = f"https://api.telegram.org/bot{settings.TELEGRAM_BOT_TOKEN}/"
+    method: str = 'sendDocument' if document_bytes or document_ref else 'sendMessage'
+    payload: Dict[str, Any] = {'text': text, 'filename': filename, 'caption': caption, 'document_ref': document_ref}
 
     try:
-        if document_bytes:
-            url: str = base_url + "sendDocument"
-            files: Dict[str, Any] = {
-                'document': (filename or 'file.pdf', document_bytes, 'application/pdf')
-            }
-            data: Dict[str, Any] = {'chat_id': chat_id}
-            if caption:
-                data['caption'] = caption
-                # Using HTML for caption if explicitly requested via structure
-                data['parse_mode'] = 'HTML'
-
-            response: requests.Response = requests.post(url, data=data, files=files, timeout=15)
+        if document_ref:
+            store = get_blob_store()
+            with store.open(document_ref) as document:
+                result: Any = deliver(chat_id, document=document, filename=filename, caption=caption)
+            store.delete(document_ref)
         else:
-            url = base_url + "sendMessage"
-            payload: Dict[str, Any] = {
-                'chat_id': chat_id,
-                'text': text or 'Сообщение без текста',
-                'parse_mode': 'HTML' if caption else 'Markdown'
-            }
-            response = requests.post(url, json=payload, timeout=10)
+            result = deliver(chat_id, text=text, document=document_bytes or None, filename=filename, caption=caption)
 
-        response.raise_for_status()
-        return "Отправлено успешно"
+    except RetryLater as exc:
+        return retry_or_dead_letter(self, exc, chat_id, method, payload)
 
     except Exception as e:
-        return f"Ошибка отправки: {str(e)}"
\ No newline at end of file
+        store_dead_letter(chat_id, method, payload, str(e), self.request.retries + 1)
+        return f"Ошибка отправки: {str(e)}"
+
+    file_id: Optional[str] = ((result or {}).get('document') or {}).get('file_id')
+    if on_uploaded and file_id:
+        signature(on_uploaded)(file_id)
+    return "Отправлено успешно"
@@ -0,0 +1,174 @@
+import os
+import threading
+from typing import Any, BinaryIO, Dict, Optional, Tuple, Union
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+# A document can be passed as raw bytes, an open binary file or the `file_id`
+# of a document already uploaded to Telegram
+DocumentContent = Union[bytes, BinaryIO, str]
+
+# Descriptions of 400 errors for a `file_id` Telegram no longer accepts (the file must be uploaded again)
+FILE_ID_ERRORS: Tuple[str, ...] = (
+    'wrong file identifier',
+    'wrong remote file identifier',
+    'file reference expired',
+    'file_reference_expired',
+)
+
+
+class TelegramAPIError(Exception):
+    """
+        Error returned by the Telegram Bot API.
+
+        Attributes:
+            error_code: HTTP-like error code from the response (e.g. 400, 429).
+            retry_after: Seconds to wait before retrying, set for 429 responses.
+    """
+
+    def __init__(self, description: str, error_code: Optional[int] = None, retry_after: Optional[int] = None) -> None:
+        super().__init__(description)
+        self.error_code: Optional[int] = error_code
+        self.retry_after: Optional[int] = retry_after
+
+    @property
+    def is_file_id_error(self) -> bool:
+        """Whether Telegram rejected the `file_id` of a document, rather than the chat or the request."""
+        description: str = str(self).lower()
+        return self.error_code == 400 and any(error in description for error in FILE_ID_ERRORS)
+
+
+class TelegramClient:
+    """
+        Thread-safe Telegram Bot API client reusing keep-alive connections.
+
+        All senders share one `requests.Session` per process whose connection
+        pool keeps TCP/TLS connections to the API open between messages.
+
+        Attributes:
+            base_url: `<api_url>/bot<token>/` prefix of every method call.
+            timeout: `(connect, read)` timeout pair in seconds.
+    """
+
+    def __init__(
+            self,
+            token: str,
+            api_url: str = 'https://api.telegram.org',
+            pool_size: int = 10,
+            connect_timeout: float = 5.0,
+            read_timeout: float = 15.0,
+    ) -> None:
+        self.base_url: str = f"{api_url.rstrip('/')}/bot{token}/"
+        self.timeout: tuple = (connect_timeout, read_timeout)
+        self.session: requests.Session = requests.Session()
+
+        adapter: HTTPAdapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def call(
+            self,
+            method: str,
+            json: Optional[Dict[str, Any]] = None,
+            data: Optional[Dict[str, Any]] = None,
+            files: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        """
+        Call a Bot API method and return its `result` field.
+
+        Raises:
+            TelegramAPIError: If the API answered with `ok: false`.
+            requests.RequestException: On network failures.
+        """
+        response: requests.Response = self.session.post(
+            self.base_url + method, json=json, data=data, files=files, timeout=self.timeout
+        )
+
+        try:
+            body: Dict[str, Any] = response.json()
+        except ValueError:
+            response.raise_for_status()
+            raise TelegramAPIError(f"Invalid response from Telegram: {response.text[:200]}", response.status_code)
+
+        if not body.get('ok'):
+            parameters: Dict[str, Any] = body.get('parameters') or {}
+            raise TelegramAPIError(
+                body.get('description', 'Unknown Telegram error'),
+                body.get('error_code', response.status_code),
+                parameters.get('retry_after'),
+            )
+        return body.get('result')
+
+    def send_message(self, chat_id: Union[int, str], text: str, parse_mode: Optional[str] = None) -> Any:
+        """Send a text message via sendMessage."""
+        payload: Dict[str, Any] = {'chat_id': chat_id, 'text': text}
+        if parse_mode:
+            payload['parse_mode'] = parse_mode
+        return self.call('sendMessage', json=payload)
+
+    def send_document(
+            self,
+            chat_id: Union[int, str],
+            document: DocumentContent,
+            filename: str = 'file.pdf',
+            caption: Optional[str] = None,
+            parse_mode: Optional[str] = None,
+    ) -> Any:
+        """
+        Send a document via sendDocument.
+
+        Bytes and file objects are uploaded as multipart; a string is a
+        `file_id` of an earlier upload and is sent by reference without
+        transferring the file again.
+        """
+        data: Dict[str, Any] = {'chat_id': chat_id}
+        if caption:
+            data['caption'] = caption
+        if parse_mode:
+            data['parse_mode'] = parse_mode
+        if isinstance(document, str):
+            data['document'] = document
+            return self.call('sendDocument', json=data)
+        files: Dict[str, Any] = {'document': (filename, document, 'application/pdf')}
+        return self.call('sendDocument', data=data, files=files)
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self.session.close()
+
+
+_client: Optional[TelegramClient] = None
+_client_pid: Optional[int] = None
+_client_lock: threading.Lock = threading.Lock()
+
+
+def get_telegram_client() -> TelegramClient:
+    """
+    Return the per-process client configured from Django settings.
+
+    A new client is created after a fork so Celery prefork children never
+    share sockets with their parent.
+    """
+    global _client, _client_pid
+    with _client_lock:
+        if _client is None or _client_pid != os.getpid():
+            _client = TelegramClient(
+                token=settings.TELEGRAM_BOT_TOKEN,
+                api_url=settings.TELEGRAM_API_URL,
+                pool_size=settings.TELEGRAM_POOL_SIZE,
+                connect_timeout=settings.TELEGRAM_CONNECT_TIMEOUT,
+                read_timeout=settings.TELEGRAM_READ_TIMEOUT,
+            )
+            _client_pid = os.getpid()
+        return _client
+
+
+def reset_telegram_client() -> None:
+    """Drop the cached client so the next call picks up changed settings."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = None
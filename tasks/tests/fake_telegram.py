@@ -0,0 +1,141 @@
+import email.parser
+import email.policy
+import itertools
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl
+
+
+class FakeTelegramServer(ThreadingHTTPServer):
+    """
+        Local stand-in for the Telegram Bot API used by tests and benchmarks.
+
+        Every call is recorded in `calls` as `{'method', 'params', 'files'}`.
+        Responses can be scripted per method with `enqueue_response`;
+        otherwise a successful result is returned. `connections` counts
+        accepted TCP connections, which shows whether keep-alive works.
+        `delay` seconds are slept before every answer to mimic the round
+        trip to the real API.
+    """
+    daemon_threads: bool = True
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0) -> None:
+        super().__init__((host, port), _FakeTelegramHandler)
+        self.calls: List[Dict[str, Any]] = []
+        self.connections: int = 0
+        self.delay: float = 0.0
+        self.scripted: Dict[str, Deque[Tuple[int, Dict[str, Any]]]] = defaultdict(deque)
+        self._message_ids = itertools.count(1)
+        self._lock: threading.Lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'FakeTelegramServer':
+        self._thread = threading.Thread(target=self.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def enqueue_response(self, method: str, status: int, body: Dict[str, Any]) -> None:
+        """Make the next call of `method` answer with the given status and JSON body."""
+        self.scripted[method].append((status, body))
+
+    def enqueue_retry_after(self, method: str, retry_after: int) -> None:
+        """Make the next call of `method` answer 429 Too Many Requests."""
+        self.enqueue_response(method, 429, {
+            'ok': False,
+            'error_code': 429,
+            'description': f"Too Many Requests: retry after {retry_after}",
+            'parameters': {'retry_after': retry_after},
+        })
+
+    def calls_for(self, method: str) -> List[Dict[str, Any]]:
+        return [call for call in self.calls if call['method'] == method]
+
+    def respond(self, method: str, params: Dict[str, Any], files: Dict[str, bytes]) -> Tuple[int, Dict[str, Any]]:
+        if self.delay:
+            time.sleep(self.delay)
+        with self._lock:
+            self.calls.append({'method': method, 'params': params, 'files': files})
+            if self.scripted[method]:
+                return self.scripted[method].popleft()
+            message_id: int = next(self._message_ids)
+
+        # Enough of a Message for clients that validate responses (aiogram)
+        result: Dict[str, Any] = {
+            'message_id': message_id,
+            'date': int(time.time()),
+            'chat': {'id': params.get('chat_id'), 'type': 'private'},
+        }
+        if method == 'sendDocument':
+            result['document'] = {
+                'file_id': params.get('document') if not files else f"FAKE-FILE-{message_id}",
+                'file_name': next(iter(files), 'document'),
+            }
+        return 200, {'ok': True, 'result': result}
+
+
+class _FakeTelegramHandler(BaseHTTPRequestHandler):
+    protocol_version: str = 'HTTP/1.1'
+    # Headers and body are written separately; avoid Nagle stalls on keep-alive connections
+    disable_nagle_algorithm: bool = True
+    server: FakeTelegramServer
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server._lock:
+            self.server.connections += 1
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def do_POST(self) -> None:
+        length: int = int(self.headers.get('Content-Length', 0))
+        raw: bytes = self.rfile.read(length)
+        content_type: str = self.headers.get('Content-Type', '')
+        method: str = self.path.rstrip('/').rsplit('/', 1)[-1]
+
+        params, files = _parse_body(content_type, raw)
+        status, body = self.server.respond(method, params, files)
+
+        payload: bytes = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def _parse_body(content_type: str, raw: bytes) -> Tuple[Dict[str, Any], Dict[str, bytes]]:
+    """Decode JSON, urlencoded or multipart request bodies into params and uploaded files."""
+    if content_type.startswith('application/json'):
+        return json.loads(raw or b'{}'), {}
+
+    if content_type.startswith('multipart/form-data'):
+        message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode('utf-8') + raw
+        )
+        params: Dict[str, Any] = {}
+        files: Dict[str, bytes] = {}
+        for part in message.iter_parts():
+            name: str = part.get_param('name', header='content-disposition')
+            filename: Optional[str] = part.get_filename()
+            content: bytes = part.get_payload(decode=True) or b''
+            if filename:
+                files[filename] = content
+            else:
+                params[name] = content.decode('utf-8')
+        return params, files
+
+    return dict(parse_qsl(raw.decode('utf-8'))), {}
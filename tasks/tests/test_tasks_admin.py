@@ -0,0 +1,78 @@
+import pytest
+from typing import Any
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import Client as HttpClient
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from clients.models import Client
+from invoices.views import send_invoice_to_telegram
+from tasks.models import DeadLetterMessage
+from tasks.tasks import send_telegram
+
+
+def _resend(admin_client: HttpClient, *letters: DeadLetterMessage) -> Any:
+    """Run the admin's re-send action on the given dead letters"""
+    return admin_client.post(reverse('admin:tasks_deadlettermessage_changelist'), {
+        'action': 'resend',
+        '_selected_action': [letter.pk for letter in letters],
+    }, follow=True)
+
+
+@pytest.mark.django_db
+class TestDeadLetterAdmin:
+    """Tests for re-sending dead letters from the admin"""
+
+    def test_resend_queues_messages_again(self, admin_client: HttpClient) -> None:
+        """Verify that messages and documents are queued with their stored parameters and leave the store"""
+        text: DeadLetterMessage = DeadLetterMessage.objects.create(
+            chat_id='42', method='sendMessage', payload={'text': "Отчёт"}, error="Bad Gateway",
+        )
+        document: DeadLetterMessage = DeadLetterMessage.objects.create(
+            chat_id='43', method='sendDocument', error="Bad Gateway",
+            payload={'text': None, 'filename': 'inv.pdf', 'caption': "Счёт", 'document_ref': 'a' * 32},
+        )
+
+        with patch.object(send_telegram, 'delay') as delay:
+            response: Any = _resend(admin_client, text, document)
+
+        assert sorted((call.kwargs for call in delay.call_args_list), key=lambda kwargs: kwargs['chat_id']) == [
+            {'chat_id': '42', 'text': "Отчёт", 'filename': None, 'caption': None, 'document_ref': None},
+            {'chat_id': '43', 'text': None, 'filename': 'inv.pdf', 'caption': "Счёт", 'document_ref': 'a' * 32},
+        ]
+        assert not DeadLetterMessage.objects.exists()
+        assert "Отправлено повторно: 2" in response.content.decode()
+
+    def test_resend_invoice(self, admin_client: HttpClient) -> None:
+        """Verify that an invoice that could not be sent is queued through the invoice task"""
+        letter: DeadLetterMessage = DeadLetterMessage.objects.create(
+            chat_id='42', method='sendDocument', payload={'invoice_id': 7}, error="Bad Request: chat not found",
+        )
+
+        with patch.object(send_invoice_to_telegram, 'delay') as delay:
+            _resend(admin_client, letter)
+
+        delay.assert_called_once_with(7, '42')
+        assert not DeadLetterMessage.objects.exists()
+
+    def test_changelist_names_clients_in_one_query(self, admin_client: HttpClient) -> None:
+        """Verify that the client column does not add a query per row"""
+        url: str = reverse('admin:tasks_deadlettermessage_changelist')
+
+        def page_queries() -> int:
+            with CaptureQueriesContext(connection) as captured:
+                response: Any = admin_client.get(url)
+            assert response.status_code == 200
+            return len(captured)
+
+        Client.objects.create(name="Клиент 1", telegram_chat_id='1')
+        DeadLetterMessage.objects.create(chat_id='1', method='sendMessage', payload={}, error="Bad Gateway")
+        one_row: int = page_queries()
+        for n in range(2, 6):
+            Client.objects.create(name=f"Клиент {n}", telegram_chat_id=str(n))
+            DeadLetterMessage.objects.create(chat_id=str(n), method='sendMessage', payload={}, error="Bad Gateway")
+
+        assert page_queries() == one_row
+        assert "Клиент 5" in admin_client.get(url).content.decode()
@@ -0,0 +1,107 @@
+import json
+import os
+import time
+import pytest
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+from celery.exceptions import Retry
+
+from invoices.models import Invoice
+from invoices.views import send_invoice_to_telegram
+from tasks.blobs import BlobNotFound, FileBlobStore, get_blob_store
+from tasks.models import DeadLetterMessage
+from tasks.tasks import send_telegram
+from tasks.tests.fake_telegram import FakeTelegramServer
+
+
+class TestFileBlobStore:
+    """Tests for the file-based blob handoff store"""
+
+    def test_put_and_open(self, tmp_path: Path) -> None:
+        """Verify that stored bytes are read back by reference"""
+        store = FileBlobStore(tmp_path, ttl=60)
+        ref: str = store.put(b'%PDF-data')
+
+        with store.open(ref) as blob:
+            assert blob.read() == b'%PDF-data'
+
+    def test_delete(self, tmp_path: Path) -> None:
+        """Verify that deleted blobs can no longer be opened"""
+        store = FileBlobStore(tmp_path, ttl=60)
+        ref: str = store.put(b'x')
+        store.delete(ref)
+
+        with pytest.raises(BlobNotFound):
+            store.open(ref)
+
+    def test_invalid_reference_rejected(self, tmp_path: Path) -> None:
+        """Verify that references outside the store format never reach the filesystem"""
+        store = FileBlobStore(tmp_path, ttl=60)
+
+        with pytest.raises(BlobNotFound):
+            store.open('../../etc/passwd')
+
+    def test_purge_expired(self, tmp_path: Path) -> None:
+        """Verify that blobs older than the TTL are removed"""
+        store = FileBlobStore(tmp_path, ttl=60)
+        old_ref: str = store.put(b'old')
+        fresh_ref: str = store.put(b'fresh')
+        past: float = time.time() - 120
+        os.utime(tmp_path / f"{old_ref}.blob", (past, past))
+
+        assert store.purge_expired() == 1
+        assert store.open(fresh_ref).read() == b'fresh'
+
+
+@pytest.mark.django_db
+class TestDocumentHandoff:
+    """Tests for passing documents between tasks by reference"""
+
+    def test_send_by_reference(self, fake_telegram: FakeTelegramServer) -> None:
+        """Verify that the blob is uploaded and removed after delivery"""
+        ref: str = get_blob_store().put(b'%PDF-1')
+
+        result: str = send_telegram.run(chat_id=42, document_ref=ref, filename='inv.pdf', caption='Счёт')
+
+        assert result == "Отправлено успешно"
+        assert fake_telegram.calls_for('sendDocument')[0]['files'] == {'inv.pdf': b'%PDF-1'}
+        with pytest.raises(BlobNotFound):
+            get_blob_store().open(ref)
+
+    def test_blob_kept_for_retry(self, fake_telegram: FakeTelegramServer) -> None:
+        """Verify that a throttled upload keeps the blob for the next attempt"""
+        ref: str = get_blob_store().put(b'%PDF-1')
+        fake_telegram.enqueue_retry_after('sendDocument', 5)
+
+        with patch.object(send_telegram, 'retry', side_effect=Retry()):
+            send_telegram.apply(kwargs={'chat_id': 42, 'document_ref': ref})
+
+        assert get_blob_store().open(ref).read() == b'%PDF-1'
+
+    def test_missing_blob_dead_lettered(self, fake_telegram: FakeTelegramServer) -> None:
+        """Verify that an expired blob is recorded as a dead letter"""
+        result: str = send_telegram.run(chat_id=42, document_ref='0' * 32)
+
+        assert result.startswith("Ошибка отправки")
+        assert DeadLetterMessage.objects.get().payload['document_ref'] == '0' * 32
+        assert not fake_telegram.calls
+
+    @patch('invoices.views.render_invoice_pdf', return_value=b'%PDF-invoice')
+    @patch('invoices.views.send_telegram.delay')
+    def test_invoice_task_enqueues_reference(
+            self,
+            mock_delay: Any,
+            mock_render: Any,
+            invoice: Invoice,
+            settings: Any,
+            tmp_path: Path,
+    ) -> None:
+        """Verify that the broker message carries a small JSON payload instead of PDF bytes"""
+        settings.INVOICE_PDF_CACHE_DIR = str(tmp_path)
+        send_invoice_to_telegram.run(invoice.pk, 42)
+
+        kwargs: Any = mock_delay.call_args.kwargs
+        assert len(json.dumps(kwargs, ensure_ascii=False)) < 1024
+        assert get_blob_store().open(kwargs['document_ref']).read() == b'%PDF-invoice'
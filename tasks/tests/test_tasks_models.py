@@ -1,7 +1,7 @@
 import pytest
 from datetime import timedelta, date
 from django.utils import timezone
-from tasks.models import Task
+from tasks.models import OPEN_TASK_STATUSES, Task
 from projects.models import Project
 
 @pytest.mark.django_db
@@ -65,4 +65,12 @@ class TestTaskModel:
 
         tasks = Task.objects.all()
         assert tasks[0] == t2
-        assert tasks[1] == t1
\ No newline at end of file
+        assert tasks[1] == t1
+
+    def test_overdue_lookup_uses_index(self) -> None:
+        """Verify that the overdue filter is answered from a (status, deadline) index"""
+        today: date = timezone.now().date()
+
+        plan: str = Task.objects.filter(status__in=OPEN_TASK_STATUSES, deadline__lt=today).explain()
+
+        assert 'task_status_deadline_idx' in plan or 'task_open_deadline_idx' in plan
@@ -0,0 +1,117 @@
+import pytest
+from typing import Any
+from unittest.mock import patch
+
+from celery.exceptions import Retry
+
+from tasks.models import DeadLetterMessage
+from tasks.outbound import RetryLater, deliver, wait_for_slot
+from tasks.ratelimit import TelegramRateLimiter, get_rate_limiter
+from tasks.tasks import send_telegram
+from tasks.tests.fake_telegram import FakeTelegramServer
+
+
+class TestTelegramRateLimiter:
+    """Tests for the in-memory global and per-chat token buckets"""
+
+    def test_per_chat_limit(self) -> None:
+        """Verify that a second message to the same chat has to wait"""
+        limiter = TelegramRateLimiter(global_rate=30, chat_rate=1)
+
+        assert limiter.acquire(1) == 0
+        assert 0 < limiter.acquire(1) <= 1
+
+    def test_global_limit(self) -> None:
+        """Verify that the global bucket caps sends across different chats"""
+        limiter = TelegramRateLimiter(global_rate=3, chat_rate=1)
+
+        waits = [limiter.acquire(chat_id) for chat_id in range(4)]
+
+        assert waits[:3] == [0, 0, 0]
+        assert waits[3] > 0
+
+    def test_wait_takes_no_token(self) -> None:
+        """Verify that a refused acquire does not drain the buckets further"""
+        limiter = TelegramRateLimiter(global_rate=30, chat_rate=1)
+        limiter.acquire(1)
+
+        first: float = limiter.acquire(1)
+        second: float = limiter.acquire(1)
+
+        assert second <= first
+
+    def test_penalize_blocks_chat(self) -> None:
+        """Verify that retry_after from a 429 blocks only the affected chat"""
+        limiter = TelegramRateLimiter(global_rate=30, chat_rate=1)
+        limiter.penalize(1, 20)
+
+        assert limiter.acquire(1) >= 20
+        assert limiter.acquire(2) == 0
+
+
+@pytest.mark.django_db
+class TestOutboundDelivery:
+    """Tests for throttled delivery, Celery retries and dead letters"""
+
+    def test_short_wait_is_slept(self, fake_telegram: FakeTelegramServer, settings: Any) -> None:
+        """Verify that waits below TELEGRAM_RATE_MAX_WAIT are slept in place"""
+        settings.TELEGRAM_RATE_MAX_WAIT = 2.0
+
+        with patch('tasks.outbound.time.sleep') as sleep, \
+                patch.object(get_rate_limiter(), 'acquire', side_effect=[0.5, 0]):
+            wait_for_slot(7)
+
+        sleep.assert_called_once_with(0.5)
+
+    def test_long_wait_raises_retry_later(self, fake_telegram: FakeTelegramServer, settings: Any) -> None:
+        """Verify that long waits are handed back to Celery"""
+        settings.TELEGRAM_RATE_MAX_WAIT = 2.0
+        get_rate_limiter().penalize(7, 30)
+
+        with pytest.raises(RetryLater) as exc_info:
+            wait_for_slot(7)
+        assert exc_info.value.delay >= 29
+
+    def test_429_penalizes_chat(self, fake_telegram: FakeTelegramServer) -> None:
+        """Verify that retry_after from Telegram becomes the retry delay"""
+        fake_telegram.enqueue_retry_after('sendMessage', 15)
+
+        with pytest.raises(RetryLater) as exc_info:
+            deliver(5, text='x')
+
+        assert exc_info.value.delay == 15
+        assert get_rate_limiter().acquire(5) >= 14
+
+    def test_429_schedules_celery_retry(self, fake_telegram: FakeTelegramServer) -> None:
+        """Verify that a throttled task is retried with countdown = retry_after"""
+        fake_telegram.enqueue_retry_after('sendMessage', 15)
+
+        with patch.object(send_telegram, 'retry', side_effect=Retry()) as retry:
+            send_telegram.apply(kwargs={'chat_id': 5, 'text': 'x'})
+
+        assert retry.call_args.kwargs['countdown'] == 15
+        assert not DeadLetterMessage.objects.exists()
+
+    def test_exhausted_retries_go_to_dead_letters(self, fake_telegram: FakeTelegramServer) -> None:
+        """Verify that a message still throttled after the last retry is stored"""
+        fake_telegram.enqueue_retry_after('sendMessage', 15)
+
+        result: str = send_telegram.run(chat_id=5, text='Счёт')
+
+        assert result.startswith("Ошибка отправки")
+        letter: DeadLetterMessage = DeadLetterMessage.objects.get()
+        assert letter.chat_id == '5'
+        assert letter.method == 'sendMessage'
+        assert letter.payload['text'] == 'Счёт'
+
+    def test_permanent_error_is_not_retried(self, fake_telegram: FakeTelegramServer) -> None:
+        """Verify that errors like 'chat not found' are dead-lettered immediately"""
+        fake_telegram.enqueue_response('sendMessage', 400, {
+            'ok': False, 'error_code': 400, 'description': 'Bad Request: chat not found'
+        })
+
+        with patch.object(send_telegram, 'retry') as retry:
+            send_telegram.apply(kwargs={'chat_id': 5, 'text': 'x'})
+
+        retry.assert_not_called()
+        assert DeadLetterMessage.objects.get().error == 'Bad Request: chat not found'
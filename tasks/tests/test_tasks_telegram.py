@@ -0,0 +1,70 @@
+import pytest
+from datetime import timedelta
+from typing import Any
+
+from django.utils import timezone
+
+from projects.models import Project
+from tasks.models import DeadLetterMessage, Task
+from tasks.tasks import send_telegram, send_telegram_notifications
+from tasks.telegram import TelegramAPIError, get_telegram_client
+from tasks.tests.fake_telegram import FakeTelegramServer
+
+
+@pytest.mark.django_db
+class TestTelegramDelivery:
+    """Tests for the pooled Telegram client against a local fake Bot API"""
+
+    def test_send_text_message(self, fake_telegram: FakeTelegramServer) -> None:
+        """Verify that text messages are sent via sendMessage with Markdown"""
+        result: str = send_telegram.run(chat_id=42, text="Привет")
+
+        assert result == "Отправлено успешно"
+        call: Any = fake_telegram.calls_for('sendMessage')[0]
+        assert call['params'] == {'chat_id': 42, 'text': 'Привет', 'parse_mode': 'Markdown'}
+
+    def test_send_document_multipart(self, fake_telegram: FakeTelegramServer) -> None:
+        """Verify that documents are uploaded as multipart with an HTML caption"""
+        send_telegram.run(chat_id=42, document_bytes=b'%PDF-1', filename='inv.pdf', caption='<b>Счёт</b>')
+
+        call: Any = fake_telegram.calls_for('sendDocument')[0]
+        assert call['params']['caption'] == '<b>Счёт</b>'
+        assert call['params']['parse_mode'] == 'HTML'
+        assert call['files'] == {'inv.pdf': b'%PDF-1'}
+
+    def test_connections_are_reused(self, fake_telegram: FakeTelegramServer) -> None:
+        """Verify that consecutive sends share one keep-alive connection"""
+        for i in range(5):
+            send_telegram.run(chat_id=100 + i, text=f"msg {i}")
+
+        assert len(fake_telegram.calls) == 5
+        assert fake_telegram.connections == 1
+
+    def test_api_error_is_reported(self, fake_telegram: FakeTelegramServer) -> None:
+        """Verify that ok=false responses surface as errors"""
+        fake_telegram.enqueue_response('sendMessage', 400, {
+            'ok': False, 'error_code': 400, 'description': 'Bad Request: chat not found'
+        })
+
+        with pytest.raises(TelegramAPIError) as exc_info:
+            get_telegram_client().send_message(1, 'x')
+        assert exc_info.value.error_code == 400
+
+    def test_notifications_report(self, fake_telegram: FakeTelegramServer, project: Project) -> None:
+        """Verify that the daily report goes to the admin chat through the shared client"""
+        Task.objects.create(project=project, title="Late", deadline=timezone.now().date() - timedelta(days=1))
+
+        assert send_telegram_notifications() == "Success"
+        assert 'Late' in fake_telegram.calls_for('sendMessage')[0]['params']['text']
+
+    def test_failed_report_is_dead_lettered(self, fake_telegram: FakeTelegramServer, project: Project) -> None:
+        """Verify that a report Telegram refuses is kept in the dead-letter store instead of being lost"""
+        Task.objects.create(project=project, title="Late", deadline=timezone.now().date() - timedelta(days=1))
+        fake_telegram.enqueue_response('sendMessage', 400, {
+            'ok': False, 'error_code': 400, 'description': 'Bad Request: chat not found'
+        })
+
+        assert send_telegram_notifications() == "Error: Bad Request: chat not found"
+        letter: DeadLetterMessage = DeadLetterMessage.objects.get()
+        assert letter.error == 'Bad Request: chat not found'
+        assert 'Late' in letter.payload['text']